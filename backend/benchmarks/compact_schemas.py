@@ -0,0 +1,127 @@
+"""
+Quantify output-token and latency savings of compact tool schemas.
+
+Offline, a realistic output for each tool is rendered with original and with
+compact keys and sized with the local token estimate. Then the same tools are
+called through ClaudeClient against the fake Messages API with
+--tokens-per-second, where latency grows with output tokens, in both modes:
+
+    cd backend
+    python -m benchmarks.compact_schemas --repeats 5 --tokens-per-second 60
+"""
+
+import json
+import os
+
+import click
+
+from src.compact_schemas import ENUM_CODES, KEY_MAPS
+from src.context_builder import estimate_tokens
+from src.fake_anthropic_server import (
+    FakeAnthropicServer,
+    FakeServerConfig,
+    LatencyModel,
+)
+from src.schemas import (
+    ANALYSIS_SCHEMA,
+    QUESTION_WITH_ANSWERS_SCHEMA,
+    SUMMARY_EXTRACTOR_SCHEMA,
+)
+from src.telemetry import Telemetry, percentile
+
+SAMPLES = {
+    "generate_analysis_report": {
+        "timeline": [
+            {"time": "Feb 10", "event": "Rob booked flights for himself and John"},
+            {"time": "March 3", "event": "John and Rob flew to Cancun"},
+            {"time": "March 4", "event": "Lamar saw the trip on Instagram"},
+        ],
+        "key_facts": ["The three had planned a trip together", "Marcus drove them to the airport"],
+        "gaps": ["Whether Lamar was ever told the original trip was off"],
+        "verdict": {
+            "primary_responsibility": "Rob",
+            "percentage": 70,
+            "reasoning": "Rob booked the trip and chose not to invite Lamar",
+            "contributing_factors": "John went along with it",
+            "drama_rating": 8,
+            "drama_rating_explanation": "A secret trip found out on Instagram is peak drama",
+        },
+    },
+    "generate_question_with_answers": {
+        "question": "So who actually booked the flights?",
+        "target_goal": "g1",
+        "reasoning": "Booking date anchors the timeline",
+        "answers": [
+            {"answer": "Rob did, in February", "reasoning": "Specific"},
+            {"answer": "I think John", "reasoning": "Uncertain"},
+            {"answer": "No idea", "reasoning": "Non-answer"},
+            {"answer": "Why does it matter", "reasoning": "Deflection"},
+        ],
+    },
+    "extract_summary_structure": {
+        "actors": [
+            {"name": name, "role": "friend", "relationships": ["friends with the others"],
+             "emotional_state": ["hurt"]}
+            for name in ("Lamar", "John", "Rob")
+        ],
+        "point_of_conflict": {"primary": "Secret Mexico trip", "secondary": ["Broken plans"]},
+        "general_details": {
+            "timeline_markers": ["March 3"],
+            "location_context": ["Cancun"],
+            "communication_history": ["Group chat went quiet in February"],
+            "emotional_atmosphere": "hurt and betrayed",
+        },
+        "missing_info": ["Who else knew"],
+    },
+}
+
+
+def compact_output(value, keys):
+    if isinstance(value, dict):
+        return {keys.get(k, k): compact_output(v, keys) for k, v in value.items()}
+    if isinstance(value, list):
+        return [compact_output(v, keys) for v in value]
+    if isinstance(value, str) and value in ENUM_CODES:
+        return ENUM_CODES[value]
+    return value
+
+
+def offline() -> None:
+    click.echo(f"{'tool':<34}{'original':>10}{'compact':>10}{'saved':>8}  (est. output tokens)")
+    for name, sample in SAMPLES.items():
+        original = estimate_tokens(json.dumps(sample))
+        compact = estimate_tokens(json.dumps(compact_output(sample, KEY_MAPS[name])))
+        click.echo(f"{name:<34}{original:>10}{compact:>10}{(original - compact) / original:>8.0%}")
+
+
+def fake_latency(repeats: int, tokens_per_second: float) -> None:
+    from src.api_client import ClaudeClient
+
+    config = FakeServerConfig(latency=LatencyModel(kind="constant", a=50, tokens_per_second=tokens_per_second))
+    with FakeAnthropicServer(config) as server:
+        os.environ.setdefault("ANTHROPIC_API_KEY", "fake-key")
+        click.echo(f"\nfake API at {tokens_per_second:.0f} output tokens/s, {repeats} calls per tool")
+        click.echo(f"{'tool':<34}{'mode':>9}{'out tok':>9}{'p50 ms':>9}")
+        for schema in (ANALYSIS_SCHEMA, QUESTION_WITH_ANSWERS_SCHEMA, SUMMARY_EXTRACTOR_SCHEMA):
+            for compact in (False, True):
+                telemetry = Telemetry()
+                client = ClaudeClient(base_url=server.base_url, telemetry=telemetry, compact_schemas=compact)
+                for _ in range(repeats):
+                    client.call_with_tool("system", "prompt", schema, agent_name="Benchmark")
+                calls = telemetry.recent_calls(repeats)
+                tokens = sum(c.output_tokens for c in calls) / len(calls)
+                p50 = percentile([c.latency_ms for c in calls], 50)
+                mode = "compact" if compact else "original"
+                click.echo(f"{schema['name']:<34}{mode:>9}{tokens:>9.0f}{p50:>9.0f}")
+
+
+@click.command()
+@click.option("--repeats", default=5)
+@click.option("--tokens-per-second", default=60.0, help="Fake API generation speed")
+def main(repeats, tokens_per_second):
+    offline()
+    fake_latency(repeats, tokens_per_second)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measure near-duplicate fact merging on long synthetic sessions.
+
+Each session restates earlier facts in paraphrase (--repeat of the time),
+the way interviewees and the extractor do. Prints how many facts are kept,
+the estimated tokens of the facts section before and after, and the insert
+cost per fact:
+
+    cd backend
+    python -m benchmarks.fact_dedup --facts 500,2000,5000
+"""
+
+import random
+import time
+
+import click
+
+from src.context_builder import estimate_tokens
+from src.fact_dedup import FactDeduplicator
+from src.models import Fact
+
+PEOPLE = ["Rob", "Tasha", "Lamar", "Jordan", "Kim", "Dre", "Maya", "Chris"]
+VERBS = ["booked", "paid for", "posted about", "hid", "mentioned", "cancelled", "planned", "argued about"]
+THINGS = ["the flights", "the hotel", "the Cancun trip", "the group chat", "the dinner", "the photos"]
+TOPICS = ["timeline", "motive", "who knew", "fallout"]
+
+
+def synthetic_facts(count: int, repeat: float, seed: int = 0) -> list[Fact]:
+    rng = random.Random(seed)
+    facts: list[Fact] = []
+    while len(facts) < count:
+        if facts and rng.random() < repeat:
+            original = rng.choice(facts)
+            claim = rng.choice(["Honestly ", "I think ", "", "Yeah "]) + original.claim.lower()
+            facts.append(Fact(topic=original.topic, claim=claim, confidence="uncertain"))
+        else:
+            claim = (
+                f"{rng.choice(PEOPLE)} {rng.choice(VERBS)} {rng.choice(THINGS)} "
+                f"on day {rng.randint(1, 400)}"
+            )
+            facts.append(Fact(topic=rng.choice(TOPICS), claim=claim, confidence=rng.choice(["certain", "uncertain"])))
+    return facts
+
+
+def facts_tokens(facts: list[Fact]) -> int:
+    return estimate_tokens("\n".join(f"- {f.claim}" for f in facts))
+
+
+@click.command()
+@click.option("--facts", default="500,2000,5000", help="Comma-separated session lengths (facts extracted)")
+@click.option("--repeat", default=0.3, help="Share of extracted facts that restate an earlier one")
+def main(facts, repeat):
+    click.echo(f"{'facts':>6}{'kept':>7}{'tokens':>9}{'deduped':>9}{'mean us':>9}{'p99 us':>9}")
+    for count in (int(c) for c in facts.split(",")):
+        extracted = synthetic_facts(count, repeat)
+        kept: list[Fact] = []
+        dedup = FactDeduplicator()
+        timings = []
+        for turn, fact in enumerate(extracted):
+            start = time.perf_counter()
+            dedup.insert(kept, [fact.model_copy()], turn=turn)
+            timings.append((time.perf_counter() - start) * 1e6)
+        click.echo(
+            f"{count:>6}{len(kept):>7}{facts_tokens(extracted):>9}{facts_tokens(kept):>9}"
+            f"{sum(timings) / len(timings):>9.0f}{sorted(timings)[int(len(timings) * 0.99)]:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
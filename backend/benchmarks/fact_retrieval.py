@@ -0,0 +1,68 @@
+"""
+Compare "last 10 facts" with relevance-ranked fact retrieval on long sessions.
+
+Synthetic sessions interleave facts about five goals. For each length, the
+least-confident goal is the one the next question targets; the benchmark
+prints how many of the facts shown belong to that goal under each strategy,
+plus the time to index one new turn's facts and retrieve (the per-turn cost):
+
+    cd backend
+    python -m benchmarks.fact_retrieval --facts 50,500,5000
+"""
+
+import random
+import time
+
+import click
+
+from src.fact_index import FactIndex
+from src.models import Fact, Goal
+
+GOALS = {
+    "Timeline of when Rob booked the Cancun trip": ["booked", "trip", "flight", "Cancun", "date", "week"],
+    "Who knew about the trip before Lamar": ["knew", "told", "Tasha", "group chat", "before", "secret"],
+    "Why Lamar was left out": ["left out", "invite", "reason", "budget", "excluded", "why"],
+    "How Lamar found out": ["found out", "Instagram", "photo", "story", "saw", "posted"],
+    "What was said in the argument afterwards": ["argument", "yelled", "apology", "text", "said", "angry"],
+}
+FILLER = ["honestly", "apparently", "last", "really", "said", "thing", "maybe", "then"]
+
+
+def synthetic_facts(count: int, seed: int = 0) -> list[Fact]:
+    rng = random.Random(seed)
+    facts = []
+    for _ in range(count):
+        goal = rng.choice(list(GOALS))
+        words = rng.sample(GOALS[goal], 3) + rng.sample(FILLER, 4)
+        rng.shuffle(words)
+        facts.append(Fact(topic=goal.split()[0].lower(), claim=" ".join(words), source=goal))
+    return facts
+
+
+@click.command()
+@click.option("--facts", default="50,500,5000", help="Comma-separated session lengths (facts)")
+@click.option("--k", default=10)
+def main(facts, k):
+    goals = [Goal(description=d, confidence=70) for d in GOALS]
+    target = goals[2]
+    target.confidence = 20
+    click.echo(f"{'facts':>6}{'last-k on-goal':>16}{'ranked on-goal':>16}{'turn ms':>9}")
+    for count in (int(c) for c in facts.split(",")):
+        session_facts = synthetic_facts(count)
+        index = FactIndex()
+        index.sync(session_facts[:-2])
+
+        start = time.perf_counter()
+        ranked = index.relevant_facts(session_facts, goals, k=k, token_budget=10_000)
+        turn_ms = (time.perf_counter() - start) * 1000
+
+        def on_goal(shown):
+            return sum(f.source == target.description for f in shown)
+
+        click.echo(
+            f"{count:>6}{on_goal(session_facts[-k:]):>13}/{k:<2}{on_goal(ranked):>13}/{k:<2}{turn_ms:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
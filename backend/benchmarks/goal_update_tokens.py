@@ -0,0 +1,101 @@
+"""
+Measure output tokens saved by referencing goals by ID in goal updates.
+
+Offline (default) the update_goal_progress payload is rendered both ways for
+the same updates and sized with the local token estimate. With --live the
+goal tracker prompt is sent to the API once per schema and the reported
+usage.output_tokens are compared:
+
+    cd backend
+    python -m benchmarks.goal_update_tokens
+    python -m benchmarks.goal_update_tokens --live --repeats 3
+"""
+
+import copy
+import json
+
+import click
+
+from src.context_builder import estimate_tokens
+from src.goal_updates import goal_dicts
+from src.models import Goal
+from src.prompts import GOAL_TRACKER_SYSTEM, build_goal_tracker_prompt
+from src.schemas import GOAL_TRACKER_SCHEMA
+
+GOALS = [
+    Goal(description="Establish the full timeline of when the Mexico trip was planned, booked and taken"),
+    Goal(description="Identify everyone who knew about the trip before Lamar found out on Instagram"),
+    Goal(description="Understand why John and Rob decided not to tell Lamar about the trip"),
+    Goal(description="Determine whether the original three-person trip was ever formally cancelled"),
+]
+
+FACTS = [
+    {"claim": "Rob booked the flights on February 10th", "topic": "timeline", "timestamp": "Feb 10"},
+    {"claim": "Marcus drove John and Rob to the airport", "topic": "people", "timestamp": "March 3"},
+]
+
+# The schema as it was before goal IDs: the model echoes each description
+LEGACY_SCHEMA = copy.deepcopy(GOAL_TRACKER_SCHEMA)
+_legacy_item = LEGACY_SCHEMA["input_schema"]["properties"]["goal_updates"]["items"]
+_legacy_item["properties"]["goal"] = _legacy_item["properties"].pop("goal_id")
+_legacy_item["required"] = ["goal", "confidence", "status", "reasoning"]
+
+
+def offline() -> None:
+    goals = goal_dicts(GOALS)
+    reasoning = "New facts address this goal directly"
+    by_description = {"goal_updates": [
+        {"goal": g["description"], "confidence": 45, "status": "in_progress", "reasoning": reasoning}
+        for g in goals
+    ]}
+    by_id = {"goal_updates": [
+        {"goal_id": g["id"], "confidence": 45, "status": "in_progress", "reasoning": reasoning}
+        for g in goals
+    ]}
+    legacy = estimate_tokens(json.dumps(by_description))
+    current = estimate_tokens(json.dumps(by_id))
+    click.echo(f"estimated output tokens for {len(goals)} goal updates")
+    click.echo(f"  descriptions echoed: {legacy}")
+    click.echo(f"  goal IDs:            {current}")
+    click.echo(f"  saved:               {legacy - current} ({(legacy - current) / legacy:.0%})")
+
+
+def live(repeats: int) -> None:
+    from src.api_client import ClaudeClient
+    from src.telemetry import Telemetry
+
+    telemetry = Telemetry()
+    client = ClaudeClient(telemetry=telemetry)
+    legacy_prompt = build_goal_tracker_prompt(
+        [{**g, "id": ""} for g in goal_dicts(GOALS)], FACTS
+    )
+    id_prompt = build_goal_tracker_prompt(goal_dicts(GOALS), FACTS)
+
+    results = {}
+    for label, prompt, schema in (
+        ("descriptions echoed", legacy_prompt, LEGACY_SCHEMA),
+        ("goal IDs", id_prompt, GOAL_TRACKER_SCHEMA),
+    ):
+        tokens, latency = [], []
+        for _ in range(repeats):
+            client.call_with_tool(GOAL_TRACKER_SYSTEM, prompt, schema, agent_name="GoalTrackerAgent")
+            record = telemetry.recent_calls(1)[0]
+            tokens.append(record.output_tokens)
+            latency.append(record.latency_ms)
+        results[label] = (sum(tokens) / repeats, sum(latency) / repeats)
+
+    for label, (tokens, latency) in results.items():
+        click.echo(f"  {label:<20} output_tokens={tokens:.0f} latency={latency:.0f}ms")
+
+
+@click.command()
+@click.option("--live", "use_api", is_flag=True, help="Call the API and compare reported usage")
+@click.option("--repeats", default=3)
+def main(use_api, repeats):
+    offline()
+    if use_api:
+        live(repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare summary extraction wall-clock time for growing screenshot uploads.
+
+Runs SummaryExtractorAgent against the local fake Messages API, where every
+image in a request adds --ms-per-image of input processing, once with all
+images in a single vision call and once map-reduced (parallel per-image
+transcription, then a text-only summary call):
+
+    cd backend
+    python -m benchmarks.image_extraction --counts 1,5,10,20 --concurrency 8
+"""
+
+import base64
+import os
+import time
+
+import click
+
+from src.fake_anthropic_server import (
+    FakeAnthropicServer,
+    FakeServerConfig,
+    LatencyModel,
+)
+
+
+def screenshots(count: int) -> list[dict]:
+    return [
+        {"data": base64.b64encode(os.urandom(64)).decode(), "media_type": "image/png"}
+        for _ in range(count)
+    ]
+
+
+def extract_ms(map_reduce: bool, count: int, concurrency: int) -> float:
+    from src.agents.summary_extractor import SummaryExtractorAgent
+    from src.api_client import ClaudeClient
+
+    agent = SummaryExtractorAgent(ClaudeClient(), map_reduce=map_reduce, concurrency=concurrency)
+    start = time.perf_counter()
+    agent.extract_summary("", screenshots(count))
+    return (time.perf_counter() - start) * 1000
+
+
+@click.command()
+@click.option("--counts", default="1,5,10,20", help="Comma-separated image counts")
+@click.option("--latency", default="constant:400", help="Fake per-call latency")
+@click.option("--ms-per-image", default=300.0, help="Fake input processing time per image")
+@click.option("--concurrency", default=8)
+def main(counts, latency, ms_per_image, concurrency):
+    model = LatencyModel.parse(latency)
+    model.ms_per_image = ms_per_image
+    with FakeAnthropicServer(FakeServerConfig(latency=model, seed=0)) as fake:
+        os.environ["ANTHROPIC_BASE_URL"] = fake.base_url
+        os.environ.setdefault("ANTHROPIC_API_KEY", "fake-key")
+
+        click.echo(f"{'images':>7}{'single ms':>12}{'map-reduce ms':>15}")
+        for count in (int(c) for c in counts.split(",")):
+            single = extract_ms(False, count, concurrency)
+            mapped = extract_ms(True, count, concurrency)
+            click.echo(f"{count:>7}{single:>12.0f}{mapped:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
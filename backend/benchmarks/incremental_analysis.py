@@ -0,0 +1,70 @@
+"""
+Compare the final analysis call with and without incremental analysis.
+
+Runs against the local fake Messages API, where input tokens add
+--ms-per-1k-tokens and output tokens are generated at --tokens-per-second.
+For each interview length it times the single full analysis call, then
+replays the interview with a running-state update after every turn (off the
+response path; mean shown) and times the verdict-only final call:
+
+    cd backend
+    python -m benchmarks.incremental_analysis --turns 10,40
+"""
+
+import os
+import time
+
+import click
+
+from benchmarks.prompt_growth import synthetic_session
+from src.fake_anthropic_server import (
+    FakeAnthropicServer,
+    FakeServerConfig,
+    LatencyModel,
+)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+@click.command()
+@click.option("--turns", default="10,40", help="Comma-separated interview lengths")
+@click.option("--latency", default="constant:300", help="Fake per-call latency")
+@click.option("--ms-per-1k-tokens", default=60.0, help="Fake processing time per 1k input tokens")
+@click.option("--tokens-per-second", default=60.0, help="Fake output generation speed")
+@click.option("--array-items", default=10, help="Items the fake server puts in each list it returns")
+def main(turns, latency, ms_per_1k_tokens, tokens_per_second, array_items):
+    from src.agents.agent_analysis import AnalysisAgent
+    from src.agents.incremental_analysis import IncrementalAnalysisAgent
+    from src.api_client import ClaudeClient
+    from src.models import AnalysisState
+
+    model = LatencyModel.parse(latency, tokens_per_second=tokens_per_second)
+    model.ms_per_1k_input_tokens = ms_per_1k_tokens
+    config = FakeServerConfig(latency=model, default_array_items=array_items, seed=0)
+    with FakeAnthropicServer(config) as fake:
+        os.environ["ANTHROPIC_BASE_URL"] = fake.base_url
+        os.environ.setdefault("ANTHROPIC_API_KEY", "fake-key")
+        client = ClaudeClient()
+        full_agent = AnalysisAgent(client)
+        incremental_agent = IncrementalAnalysisAgent(client)
+
+        click.echo(f"{'turns':>6}{'full ms':>10}{'verdict ms':>12}{'update ms':>11}")
+        for count in (int(t) for t in turns.split(",")):
+            session = synthetic_session(count)
+            _, full_ms = timed(full_agent.generate_analysis, session.model_dump())
+
+            state, update_ms = AnalysisState(), []
+            for turn in range(1, count + 1):
+                state, ms = timed(incremental_agent.update_state, state, session.facts[: 2 * turn], session.goals)
+                update_ms.append(ms)
+            session.analysis_state = state
+            _, verdict_ms = timed(incremental_agent.generate_analysis, session.model_dump())
+            click.echo(f"{count:>6}{full_ms:>10.0f}{verdict_ms:>12.0f}{sum(update_ms) / len(update_ms):>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
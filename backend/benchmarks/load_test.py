@@ -0,0 +1,126 @@
+"""
+Load test the Flask API + InterviewOrchestrator + ClaudeClient offline.
+
+Starts the fake Messages API and the Flask app in-process, then drives
+concurrent interviews over HTTP and reports throughput and latency
+percentiles per endpoint.
+
+    cd backend
+    python -m benchmarks.load_test --sessions 40 --turns 5 --concurrency 8 \
+        --latency lognormal:700,0.5 --rate-529 0.01
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import click
+import httpx
+import jwt
+from werkzeug.serving import make_server
+
+from src.fake_anthropic_server import (
+    FakeAnthropicServer,
+    FakeServerConfig,
+    LatencyModel,
+)
+from src.telemetry import percentile
+
+
+def run_interview(base_url: str, token: str, turns: int, timings: dict, lock: threading.Lock) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+    with httpx.Client(base_url=base_url, headers=headers, timeout=120) as http:
+        start = time.perf_counter()
+        response = http.post("/api/investigate", json={
+            "incident_name": "load-test",
+            "summary": "Lamar found out John and Rob went to Mexico without him.",
+            "interviewee_name": "Lamar",
+            "interviewee_role": "participant",
+            "images": [],
+        })
+        with lock:
+            timings["investigate"].append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        data = response.json()
+
+        for _ in range(turns):
+            start = time.perf_counter()
+            response = http.post("/api/answer", json={
+                "session_id": data["session_id"],
+                "answer": data["answers"][0],
+            })
+            with lock:
+                timings["answer"].append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+            if response.json().get("is_complete"):
+                break
+            data = {**data, **response.json()}
+
+
+@click.command()
+@click.option("--sessions", default=20, help="Interviews to run")
+@click.option("--turns", default=5, help="Answers per interview")
+@click.option("--concurrency", default=8, help="Concurrent interviews")
+@click.option("--latency", default="lognormal:600,0.4", help="Fake upstream latency distribution")
+@click.option("--tokens-per-second", default=None, type=float)
+@click.option("--rate-429", default=0.0, type=float)
+@click.option("--rate-529", default=0.0, type=float)
+def main(sessions, turns, concurrency, latency, tokens_per_second, rate_429, rate_529):
+    config = FakeServerConfig(
+        latency=LatencyModel.parse(latency, tokens_per_second),
+        rate_429=rate_429,
+        rate_529=rate_529,
+        seed=0,
+    )
+    with FakeAnthropicServer(config) as fake, tempfile.TemporaryDirectory() as data_dir:
+        os.environ["ANTHROPIC_BASE_URL"] = fake.base_url
+        os.environ.setdefault("ANTHROPIC_API_KEY", "fake-key")
+        os.environ["DATA_DIR"] = data_dir
+
+        from src.api.app import create_app
+        from src.api.routes import JWT_ALGORITHM, JWT_SECRET
+
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+        token = jwt.encode({"exp": datetime.utcnow() + timedelta(hours=1)}, JWT_SECRET, algorithm=JWT_ALGORITHM)
+        server = make_server("127.0.0.1", 0, create_app(), threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+        timings: dict[str, list[float]] = {"investigate": [], "answer": []}
+        lock = threading.Lock()
+        errors = 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [
+                pool.submit(run_interview, base_url, token, turns, timings, lock)
+                for _ in range(sessions)
+            ]
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    errors += 1
+                    click.echo(f"interview failed: {e}")
+        elapsed = time.perf_counter() - start
+        server.shutdown()
+
+    requests_done = sum(len(v) for v in timings.values())
+    click.echo(f"\n{sessions} interviews, {requests_done} requests in {elapsed:.1f}s "
+               f"({requests_done / elapsed:.1f} req/s), {errors} failed, "
+               f"{fake.request_count} upstream calls")
+    for endpoint, values in timings.items():
+        if values:
+            click.echo(
+                f"  /api/{endpoint:<12} n={len(values):<4} "
+                f"p50={percentile(values, 50):7.0f}ms "
+                f"p95={percentile(values, 95):7.0f}ms "
+                f"p99={percentile(values, 99):7.0f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
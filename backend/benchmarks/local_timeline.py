@@ -0,0 +1,76 @@
+"""
+Estimate what the locally built timeline saves in the analysis call.
+
+Synthetic sessions get facts with a mix of absolute, relative and unreadable
+timestamps. For each length this prints the analysis prompt tokens, the
+output tokens spent on the timeline (every dated fact restated as an event,
+versus only the unclear ones placed as additions), how many facts the local
+parser ordered, and the time to build the timeline:
+
+    cd backend
+    python -m benchmarks.local_timeline --facts 20,100,400
+"""
+
+import json
+import random
+import time
+
+import click
+
+from src.context_builder import estimate_tokens
+from src.models import Fact, Goal, Message, Session
+from src.prompts import build_analysis_prompt
+from src.timeline import build_timeline, reference_time
+
+TIMESTAMPS = [
+    "March 12", "last Friday around 6", "5:30pm", "2 weeks ago", "yesterday", "that night",
+    "the day after", "after dinner", "3/14", "on Sunday", "last week", "around 9", "before the party",
+    "2024-03-02", "a couple of days ago", "late February", "this morning", "21:40",
+]
+EVENTS = ["Rob booked the flights", "Tasha told Lamar", "Lamar saw the photos", "the group chat blew up",
+          "Rob apologized", "Maya left the chat", "they argued at dinner"]
+
+
+def synthetic_session(facts: int, seed: int = 0) -> Session:
+    rng = random.Random(seed)
+    session = Session(
+        session_id="bench", incident_name="Trip", created_at="2024-03-20T12:00:00",
+        summary="Rob and Tasha went to Cancun without Lamar.",
+        goals=[Goal(description=f"Goal {i}", confidence=60) for i in range(5)],
+    )
+    for i in range(facts):
+        timestamp = rng.choice(TIMESTAMPS) if rng.random() < 0.8 else None
+        session.facts.append(Fact(topic="trip", claim=f"{rng.choice(EVENTS)} ({i})", timestamp=timestamp))
+        if i % 2 == 0:
+            session.messages.append(Message(role="assistant", content="And then what happened?", timestamp=""))
+            session.messages.append(Message(role="user", content=f"{rng.choice(EVENTS)}, I think", timestamp=""))
+    return session
+
+
+@click.command()
+@click.option("--facts", default="20,100,400", help="Comma-separated session sizes (facts)")
+def main(facts):
+    click.echo(
+        f"{'facts':>6}{'prompt':>8}{'+local':>8}{'timeline out':>14}{'+local':>8}{'ordered':>9}{'build ms':>10}"
+    )
+    for count in (int(c) for c in facts.split(",")):
+        session = synthetic_session(count)
+        data = session.model_dump()
+        start = time.perf_counter()
+        timeline = build_timeline(session.facts, reference_time(session.created_at))
+        build_ms = (time.perf_counter() - start) * 1000
+
+        dated = [f for f in session.facts if f.timestamp]
+        restated = estimate_tokens(json.dumps([{"time": f.timestamp, "event": f.claim} for f in dated]))
+        additions = estimate_tokens(json.dumps(
+            [{"after": 0, "time": f.timestamp, "event": f.claim} for f in timeline.unclear]
+        ))
+        click.echo(
+            f"{count:>6}{estimate_tokens(build_analysis_prompt(data)):>8}"
+            f"{estimate_tokens(build_analysis_prompt(data, local_timeline=timeline)):>8}"
+            f"{restated:>14}{additions:>8}{len(timeline.events):>5}/{len(dated):<3}{build_ms:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Compare summary + goal generation wall-clock time for growing pasted chat logs.
+
+Runs SummaryAndGoalGenerator against the local fake Messages API, where every
+thousand input tokens add --ms-per-1k-tokens of processing, once with the
+whole log in a single request and once chunked (parallel per-chunk extraction,
+local merge, then goal generation):
+
+    cd backend
+    python -m benchmarks.long_summary --messages 200,1000,3000 --chunk-tokens 6000
+"""
+
+import os
+import random
+import time
+
+import click
+
+from src.fake_anthropic_server import (
+    FakeAnthropicServer,
+    FakeServerConfig,
+    LatencyModel,
+)
+
+SPEAKERS = ["Lamar", "Rob", "Tasha", "Me"]
+
+
+def chat_log(messages: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return "\n".join(
+        f"[3/{1 + i // 400}/24, {8 + (i // 60) % 12}:{i % 60:02d} PM] {rng.choice(SPEAKERS)}: "
+        + " ".join(rng.choice(["so", "the trip", "Cancun", "why", "didn't", "tell me", "lol", "seriously"])
+                   for _ in range(rng.randint(3, 18)))
+        for i in range(messages)
+    )
+
+
+def generate_ms(log: str, chunk_tokens: int) -> float:
+    from src.agents.summary_and_goal_generator import SummaryAndGoalGenerator
+    from src.api_client import ClaudeClient
+
+    generator = SummaryAndGoalGenerator(ClaudeClient(), chunk_tokens=chunk_tokens)
+    start = time.perf_counter()
+    generator.extract_and_generate(log)
+    return (time.perf_counter() - start) * 1000
+
+
+@click.command()
+@click.option("--messages", default="200,1000,3000", help="Comma-separated chat log lengths")
+@click.option("--latency", default="constant:400", help="Fake per-call latency")
+@click.option("--ms-per-1k-tokens", default=60.0, help="Fake processing time per 1k input tokens")
+@click.option("--chunk-tokens", default=6000)
+@click.option("--concurrency", default=4)
+def main(messages, latency, ms_per_1k_tokens, chunk_tokens, concurrency):
+    from src.context_builder import estimate_tokens
+
+    model = LatencyModel.parse(latency)
+    model.ms_per_1k_input_tokens = ms_per_1k_tokens
+    os.environ["SUMMARY_CHUNK_CONCURRENCY"] = str(concurrency)
+    with FakeAnthropicServer(FakeServerConfig(latency=model, seed=0)) as fake:
+        os.environ["ANTHROPIC_BASE_URL"] = fake.base_url
+        os.environ.setdefault("ANTHROPIC_API_KEY", "fake-key")
+
+        click.echo(f"{'messages':>9}{'tokens':>9}{'single ms':>12}{'chunked ms':>12}")
+        for count in (int(c) for c in messages.split(",")):
+            log = chat_log(count)
+            single = generate_ms(log, 0)
+            chunked = generate_ms(log, chunk_tokens)
+            click.echo(f"{count:>9}{estimate_tokens(log):>9}{single:>12.0f}{chunked:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare the single analysis call with the sectioned (PARALLEL_ANALYSIS) one.
+
+Runs against the local fake Messages API, where input tokens add
+--ms-per-1k-tokens and output tokens are generated at --tokens-per-second.
+For each interview length it prints the wall-clock time of the report and,
+summed over its calls, the uncached input tokens, cache writes, cache reads
+and output tokens. Sectioned mode sends the shared prefix (system, tools,
+session prompt) once per section: the first section writes it to the cache
+and the three sent after it read it. Each analysis of a new session pays
+that write again, and the fake server models cache hits exactly, so the real
+API may read less (e.g. prompts under the minimum cacheable length):
+
+    cd backend
+    python -m benchmarks.parallel_analysis --turns 10,40
+"""
+
+import os
+import time
+
+import click
+
+from benchmarks.prompt_growth import synthetic_session
+from src.fake_anthropic_server import (
+    FakeAnthropicServer,
+    FakeServerConfig,
+    LatencyModel,
+)
+from src.telemetry import Telemetry
+
+
+@click.command()
+@click.option("--turns", default="10,40", help="Comma-separated interview lengths")
+@click.option("--latency", default="constant:300", help="Fake per-call latency")
+@click.option("--ms-per-1k-tokens", default=60.0, help="Fake processing time per 1k input tokens")
+@click.option("--tokens-per-second", default=60.0, help="Fake output generation speed")
+@click.option("--array-items", default=10, help="Items the fake server puts in each list it returns")
+@click.option("--repeats", default=3)
+def main(turns, latency, ms_per_1k_tokens, tokens_per_second, array_items, repeats):
+    from src.agents.agent_analysis import AnalysisAgent
+    from src.api_client import ClaudeClient
+
+    model = LatencyModel.parse(latency, tokens_per_second=tokens_per_second)
+    model.ms_per_1k_input_tokens = ms_per_1k_tokens
+    config = FakeServerConfig(latency=model, default_array_items=array_items, seed=0)
+    os.environ.setdefault("ANTHROPIC_API_KEY", "fake-key")
+    click.echo(
+        f"{'turns':>6}{'mode':>11}{'calls':>7}{'ms':>8}{'in tok':>9}"
+        f"{'cache wr':>10}{'cache rd':>10}{'out tok':>9}"
+    )
+    for count in (int(t) for t in turns.split(",")):
+        data = synthetic_session(count).model_dump()
+        for parallel in (False, True):
+            telemetry = Telemetry()
+            wall_ms = []
+            for _ in range(repeats):
+                # A fresh server per run starts with an empty cache, like a new session
+                with FakeAnthropicServer(config) as fake:
+                    agent = AnalysisAgent(
+                        ClaudeClient(base_url=fake.base_url, telemetry=telemetry), parallel=parallel
+                    )
+                    start = time.perf_counter()
+                    agent.generate_analysis(data)
+                    wall_ms.append((time.perf_counter() - start) * 1000)
+            calls = telemetry.recent_calls(500)
+            mode = "sectioned" if parallel else "single"
+            click.echo(
+                f"{count:>6}{mode:>11}{len(calls) // repeats:>7}{sorted(wall_ms)[len(wall_ms) // 2]:>8.0f}"
+                f"{sum(c.input_tokens for c in calls) // repeats:>9}"
+                f"{sum(c.cache_creation_input_tokens for c in calls) // repeats:>10}"
+                f"{sum(c.cache_read_input_tokens for c in calls) // repeats:>10}"
+                f"{sum(c.output_tokens for c in calls) // repeats:>9}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Show how prompt size grows with interview length, with and without the
+rolling conversation summary.
+
+Builds synthetic sessions of increasing length and prints the estimated
+tokens of the question and analysis prompts. With the summary, folds are
+simulated the way ROLLING_SUMMARY=true schedules them, using a stub summary
+of --summary-tokens instead of a model call:
+
+    cd backend
+    python -m benchmarks.prompt_growth --turns 10,40,120
+"""
+
+import random
+
+import click
+
+from src.context_builder import estimate_tokens
+from src.memory import RollingMemory
+from src.models import (
+    Actor,
+    Conflict,
+    ExtractedSummary,
+    Fact,
+    GeneralDetails,
+    Goal,
+    Message,
+    Session,
+)
+from src.prompts import build_analysis_prompt, build_question_with_answers_prompt
+
+WORDS = ["Lamar", "Rob", "Tasha", "Cancun", "booked", "didn't", "tell", "flight", "group chat", "angry"]
+
+
+class StubSummarizer:
+    def __init__(self, tokens: int):
+        self.tokens = tokens
+
+    def fold(self, previous_summary, messages, facts, session_id=None):
+        return ("summary " * self.tokens)[: self.tokens * 4]
+
+
+def synthetic_session(turns: int, rolling: RollingMemory = None, seed: int = 0) -> Session:
+    rng = random.Random(seed)
+
+    def sentence(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n))
+
+    session = Session(
+        session_id="bench", incident_name="Trip", created_at="2025-01-01T12:00:00",
+        goals=[Goal(description=f"Goal {i}", confidence=50) for i in range(5)],
+    )
+    for _ in range(turns):
+        session.messages.append(Message(role="assistant", content=sentence(15) + "?", timestamp=""))
+        session.messages.append(Message(role="user", content=sentence(25), timestamp=""))
+        session.facts.extend(Fact(topic="trip", claim=sentence(12)) for _ in range(2))
+        if rolling is not None and rolling.due(session):
+            session.memory = rolling.fold(session)
+    return session
+
+
+def question_tokens(session: Session) -> int:
+    memory = session.memory
+    prompt = build_question_with_answers_prompt(
+        [g.model_dump() for g in session.goals],
+        [f.model_dump() for f in session.facts[memory.covered_facts:]],
+        [m.model_dump() for m in session.messages[memory.covered_messages:]],
+        "",
+        ExtractedSummary(actors=[Actor(name="Lamar")], point_of_conflict=Conflict(primary="The trip"), general_details=GeneralDetails()),
+        conversation_summary=memory.summary,
+    )
+    return estimate_tokens(prompt)
+
+
+@click.command()
+@click.option("--turns", default="10,40,120", help="Comma-separated interview lengths")
+@click.option("--summary-tokens", default=300, help="Size of the stub rolling summary")
+def main(turns, summary_tokens):
+    click.echo(f"{'turns':>6}{'question':>10}{'+summary':>10}{'analysis':>10}{'+summary':>10}")
+    for count in (int(t) for t in turns.split(",")):
+        plain = synthetic_session(count)
+        folded = synthetic_session(count, RollingMemory(StubSummarizer(summary_tokens)))
+        click.echo(
+            f"{count:>6}{question_tokens(plain):>10}{question_tokens(folded):>10}"
+            f"{estimate_tokens(build_analysis_prompt(plain.model_dump())):>10}"
+            f"{estimate_tokens(build_analysis_prompt(folded.model_dump())):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Replay a full interview from a cassette to measure our own overhead.
+
+Record once (against the fake server, or the real API without --fake):
+    python -m benchmarks.replay_interview record --cassette /tmp/interview.jsonl --fake
+
+Then replay as often as needed; model time drops to ~0 (or the recorded
+latency with --with-latency) and what remains is prompt building,
+validation and persistence:
+    python -m benchmarks.replay_interview replay --cassette /tmp/interview.jsonl
+"""
+
+import contextlib
+import os
+import tempfile
+import time
+
+import click
+
+from src.fake_anthropic_server import (
+    FakeAnthropicServer,
+    FakeServerConfig,
+    LatencyModel,
+)
+from src.telemetry import TELEMETRY, percentile
+
+SUMMARY = (
+    "Lamar found out from Instagram that John and Rob went to Mexico together. "
+    "Nobody told him, even though the three of them had planned a trip for months."
+)
+
+
+def model_ms_between(start: float, end: float) -> float:
+    return sum(
+        r.latency_ms for r in TELEMETRY.recent_calls(500) if start <= r.timestamp <= end
+    )
+
+
+def run_interview(turns: int) -> list[dict]:
+    # Imported late so the cassette/base-URL environment is in place first
+    from src.agents.agent_analysis import AnalysisAgent
+    from src.api_client import ClaudeClient
+    from src.interview import InterviewOrchestrator
+    from src.session import SessionManager
+
+    rows = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = SessionManager(data_dir=data_dir)
+        session = manager.create_session("replay-benchmark", "Lamar", "participant")
+
+        def timed(label, fn):
+            start_wall, start = time.time(), time.perf_counter()
+            fn()
+            total = (time.perf_counter() - start) * 1000
+            save_start = time.perf_counter()
+            manager.save_session(session)
+            persist = (time.perf_counter() - save_start) * 1000
+            model = model_ms_between(start_wall, time.time())
+            rows.append({"step": label, "total_ms": total + persist, "model_ms": model,
+                         "persist_ms": persist, "overhead_ms": total + persist - model})
+
+        orchestrator = InterviewOrchestrator(session)
+        timed("initialize", lambda: orchestrator.initialize_investigation(SUMMARY, image_data_list=[]))
+        for turn in range(turns):
+            if not session.answers:
+                break
+            timed(f"turn {turn + 1}", lambda: orchestrator.process_answer(session.answers[0]))
+        timed("analysis", lambda: AnalysisAgent(ClaudeClient()).generate_analysis(
+            session.model_dump(), session_id=session.session_id))
+    return rows
+
+
+def report(rows: list[dict]) -> None:
+    click.echo(f"{'step':<12}{'total':>10}{'model':>10}{'persist':>10}{'overhead':>10}  (ms)")
+    for row in rows:
+        click.echo(f"{row['step']:<12}{row['total_ms']:>10.1f}{row['model_ms']:>10.1f}"
+                   f"{row['persist_ms']:>10.1f}{row['overhead_ms']:>10.1f}")
+    overhead = [r["overhead_ms"] for r in rows]
+    click.echo(f"overhead p50={percentile(overhead, 50):.1f}ms max={max(overhead):.1f}ms "
+               f"total={sum(overhead):.1f}ms across {len(rows)} steps")
+
+
+@click.group()
+def cli():
+    """Record or replay an interview cassette."""
+
+
+@cli.command()
+@click.option("--cassette", required=True, type=click.Path())
+@click.option("--turns", default=6)
+@click.option("--fake", is_flag=True, help="Record against the local fake Messages API")
+@click.option("--latency", default="lognormal:700,0.4", help="Fake server latency (with --fake)")
+def record(cassette, turns, fake, latency):
+    if os.path.exists(cassette):
+        os.remove(cassette)
+    os.environ["LLM_CASSETTE"] = cassette
+    os.environ["LLM_CASSETTE_MODE"] = "record"
+    server = (
+        FakeAnthropicServer(FakeServerConfig(latency=LatencyModel.parse(latency), seed=0))
+        if fake else contextlib.nullcontext()
+    )
+    with server:
+        if fake:
+            os.environ["ANTHROPIC_BASE_URL"] = server.base_url
+            os.environ.setdefault("ANTHROPIC_API_KEY", "fake-key")
+        report(run_interview(turns))
+    click.echo(f"Recorded cassette: {cassette}")
+
+
+@cli.command()
+@click.option("--cassette", required=True, type=click.Path(exists=True))
+@click.option("--turns", default=6)
+@click.option("--with-latency", is_flag=True, help="Re-impose recorded model latency")
+def replay(cassette, turns, with_latency):
+    os.environ["LLM_CASSETTE"] = cassette
+    os.environ["LLM_CASSETTE_MODE"] = "replay"
+    os.environ["LLM_CASSETTE_REPLAY_LATENCY"] = "true" if with_latency else "false"
+    os.environ.setdefault("ANTHROPIC_API_KEY", "unused-in-replay")
+    report(run_interview(turns))
+
+
+if __name__ == "__main__":
+    cli()
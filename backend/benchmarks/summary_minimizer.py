@@ -0,0 +1,44 @@
+"""
+Report input-token reduction from the chat-export minimizer on sample exports.
+
+Each file in --corpus (default benchmarks/chat_exports) is minimized the way
+MINIMIZE_SUMMARY=true does before the summary prompt is built, and the
+estimated summary-prompt tokens before and after are printed:
+
+    cd backend
+    python -m benchmarks.summary_minimizer
+"""
+
+from pathlib import Path
+
+import click
+
+from src.chat_export import minimize_summary
+from src.context_builder import estimate_tokens
+from src.prompts import build_summary_and_goals_prompt
+
+DEFAULT_CORPUS = Path(__file__).parent / "chat_exports"
+
+
+@click.command()
+@click.option("--corpus", default=str(DEFAULT_CORPUS), help="Directory of exported chats (*.txt)")
+def main(corpus):
+    click.echo(f"{'file':<24}{'format':<10}{'prompt in':>10}{'prompt out':>11}{'saved':>8}")
+    total_in = total_out = 0
+    for path in sorted(Path(corpus).glob("*.txt")):
+        raw = path.read_text()
+        minimized = minimize_summary(raw)
+        tokens_in = estimate_tokens(build_summary_and_goals_prompt(raw))
+        tokens_out = estimate_tokens(build_summary_and_goals_prompt(minimized.text))
+        total_in += tokens_in
+        total_out += tokens_out
+        click.echo(
+            f"{path.name:<24}{minimized.format:<10}{tokens_in:>10}{tokens_out:>11}"
+            f"{1 - tokens_out / tokens_in:>8.0%}"
+        )
+    if total_in:
+        click.echo(f"{'total':<34}{total_in:>10}{total_out:>11}{1 - total_out / total_in:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
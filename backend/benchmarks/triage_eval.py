@@ -0,0 +1,108 @@
+"""
+Evaluate answer triage against the full fact/goal extraction pipeline.
+
+Every case is triaged locally and also sent through FactAndGoalUpdater. For
+answers triage would skip, the report shows what the full pipeline extracted
+anyway (facts, goal confidence movement), i.e. what skipping would lose:
+
+    cd backend
+    python -m benchmarks.triage_eval                       # real API, built-in cases
+    python -m benchmarks.triage_eval --cases cases.jsonl   # {"question", "answer", "facts": [...]}
+    python -m benchmarks.triage_eval --fake                # plumbing only: fake outputs always have facts
+
+Combine with LLM_CASSETTE=... LLM_CASSETTE_MODE=record|replay to rerun a
+labelled set without paying for it twice.
+"""
+
+import contextlib
+import json
+import os
+
+import click
+
+from src.fake_anthropic_server import FakeAnthropicServer
+from src.models import Answer, Fact, Goal, GoalStatus
+from src.telemetry import Telemetry
+
+GOALS = [
+    Goal(description="Establish the timeline of the Mexico trip", confidence=40, status=GoalStatus.IN_PROGRESS),
+    Goal(description="Identify who knew about the trip", confidence=30, status=GoalStatus.IN_PROGRESS),
+    Goal(description="Understand why Lamar wasn't told", confidence=20, status=GoalStatus.IN_PROGRESS),
+]
+
+KNOWN_FACTS = [
+    "John and Rob flew to Cancun on March 3rd",
+    "Lamar saw the trip on Instagram",
+    "The three friends had planned a trip together for months",
+]
+
+CASES = [
+    ("When did you find out about the trip?", "I don't know"),
+    ("When did you find out about the trip?", "idk honestly"),
+    ("Who else knew?", "no idea"),
+    ("Who else knew?", "..."),
+    ("Did Rob tell you?", "No"),
+    ("How did you find out?", "Lamar saw the trip on Instagram"),
+    ("When did they leave?", "John and Rob flew to Cancun on March 3rd"),
+    ("Why do you think they hid it?", "Rob said Lamar couldn't afford it so they didn't ask"),
+    ("Who else knew?", "Marcus knew, he drove them to the airport on the 3rd"),
+    ("How do you feel?", "Not sure, I can't really remember how I felt"),
+    ("Who told him?", "idk, maybe Rob told him on Friday"),
+    ("How did it get out?", "Whatever, Marcus leaked the group chat"),
+    ("When did Lamar hear?", "Skip lunch was when Rob told Lamar"),
+    ("When did they leave?", "John and Rob never flew to Cancun on March 3rd"),
+    ("When did they leave?", "Rob flew to Cancun on March 3rd without John"),
+]
+
+
+def load_cases(path):
+    if not path:
+        return [{"question": q, "answer": a, "facts": KNOWN_FACTS} for q, a in CASES]
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@click.command()
+@click.option("--cases", "cases_path", default=None, type=click.Path(exists=True))
+@click.option("--fake", is_flag=True, help="Use the local fake Messages API")
+def main(cases_path, fake):
+    server = FakeAnthropicServer() if fake else contextlib.nullcontext()
+    with server:
+        if fake:
+            os.environ["ANTHROPIC_BASE_URL"] = server.base_url
+            os.environ.setdefault("ANTHROPIC_API_KEY", "fake-key")
+
+        from src.agents.fact_and_goal_updater import FactAndGoalUpdater
+        from src.api_client import ClaudeClient
+        from src.triage import triage_answer
+
+        updater = FactAndGoalUpdater(ClaudeClient())
+        rows = []
+        for case in load_cases(cases_path):
+            answer = Answer(answer=case["answer"], reasoning="")
+            facts = [Fact(topic="known", claim=claim) for claim in case.get("facts", [])]
+            result = triage_answer(answer, facts, telemetry=Telemetry())
+            new_facts, new_goals = updater.extract_and_update(case["question"], answer, GOALS)
+            delta = max(
+                (abs(n.confidence - g.confidence) for g, n in zip(GOALS, new_goals, strict=True)), default=0
+            )
+            rows.append((case["answer"], result, len(new_facts), delta))
+
+    click.echo(f"{'answer':<48}{'triage':>14}{'facts':>7}{'max Δconf':>11}")
+    for text, result, fact_count, delta in rows:
+        label = result.reason if result.skip else "full"
+        click.echo(f"{text[:46]:<48}{label:>14}{fact_count:>7}{delta:>11}")
+
+    skipped = [r for r in rows if r[1].skip]
+    lossless = [r for r in skipped if r[2] == 0 and r[3] < 10]
+    click.echo(f"skip rate: {len(skipped)}/{len(rows)} ({len(skipped) / len(rows):.0%})")
+    if skipped:
+        click.echo(
+            f"skips where full pipeline found no facts and moved no goal >=10 pts: "
+            f"{len(lossless)}/{len(skipped)}"
+        )
+        click.echo(f"facts the full pipeline extracted from skipped answers: {sum(r[2] for r in skipped)}")
+
+
+if __name__ == "__main__":
+    main()
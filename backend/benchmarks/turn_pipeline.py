@@ -0,0 +1,71 @@
+"""
+Compare per-turn latency of the sequential and concurrent turn pipelines.
+
+Runs the same interview against the local fake Messages API once per mode and
+reports process_answer latency percentiles:
+
+    cd backend
+    python -m benchmarks.turn_pipeline --turns 8 --latency lognormal:700,0.3
+"""
+
+import os
+import tempfile
+import time
+
+import click
+
+from src.fake_anthropic_server import (
+    FakeAnthropicServer,
+    FakeServerConfig,
+    LatencyModel,
+)
+from src.telemetry import percentile
+
+SUMMARY = (
+    "Lamar found out from Instagram that John and Rob went to Mexico together. "
+    "Nobody told him, even though the three of them had planned a trip for months."
+)
+
+
+def run_turns(concurrent: bool, turns: int) -> list[float]:
+    from src.interview import InterviewOrchestrator
+    from src.session import SessionManager
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = SessionManager(data_dir=data_dir)
+        session = manager.create_session("pipeline-benchmark", "Lamar", "participant")
+        # Keep the interview going for every measured turn
+        session.confidence_threshold = 95
+        orchestrator = InterviewOrchestrator(session, concurrent=concurrent)
+        orchestrator.initialize_investigation(SUMMARY, image_data_list=[])
+
+        latencies = []
+        for _ in range(turns):
+            start = time.perf_counter()
+            orchestrator.process_answer(session.answers[0])
+            latencies.append((time.perf_counter() - start) * 1000)
+            manager.save_session(session)
+        return latencies
+
+
+@click.command()
+@click.option("--turns", default=8)
+@click.option("--latency", default="lognormal:700,0.3", help="Fake upstream latency distribution")
+def main(turns, latency):
+    config = FakeServerConfig(latency=LatencyModel.parse(latency), seed=0)
+    with FakeAnthropicServer(config) as fake:
+        os.environ["ANTHROPIC_BASE_URL"] = fake.base_url
+        os.environ.setdefault("ANTHROPIC_API_KEY", "fake-key")
+
+        results = {mode: run_turns(mode == "concurrent", turns) for mode in ("sequential", "concurrent")}
+
+    click.echo(f"{'mode':<12}{'p50':>10}{'p95':>10}{'mean':>10}  (ms per turn, {turns} turns)")
+    for mode, values in results.items():
+        click.echo(f"{mode:<12}{percentile(values, 50):>10.0f}{percentile(values, 95):>10.0f}"
+                   f"{sum(values) / len(values):>10.0f}")
+    speedup = percentile(results["sequential"], 50) / percentile(results["concurrent"], 50)
+    click.echo(f"p50 speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
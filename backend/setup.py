@@ -15,6 +15,7 @@ setup(
         "console_scripts": [
             "drama=src.cli:cli",
             "drama-api=src.api_server:main",
+            "drama-fake-api=src.fake_anthropic_server:main",
         ],
     },
     python_requires=">=3.9",
@@ -1,14 +1,60 @@
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from ..api_client import ClaudeClient
-from ..models import AnalysisReport
-from ..prompts import ANALYSIS_SYSTEM, build_analysis_prompt
-from ..schemas import ANALYSIS_SCHEMA
+from ..compact_schemas import expand_tool_output
+from ..context_builder import estimate_tokens, get_input_budget
+from ..env import env_flag
+from ..models import AnalysisReport, Fact, Verdict
+from ..prompts import (
+    ANALYSIS_SECTION_TASKS,
+    ANALYSIS_SECTIONS_SYSTEM,
+    ANALYSIS_SYSTEM,
+    LOCAL_TIMELINE_TASK,
+    build_analysis_prompt,
+)
+from ..schemas import (
+    ANALYSIS_LOCAL_TIMELINE_SCHEMA,
+    ANALYSIS_SCHEMA,
+    GAPS_SECTION_SCHEMA,
+    KEY_FACTS_SECTION_SCHEMA,
+    TIMELINE_ADDITIONS_SECTION_SCHEMA,
+    TIMELINE_SECTION_SCHEMA,
+    VERDICT_SCHEMA,
+)
+from ..telemetry import TELEMETRY
+from ..timeline import (
+    LocalTimeline,
+    build_timeline,
+    local_timeline_enabled,
+    merge_timeline,
+    reference_time,
+)
+
+# Sectioned analysis sends this (short) section first to write the shared prefix
+CACHE_WARMING_SECTION = "gaps"
+
+
+def parallel_analysis_enabled() -> bool:
+    """PARALLEL_ANALYSIS=true writes the report's sections in concurrent calls."""
+    return env_flag("PARALLEL_ANALYSIS")
 
 
 class AnalysisAgent:
-    def __init__(self, client: ClaudeClient):
+    def __init__(
+        self,
+        client: ClaudeClient,
+        local_timeline: Optional[bool] = None,
+        parallel: Optional[bool] = None,
+    ):
         self.client = client
+        # Build the timeline from fact timestamps (LOCAL_TIMELINE when not given)
+        self.local_timeline = local_timeline_enabled() if local_timeline is None else local_timeline
+        # One concurrent call per report section (PARALLEL_ANALYSIS when not given)
+        self.parallel = parallel_analysis_enabled() if parallel is None else parallel
 
     def generate_analysis(
         self, session_data: dict, session_id: Optional[str] = None
@@ -23,8 +69,12 @@ class AnalysisAgent:
         Returns:
             AnalysisReport model with timeline, key_facts, gaps, verdict
         """
-        # Build user prompt from session data
-        user_prompt = build_analysis_prompt(session_data)
+        agent_name = type(self).__name__
+        if self.parallel:
+            return self._generate_sections(session_data, session_id)
+        if self.local_timeline:
+            return self._generate_around_local_timeline(session_data, session_id)
+        user_prompt = self._build_prompt(session_data)
 
         # Call Claude API with tool schema enforcement
         response = self.client.call_with_tool(
@@ -32,8 +82,146 @@ class AnalysisAgent:
             user_prompt,
             ANALYSIS_SCHEMA,
             session_id=session_id,
-            use_cache=True
+            use_cache=True,
+            agent_name=agent_name,
         )
 
         # Convert dict response to AnalysisReport Pydantic model
         return AnalysisReport.model_validate(response)
+
+    def _generate_around_local_timeline(
+        self, session_data: dict, session_id: Optional[str]
+    ) -> AnalysisReport:
+        """The model gets the locally built timeline and only places what it couldn't order."""
+        timeline = build_timeline(
+            [Fact.model_validate(f) for f in session_data["facts"]],
+            reference_time(session_data.get("created_at", "")),
+        )
+        response = self.client.call_with_tool(
+            ANALYSIS_SYSTEM,
+            self._build_prompt(session_data, timeline),
+            ANALYSIS_LOCAL_TIMELINE_SCHEMA,
+            session_id=session_id,
+            use_cache=True,
+            agent_name=type(self).__name__,
+        )
+        return AnalysisReport(
+            timeline=merge_timeline(timeline.events, response.get("timeline_additions", [])),
+            key_facts=response["key_facts"],
+            gaps=response["gaps"],
+            verdict=Verdict.model_validate(response["verdict"]),
+        )
+
+    def _generate_sections(
+        self, session_data: dict, session_id: Optional[str]
+    ) -> AnalysisReport:
+        """
+        Write timeline, key facts, gaps and verdict in separate calls and merge them.
+
+        Every call sends the same system prompt, tools and session prompt (the
+        cached prefix) and differs only in the trailing section request. The
+        short gaps section goes first and writes the prefix to the cache; the
+        other three then run concurrently and read it, so the report takes
+        about as long as the gaps plus the longest other section.
+        """
+        timeline = None
+        timeline_schema = TIMELINE_SECTION_SCHEMA
+        tasks = dict(ANALYSIS_SECTION_TASKS)
+        if self.local_timeline:
+            timeline = build_timeline(
+                [Fact.model_validate(f) for f in session_data["facts"]],
+                reference_time(session_data.get("created_at", "")),
+            )
+            timeline_schema = TIMELINE_ADDITIONS_SECTION_SCHEMA
+            tasks["timeline"] += "\n" + LOCAL_TIMELINE_TASK
+        user_prompt = self._build_prompt(session_data, timeline, sectioned=True)
+        schemas = {
+            "timeline": timeline_schema,
+            "key_facts": KEY_FACTS_SECTION_SCHEMA,
+            "gaps": GAPS_SECTION_SCHEMA,
+            "verdict": VERDICT_SCHEMA,
+        }
+
+        def write(section: str) -> dict:
+            # No prior outputs: the section request is appended after the cached prompt
+            return self.client.call_tool_followup(
+                ANALYSIS_SECTIONS_SYSTEM,
+                user_prompt,
+                {},
+                list(schemas.values()),
+                schemas[section]["name"],
+                tasks[section],
+                max_retries=3,
+                session_id=session_id,
+                use_cache=True,
+                agent_name=type(self).__name__,
+            )
+
+        start = time.perf_counter()
+        # Calls started together can't read a cache entry still being written
+        sections = {CACHE_WARMING_SECTION: write(CACHE_WARMING_SECTION)}
+        rest = [section for section in schemas if section != CACHE_WARMING_SECTION]
+        with ThreadPoolExecutor(max_workers=len(rest)) as pool:
+            sections.update(zip(rest, pool.map(write, rest), strict=True))
+        TELEMETRY.observe("analysis:sections", (time.perf_counter() - start) * 1000)
+
+        return AnalysisReport(
+            timeline=(
+                merge_timeline(timeline.events, sections["timeline"].get("timeline_additions", []))
+                if timeline is not None
+                else sections["timeline"]["timeline"]
+            ),
+            key_facts=sections["key_facts"]["key_facts"],
+            gaps=sections["gaps"]["gaps"],
+            verdict=Verdict.model_validate(sections["verdict"]["verdict"]),
+        )
+
+    def _build_prompt(
+        self,
+        session_data: dict,
+        local_timeline: Optional[LocalTimeline] = None,
+        sectioned: bool = False,
+    ) -> str:
+        # Build user prompt from session data, trimmed to this agent's input budget
+        agent_name = type(self).__name__
+        user_prompt = build_analysis_prompt(
+            session_data,
+            token_budget=get_input_budget(agent_name),
+            local_timeline=local_timeline,
+            sectioned=sectioned,
+        )
+        TELEMETRY.set_gauge(f"prompt_tokens.{agent_name}", estimate_tokens(user_prompt))
+        return user_prompt
+
+    def build_batch_request(
+        self, session_data: dict, session_id: Optional[str] = None
+    ) -> dict:
+        """
+        Build the Messages API params for an analysis without sending them.
+
+        Used by bulk reprocessing to submit many analyses as one batch.
+        """
+        return self.client.build_tool_request(
+            ANALYSIS_SYSTEM,
+            self._build_prompt(session_data),
+            ANALYSIS_SCHEMA,
+            session_id=session_id,
+            use_cache=True,
+            agent_name=type(self).__name__,
+        )
+
+    def batch_fingerprint(self) -> str:
+        """Hash of everything besides the session that shapes a batch request."""
+        payload = json.dumps([self.client.model, ANALYSIS_SYSTEM, ANALYSIS_SCHEMA], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def parse_tool_output(message: dict) -> AnalysisReport:
+        """Extract the analysis from a raw Messages API response dict."""
+        for block in message.get("content", []):
+            if block.get("type") == "tool_use":
+                # Requests may have been built in compact-schema mode
+                return AnalysisReport.model_validate(
+                    expand_tool_output(ANALYSIS_SCHEMA, block["input"])
+                )
+        raise ValueError("No tool_use block found in response")
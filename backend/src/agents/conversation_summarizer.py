@@ -0,0 +1,45 @@
+from typing import Optional
+
+from ..api_client import ClaudeClient
+from ..models import Fact, Message
+from ..prompts import CONVERSATION_SUMMARY_SYSTEM, build_conversation_summary_prompt
+from ..schemas import CONVERSATION_SUMMARY_SCHEMA
+
+
+class ConversationSummarizerAgent:
+    def __init__(self, client: ClaudeClient):
+        self.client = client
+
+    def fold(
+        self,
+        previous_summary: str,
+        messages: list[Message],
+        facts: list[Fact],
+        session_id: Optional[str] = None,
+    ) -> str:
+        """
+        Fold exchanges and facts leaving the recent window into the running summary.
+
+        Args:
+            previous_summary: Summary so far ("" on the first fold)
+            messages: Messages to fold in, oldest first
+            facts: Facts to fold in, oldest first
+            session_id: Optional session ID for context isolation
+
+        Returns:
+            The updated summary text
+        """
+        user_prompt = build_conversation_summary_prompt(
+            previous_summary,
+            [{"role": m.role, "content": m.content} for m in messages],
+            [{"claim": f.claim, "confidence": f.confidence} for f in facts],
+        )
+        response = self.client.call_with_tool(
+            CONVERSATION_SUMMARY_SYSTEM,
+            user_prompt,
+            CONVERSATION_SUMMARY_SCHEMA,
+            session_id=session_id,
+            use_cache=True,
+            agent_name=type(self).__name__,
+        )
+        return response["summary"]
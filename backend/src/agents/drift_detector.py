@@ -33,7 +33,8 @@ class DriftDetectorAgent:
             user_prompt,
             DRIFT_DETECTOR_SCHEMA,
             session_id=session_id,
-            use_cache=True
+            use_cache=True,
+            agent_name=type(self).__name__,
         )
 
         # Convert dict response to DriftAnalysis Pydantic model
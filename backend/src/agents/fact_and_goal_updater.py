@@ -1,7 +1,8 @@
 from typing import Optional
 
 from ..api_client import ClaudeClient
-from ..models import Answer, Fact, Goal, GoalStatus
+from ..goal_updates import apply_goal_updates, goal_dicts
+from ..models import Answer, Fact, Goal
 from ..prompts import build_fact_and_goal_update_prompt, FACT_AND_GOAL_UPDATE_SYSTEM
 from ..schemas import FACT_EXTRACTOR_SCHEMA, GOAL_TRACKER_SCHEMA
 
@@ -40,14 +41,7 @@ class FactAndGoalUpdater:
         user_prompt = build_fact_and_goal_update_prompt(
             question,
             answer_obj.model_dump(),
-            [
-                {
-                    "description": g.description,
-                    "confidence": g.confidence,
-                    "status": g.status.value,
-                }
-                for g in goals
-            ]
+            goal_dicts(goals),
         )
 
         # Call with multiple tools
@@ -56,7 +50,8 @@ class FactAndGoalUpdater:
             user_prompt,
             [FACT_EXTRACTOR_SCHEMA, GOAL_TRACKER_SCHEMA],
             session_id=session_id,
-            use_cache=True
+            use_cache=True,
+            agent_name=type(self).__name__,
         )
 
         # Extract facts from tool results
@@ -66,21 +61,5 @@ class FactAndGoalUpdater:
         # Extract goal updates from tool results
         goal_updates = tool_results.get("update_goal_progress", {}).get("goal_updates", [])
 
-        # Apply updates to goals
-        update_map = {update["goal"]: update for update in goal_updates}
-        updated_goals = []
+        return extracted_facts, apply_goal_updates(goals, goal_updates)
 
-        for goal in goals:
-            if goal.description in update_map:
-                update = update_map[goal.description]
-                updated_goal = Goal(
-                    description=goal.description,
-                    confidence=update["confidence"],
-                    status=GoalStatus(update["status"]),
-                )
-                updated_goals.append(updated_goal)
-            else:
-                # Keep goal unchanged if no update found
-                updated_goals.append(goal)
-
-        return extracted_facts, updated_goals
\ No newline at end of file
@@ -37,7 +37,8 @@ class FactExtractorAgent:
             fact_gen_prompt,
             FACT_EXTRACTOR_SCHEMA,
             session_id=session_id,
-            use_cache=True
+            use_cache=True,
+            agent_name=type(self).__name__,
         )
 
         # Schema guarantees response["facts"] is a list of valid fact dicts
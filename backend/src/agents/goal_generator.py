@@ -1,6 +1,7 @@
 from typing import Optional
 
 from ..api_client import ClaudeClient
+from ..goal_updates import assign_goal_ids
 from ..models import Goal, GoalStatus, ExtractedSummary
 from ..prompts import GOAL_GENERATOR_SYSTEM, build_goal_generator_prompt
 from ..schemas import GOAL_GENERATOR_SCHEMA
@@ -21,7 +22,8 @@ class GoalGeneratorAgent:
             user_goal_prompt,
             GOAL_GENERATOR_SCHEMA,
             session_id=session_id,
-            use_cache=True
+            use_cache=True,
+            agent_name=type(self).__name__,
         )
 
         # Schema guarantees response["goals"] is a list of strings
@@ -32,4 +34,4 @@ class GoalGeneratorAgent:
             Goal(description=goal_str, status=GoalStatus.NOT_STARTED)
             for goal_str in goals_list
         ]
-        return list_goals
+        return assign_goal_ids(list_goals)
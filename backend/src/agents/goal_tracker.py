@@ -1,7 +1,8 @@
 from typing import Optional
 
 from ..api_client import ClaudeClient
-from ..models import Fact, Goal, GoalStatus
+from ..goal_updates import apply_goal_updates, goal_dicts
+from ..models import Fact, Goal
 from ..prompts import GOAL_TRACKER_SYSTEM, build_goal_tracker_prompt
 from ..schemas import GOAL_TRACKER_SCHEMA
 
@@ -18,14 +19,7 @@ class GoalTrackerAgent:
             return goals
 
         # Convert goals and facts to dicts for prompt
-        goals_dicts = [
-            {
-                "description": g.description,
-                "confidence": g.confidence,
-                "status": g.status.value,
-            }
-            for g in goals
-        ]
+        goals_dicts = goal_dicts(goals)
         facts_dicts = [
             {"claim": f.claim, "topic": f.topic, "timestamp": f.timestamp}
             for f in new_facts
@@ -40,30 +34,12 @@ class GoalTrackerAgent:
             user_prompt,
             GOAL_TRACKER_SCHEMA,
             session_id=session_id,
-            use_cache=True
+            use_cache=True,
+            agent_name=type(self).__name__,
         )
 
         # Schema guarantees response["goal_updates"] is a list of valid update dicts
         updates = response["goal_updates"]
 
-        # Create update map by goal description
-        update_map = {update["goal"]: update for update in updates}
-
-        # Apply updates to each goal
-        updated_goals = []
-        for goal in goals:
-            if goal.description in update_map:
-                update = update_map[goal.description]
-                # Create updated goal with new confidence and status
-                updated_goal = Goal(
-                    description=goal.description,
-                    confidence=update["confidence"],
-                    status=GoalStatus(update["status"]),
-                )
-                updated_goals.append(updated_goal)
-            else:
-                # Keep goal unchanged if no update found
-                updated_goals.append(goal)
-
-        # Return updated goals
-        return updated_goals
+        # Apply updates through the goal ID index (fuzzy description fallback)
+        return apply_goal_updates(goals, updates)
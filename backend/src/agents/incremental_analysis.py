@@ -0,0 +1,117 @@
+from typing import Optional
+
+from ..api_client import ClaudeClient
+from ..context_builder import estimate_tokens
+from ..models import AnalysisReport, AnalysisState, Fact, Goal, TimelineEvent, Verdict
+from ..prompts import (
+    ANALYSIS_STATE_SYSTEM,
+    VERDICT_SYSTEM,
+    build_analysis_state_prompt,
+    build_verdict_prompt,
+)
+from ..schemas import (
+    ANALYSIS_STATE_LOCAL_TIMELINE_SCHEMA,
+    ANALYSIS_STATE_SCHEMA,
+    VERDICT_SCHEMA,
+)
+from ..telemetry import TELEMETRY
+from ..timeline import build_timeline, local_timeline_enabled, reference_time
+from .agent_analysis import AnalysisAgent
+
+
+class IncrementalAnalysisAgent:
+    """Analysis built up turn by turn; the final call only returns the verdict."""
+
+    def __init__(self, client: ClaudeClient, local_timeline: Optional[bool] = None):
+        self.client = client
+        # Timeline built from fact timestamps at the end (LOCAL_TIMELINE when not given)
+        self.local_timeline = local_timeline_enabled() if local_timeline is None else local_timeline
+
+    def update_state(
+        self,
+        state: AnalysisState,
+        facts: list[Fact],
+        goals: list[Goal],
+        session_id: Optional[str] = None,
+    ) -> AnalysisState:
+        """
+        Merge the facts added since state was last updated into it.
+
+        Args:
+            state: Running analysis so far
+            facts: All session facts; those past state.covered_facts are merged
+            goals: Current goals, used to judge open gaps
+            session_id: Optional session ID for context isolation
+
+        Returns:
+            New AnalysisState covering all of facts
+        """
+        user_prompt = build_analysis_state_prompt(
+            state.model_dump(),
+            [f.model_dump() for f in facts[state.covered_facts:]],
+            [g.model_dump() for g in goals],
+            local_timeline=self.local_timeline,
+        )
+        response = self.client.call_with_tool(
+            ANALYSIS_STATE_SYSTEM,
+            user_prompt,
+            ANALYSIS_STATE_LOCAL_TIMELINE_SCHEMA if self.local_timeline else ANALYSIS_STATE_SCHEMA,
+            session_id=session_id,
+            use_cache=True,
+            agent_name=type(self).__name__,
+        )
+        return AnalysisState.model_validate({**response, "covered_facts": len(facts)})
+
+    def generate_analysis(
+        self, session_data: dict, session_id: Optional[str] = None
+    ) -> AnalysisReport:
+        """
+        Generate the analysis report from the running state plus a verdict call.
+
+        Sessions with no running state (started before INCREMENTAL_ANALYSIS was
+        enabled) get the full single-call analysis instead.
+
+        Args:
+            session_data: Session dict, including analysis_state
+            session_id: Optional session ID for context isolation
+
+        Returns:
+            AnalysisReport model with timeline, key_facts, gaps, verdict
+        """
+        state = AnalysisState.model_validate(session_data.get("analysis_state") or {})
+        if not state.covered_facts:
+            return AnalysisAgent(self.client, local_timeline=self.local_timeline).generate_analysis(
+                session_data, session_id=session_id
+            )
+
+        # Facts from the last turn(s) whose update hasn't landed go in verbatim
+        new_facts = session_data["facts"][state.covered_facts:]
+        new_events = [
+            TimelineEvent(time=f["timestamp"], event=f["claim"]) for f in new_facts if f.get("timestamp")
+        ]
+        if self.local_timeline:
+            # Every fact's timestamp, new ones included; unreadable times go last as said
+            timeline = build_timeline(
+                [Fact.model_validate(f) for f in session_data["facts"]],
+                reference_time(session_data.get("created_at", "")),
+            )
+            state.timeline = timeline.events + [
+                TimelineEvent(time=f.timestamp, event=f.claim) for f in timeline.unclear
+            ]
+            new_events = []
+        user_prompt = build_verdict_prompt(session_data, state.model_dump(), new_facts)
+        TELEMETRY.set_gauge(f"prompt_tokens.{type(self).__name__}", estimate_tokens(user_prompt))
+        response = self.client.call_with_tool(
+            VERDICT_SYSTEM,
+            user_prompt,
+            VERDICT_SCHEMA,
+            session_id=session_id,
+            use_cache=True,
+            agent_name=type(self).__name__,
+        )
+        return AnalysisReport(
+            timeline=state.timeline + new_events,
+            key_facts=state.key_facts + [f["claim"] for f in new_facts],
+            gaps=state.gaps,
+            verdict=Verdict.model_validate(response["verdict"]),
+        )
@@ -1,9 +1,26 @@
 from typing import Optional
 
 from ..api_client import ClaudeClient
-from ..models import Fact, Goal, Message, ExtractedSummary, QuestionWithAnswers
-from ..prompts import QUESTION_WITH_ANSWERS_SYSTEM, build_question_with_answers_prompt
-from ..schemas import QUESTION_WITH_ANSWERS_SCHEMA
+from ..context_builder import estimate_tokens, get_input_budget
+from ..fact_index import FactIndex
+from ..goal_updates import goal_dicts
+from ..models import (
+    ConversationMemory,
+    ExtractedSummary,
+    Fact,
+    Goal,
+    Message,
+    OptionImplication,
+    QuestionWithAnswers,
+)
+from ..prompts import (
+    OPTION_IMPLICATIONS_INSTRUCTIONS,
+    QUESTION_WITH_ANSWERS_SYSTEM,
+    build_question_with_answers_prompt,
+)
+from ..repair import repair_question_output
+from ..schemas import QUESTION_WITH_ANSWERS_SCHEMA, QUESTION_WITH_IMPLICATIONS_SCHEMA
+from ..telemetry import TELEMETRY
 
 
 class QuestionGeneratorAgent:
@@ -22,42 +39,77 @@ class QuestionGeneratorAgent:
         interviewee_name: str = "",
         interviewee_role: str = "",
         confidence_threshold: int = 90,
+        precompute_implications: bool = False,
+        memory: Optional[ConversationMemory] = None,
+        fact_index: Optional[FactIndex] = None,
     ) -> QuestionWithAnswers:
         # Calculate average confidence across goals
         avg_confidence = sum(g.confidence for g in goals) / len(goals) if goals else 0
 
+        # Facts and messages already folded into the rolling summary are sent as the summary
+        conversation_summary = ""
+        all_facts = facts
+        if memory is not None and memory.summary:
+            conversation_summary = memory.summary
+            facts = facts[memory.covered_facts:]
+            messages = messages[memory.covered_messages:]
+
+        # Facts relevant to the weakest goals, from the whole interview, instead of the newest ones
+        if fact_index is not None:
+            facts = fact_index.relevant_facts(all_facts, goals, confidence_threshold)
+
         # Convert models to dicts for prompt
-        goals_dicts = [
-            {
-                "description": g.description,
-                "confidence": g.confidence,
-                "status": g.status.value,
-            }
-            for g in goals
-        ]
+        goals_dicts = goal_dicts(goals)
         facts_dicts = [
             {"claim": f.claim, "topic": f.topic, "timestamp": f.timestamp}
             for f in facts
         ]
         messages_dicts = [{"role": m.role, "content": m.content} for m in messages]
 
-        # Build user prompt (include drift_redirect if present)
+        # Build user prompt (include drift_redirect if present), trimmed to this agent's input budget
+        agent_name = type(self).__name__
         user_prompt = build_question_with_answers_prompt(
-            goals_dicts, facts_dicts, messages_dicts, drift_redirect, extracted_summary, interviewee_name, interviewee_role
+            goals_dicts, facts_dicts, messages_dicts, drift_redirect, extracted_summary, interviewee_name, interviewee_role,
+            token_budget=get_input_budget(agent_name),
+            conversation_summary=conversation_summary,
+            facts_ranked=fact_index is not None,
         )
+        TELEMETRY.set_gauge(f"prompt_tokens.{agent_name}", estimate_tokens(user_prompt))
+
+        # Optionally ask for each option's facts and goal impact up front, so a
+        # canned answer needs no extraction call when it's picked
+        schema = QUESTION_WITH_ANSWERS_SCHEMA
+        if precompute_implications:
+            user_prompt += OPTION_IMPLICATIONS_INSTRUCTIONS
+            schema = QUESTION_WITH_IMPLICATIONS_SCHEMA
 
         # Call Claude API with tool schema enforcement
         response = self.client.call_with_tool(
             QUESTION_WITH_ANSWERS_SYSTEM,
             user_prompt,
-            QUESTION_WITH_ANSWERS_SCHEMA,
+            schema,
             session_id=session_id,
-            use_cache=True
+            use_cache=True,
+            agent_name=agent_name,
+            hedge=True,  # Interactive turn call: tail latency is user-visible
         )
 
+        # A wrong number of options is patched locally rather than regenerated
+        response = repair_question_output(response)
+
         # Override target_goal if investigation reaches user-specified confidence threshold
         if avg_confidence > confidence_threshold:
             response["target_goal"] = "wrap_up"
 
+        if precompute_implications:
+            response["implications"] = [
+                OptionImplication(
+                    answer=option["answer"],
+                    facts=option.pop("implied_facts", []),
+                    goal_updates=option.pop("goal_impact", []),
+                )
+                for option in response["answers"]
+            ]
+
         # Convert dict response to QuestionWithAnswers Pydantic model
         return QuestionWithAnswers.model_validate(response)
@@ -1,9 +1,14 @@
 from typing import Optional
 
 from ..api_client import ClaudeClient
+from ..chat_chunking import needs_chunking
+from ..goal_updates import assign_goal_ids
 from ..models import ExtractedSummary, Goal, GoalStatus
 from ..prompts import build_summary_and_goals_prompt, SUMMARY_AND_GOAL_GENERATION_SYSTEM
+from ..repair import EMPTY_ACTORS_INSTRUCTION, TOO_FEW_GOALS_INSTRUCTION, repair_summary_output
 from ..schemas import SUMMARY_EXTRACTOR_SCHEMA, GOAL_GENERATOR_SCHEMA
+from .goal_generator import GoalGeneratorAgent
+from .summary_extractor import SummaryExtractorAgent
 
 
 class SummaryAndGoalGenerator:
@@ -11,11 +16,14 @@ class SummaryAndGoalGenerator:
     Combined agent that extracts summary AND generates goals in a single API call.
 
     This reduces latency during initialization by combining two sequential operations,
-    using Claude's multi-tool calling capability.
+    using Claude's multi-tool calling capability. Summaries too long for one
+    request are extracted in parallel chunks and merged first, then goals are
+    generated from the merged summary.
     """
 
-    def __init__(self, client: ClaudeClient):
+    def __init__(self, client: ClaudeClient, chunk_tokens: Optional[int] = None):
         self.client = client
+        self.summary_extractor = SummaryExtractorAgent(client, chunk_tokens=chunk_tokens)
 
     def extract_and_generate(
         self,
@@ -34,6 +42,15 @@ class SummaryAndGoalGenerator:
         Returns:
             Tuple of (extracted_summary, goals)
         """
+        if not image_data_list and needs_chunking(raw_summary, self.summary_extractor.chunk_tokens):
+            extracted_summary = self.summary_extractor.extract_summary(
+                raw_summary, [], session_id=session_id
+            )
+            goals = GoalGeneratorAgent(self.client).generate_goals(
+                extracted_summary, session_id=session_id
+            )
+            return extracted_summary, goals
+
         # Build prompt
         user_prompt = build_summary_and_goals_prompt(raw_summary)
 
@@ -70,11 +87,43 @@ class SummaryAndGoalGenerator:
                 user_prompt,
                 [SUMMARY_EXTRACTOR_SCHEMA, GOAL_GENERATOR_SCHEMA],
                 session_id=session_id,
-                use_cache=True
+                use_cache=True,
+                agent_name=type(self).__name__,
             )
 
+        # Fill defaults locally, then re-ask for just the tool whose output
+        # can't be patched, with the first response as context
+        tool_results["extract_summary_structure"] = repair_summary_output(
+            tool_results.get("extract_summary_structure", {})
+        )
+        schemas = [SUMMARY_EXTRACTOR_SCHEMA, GOAL_GENERATOR_SCHEMA]
+        for schema, invalid, instruction in (
+            (
+                SUMMARY_EXTRACTOR_SCHEMA,
+                not tool_results["extract_summary_structure"]["actors"],
+                EMPTY_ACTORS_INSTRUCTION,
+            ),
+            (
+                GOAL_GENERATOR_SCHEMA,
+                len(tool_results.get("generate_investigation_goals", {}).get("goals", [])) < 3,
+                TOO_FEW_GOALS_INSTRUCTION,
+            ),
+        ):
+            if invalid:
+                tool_results[schema["name"]] = self.client.call_tool_followup(
+                    SUMMARY_AND_GOAL_GENERATION_SYSTEM,
+                    user_prompt,
+                    dict(tool_results),
+                    schemas,
+                    schema["name"],
+                    instruction,
+                    session_id=session_id,
+                    use_cache=True,
+                    agent_name=type(self).__name__,
+                )
+
         # Extract summary from tool results
-        summary_data = tool_results.get("extract_summary_structure", {})
+        summary_data = repair_summary_output(tool_results["extract_summary_structure"])
         extracted_summary = ExtractedSummary(**summary_data)
 
         # Extract goals from tool results
@@ -91,4 +140,4 @@ class SummaryAndGoalGenerator:
             for goal_str in goal_strings
         ]
 
-        return extracted_summary, goals
\ No newline at end of file
+        return extracted_summary, assign_goal_ids(goals)
\ No newline at end of file
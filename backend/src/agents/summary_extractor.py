@@ -1,24 +1,164 @@
 """Summary Extractor Agent for parsing raw drama descriptions into structured data."""
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from ..api_client import ClaudeClient
-from ..prompts import SUMMARY_EXTRACTOR_SYSTEM, build_summary_extractor_prompt
-from ..schemas import SUMMARY_EXTRACTOR_SCHEMA
+from ..chat_chunking import (
+    merge_summaries,
+    needs_chunking,
+    split_on_message_boundaries,
+    summary_chunk_concurrency,
+    summary_chunk_tokens,
+)
+from ..image_cache import (
+    ImageExtractionCache,
+    image_cache_enabled,
+    image_extraction_concurrency,
+    image_hash,
+    map_reduce_enabled,
+)
+from ..prompts import (
+    IMAGE_TRANSCRIPTION_SYSTEM,
+    SUMMARY_EXTRACTOR_SYSTEM,
+    build_screenshot_transcripts_prompt,
+    build_summary_chunk_prompt,
+    build_summary_extractor_prompt,
+)
+from ..schemas import IMAGE_TRANSCRIPTION_SCHEMA, SUMMARY_EXTRACTOR_SCHEMA
 from ..models import ExtractedSummary
+from ..repair import EMPTY_ACTORS_INSTRUCTION, repair_summary_output
+from ..telemetry import TELEMETRY
 
 
 class SummaryExtractorAgent:
     """Agent that extracts structured data from raw drama summaries."""
 
-    def __init__(self, client: ClaudeClient):
+    def __init__(
+        self,
+        client: ClaudeClient,
+        image_cache: Optional[ImageExtractionCache] = None,
+        map_reduce: Optional[bool] = None,
+        concurrency: Optional[int] = None,
+        chunk_tokens: Optional[int] = None,
+    ):
         """
         Initialize the SummaryExtractorAgent.
 
         Args:
             client: ClaudeClient instance for API calls
+            image_cache: Per-image transcription cache; defaults to the shared
+                on-disk cache when IMAGE_CACHE is enabled
+            map_reduce: Transcribe images in parallel per-image calls and reduce
+                with a text-only summary call (defaults to IMAGE_EXTRACTION);
+                also implied by an image cache. Otherwise all images are sent
+                with the summary in a single vision call
+            concurrency: Max parallel per-image calls (IMAGE_EXTRACTION_CONCURRENCY)
+            chunk_tokens: Text summaries longer than this are split into chunks
+                extracted in parallel (SUMMARY_CHUNK_TOKENS; 0 disables)
         """
         self.client = client
+        if image_cache is None and image_cache_enabled():
+            image_cache = ImageExtractionCache()
+        self.image_cache = image_cache
+        self.map_reduce = (
+            map_reduce_enabled() if map_reduce is None else map_reduce
+        ) or image_cache is not None
+        self.concurrency = concurrency or image_extraction_concurrency()
+        self.chunk_tokens = summary_chunk_tokens() if chunk_tokens is None else chunk_tokens
+
+    def _transcribe_image(self, image: dict, digest: str, session_id: Optional[str]) -> dict:
+        transcription = self.client.call_with_tool_and_images(
+            IMAGE_TRANSCRIPTION_SYSTEM,
+            "Transcribe this screenshot.",
+            IMAGE_TRANSCRIPTION_SCHEMA,
+            image_data_list=[image],
+            session_id=session_id,
+            use_cache=True,
+            agent_name=type(self).__name__,
+        )
+        # Stored as soon as it lands, so a failed upload keeps its finished images
+        if self.image_cache is not None:
+            self.image_cache.put(digest, transcription)
+        return transcription
+
+    def transcribe_images(self, image_data_list: list[dict], session_id: Optional[str] = None) -> list[dict]:
+        """
+        Transcribe each image, reusing cached results for images seen before.
+
+        Images not in the cache are transcribed concurrently, at most
+        self.concurrency calls at a time, so wall-clock time stays close to
+        one call for uploads up to that size.
+
+        Args:
+            image_data_list: Image dicts with base64 "data" and "media_type"
+            session_id: Optional session ID for context isolation
+
+        Returns:
+            transcribe_screenshot outputs in upload order
+        """
+        results: dict[str, dict] = {}
+        unseen: dict[str, dict] = {}
+        digests = [image_hash(image) for image in image_data_list]
+        for digest, image in zip(digests, image_data_list, strict=True):
+            if digest in results or digest in unseen:
+                continue  # same screenshot twice in one upload
+            cached = self.image_cache.get(digest) if self.image_cache is not None else None
+            if cached is None:
+                unseen[digest] = image
+            else:
+                results[digest] = cached
+
+        if unseen:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(unseen))) as pool:
+                futures = {
+                    digest: pool.submit(self._transcribe_image, image, digest, session_id)
+                    for digest, image in unseen.items()
+                }
+                for digest, future in futures.items():
+                    results[digest] = future.result()
+            TELEMETRY.observe("image_extraction:map", (time.perf_counter() - start) * 1000)
+        return [results[digest] for digest in digests]
+
+    def _extract_chunk(self, chunk: str, number: int, total: int, session_id: Optional[str]) -> dict:
+        return repair_summary_output(
+            self.client.call_with_tool(
+                SUMMARY_EXTRACTOR_SYSTEM,
+                build_summary_chunk_prompt(chunk, number, total),
+                SUMMARY_EXTRACTOR_SCHEMA,
+                session_id=session_id,
+                use_cache=True,
+                agent_name=type(self).__name__,
+            )
+        )
+
+    def extract_chunked(self, raw_summary: str, session_id: Optional[str] = None) -> dict:
+        """
+        Extract a long text summary chunk by chunk and merge the results locally.
+
+        The text is split on message boundaries into chunks of at most
+        self.chunk_tokens, extracted concurrently (SUMMARY_CHUNK_CONCURRENCY
+        at a time), and merged by chat_chunking.merge_summaries.
+
+        Args:
+            raw_summary: Long pasted chat log or description
+            session_id: Optional session ID for context isolation
+
+        Returns:
+            Merged extract_summary_structure output (actors may be empty)
+        """
+        chunks = split_on_message_boundaries(raw_summary, self.chunk_tokens)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(summary_chunk_concurrency(), len(chunks))) as pool:
+            parts = list(pool.map(
+                lambda numbered: self._extract_chunk(numbered[1], numbered[0], len(chunks), session_id),
+                enumerate(chunks, 1),
+            ))
+        TELEMETRY.observe("summary_extraction:map", (time.perf_counter() - start) * 1000)
+        TELEMETRY.increment("summary_extraction.chunks", len(chunks))
+        return merge_summaries(parts)
 
     def extract_summary(self, raw_summary: str, image_data_list: list[dict], session_id: Optional[str] = None) -> ExtractedSummary:
         """
@@ -36,16 +176,36 @@ class SummaryExtractorAgent:
         if not raw_summary and not image_data_list:
             raise ValueError("Must provide either raw_summary or image_data_list")
         user_prompt = build_summary_extractor_prompt(raw_summary)
+        chunked = False
         
         # Build user prompt
-        if image_data_list:
+        if not image_data_list and needs_chunking(raw_summary, self.chunk_tokens):
+            # Long pasted logs: parallel per-chunk extraction, merged locally
+            response = self.extract_chunked(raw_summary, session_id)
+            chunked = True
+        elif image_data_list and self.map_reduce:
+            # Only unseen images cost vision tokens; the summary is text-only
+            user_prompt = build_screenshot_transcripts_prompt(
+                raw_summary, self.transcribe_images(image_data_list, session_id)
+            )
+            image_data_list = []  # a repair follow-up resends the transcripts, not the images
+            response = self.client.call_with_tool(
+                SUMMARY_EXTRACTOR_SYSTEM,
+                user_prompt,
+                SUMMARY_EXTRACTOR_SCHEMA,
+                session_id=session_id,
+                use_cache=True,
+                agent_name=type(self).__name__,
+            )
+        elif image_data_list:
             response = self.client.call_with_tool_and_images(
                 SUMMARY_EXTRACTOR_SYSTEM,
                 user_prompt,
                 SUMMARY_EXTRACTOR_SCHEMA,
                 image_data_list=image_data_list,
                 session_id=session_id,
-                use_cache=True
+                use_cache=True,
+                agent_name=type(self).__name__,
             )
         elif not image_data_list:
             response = self.client.call_with_tool(
@@ -53,9 +213,32 @@ class SummaryExtractorAgent:
                 user_prompt,
                 SUMMARY_EXTRACTOR_SCHEMA,
                 session_id=session_id,
-                use_cache=True
+                use_cache=True,
+                agent_name=type(self).__name__,
+            )
+
+        # Patch missing optional fields locally; only an empty actors list
+        # needs the model again, and then only for this one tool
+        response = repair_summary_output(response)
+        if not response["actors"]:
+            if chunked:
+                # The merged output is replayed with the first chunk, never the
+                # whole log the chunking exists to avoid sending
+                chunks = split_on_message_boundaries(raw_summary, self.chunk_tokens)
+                user_prompt = build_summary_chunk_prompt(chunks[0], 1, len(chunks))
+            response = repair_summary_output(
+                self.client.call_tool_followup(
+                    SUMMARY_EXTRACTOR_SYSTEM,
+                    self.client.image_content(image_data_list, user_prompt),
+                    {SUMMARY_EXTRACTOR_SCHEMA["name"]: response},
+                    [SUMMARY_EXTRACTOR_SCHEMA],
+                    SUMMARY_EXTRACTOR_SCHEMA["name"],
+                    EMPTY_ACTORS_INSTRUCTION,
+                    session_id=session_id,
+                    use_cache=True,
+                    agent_name=type(self).__name__,
+                )
             )
 
-        # Schema guarantees response has all required fields
         # Convert dict response to ExtractedSummary Pydantic model
         return ExtractedSummary.model_validate(response)
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""Running analysis state that keeps the final analysis call small.
+
+The analysis used to be rebuilt from the whole transcript in one large call
+when the user asked for it, the slowest response they see. With
+INCREMENTAL_ANALYSIS=true, each turn that adds facts starts a small background
+call that merges them into session.analysis_state (timeline, key facts, open
+gaps). The result is applied on the next turn, like rolling-summary folds,
+and the update for the last turn is picked up by the analysis request. The
+final call then only produces the verdict from that compact state; facts
+whose update hasn't landed yet are passed verbatim and appended locally.
+"""
+
+from typing import Optional
+
+from .agents.incremental_analysis import IncrementalAnalysisAgent
+from .api_client import ClaudeClient
+from .background import BACKGROUND
+from .env import env_flag
+from .models import AnalysisReport, AnalysisState, Session
+
+
+def incremental_analysis_enabled() -> bool:
+    return env_flag("INCREMENTAL_ANALYSIS")
+
+
+def analysis_state_key(session_id: str) -> str:
+    return f"analysis_state:{session_id}"
+
+
+def analysis_state_due(session: Session) -> bool:
+    return len(session.facts) > session.analysis_state.covered_facts
+
+
+def apply_analysis_state(session: Session, state: Optional[AnalysisState]) -> bool:
+    """Adopt a finished update unless the session already has a newer one."""
+    if state is None or state.covered_facts <= session.analysis_state.covered_facts:
+        return False
+    session.analysis_state = state
+    return True
+
+
+
+def generate_incremental_analysis(session: Session, client: ClaudeClient) -> AnalysisReport:
+    """Analyze a session from its running state plus one verdict call."""
+    # The update started after the last answer, if it has finished
+    apply_analysis_state(session, BACKGROUND.take(analysis_state_key(session.session_id)))
+    return IncrementalAnalysisAgent(client).generate_analysis(
+        session.model_dump(), session_id=session.session_id
+    )
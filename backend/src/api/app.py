@@ -3,6 +3,8 @@ import os
 from flask import Flask
 from flask_cors import CORS
 
+from ..env import env_int
+
 def create_app():
     app = Flask(__name__)
 
@@ -19,6 +21,9 @@ def create_app():
         }
     })
 
+    # Reject oversized request bodies before they are read into memory
+    app.config["MAX_CONTENT_LENGTH"] = env_int("MAX_REQUEST_BYTES", 64 * 1024 * 1024)
+
     # Register routes
     from .routes import api_bp
     app.register_blueprint(api_bp, url_prefix='/api')
@@ -4,12 +4,19 @@ from flask_cors import CORS
 from functools import wraps
 import jwt
 import os
+import time
 from datetime import datetime, timedelta
-from ..interview import InterviewOrchestrator
+from ..interview import InterviewOrchestrator, drift_stats
 from ..agents.agent_analysis import AnalysisAgent
+from ..analysis_state import generate_incremental_analysis, incremental_analysis_enabled
 from ..api_client import ClaudeClient
+from ..hedging import hedge_stats
+from ..image_store import ImageStore, image_store_enabled
+from ..images import ImageRejectedError, decode_base64_image, normalize_images
 from ..models import Session, Answer
 from ..session import SessionManager
+from ..telemetry import TELEMETRY
+from ..triage import triage_stats
 
 api_bp = Blueprint('api', __name__)
 
@@ -87,34 +94,21 @@ def verify_password():
 @token_required
 def investigate():
     try:
-        data = request.get_json()
+        # Screenshots come as multipart files or base64 strings in JSON
+        multipart = request.mimetype == 'multipart/form-data'
+        data = request.form.to_dict() if multipart else request.get_json()
         incident_name = data["incident_name"]
         summary: str = data.get("summary", "")
         interviewee_name = data["interviewee_name"]
         interviewee_role = data["interviewee_role"]
-        confidence_threshold = data.get("confidence_threshold", 90)  # Default to 90 if not provided
-        images = data["images"]
-
-           # Process images into format for API client
-        image_data_list = []
-        if images:
-            for img_base64 in images:
-                # Detect media type from base64 prefix or default to jpeg
-                if img_base64.startswith('/9j/'):  # JPEG magic bytes
-                    media_type = "image/jpeg"
-                elif img_base64.startswith('iVBORw'):  # PNG magic bytes
-                    media_type = "image/png"
-                elif img_base64.startswith('R0lG'):  # GIF magic bytes
-                    media_type = "image/gif"
-                elif img_base64.startswith('UklGR'):  # WebP magic bytes
-                    media_type = "image/webp"
-                else:
-                    media_type = "image/jpeg"  # Default fallback
-
-                image_data_list.append({
-                    "data": img_base64,
-                    "media_type": media_type
-                })
+        confidence_threshold = int(data.get("confidence_threshold", 90))  # Default to 90 if not provided
+        if multipart:
+            uploads = [f.read() for f in request.files.getlist('images')]
+        else:
+            uploads = [decode_base64_image(img) for img in data["images"] or []]
+
+        # Verify, dedupe and downscale before anything reaches the model
+        image_data_list, image_report = normalize_images(uploads)
 
         # Validate required fields
         if not incident_name:
@@ -123,6 +117,12 @@ def investigate():
         # create session
         session_manager: SessionManager = SessionManager()
         session: Session = session_manager.create_session(incident_name, interviewee_name, interviewee_role, confidence_threshold)
+        if image_data_list and image_store_enabled():
+            # The session keeps hashes; the bytes live once in the image store,
+            # and the request images are encoded from the mapped blobs
+            image_store = ImageStore()
+            session.images = image_store.put_all(image_data_list, session.session_id)
+            image_data_list = image_store.load_all(session.images)
 
         # initialize investigation
         orchestrator: InterviewOrchestrator = InterviewOrchestrator(session)
@@ -140,10 +140,13 @@ def investigate():
             'question': session.current_question,
             'answers': [a.model_dump() for a in session.answers],
             'turn_count': session.turn_count,
-            'goals': [g.model_dump() for g in session.goals]
+            'goals': [g.model_dump() for g in session.goals],
+            'image_report': image_report.summary(),
         })
     except KeyError as e:
         return jsonify({'error': f'Missing required field: {str(e)}'}), 400
+    except ImageRejectedError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -158,6 +161,7 @@ def investigate():
 @api_bp.route('/answer', methods=['POST'])
 @token_required
 def submit_answer():
+    start = time.perf_counter()
     try:
         data = request.get_json()
         session_id = data['session_id']
@@ -178,6 +182,7 @@ def submit_answer():
 
         # Save session
         session_manager.save_session(session)
+        TELEMETRY.observe('api:answer', (time.perf_counter() - start) * 1000)
         if is_complete:
             return jsonify({
                 'is_complete': True,
@@ -232,12 +237,15 @@ def get_analysis(session_id):
         session_manager = SessionManager()
         session = session_manager.load_session(session_id)
 
-        # Generate analysis
-        analysis_agent = AnalysisAgent(client=ClaudeClient())
-        analysis = analysis_agent.generate_analysis(
-            session.model_dump(),
-            session_id=session_id
-        )
+        # Generate analysis (verdict only, from the running state, with INCREMENTAL_ANALYSIS)
+        if incremental_analysis_enabled():
+            analysis = generate_incremental_analysis(session, ClaudeClient())
+        else:
+            analysis_agent = AnalysisAgent(client=ClaudeClient())
+            analysis = analysis_agent.generate_analysis(
+                session.model_dump(),
+                session_id=session_id
+            )
 
         return jsonify({
             'incident_name': session.incident_name,
@@ -246,4 +254,15 @@ def get_analysis(session_id):
     except FileNotFoundError:
         return jsonify({'error': 'Session not found'}), 404
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/metrics', methods=['GET'])
+@token_required
+def get_metrics():
+    """Return in-process telemetry: routes served, latency percentiles, counters."""
+    return jsonify({
+        **TELEMETRY.snapshot(),
+        'hedging': hedge_stats(),
+        'drift': drift_stats(),
+        'triage': triage_stats(),
+    })
@@ -4,24 +4,171 @@ import time
 from typing import Optional, Union
 
 from anthropic import Anthropic
-from anthropic.types import TextBlock, ToolUseBlock
+from anthropic.types import Message, TextBlock, ToolUseBlock
 from dotenv import load_dotenv
 
+from .cassette import Cassette, CassetteMissError
+from .compact_schemas import (
+    compact_enabled,
+    compact_schema,
+    compact_tool_output,
+    expand_tool_output,
+)
+from .hedging import HedgePolicy, Hedger
+from .repair import missing_tool_instruction
+from .routing import RoutingTable
+from .telemetry import TELEMETRY, CallRecord, Telemetry
+
 load_dotenv()
 
 
+def _token_count(usage, field: str) -> int:
+    """A usage counter, or 0 when the response (or a test double) has none."""
+    value = getattr(usage, field, None)
+    return value if isinstance(value, int) else 0
+
+
 class ClaudeClient:
     def __init__(
         self,
         model: str = "claude-haiku-4-5",
         temperature: float = 0.3,
         max_tokens: int = 2048,
+        routing_table: Optional[RoutingTable] = None,
+        telemetry: Optional[Telemetry] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        base_url: Optional[str] = None,
+        cassette: Optional[Cassette] = None,
+        compact_schemas: Optional[bool] = None,
     ):
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
-        self.client = Anthropic()
-        pass
+        # base_url points the client at a stand-in server (e.g. fake_anthropic_server);
+        # the SDK also honours ANTHROPIC_BASE_URL when this is unset
+        self.client = Anthropic(base_url=base_url) if base_url else Anthropic()
+        # Per-agent model routing; constructor args are the "default" tier
+        self.routing_table = routing_table or RoutingTable.from_env(
+            model, max_tokens, temperature
+        )
+        self.telemetry = telemetry or TELEMETRY
+        # Opt-in hedging for interactive calls (HEDGE_ENABLED)
+        self.hedger = Hedger(hedge_policy or HedgePolicy.from_env(), self.telemetry)
+        # Record/replay of LLM traffic (LLM_CASSETTE, LLM_CASSETTE_MODE)
+        self.cassette = cassette if cassette is not None else Cassette.from_env()
+        # Short-key tool schemas, expanded on the way back (COMPACT_SCHEMAS)
+        self.compact_schemas = compact_enabled() if compact_schemas is None else compact_schemas
+
+    def _create_message(
+        self, agent_name: Optional[str], hedge: bool = False, **request
+    ) -> Message:
+        """
+        Send one Messages API request on the route chosen for agent_name.
+
+        Model, max_tokens and temperature come from the routing table; every
+        call (successful or not) is recorded to telemetry with the route used.
+        With hedge=True and hedging enabled, a slow request is raced against
+        an identical second request. A cassette records or replaces the
+        upstream call entirely.
+        """
+        route = self.routing_table.resolve(agent_name, self.telemetry)
+        full_request = {
+            "model": route.model,
+            "max_tokens": route.max_tokens,
+            "temperature": route.temperature,
+            **request,
+        }
+
+        def send() -> Message:
+            return self.client.messages.create(**full_request)
+
+        start = time.perf_counter()
+        status = "ok"
+        source = "api"
+        usage = None
+        try:
+            if self.cassette is not None and self.cassette.mode == "replay":
+                source = "replay"
+                response, recorded_ms = self.cassette.replay(full_request)
+                if self.cassette.replay_latency:
+                    time.sleep(recorded_ms / 1000)
+            elif hedge and self.hedger.policy.enabled:
+                response = self.hedger.run(f"{agent_name}:{route.name}", send)
+            else:
+                response = send()
+            usage = getattr(response, "usage", None)
+            if self.cassette is not None and self.cassette.mode == "record":
+                self.cassette.record(
+                    full_request, response, (time.perf_counter() - start) * 1000
+                )
+            return response
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            self.telemetry.record_call(
+                CallRecord(
+                    agent=agent_name or "unknown",
+                    route=route.name,
+                    model=route.model,
+                    latency_ms=(time.perf_counter() - start) * 1000,
+                    fallback=route.fallback,
+                    input_tokens=_token_count(usage, "input_tokens"),
+                    output_tokens=_token_count(usage, "output_tokens"),
+                    cache_creation_input_tokens=_token_count(usage, "cache_creation_input_tokens"),
+                    cache_read_input_tokens=_token_count(usage, "cache_read_input_tokens"),
+                    status=status,
+                    source=source,
+                )
+            )
+
+    def _wire_schema(self, schema: dict) -> dict:
+        """The tool schema as sent: the compact variant in compact mode."""
+        return compact_schema(schema) if self.compact_schemas else schema
+
+    def _unwire_output(self, schema: dict, data: dict) -> dict:
+        """Expand a compact tool output back to the schema's original keys."""
+        return expand_tool_output(schema, data) if self.compact_schemas else data
+
+    def _compact_output(self, schema: Optional[dict], data: dict) -> dict:
+        """Re-key an expanded output as the model produced it (for replaying history)."""
+        if not self.compact_schemas or schema is None:
+            return data
+        return compact_tool_output(schema, data)
+
+    def build_tool_request(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        tool_schema: dict,
+        session_id: Optional[str] = None,
+        use_cache: bool = False,
+        agent_name: Optional[str] = None,
+    ) -> dict:
+        """
+        Build the Messages API params call_with_tool would send, without sending.
+
+        Used to queue requests for the Message Batches API; model, max_tokens
+        and temperature come from the agent's route.
+        """
+        if session_id:
+            system_prompt = f"[Session: {session_id}]\n\n{system_prompt}"
+        system = (
+            [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+            if use_cache
+            else system_prompt
+        )
+        route = self.routing_table.resolve(agent_name)
+        return {
+            "model": route.model,
+            "max_tokens": route.max_tokens,
+            "temperature": route.temperature,
+            "system": system,
+            "messages": [{"role": "user", "content": user_prompt}],
+            "tools": [self._wire_schema(tool_schema)],
+            "tool_choice": {"type": "tool", "name": tool_schema["name"]},
+        }
+
     def call_with_images(
         self,
         system_prompt: str,
@@ -29,6 +176,7 @@ class ClaudeClient:
         image_data_list: list[dict],  # [{"data": base64_str, "media_type": "image/jpeg"}, ...]
         max_retries: int = 3,
         session_id: Optional[str] = None,
+        agent_name: Optional[str] = None,
     ) -> str:
         """
         Call Claude API with text and images for vision processing.
@@ -39,6 +187,7 @@ class ClaudeClient:
             image_data_list: List of dicts with 'data' (base64) and 'media_type' keys
             max_retries: Number of retry attempts
             session_id: Optional session ID for caching
+            agent_name: Calling agent class name, used for model routing
 
         Returns:
             Response text from Claude
@@ -71,10 +220,8 @@ class ClaudeClient:
 
         for attempt in range(max_retries):
             try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
+                response = self._create_message(
+                    agent_name,
                     system=system_prompt,
                     messages=[{"role": "user", "content": content}],
                 )
@@ -84,6 +231,8 @@ class ClaudeClient:
                     f"Expected TextBlock, got {type(content_block).__name__}"
                 )
                 return content_block.text
+            except CassetteMissError:
+                raise  # replaying again can't find a response that was never recorded
             except Exception as e:
                 last_error = e
                 if attempt < max_retries - 1:
@@ -98,6 +247,7 @@ class ClaudeClient:
         max_retries: int = 3,
         session_id: Optional[str] = None,
         use_cache: bool = False,
+        agent_name: Optional[str] = None,
     ) -> str:
         last_error: Optional[Exception] = None
 
@@ -119,10 +269,8 @@ class ClaudeClient:
                 else:
                     system = system_prompt
 
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
+                response = self._create_message(
+                    agent_name,
                     system=system, # type: ignore
                     messages=[{"role": "user", "content": user_prompt}],
                 )
@@ -132,6 +280,8 @@ class ClaudeClient:
                     f"Expected TextBlock, got {type(content_block).__name__}"
                 )
                 return content_block.text
+            except CassetteMissError:
+                raise  # replaying again can't find a response that was never recorded
             except Exception as e:
                 last_error = e
                 if attempt < max_retries - 1:
@@ -149,6 +299,8 @@ class ClaudeClient:
         max_retries: int = 3,
         session_id: Optional[str] = None,
         use_cache: bool = False,
+        agent_name: Optional[str] = None,
+        hedge: bool = False,
     ) -> dict:
         """
         Call Claude API with tool calling to enforce JSON schema.
@@ -160,6 +312,8 @@ class ClaudeClient:
             max_retries: Number of retry attempts on failure
             session_id: Optional session ID to prevent context bleeding
             use_cache: Whether to use prompt caching for system prompt
+            agent_name: Calling agent class name, used for model routing
+            hedge: Race slow calls against a second request (interactive calls)
 
         Returns:
             Dictionary matching the tool schema (guaranteed valid structure)
@@ -188,13 +342,12 @@ class ClaudeClient:
 
         for attempt in range(max_retries):
             try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
+                response = self._create_message(
+                    agent_name,
+                    hedge=hedge,
                     system=system,  # type: ignore
                     messages=[{"role": "user", "content": user_prompt}],
-                    tools=[tool_schema],  # Provide the tool schema # type: ignore
+                    tools=[self._wire_schema(tool_schema)],  # Provide the tool schema # type: ignore
                     tool_choice={"type": "tool", "name": tool_schema["name"]}  # Force tool use
                 )
 
@@ -205,10 +358,12 @@ class ClaudeClient:
                             f"Expected ToolUseBlock, got {type(block).__name__}"
                         )
                         # block.input is guaranteed to match the schema
-                        return block.input  # type: ignore
+                        return self._unwire_output(tool_schema, block.input)  # type: ignore
 
                 raise ValueError("No tool_use block found in response")
 
+            except CassetteMissError:
+                raise  # replaying again can't find a response that was never recorded
             except Exception as e:
                 last_error = e
                 if attempt < max_retries - 1:
@@ -226,6 +381,8 @@ class ClaudeClient:
         max_retries: int = 3,
         session_id: Optional[str] = None,
         use_cache: bool = False,
+        agent_name: Optional[str] = None,
+        hedge: bool = False,
     ) -> dict[str, dict]:
         """
         Call Claude API with multiple tools, allowing it to use multiple tools in one response.
@@ -237,6 +394,8 @@ class ClaudeClient:
             max_retries: Number of retry attempts on failure
             session_id: Optional session ID to prevent context bleeding
             use_cache: Whether to use prompt caching for system prompt
+            agent_name: Calling agent class name, used for model routing
+            hedge: Race slow calls against a second request (interactive calls)
 
         Returns:
             Dictionary mapping tool names to their inputs: {tool_name: tool_input_dict}
@@ -265,38 +424,156 @@ class ClaudeClient:
 
         for attempt in range(max_retries):
             try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
+                response = self._create_message(
+                    agent_name,
+                    hedge=hedge,
                     system=system,  # type: ignore
                     messages=[{"role": "user", "content": user_prompt}],
-                    tools=tool_schemas,  # type: ignore
+                    tools=[self._wire_schema(s) for s in tool_schemas],  # type: ignore
                     tool_choice={"type": "any"}  # Force at least one tool use
                 )
 
                 # Extract all tool uses from response
+                schemas_by_name = {s["name"]: s for s in tool_schemas}
                 tool_results = {}
                 for block in response.content:
                     if block.type == "tool_use":
                         assert isinstance(block, ToolUseBlock), (
                             f"Expected ToolUseBlock, got {type(block).__name__}"
                         )
-                        tool_results[block.name] = block.input  # type: ignore
+                        schema = schemas_by_name.get(block.name)
+                        tool_results[block.name] = (
+                            self._unwire_output(schema, block.input)  # type: ignore
+                            if schema
+                            else block.input
+                        )
 
                 if not tool_results:
                     raise ValueError("No tool_use blocks found in response")
 
-                return tool_results
+                break
 
+            except CassetteMissError:
+                raise  # replaying again can't find a response that was never recorded
             except Exception as e:
                 last_error = e
                 if attempt < max_retries - 1:
                     wait_time = 2**attempt  # exponential backoff: 1s, 2s, 4s
                     time.sleep(wait_time)
+        else:
+            # If we've exhausted all retries, raise the last error
+            raise Exception(f"Failed after {max_retries} attempts: {last_error}")
+
+        # Ask for just the tools the model skipped rather than redoing all of them
+        for schema in tool_schemas:
+            if schema["name"] not in tool_results:
+                self.telemetry.increment("repair.followup.missing_tool")
+                tool_results[schema["name"]] = self.call_tool_followup(
+                    system_prompt,
+                    user_prompt,
+                    tool_results,
+                    tool_schemas,
+                    schema["name"],
+                    missing_tool_instruction(schema["name"]),
+                    use_cache=use_cache,
+                    agent_name=agent_name,
+                )
+        return tool_results
 
-        # If we've exhausted all retries, raise the last error
-        raise Exception(f"Failed after {max_retries} attempts: {last_error}")
+    def call_tool_followup(
+        self,
+        system_prompt: str,
+        user_content: str | list,
+        prior_outputs: dict[str, dict],
+        tool_schemas: list[dict],
+        target_tool: str,
+        instruction: str,
+        max_retries: int = 2,
+        session_id: Optional[str] = None,
+        use_cache: bool = False,
+        agent_name: Optional[str] = None,
+    ) -> dict:
+        """
+        Ask for one tool again, with the original request and outputs as context.
+
+        The earlier tool outputs are replayed as the assistant turn, so the
+        model only regenerates target_tool. With use_cache the system prompt
+        and original user content are cache breakpoints, so the repeated
+        context is billed and processed as a cache read.
+
+        Args:
+            system_prompt: System instructions of the original call
+            user_content: User prompt (or content blocks) of the original call
+            prior_outputs: Tool name -> input from the original response
+            tool_schemas: Schemas of every tool in the original call
+            target_tool: Name of the tool to call again
+            instruction: What was wrong / what to produce
+            max_retries: Number of attempts
+            session_id: Optional session ID (omit if already in system_prompt)
+            use_cache: Whether to use prompt caching
+            agent_name: Calling agent class name, used for model routing
+
+        Returns:
+            Tool input dict for target_tool, keyed as its original schema
+        """
+        if session_id:
+            system_prompt = f"[Session: {session_id}]\n\n{system_prompt}"
+        cache = {"cache_control": {"type": "ephemeral"}} if use_cache else {}
+        system = [{"type": "text", "text": system_prompt, **cache}] if use_cache else system_prompt
+
+        content = (
+            [{"type": "text", "text": user_content}]
+            if isinstance(user_content, str)
+            else [dict(block) for block in user_content]
+        )
+        content[-1] = {**content[-1], **cache}
+
+        schemas_by_name = {s["name"]: s for s in tool_schemas}
+        tool_uses = [
+            {
+                "type": "tool_use",
+                "id": f"toolu_prior_{index}",
+                "name": name,
+                "input": self._compact_output(schemas_by_name.get(name), output),
+            }
+            for index, (name, output) in enumerate(prior_outputs.items())
+        ]
+        followup = [
+            {"type": "tool_result", "tool_use_id": use["id"], "content": "Received."}
+            for use in tool_uses
+        ]
+        followup.append({"type": "text", "text": instruction})
+        messages = [{"role": "user", "content": content}]
+        if tool_uses:
+            messages.append({"role": "assistant", "content": tool_uses})
+            messages.append({"role": "user", "content": followup})
+        else:
+            messages[0]["content"] = [*content, {"type": "text", "text": instruction}]
+
+        last_error: Optional[Exception] = None
+        for attempt in range(max_retries):
+            try:
+                response = self._create_message(
+                    agent_name,
+                    system=system,  # type: ignore
+                    messages=messages,  # type: ignore
+                    tools=[self._wire_schema(s) for s in tool_schemas],  # type: ignore
+                    tool_choice={"type": "tool", "name": target_tool},
+                )
+                for block in response.content:
+                    if block.type == "tool_use" and block.name == target_tool:
+                        return self._unwire_output(
+                            schemas_by_name[target_tool], block.input  # type: ignore
+                        )
+                raise ValueError(f"No {target_tool} tool_use block in follow-up response")
+            except CassetteMissError:
+                raise  # replaying again can't find a response that was never recorded
+            except Exception as e:
+                last_error = e
+                if attempt < max_retries - 1:
+                    time.sleep(2**attempt)
+
+        raise Exception(f"Follow-up for {target_tool} failed after {max_retries} attempts: {last_error}")
 
     def call_with_tool_and_images(
         self,
@@ -306,7 +583,8 @@ class ClaudeClient:
         image_data_list: list[dict], # type: ignore
         max_retries: int = 3,
         session_id: Optional[str] = None,
-        use_cache: bool = False
+        use_cache: bool = False,
+        agent_name: Optional[str] = None,
     ) -> dict:
         """
         Call Claude API with tool use (structured output) and optional images.
@@ -319,6 +597,7 @@ class ClaudeClient:
             max_retries: Number of retry attempts
             session_id: Optional session ID
             use_cache: Whether to use prompt caching
+            agent_name: Calling agent class name, used for model routing
 
         Returns:
             Structured dict extracted from tool use
@@ -329,26 +608,7 @@ class ClaudeClient:
         if session_id:
             system_prompt = f"[Session: {session_id}]\n\n{system_prompt}"
 
-        # Build content array
-        content = []
-
-        # Add images if present
-        if image_data_list:
-            for img in image_data_list:
-                content.append({
-                    "type": "image",
-                    "source": {
-                        "type": "base64",
-                        "media_type": img["media_type"],
-                        "data": img["data"]
-                    }
-                })
-
-        # Add text prompt
-        content.append({
-            "type": "text",
-            "text": text_prompt
-        })
+        content = self.image_content(image_data_list, text_prompt)
 
         # Prepare system with caching if requested
         if use_cache:
@@ -364,23 +624,23 @@ class ClaudeClient:
 
         for attempt in range(max_retries):
             try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
+                response = self._create_message(
+                    agent_name,
                     system=system,
                     messages=[{"role": "user", "content": content}],
-                    tools=[tool_schema]
+                    tools=[self._wire_schema(tool_schema)]
                 )
 
                 # Extract tool use from response
                 for block in response.content:
                     if block.type == "tool_use":
-                        return block.input  # This is already a dict
+                        return self._unwire_output(tool_schema, block.input)  # type: ignore
 
                 # If no tool use found, raise error
                 raise ValueError("No tool use found in response")
 
+            except CassetteMissError:
+                raise  # replaying again can't find a response that was never recorded
             except Exception as e:
                 last_error = e
                 if attempt < max_retries - 1:
@@ -389,6 +649,23 @@ class ClaudeClient:
 
         raise Exception(f"Failed after {max_retries} attempts: {last_error}")
 
+    @staticmethod
+    def image_content(image_data_list: Optional[list[dict]], text_prompt: str) -> list[dict]:
+        """User content blocks: base64 images (if any) followed by the text prompt."""
+        content: list[dict] = [
+            {
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": img["media_type"],
+                    "data": img["data"]
+                }
+            }
+            for img in image_data_list or []
+        ]
+        content.append({"type": "text", "text": text_prompt})
+        return content
+
     def extract_json_from_response(self, response_text: str) -> Union[dict, list]:
         # Try different patterns in order of preference
         patterns = [
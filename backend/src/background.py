@@ -0,0 +1,113 @@
+"""Background work whose result is picked up by a later request.
+
+Flask builds a fresh orchestrator per request, so results produced after a
+response has been sent (e.g. a drift check for the answer just submitted) are
+kept here, keyed by session, until the next turn asks for them. Results live
+in this process only; with several workers a result is simply not found and
+the turn proceeds without it. Keys are "<kind>:<session_id>". Results nobody
+takes (abandoned sessions) are dropped after ttl_seconds, and past
+max_results the oldest go first, like the per-session fact indexes.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Optional
+
+from .telemetry import TELEMETRY, Telemetry
+
+logger = logging.getLogger(__name__)
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="background")
+
+
+class BackgroundResults:
+    """Thread-safe map of key -> Future for work submitted off the critical path."""
+
+    def __init__(
+        self,
+        executor: Optional[ThreadPoolExecutor] = None,
+        telemetry: Optional[Telemetry] = None,
+        max_results: int = 1024,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.executor = executor or _EXECUTOR
+        self.telemetry = telemetry or TELEMETRY
+        self.max_results = max_results
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        # key -> (future, submit time), oldest submission first
+        self._futures: OrderedDict[str, tuple[Future, float]] = OrderedDict()
+
+    def submit(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Start fn in the background; replaces any result still pending for key."""
+        future = self.executor.submit(fn, *args, **kwargs)
+        now = self.clock()
+        with self._lock:
+            self._futures.pop(key, None)
+            self._futures[key] = (future, now)
+            self._evict(now)
+        return future
+
+    def _evict(self, now: float) -> None:
+        """Drop finished results older than ttl_seconds, then the oldest past max_results."""
+        expired = [
+            key for key, (future, submitted) in self._futures.items()
+            if future.done() and now - submitted > self.ttl_seconds
+        ]
+        for key in expired:
+            del self._futures[key]
+        evicted = len(expired)
+        while len(self._futures) > self.max_results:
+            self._futures.popitem(last=False)
+            evicted += 1
+        if evicted:
+            self.telemetry.increment("background.evicted", evicted)
+
+    def take(self, key: str) -> Optional[Any]:
+        """
+        Pop and return the result for key if it is ready, without waiting.
+
+        Returns None when nothing was submitted, the work is still running (it
+        stays pending for a later call) or it failed (logged and dropped).
+        """
+        with self._lock:
+            future, _ = self._futures.get(key, (None, 0.0))
+            if future is None or not future.done():
+                return None
+            del self._futures[key]
+        error = future.exception()
+        if error is not None:
+            logger.warning("Background task %s failed: %s", key, error)
+            self.telemetry.increment("background.errors")
+            return None
+        return future.result()
+
+    def pending(self, key: str) -> bool:
+        with self._lock:
+            return key in self._futures
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._futures.pop(key, None)
+
+    def discard_session(self, session_id: str) -> None:
+        """Drop every result kept for a session (archived or abandoned)."""
+        with self._lock:
+            for key in [k for k in self._futures if k.partition(":")[2] == session_id]:
+                del self._futures[key]
+
+    def wait_all(self, timeout: Optional[float] = None) -> None:
+        """Block until everything submitted so far has finished (tests, shutdown)."""
+        with self._lock:
+            futures = [future for future, _ in self._futures.values()]
+        wait(futures, timeout=timeout)
+
+
+# Shared process-wide instance
+BACKGROUND = BackgroundResults()
@@ -0,0 +1,319 @@
+"""Bulk re-analysis of stored sessions through a batch interface.
+
+Analysis requests for many sessions are submitted as Message Batches instead of
+one blocking call each. Progress is checkpointed to a JSON file after every
+submit and every collected batch, so an interrupted run picks up where it
+stopped: finished sessions are skipped and batches already submitted are
+polled again rather than resubmitted. All chunks are submitted before any is
+polled, so the batches are processed concurrently.
+
+A checkpoint only resumes the same work: it records a fingerprint of the
+session IDs, model, prompt and schema, and one left by a different run is
+ignored. A run with no failures deletes its checkpoint.
+
+Backends:
+    AnthropicBatchBackend  Message Batches API (client.messages.batches)
+    LocalBatchBackend      File-backed stand-in that answers requests with a
+                           local responder (fake_anthropic_server.build_message
+                           by default); used in tests and offline runs
+"""
+
+import hashlib
+import logging
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Optional
+
+from anthropic import Anthropic
+from pydantic import BaseModel, Field, ValidationError
+
+from .agents.agent_analysis import AnalysisAgent
+from .fake_anthropic_server import build_message
+from .session import SessionManager
+from .telemetry import TELEMETRY, Telemetry
+
+logger = logging.getLogger(__name__)
+
+
+class BatchRequest(BaseModel):
+    custom_id: str
+    params: dict
+
+
+class BatchResult(BaseModel):
+    custom_id: str
+    status: str  # "succeeded", "errored", "canceled" or "expired"
+    message: Optional[dict] = None
+    error: Optional[str] = None
+
+
+class BatchBackend(ABC):
+    """Submit a list of requests, poll until done, then stream results."""
+
+    @abstractmethod
+    def submit(self, requests: list[BatchRequest]) -> str: ...
+
+    @abstractmethod
+    def is_done(self, batch_id: str) -> bool: ...
+
+    @abstractmethod
+    def results(self, batch_id: str) -> Iterator[BatchResult]: ...
+
+
+class AnthropicBatchBackend(BatchBackend):
+    def __init__(self, client: Optional[Anthropic] = None):
+        self.client = client or Anthropic()
+
+    def submit(self, requests: list[BatchRequest]) -> str:
+        batch = self.client.messages.batches.create(
+            requests=[r.model_dump() for r in requests]  # type: ignore
+        )
+        return batch.id
+
+    def is_done(self, batch_id: str) -> bool:
+        return self.client.messages.batches.retrieve(batch_id).processing_status == "ended"
+
+    def results(self, batch_id: str) -> Iterator[BatchResult]:
+        for entry in self.client.messages.batches.results(batch_id):
+            result = entry.result
+            if result.type == "succeeded":
+                yield BatchResult(
+                    custom_id=entry.custom_id,
+                    status="succeeded",
+                    message=result.message.model_dump(mode="json"),
+                )
+            else:
+                error = getattr(result, "error", None)
+                yield BatchResult(
+                    custom_id=entry.custom_id,
+                    status=result.type,
+                    error=str(error) if error is not None else None,
+                )
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    Batch stand-in backed by a directory of JSONL files.
+
+    A batch is "processed" the first time it is polled: every request is
+    passed to responder and the responses are written next to the requests.
+    Responder exceptions become "errored" results.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        responder: Callable[[dict], dict] = build_message,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.responder = responder
+
+    def _path(self, batch_id: str, kind: str) -> Path:
+        return self.directory / f"{batch_id}.{kind}.jsonl"
+
+    def submit(self, requests: list[BatchRequest]) -> str:
+        batch_id = f"msgbatch_local_{uuid.uuid4().hex[:16]}"
+        with open(self._path(batch_id, "requests"), "w") as f:
+            for request in requests:
+                f.write(request.model_dump_json() + "\n")
+        return batch_id
+
+    def is_done(self, batch_id: str) -> bool:
+        results_path = self._path(batch_id, "results")
+        if not results_path.exists():
+            self._process(batch_id, results_path)
+        return True
+
+    def _process(self, batch_id: str, results_path: Path) -> None:
+        tmp_path = results_path.with_suffix(".tmp")
+        with open(self._path(batch_id, "requests")) as src, open(tmp_path, "w") as out:
+            for line in src:
+                if not line.strip():
+                    continue
+                request = BatchRequest.model_validate_json(line)
+                try:
+                    result = BatchResult(
+                        custom_id=request.custom_id,
+                        status="succeeded",
+                        message=self.responder(request.params),
+                    )
+                except Exception as e:
+                    result = BatchResult(
+                        custom_id=request.custom_id, status="errored", error=str(e)
+                    )
+                out.write(result.model_dump_json() + "\n")
+        os.replace(tmp_path, results_path)
+
+    def results(self, batch_id: str) -> Iterator[BatchResult]:
+        with open(self._path(batch_id, "results")) as f:
+            for line in f:
+                if line.strip():
+                    yield BatchResult.model_validate_json(line)
+
+
+class ReanalysisCheckpoint(BaseModel):
+    """Progress of a bulk re-analysis run, persisted between attempts."""
+    fingerprint: str = ""  # session IDs plus the agent's batch_fingerprint()
+    completed: list[str] = Field(default_factory=list)
+    failed: dict[str, str] = Field(default_factory=dict)
+    # batch_id -> session IDs submitted in that batch, not yet collected
+    pending: dict[str, list[str]] = Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "ReanalysisCheckpoint":
+        if not path.exists():
+            return cls()
+        return cls.model_validate_json(path.read_text())
+
+    def save(self, path: Path) -> None:
+        # Write-then-rename so a crash mid-write never corrupts the checkpoint
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(self.model_dump_json(indent=2))
+        os.replace(tmp_path, path)
+
+
+class ReanalysisSummary(BaseModel):
+    completed: list[str] = Field(default_factory=list)
+    failed: dict[str, str] = Field(default_factory=dict)
+    skipped: list[str] = Field(default_factory=list)
+
+
+class BulkReanalyzer:
+    """
+    Re-run analysis for stored sessions through a BatchBackend.
+
+    Args:
+        session_manager: Storage the sessions are read from and written back to
+        backend: Batch interface (Message Batches API or local stand-in)
+        agent: Builds request params and parses responses
+        checkpoint_path: JSON file recording progress for resumption
+        chunk_size: Sessions per submitted batch
+        poll_interval: Seconds between status checks of an unfinished batch
+    """
+
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        backend: BatchBackend,
+        agent: AnalysisAgent,
+        checkpoint_path: str | Path,
+        chunk_size: int = 100,
+        poll_interval: float = 30.0,
+        telemetry: Optional[Telemetry] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.session_manager = session_manager
+        self.backend = backend
+        self.agent = agent
+        self.checkpoint_path = Path(checkpoint_path)
+        self.chunk_size = chunk_size
+        self.poll_interval = poll_interval
+        self.telemetry = telemetry or TELEMETRY
+        self.sleep = sleep
+
+    def fingerprint(self, session_ids: list[str]) -> str:
+        """Hash of the session IDs and the agent's model, prompt and schema."""
+        payload = "\n".join([self.agent.batch_fingerprint(), *sorted(session_ids)])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def run(self, session_ids: list[str]) -> ReanalysisSummary:
+        """Re-analyze session_ids, resuming from the checkpoint if it is for the same run."""
+        fingerprint = self.fingerprint(session_ids)
+        checkpoint = ReanalysisCheckpoint.load(self.checkpoint_path)
+        if checkpoint.fingerprint != fingerprint:
+            if self.checkpoint_path.exists():
+                logger.info("Ignoring checkpoint %s from a different run", self.checkpoint_path)
+            checkpoint = ReanalysisCheckpoint(fingerprint=fingerprint)
+        summary = ReanalysisSummary()
+
+        done = set(checkpoint.completed)
+        in_flight = {sid for ids in checkpoint.pending.values() for sid in ids}
+        summary.skipped = [sid for sid in session_ids if sid in done]
+
+        # Batches submitted by an interrupted run are collected, not resubmitted;
+        # every new chunk is submitted before any is waited on, so they run side by side
+        todo = [sid for sid in session_ids if sid not in done and sid not in in_flight]
+        for start in range(0, len(todo), self.chunk_size):
+            chunk = todo[start:start + self.chunk_size]
+            requests = self._build_requests(chunk, checkpoint, summary)
+            if not requests:
+                continue
+            batch_id = self.backend.submit(requests)
+            checkpoint.pending[batch_id] = [r.custom_id for r in requests]
+            checkpoint.save(self.checkpoint_path)
+            self.telemetry.increment("batch.submitted", len(requests))
+            logger.info("Submitted batch %s with %d sessions", batch_id, len(requests))
+
+        while checkpoint.pending:
+            finished = [batch_id for batch_id in checkpoint.pending if self.backend.is_done(batch_id)]
+            if not finished:
+                self.sleep(self.poll_interval)
+            for batch_id in finished:
+                self._collect(batch_id, checkpoint, summary)
+
+        # Nothing left to resume; a rerun should analyze everything again
+        if not checkpoint.failed:
+            self.checkpoint_path.unlink(missing_ok=True)
+        return summary
+
+    def _build_requests(
+        self,
+        session_ids: list[str],
+        checkpoint: ReanalysisCheckpoint,
+        summary: ReanalysisSummary,
+    ) -> list[BatchRequest]:
+        requests = []
+        for session_id in session_ids:
+            try:
+                session = self.session_manager.load_session(session_id)
+            except FileNotFoundError as e:
+                self._fail(session_id, str(e), checkpoint, summary)
+                continue
+            params = self.agent.build_batch_request(
+                session.model_dump(), session_id=session.session_id
+            )
+            requests.append(BatchRequest(custom_id=session_id, params=params))
+        return requests
+
+    def _collect(
+        self, batch_id: str, checkpoint: ReanalysisCheckpoint, summary: ReanalysisSummary
+    ) -> None:
+        """Store each result of the finished batch_id on its session."""
+        for result in self.backend.results(batch_id):
+            session_id = result.custom_id
+            if result.status != "succeeded" or result.message is None:
+                self._fail(session_id, result.error or result.status, checkpoint, summary)
+                continue
+            try:
+                analysis = self.agent.parse_tool_output(result.message)
+                session = self.session_manager.load_session(session_id)
+            except (ValueError, ValidationError, FileNotFoundError) as e:
+                self._fail(session_id, str(e), checkpoint, summary)
+                continue
+            session.analysis = analysis
+            self.session_manager.save_session(session)
+            checkpoint.completed.append(session_id)
+            checkpoint.failed.pop(session_id, None)
+            summary.completed.append(session_id)
+            self.telemetry.increment("batch.succeeded")
+
+        del checkpoint.pending[batch_id]
+        checkpoint.save(self.checkpoint_path)
+
+    def _fail(
+        self,
+        session_id: str,
+        error: str,
+        checkpoint: ReanalysisCheckpoint,
+        summary: ReanalysisSummary,
+    ) -> None:
+        logger.warning("Re-analysis failed for %s: %s", session_id, error)
+        checkpoint.failed[session_id] = error
+        summary.failed[session_id] = error
+        self.telemetry.increment("batch.failed")
@@ -0,0 +1,141 @@
+"""Record/replay cassettes for LLM traffic.
+
+In record mode every Messages API request/response pair (with usage and the
+measured latency) is appended to a JSONL cassette file. In replay mode requests
+are served from the cassette by request hash, optionally sleeping for the
+recorded latency, so a full interview can be rerun offline with identical
+model outputs.
+
+Enable with environment variables:
+    LLM_CASSETTE=/path/to/interview.jsonl
+    LLM_CASSETTE_MODE=record|replay
+    LLM_CASSETTE_REPLAY_LATENCY=true   # re-impose recorded latency on replay
+
+Clients are built per request, so the environment-configured cassette is
+shared by the whole process: replay steps through repeated requests in order
+across clients instead of restarting at the first recording each time.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+from anthropic.types import Message
+from pydantic import BaseModel
+
+from .env import env_flag
+
+# Session IDs are random per run; they must not change the request hash
+_SESSION_PREFIX = re.compile(r"^\[Session: [^\]]*\]\n\n")
+
+
+_SHARED: dict[tuple[str, str, bool], "Cassette"] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+class CassetteMissError(KeyError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+class CassetteEntry(BaseModel):
+    request_hash: str
+    request: dict
+    response: dict
+    latency_ms: float
+
+
+def _normalize(request: dict) -> dict:
+    normalized = dict(request)
+    system = normalized.get("system")
+    if isinstance(system, str):
+        normalized["system"] = _SESSION_PREFIX.sub("", system)
+    elif isinstance(system, list):
+        normalized["system"] = [
+            {**block, "text": _SESSION_PREFIX.sub("", block.get("text", ""))}
+            for block in system
+        ]
+    return normalized
+
+
+def request_hash(request: dict) -> str:
+    """Stable hash of a Messages API request, ignoring the session ID prefix."""
+    canonical = json.dumps(_normalize(request), sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class Cassette:
+    def __init__(
+        self,
+        path: str | Path,
+        mode: str = "replay",
+        replay_latency: bool = False,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Cassette mode must be 'record' or 'replay', got {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._lock = threading.Lock()
+        # Identical requests can be recorded several times; replay them in order
+        self._entries: dict[str, list[CassetteEntry]] = defaultdict(list)
+        self._cursor: dict[str, int] = defaultdict(int)
+        if mode == "replay":
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """The process-wide cassette configured by LLM_CASSETTE*, or None."""
+        path = os.getenv("LLM_CASSETTE")
+        if not path:
+            return None
+        key = (
+            str(Path(path).resolve()),
+            os.getenv("LLM_CASSETTE_MODE", "replay"),
+            env_flag("LLM_CASSETTE_REPLAY_LATENCY"),
+        )
+        with _SHARED_LOCK:
+            if key not in _SHARED:
+                _SHARED[key] = cls(key[0], mode=key[1], replay_latency=key[2])
+            return _SHARED[key]
+
+    def _load(self) -> None:
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    entry = CassetteEntry.model_validate_json(line)
+                    self._entries[entry.request_hash].append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def record(self, request: dict, response: Message, latency_ms: float) -> None:
+        entry = CassetteEntry(
+            request_hash=request_hash(request),
+            request=_normalize(request),
+            response=response.model_dump(mode="json"),
+            latency_ms=latency_ms,
+        )
+        with self._lock:
+            self._entries[entry.request_hash].append(entry)
+            with open(self.path, "a") as f:
+                f.write(entry.model_dump_json() + "\n")
+
+    def replay(self, request: dict) -> tuple[Message, float]:
+        """Return (response, recorded latency) for a request; raise CassetteMissError if absent."""
+        key = request_hash(request)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise CassetteMissError(f"No recorded response for request {key[:12]} in {self.path}")
+            # Step through repeats, then keep serving the last one
+            index = min(self._cursor[key], len(entries) - 1)
+            self._cursor[key] += 1
+            entry = entries[index]
+        return Message.model_validate(entry.response), entry.latency_ms
@@ -0,0 +1,163 @@
+"""Split very long pasted chat logs and merge per-chunk summary extractions.
+
+Users paste whole group-chat exports as the summary. Past SUMMARY_CHUNK_TOKENS
+the text is split on message boundaries (never mid-message), each chunk's
+actors, conflicts and timeline markers are extracted in parallel calls, and
+the partial extractions are merged here without the model: actors are
+deduplicated by name, list fields by normalized text, and the first chunk's
+primary conflict stays primary while later ones become secondary.
+
+Configure with environment variables:
+    SUMMARY_CHUNK_TOKENS=6000        # chunk size; longer summaries are chunked (0 disables)
+    SUMMARY_CHUNK_CONCURRENCY=4      # max parallel chunk extractions
+"""
+
+import re
+from typing import Optional
+
+from .context_builder import CHARS_PER_TOKEN, estimate_tokens
+from .env import env_int
+
+# A line that starts a new message in common exports: "[12/03/24, 9:41 PM] Name:",
+# "12/03/2024, 21:41 - Name:", "2024-03-12 21:41 Name:", or plain "Name: text"
+_MESSAGE_START = re.compile(
+    r"""^\s*(
+        \[[^\]]{4,40}\]                                 # [date, time] / [time]
+      | \d{1,4}[/.-]\d{1,2}[/.-]\d{1,4}[,\s]             # 12/03/24, / 2024-03-12
+      | \d{1,2}:\d{2}\s*(?:[AaPp][Mm])?\b               # 9:41 PM
+      | [^\s:][^:\n]{0,40}:\s                            # Name: text
+    )""",
+    re.VERBOSE,
+)
+
+
+def summary_chunk_tokens() -> int:
+    return env_int("SUMMARY_CHUNK_TOKENS", 6000)
+
+
+def summary_chunk_concurrency() -> int:
+    return max(1, env_int("SUMMARY_CHUNK_CONCURRENCY", 4))
+
+
+def needs_chunking(raw_summary: str, chunk_tokens: Optional[int] = None) -> bool:
+    chunk_tokens = summary_chunk_tokens() if chunk_tokens is None else chunk_tokens
+    return bool(chunk_tokens) and estimate_tokens(raw_summary) > chunk_tokens
+
+
+def split_messages(text: str) -> list[str]:
+    """Group lines into messages; lines that don't start a message continue the last one."""
+    messages: list[str] = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if messages and not _MESSAGE_START.match(line):
+            messages[-1] += "\n" + line
+        else:
+            messages.append(line)
+    return messages
+
+
+def split_on_message_boundaries(text: str, chunk_tokens: int) -> list[str]:
+    """
+    Pack whole messages into chunks of at most chunk_tokens.
+
+    A single message longer than a chunk is cut on whitespace, the only case
+    where a boundary falls inside a message.
+    """
+    max_chars = chunk_tokens * CHARS_PER_TOKEN
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for message in split_messages(text):
+        pieces = [message] if len(message) <= max_chars else _cut(message, max_chars)
+        for piece in pieces:
+            if current and size + len(piece) + 1 > max_chars:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _cut(message: str, max_chars: int) -> list[str]:
+    pieces = []
+    while len(message) > max_chars:
+        cut = message.rfind(" ", 0, max_chars)
+        cut = cut if cut > 0 else max_chars
+        pieces.append(message[:cut])
+        message = message[cut:].lstrip()
+    return pieces + ([message] if message else [])
+
+
+def _key(text: str) -> str:
+    return re.sub(r"[^\w ]", "", re.sub(r"\s+", " ", text)).strip().lower()
+
+
+def _dedupe(values: list[str]) -> list[str]:
+    seen: set[str] = set()
+    unique = []
+    for value in values:
+        key = _key(value)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(value)
+    return unique
+
+
+def merge_summaries(parts: list[dict]) -> dict:
+    """
+    Merge extract_summary_structure outputs from consecutive chunks into one.
+
+    Args:
+        parts: Repaired per-chunk outputs, in chunk order
+
+    Returns:
+        One extract_summary_structure output
+    """
+    actors: dict[str, dict] = {}
+    primaries: list[str] = []
+    secondaries: list[str] = []
+    details: dict[str, list[str]] = {
+        "timeline_markers": [], "location_context": [], "communication_history": []
+    }
+    atmospheres: list[str] = []
+    missing: list[str] = []
+
+    for part in parts:
+        for actor in part["actors"]:
+            key = _key(actor.get("name", ""))
+            if not key:
+                continue
+            merged = actors.setdefault(
+                key, {"name": actor["name"], "relationships": [], "emotional_state": [], "role": ""}
+            )
+            merged["relationships"] = _dedupe(merged["relationships"] + actor.get("relationships", []))
+            merged["emotional_state"] = _dedupe(merged["emotional_state"] + actor.get("emotional_state", []))
+            merged["role"] = merged["role"] or actor.get("role", "")
+        conflict = part["point_of_conflict"]
+        primaries.append(conflict.get("primary", ""))
+        secondaries.extend(conflict.get("secondary", []))
+        general = part["general_details"]
+        for field, values in details.items():
+            values.extend(general.get(field, []))
+        atmospheres.append(general.get("emotional_atmosphere", ""))
+        missing.extend(part.get("missing_info", []))
+
+    primaries = _dedupe(primaries)
+    primary = primaries[0] if primaries else ""
+    return {
+        "actors": list(actors.values()),
+        "point_of_conflict": {
+            "primary": primary,
+            "secondary": [
+                c for c in _dedupe(primaries[1:] + secondaries) if _key(c) != _key(primary)
+            ],
+        },
+        "general_details": {
+            **{field: _dedupe(values) for field, values in details.items()},
+            "emotional_atmosphere": "; ".join(_dedupe(atmospheres)),
+        },
+        "missing_info": _dedupe(missing),
+    }
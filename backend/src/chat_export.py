@@ -0,0 +1,264 @@
+"""Parse pasted chat exports and minimize them before they reach the model.
+
+Raw summaries are often whole WhatsApp, iMessage or Discord exports: a
+timestamp on every line, "<Media omitted>", join/leave notices, read
+receipts, quoted replies and long whitespace runs. minimize_lines() reads the
+text line by line and emits compact speaker-tagged lines instead:
+
+    -- 12/03/2024 --
+    [21:41] Lamar: did you book the trip without me
+    Rob: it wasn't like that / it was last minute
+    Lamar: ok (x3)
+
+Consecutive messages from one speaker share a line, identical repeats are
+counted, times are kept only at the start of a day or after a gap of
+GAP_MINUTES, and deleted messages become "[deleted]". Text that doesn't look
+like a chat export only has its whitespace collapsed.
+
+Enable with MINIMIZE_SUMMARY=true.
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .context_builder import estimate_tokens
+from .env import env_flag
+from .telemetry import TELEMETRY, Telemetry
+
+# A silence this long (same day) is worth showing the model
+GAP_MINUTES = 60
+
+_TIME = r"\d{1,2}[:.]\d{2}(?:[:.]\d{2})?(?:\s?[AaPp]\.?\s?[Mm]\.?)?"
+_DATE = r"\d{1,4}[/.-]\d{1,2}[/.-]\d{1,4}"
+
+# WhatsApp Android: "12/03/2024, 21:41 - Lamar: text"
+_WHATSAPP_ANDROID = re.compile(rf"^(?P<date>{_DATE}),? (?P<time>{_TIME}) [-–] (?P<rest>.*)$")
+# WhatsApp iOS "[12/03/24, 9:41:03 PM] Lamar: text"; DiscordChatExporter "[3/12/2024 9:41 PM] Lamar"
+_BRACKETED = re.compile(rf"^\[(?P<date>{_DATE}),? (?P<time>{_TIME})\] (?P<rest>.*)$")
+# Discord client copy: "Lamar — Today at 9:41 PM" / "Lamar — 03/12/2024 9:41 PM"
+_DISCORD_CLIENT = re.compile(
+    rf"^(?P<speaker>[^\n—]{{1,40}}?) — (?P<date>Today|Yesterday|{_DATE})(?: at|,)? (?P<time>{_TIME})$"
+)
+# iMessage exporter: "Mar 12, 2024  9:41:03 PM" alone on a line, sender on the next
+_IMESSAGE_STAMP = re.compile(
+    rf"^(?P<date>[A-Z][a-z]{{2}} \d{{1,2}}, \d{{4}})\s+(?P<time>{_TIME})(?: \(.*\))?$"
+)
+# Copy-pasted plain chat: "Lamar: text"
+_PLAIN = re.compile(r"^(?P<speaker>[A-Z][\w .'’-]{0,30}): (?P<text>.+)$")
+
+_SYSTEM_LINE = re.compile(
+    r"(end-to-end encrypted|created (this )?group|added|removed|left$|joined|changed (the )?"
+    r"(subject|group|this group|their phone|the group)|security code|pinned a message|"
+    r"started a call|missed (voice|video) call)",
+    re.IGNORECASE,
+)
+_BOILERPLATE = re.compile(
+    r"^(<media omitted>|<attached: .*>|(image|video|audio|sticker|gif|document) omitted|"
+    r"null|read|delivered|seen|this message was edited|\(edited\)|[=_*~-]{3,}|"
+    r"messages and calls are end-to-end encrypted.*|\S+\.(heic|jpe?g|png|gif|mov|mp4|webp)|"
+    r"\{(attachments|embed|stickers)\}|https://(cdn|media)\.discordapp\.(com|net)/\S+)$",
+    re.IGNORECASE,
+)
+_DELETED = re.compile(r"^(this message was deleted|you deleted this message|message unsent)\.?$", re.IGNORECASE)
+_EDITED_SUFFIX = re.compile(r"\s*<this message was edited>$|\s*\(edited\)$", re.IGNORECASE)
+
+
+class MinimizedSummary(BaseModel):
+    text: str
+    format: str  # "whatsapp", "discord", "imessage", "plain" or "text"
+    tokens_in: int
+    tokens_out: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_in - self.tokens_out
+
+
+def minimize_summary_enabled() -> bool:
+    return env_flag("MINIMIZE_SUMMARY")
+
+
+def _minutes(time_text: str) -> Optional[int]:
+    match = re.match(r"(\d{1,2})[:.](\d{2})(?:[:.]\d{2})?\s?([AaPp])?", time_text)
+    if not match:
+        return None
+    hours = int(match.group(1))
+    meridiem = (match.group(3) or "").lower()
+    if meridiem:
+        hours = hours % 12 + (12 if meridiem == "p" else 0)
+    return hours * 60 + int(match.group(2))
+
+
+def _short_time(time_text: str) -> str:
+    minutes = _minutes(time_text)
+    return f"{minutes // 60:02d}:{minutes % 60:02d}" if minutes is not None else time_text
+
+
+def _split_speaker(rest: str) -> tuple[Optional[str], Optional[str]]:
+    """'Name: text' -> (Name, text); 'Name' -> (Name, None); system notices -> (None, None)."""
+    speaker, sep, text = rest.partition(": ")
+    if sep and len(speaker) <= 40:
+        return speaker.strip(), text
+    if rest.endswith(":"):
+        return rest[:-1].strip(), None
+    if _SYSTEM_LINE.search(rest) or len(rest) > 40:
+        return None, None
+    return rest.strip(), None
+
+
+class _Minimizer:
+    """Line-at-a-time state machine behind minimize_lines()."""
+
+    def __init__(self):
+        self.formats: dict[str, int] = {}
+        self.speaker: Optional[str] = None
+        self.expect_speaker = False  # iMessage: the line after a stamp names the sender
+        self.in_notice = False  # continuation lines of a system notice are dropped too
+        self.date: Optional[str] = None
+        self.last_minutes: Optional[int] = None
+        self.stamp = ""  # time to show on the next message
+        self.line_stamp = ""
+        self.line_speaker: Optional[str] = None
+        self.line_texts: list[list] = []  # [text, repeat count]
+        self.seen: set[str] = set()  # message texts shown so far
+
+    def _header(self, fmt: str, date: str, time_text: str, speaker: Optional[str]) -> Iterator[str]:
+        self.formats[fmt] = self.formats.get(fmt, 0) + 1
+        self.in_notice = False
+        if date != self.date:
+            yield from self._flush()
+            yield f"-- {date} --"
+            self.date, self.last_minutes = date, None
+        minutes = _minutes(time_text)
+        # A pending stamp whose message was dropped moves to this one
+        if self.stamp or self.last_minutes is None or (
+            minutes is not None and minutes - self.last_minutes >= GAP_MINUTES
+        ):
+            self.stamp = f"[{_short_time(time_text)}] "
+        if minutes is not None:
+            self.last_minutes = minutes
+        self.speaker = speaker
+
+    def _message(self, text: str) -> Iterator[str]:
+        text = _EDITED_SUFFIX.sub("", re.sub(r"\s+", " ", text).strip(" \u200e\u200f"))
+        if not text or self.in_notice or _BOILERPLATE.match(text.lstrip("> ")):
+            return
+        if self.speaker is None:
+            # The user's own words around the pasted chat are kept as they are
+            yield from self._flush()
+            yield text
+            return
+        if _DELETED.match(text):
+            text = "[deleted]"
+        key = text.lower().lstrip("> ")
+        if text.startswith(">") and key in self.seen:
+            return  # quoted reply of a message already shown; unmarked repeats are real messages
+        self.seen.add(key)
+        if self.line_speaker != self.speaker or self.stamp:
+            yield from self._flush()
+            self.line_speaker, self.line_stamp, self.stamp = self.speaker, self.stamp, ""
+        if self.line_texts and self.line_texts[-1][0] == text:
+            self.line_texts[-1][1] += 1
+        else:
+            self.line_texts.append([text, 1])
+
+    def _flush(self) -> Iterator[str]:
+        if self.line_texts:
+            texts = [t if n == 1 else f"{t} (x{n})" for t, n in self.line_texts]
+            yield f"{self.line_stamp}{self.line_speaker}: {' / '.join(texts)}"
+        self.line_texts = []
+        self.line_speaker = None
+
+    def feed(self, line: str) -> Iterator[str]:
+        line = line.strip().strip("\u200e\u200f\ufeff")
+        if not line:
+            self.expect_speaker = False
+            return
+        if self.expect_speaker:
+            self.expect_speaker = False
+            self.speaker = line
+            return
+        for fmt, pattern in (("whatsapp", _WHATSAPP_ANDROID), ("whatsapp", _BRACKETED)):
+            match = pattern.match(line)
+            if match:
+                speaker, text = _split_speaker(match.group("rest"))
+                if speaker is None:
+                    self.formats[fmt] = self.formats.get(fmt, 0) + 1
+                    self.in_notice = True
+                    return
+                # A bracketed header with no inline text is a DiscordChatExporter header
+                yield from self._header(fmt if text is not None else "discord", match.group("date"),
+                                        match.group("time"), speaker)
+                if text is not None:
+                    yield from self._message(text)
+                return
+        match = _DISCORD_CLIENT.match(line)
+        if match:
+            yield from self._header("discord", match.group("date"), match.group("time"), match.group("speaker").strip())
+            return
+        match = _IMESSAGE_STAMP.match(line)
+        if match:
+            yield from self._header("imessage", match.group("date"), match.group("time"), None)
+            self.expect_speaker = True
+            return
+        match = _PLAIN.match(line)
+        if match and not self.formats.keys() - {"plain"}:
+            self.formats["plain"] = self.formats.get("plain", 0) + 1
+            self.in_notice = False
+            self.speaker = match.group("speaker")
+            yield from self._message(match.group("text"))
+            return
+        yield from self._message(line)  # continuation of the current message
+
+    def finish(self) -> Iterator[str]:
+        yield from self._flush()
+
+    @property
+    def format(self) -> str:
+        if not self.formats or self.formats.keys() == {"plain"} and self.formats["plain"] < 3:
+            return "text"  # a "Label: ..." line or two in ordinary prose
+        return max(self.formats, key=self.formats.get)
+
+
+def minimize_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Compact speaker-tagged lines from a chat export, streamed as lines are read."""
+    minimizer = _Minimizer()
+    for line in lines:
+        yield from minimizer.feed(line)
+    yield from minimizer.finish()
+
+
+def minimize_summary(raw_summary: str, telemetry: Optional[Telemetry] = None) -> MinimizedSummary:
+    """
+    Minimize a raw summary if it is a chat export; otherwise only collapse whitespace.
+
+    Args:
+        raw_summary: User's pasted summary
+        telemetry: Where token savings are counted
+
+    Returns:
+        MinimizedSummary with the text to prompt with and token counts before/after
+    """
+    telemetry = telemetry or TELEMETRY
+    minimizer = _Minimizer()
+    lines = []
+    for line in raw_summary.splitlines():
+        lines.extend(minimizer.feed(line))
+    lines.extend(minimizer.finish())
+    if minimizer.format == "text":
+        text = re.sub(r"[ \t]+", " ", re.sub(r"\n\s*\n+", "\n\n", raw_summary)).strip()
+    else:
+        text = "\n".join(lines)
+
+    result = MinimizedSummary(
+        text=text,
+        format=minimizer.format,
+        tokens_in=estimate_tokens(raw_summary),
+        tokens_out=estimate_tokens(text),
+    )
+    telemetry.increment("summary.minimized")
+    telemetry.increment("summary.tokens_saved", result.tokens_saved)
+    return result
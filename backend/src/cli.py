@@ -29,7 +29,9 @@ from rich.prompt import Prompt
 from rich.table import Table
 
 from .agents.agent_analysis import AnalysisAgent
+from .analysis_state import generate_incremental_analysis, incremental_analysis_enabled
 from .api_client import ClaudeClient
+from .batch import AnthropicBatchBackend, BulkReanalyzer, LocalBatchBackend
 from .interview import InterviewOrchestrator
 from .models import Answer, SessionStatus
 from .report_formatter import format_report
@@ -271,11 +273,15 @@ def run_analysis(session_id: str):
             border_style="magenta",
         )
     )
-    # Create AnalysisAgent
-    analysis_agent = AnalysisAgent(client=ClaudeClient())
-    analysis = analysis_agent.generate_analysis(
-        loaded_session.model_dump(), session_id=loaded_session.session_id
-    )
+    if incremental_analysis_enabled():
+        # Verdict only, from the state kept during the interview
+        analysis = generate_incremental_analysis(loaded_session, ClaudeClient())
+    else:
+        # Create AnalysisAgent
+        analysis_agent = AnalysisAgent(client=ClaudeClient())
+        analysis = analysis_agent.generate_analysis(
+            loaded_session.model_dump(), session_id=loaded_session.session_id
+        )
     # Prepare session_data dict with model_dump()
     # Generate analysis
     format_report(analysis, loaded_session.incident_name, console)
@@ -289,6 +295,76 @@ def analyze(session_id):
     run_analysis(session_id)
 
 
+@cli.command()
+@click.argument("session_id")
+def archive(session_id):
+    """Archive a session and free images no other session uses"""
+    session_manager = SessionManager()
+    try:
+        session = session_manager.archive_session(session_id)
+    except FileNotFoundError:
+        console.print(f"[red]Session {session_id} not found[/red]")
+        return
+    console.print(
+        f"[green]Archived[/green] {session.incident_name} "
+        f"[dim]({len(session.images)} image references released)[/dim]"
+    )
+
+
+@cli.command()
+@click.argument("session_ids", nargs=-1)
+@click.option("--all", "all_sessions", is_flag=True, help="Include incomplete sessions")
+@click.option(
+    "--backend",
+    type=click.Choice(["anthropic", "local"]),
+    default="anthropic",
+    help="Message Batches API or the local file-backed stand-in",
+)
+@click.option("--batch-dir", default=None, help="Directory for the local backend [default: <data dir>/batches]")
+@click.option(
+    "--checkpoint",
+    default=None,
+    help="Progress file; rerun to resume [default: <data dir>/reanalyze.checkpoint.json]",
+)
+@click.option("--chunk-size", default=100, type=int, help="Sessions per batch")
+@click.option("--poll-interval", default=30.0, type=float, help="Seconds between batch status checks")
+def reanalyze(session_ids, all_sessions, backend, batch_dir, checkpoint, chunk_size, poll_interval):
+    """Re-run analysis for stored sessions in bulk via Message Batches"""
+    session_manager = SessionManager()
+    # Next to the sessions directory, so the CWD doesn't matter
+    data_root = session_manager.data_dir.parent
+    batch_dir = batch_dir or data_root / "batches"
+    checkpoint = checkpoint or data_root / "reanalyze.checkpoint.json"
+    if not session_ids:
+        session_ids = [
+            s.session_id
+            for s in session_manager.list_sessions()
+            if all_sessions or s.status == SessionStatus.COMPLETE
+        ]
+
+    batch_backend = (
+        LocalBatchBackend(batch_dir) if backend == "local" else AnthropicBatchBackend()
+    )
+    reanalyzer = BulkReanalyzer(
+        session_manager,
+        batch_backend,
+        AnalysisAgent(client=ClaudeClient()),
+        checkpoint,
+        chunk_size=chunk_size,
+        poll_interval=poll_interval,
+    )
+    console.print(f"[bold]Re-analyzing {len(session_ids)} sessions[/bold] [dim]({backend} batches)[/dim]")
+    summary = reanalyzer.run([*session_ids])
+
+    console.print(
+        f"[green]Completed: {len(summary.completed)}[/green]  "
+        f"[dim]Already done: {len(summary.skipped)}[/dim]  "
+        f"[red]Failed: {len(summary.failed)}[/red]"
+    )
+    for session_id, error in summary.failed.items():
+        console.print(f"  [red]{session_id[:8]}...[/red] {error}")
+
+
 @cli.command()
 @click.argument("session_id")
 def resume(session_id):
@@ -0,0 +1,184 @@
+"""Compact tool schemas with a key-expansion mapping layer.
+
+Output tokens dominate generation latency, and verbose keys such as
+``drama_rating_explanation`` are repeated in every response. In compact mode
+the client sends a copy of the tool schema with short keys (each annotated
+with its original name) and coded enums, then expands the tool output back to
+the original keys before any caller sees it. Pydantic models and agents are
+unchanged.
+
+Enable with COMPACT_SCHEMAS=true. Tools without a key map are sent as-is.
+"""
+
+import copy
+from typing import Any
+
+from .env import env_flag
+
+# Per-tool long -> short key maps; a key is renamed wherever it appears
+ANALYSIS_KEYS = {
+    "timeline": "tl",
+    "time": "t",
+    "event": "e",
+    "timeline_additions": "ta",
+    "after": "af",
+    "key_facts": "kf",
+    "gaps": "g",
+    "verdict": "v",
+    "primary_responsibility": "pr",
+    "percentage": "pct",
+    "reasoning": "r",
+    "contributing_factors": "cf",
+    "drama_rating": "dr",
+    "drama_rating_explanation": "dre",
+}
+
+QUESTION_KEYS = {
+    "question": "q",
+    "target_goal": "tg",
+    "reasoning": "r",
+    "answers": "a",
+    "answer": "t",
+    "implied_facts": "f",
+    "goal_impact": "gi",
+    "topic": "tp",
+    "claim": "c",
+    "timestamp": "ts",
+    "confidence": "cf",
+    "status": "st",
+    "goal_id": "id",
+}
+
+SUMMARY_KEYS = {
+    "actors": "ac",
+    "name": "n",
+    "role": "r",
+    "relationships": "rel",
+    "emotional_state": "em",
+    "point_of_conflict": "pc",
+    "primary": "p",
+    "secondary": "s",
+    "general_details": "gd",
+    "timeline_markers": "tm",
+    "location_context": "lc",
+    "communication_history": "ch",
+    "emotional_atmosphere": "ea",
+    "missing_info": "mi",
+}
+
+KEY_MAPS: dict[str, dict[str, str]] = {
+    "generate_analysis_report": ANALYSIS_KEYS,
+    "update_analysis_state": ANALYSIS_KEYS,
+    "generate_verdict": ANALYSIS_KEYS,
+    "generate_timeline": ANALYSIS_KEYS,
+    "generate_key_facts": ANALYSIS_KEYS,
+    "generate_gaps": ANALYSIS_KEYS,
+    "generate_question_with_answers": QUESTION_KEYS,
+    "extract_summary_structure": SUMMARY_KEYS,
+}
+
+# Enum value -> code, applied to any enum property whose values are all listed
+ENUM_CODES = {
+    "certain": "c",
+    "uncertain": "u",
+    "not_started": "n",
+    "in_progress": "p",
+    "complete": "d",
+}
+
+
+def compact_enabled() -> bool:
+    return env_flag("COMPACT_SCHEMAS")
+
+
+def _compact_node(node: dict, keys: dict[str, str]) -> dict:
+    node = dict(node)
+    if "enum" in node and all(v in ENUM_CODES for v in node["enum"]):
+        legend = ", ".join(f"{ENUM_CODES[v]}={v}" for v in node["enum"])
+        node["enum"] = [ENUM_CODES[v] for v in node["enum"]]
+        node["description"] = f"{node.get('description', '')} ({legend})".strip()
+    if node.get("type") == "object" and "properties" in node:
+        properties = {}
+        for name, sub in node["properties"].items():
+            short = keys.get(name, name)
+            sub = _compact_node(sub, keys)
+            if short != name:
+                # Keep the meaning visible to the model; descriptions are input tokens
+                sub["description"] = f"{name}. {sub.get('description', '')}".strip()
+            properties[short] = sub
+        node["properties"] = properties
+        if "required" in node:
+            node["required"] = [keys.get(name, name) for name in node["required"]]
+    if node.get("type") == "array" and "items" in node:
+        node["items"] = _compact_node(node["items"], keys)
+    return node
+
+
+def compact_schema(schema: dict) -> dict:
+    """Short-key copy of a tool schema, or the schema itself if it has no key map."""
+    keys = KEY_MAPS.get(schema["name"])
+    if keys is None:
+        return schema
+    compacted = copy.deepcopy(schema)
+    compacted["input_schema"] = _compact_node(schema["input_schema"], keys)
+    return compacted
+
+
+def _compact_value(value: Any, node: dict, keys: dict[str, str]) -> Any:
+    if "enum" in node and isinstance(value, str):
+        return ENUM_CODES.get(value, value) if all(v in ENUM_CODES for v in node["enum"]) else value
+    if node.get("type") == "object" and isinstance(value, dict):
+        properties = node.get("properties", {})
+        return {
+            keys.get(name, name): _compact_value(v, properties.get(name, {}), keys)
+            for name, v in value.items()
+        }
+    if node.get("type") == "array" and isinstance(value, list):
+        item = node.get("items", {})
+        return [_compact_value(v, item, keys) for v in value]
+    return value
+
+
+def compact_tool_output(schema: dict, data: dict) -> dict:
+    """Inverse of expand_tool_output: re-key an output as the compact schema expects."""
+    keys = KEY_MAPS.get(schema["name"])
+    if keys is None:
+        return data
+    return _compact_value(data, schema["input_schema"], keys)
+
+
+def _expand_node(value: Any, node: dict, keys: dict[str, str]) -> Any:
+    if "enum" in node and isinstance(value, str):
+        decode = {ENUM_CODES[v]: v for v in node["enum"] if v in ENUM_CODES}
+        return decode.get(value, value)
+    if node.get("type") == "object" and isinstance(value, dict):
+        expanded = {}
+        for name, sub in node.get("properties", {}).items():
+            short = keys.get(name, name)
+            # Accept the original key too, in case the model ignores the short one
+            if short in value:
+                expanded[name] = _expand_node(value[short], sub, keys)
+            elif name in value:
+                expanded[name] = _expand_node(value[name], sub, keys)
+        return expanded
+    if node.get("type") == "array" and isinstance(value, list):
+        item = node.get("items", {})
+        return [_expand_node(v, item, keys) for v in value]
+    return value
+
+
+def expand_tool_output(schema: dict, data: dict) -> dict:
+    """
+    Map a (possibly compact) tool output back to the original schema's keys.
+
+    Args:
+        schema: The original, long-key tool schema
+        data: Tool input returned by the model
+
+    Returns:
+        Dict keyed as the original schema; unchanged if the tool has no key map
+    """
+    keys = KEY_MAPS.get(schema["name"])
+    if keys is None:
+        return data
+    return _expand_node(data, schema["input_schema"], keys)
@@ -0,0 +1,198 @@
+"""Token-budgeted prompt context.
+
+Prompt sections (goals, facts, transcript, ...) are filled in priority order up
+to a per-agent input budget. A section can hold back a minimum share of the
+budget, so sections filled before it can't squeeze it out. Token counts are
+estimated locally, so building a prompt never costs an API round trip. Content
+that doesn't fit is replaced by a one-line local summary when the section
+provides one, otherwise dropped.
+"""
+
+import json
+import math
+import os
+from collections.abc import Callable
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+# Rough English average for Claude tokenizers; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+# Default input budgets (tokens) for the user prompt of each agent.
+# Override with INPUT_TOKEN_BUDGETS='{"AnalysisAgent": 8000}'.
+DEFAULT_INPUT_BUDGETS: dict[str, int] = {
+    "QuestionGeneratorAgent": 3000,
+    "AnalysisAgent": 12000,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate token count of text without calling the API."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def get_input_budget(agent_name: str) -> Optional[int]:
+    """Input token budget for agent_name, or None if the agent is unbounded."""
+    budgets = dict(DEFAULT_INPUT_BUDGETS)
+    overrides = os.getenv("INPUT_TOKEN_BUDGETS")
+    if overrides:
+        budgets.update({k: int(v) for k, v in json.loads(overrides).items()})
+    return budgets.get(agent_name)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens, marking the cut."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[: max(0, max_chars - 1)].rstrip() + "…"
+
+
+class ContextSection:
+    """
+    One block of prompt content.
+
+    Args:
+        name: Key used in the built context
+        items: Lines of content, in the order they should appear
+        priority: Lower fills first; the highest number is trimmed first
+        required: Always included in full (counts against the budget)
+        keep: "newest" keeps the tail of items when trimming, "oldest" the head
+        summarize: Builds a one-line stand-in for the dropped items
+        max_item_tokens: Truncate any single item longer than this
+        min_share: Share of the budget kept free for this section while
+            higher-priority sections fill (up to what its items need)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        items: list[str],
+        priority: int = 0,
+        required: bool = False,
+        keep: str = "newest",
+        summarize: Optional[Callable[[list[str]], str]] = None,
+        max_item_tokens: Optional[int] = None,
+        min_share: float = 0.0,
+    ):
+        self.name = name
+        self.items = items
+        self.priority = priority
+        self.required = required
+        self.keep = keep
+        self.summarize = summarize
+        self.max_item_tokens = max_item_tokens
+        self.min_share = min_share
+
+    def rendered_items(self) -> list[str]:
+        if not self.max_item_tokens:
+            return self.items
+        return [truncate_to_tokens(i, self.max_item_tokens) for i in self.items]
+
+
+class BuiltContext(BaseModel):
+    """Rendered sections plus what the budget forced out."""
+    sections: dict[str, str] = Field(default_factory=dict)
+    estimated_tokens: int = 0
+    budget: int = 0
+    dropped: dict[str, int] = Field(default_factory=dict)
+    summarized: list[str] = Field(default_factory=list)
+
+    def text(self, name: str) -> str:
+        return self.sections.get(name, "")
+
+
+class ContextBuilder:
+    def __init__(self, budget: int):
+        self.budget = budget
+
+    def build(self, sections: list[ContextSection]) -> BuiltContext:
+        """Fill sections in priority order without exceeding the budget."""
+        result = BuiltContext(budget=self.budget)
+        remaining = self.budget
+
+        ordered = sorted(sections, key=lambda s: (not s.required, s.priority))
+        # Held back for sections still to fill, released when each one's turn comes
+        reserved = {
+            section.name: min(
+                int(self.budget * section.min_share),
+                sum(estimate_tokens(i) + 1 for i in section.rendered_items()),
+            )
+            for section in ordered
+            if section.min_share and not section.required
+        }
+        for section in ordered:
+            items = section.rendered_items()
+
+            if section.required:
+                text = "\n".join(items)
+                result.sections[section.name] = text
+                remaining -= estimate_tokens(text) + 1
+                continue
+
+            reserved.pop(section.name, None)
+            available = remaining - sum(reserved.values())
+            kept, dropped = self._fill(items, section.keep, available)
+
+            if dropped and section.summarize:
+                # Make room for the stand-in line, then summarize what's left out
+                reserve = estimate_tokens(section.summarize(items)) + 1
+                if reserve <= available:
+                    kept, dropped = self._fill(items, section.keep, available - reserve)
+                    note = section.summarize(dropped)
+                    kept = [note, *kept] if section.keep == "newest" else [*kept, note]
+                    result.summarized.append(section.name)
+
+            if dropped:
+                result.dropped[section.name] = len(dropped)
+
+            kept_text = "\n".join(kept)
+            result.sections[section.name] = kept_text
+            remaining -= estimate_tokens(kept_text) + (1 if kept else 0)
+
+        result.estimated_tokens = sum(
+            estimate_tokens(text) + 1 for text in result.sections.values() if text
+        )
+        return result
+
+    @staticmethod
+    def _fill(
+        items: list[str], keep: str, remaining: int
+    ) -> tuple[list[str], list[str]]:
+        """Take items from the preferred end while they fit; return (kept, dropped)."""
+        candidates = list(reversed(items)) if keep == "newest" else list(items)
+        kept: list[str] = []
+        used = 0
+        for item in candidates:
+            cost = estimate_tokens(item) + 1
+            if used + cost > remaining:
+                break
+            kept.append(item)
+            used += cost
+
+        if keep == "newest":
+            kept.reverse()
+            dropped = items[: len(items) - len(kept)]
+        else:
+            dropped = items[len(kept):]
+        return kept, dropped
+
+
+def summarize_omitted(
+    label: str, topic_by_item: Optional[dict[str, str]] = None
+) -> Callable[[list[str]], str]:
+    """Summarizer producing '(N earlier <label> omitted; topics covered: ...)'."""
+
+    def summarize(dropped: list[str]) -> str:
+        note = f"({len(dropped)} earlier {label} omitted"
+        if topic_by_item:
+            topics = [topic_by_item[i] for i in dropped if topic_by_item.get(i)]
+            unique = list(dict.fromkeys(topics))[:6]
+            if unique:
+                note += f"; topics covered: {', '.join(unique)}"
+        return note + ")"
+
+    return summarize
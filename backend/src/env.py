@@ -0,0 +1,12 @@
+"""Environment variable parsing shared by the opt-in features and their settings."""
+
+import os
+
+
+def env_flag(name: str) -> bool:
+    """Whether name is set to 1, true or yes (any case); unset means off."""
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
+def env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
@@ -0,0 +1,179 @@
+"""Merge near-duplicate facts as they are added to a session.
+
+Interviewees repeat themselves and the extractor paraphrases, so the same
+claim ("Sarah arrived at 5:30pm", "sarah arrived around 5:30 pm") piles up in
+session.facts and is re-sent in every question and analysis prompt. With
+FACT_DEDUP=true each new fact is compared with earlier facts under the same
+topic; one whose normalized tokens overlap an earlier fact's by at least
+FACT_DEDUP_THRESHOLD (Jaccard) is merged into it instead of appended:
+
+- the earlier fact keeps its position and wording,
+- its turns gain the new fact's turn (provenance),
+- an "uncertain" fact restated in a later turn becomes "certain",
+- a missing timestamp is filled in.
+
+Facts that differ in a number ("5:30" vs "6:30") or in negation ("did" vs
+"didn't") are never merged, nor are facts whose shared words come in a
+different order, so "Lamar told Rob" stays apart from "Rob told Lamar" (a
+reordered paraphrase is kept too, which costs a duplicate, not a fact). Candidates come from a per-topic inverted index,
+read only for the new fact's rarest words (prefix filtering), so inserts stay
+well under a millisecond with thousands of facts.
+
+Configure with environment variables:
+    FACT_DEDUP=true
+    FACT_DEDUP_THRESHOLD=0.7
+"""
+
+import math
+import os
+import re
+from typing import Optional
+
+from .env import env_flag
+from .fact_index import FactIndexes, stem
+from .models import Fact
+from .telemetry import TELEMETRY
+
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_NEGATIONS = frozenset(("no", "not", "never", "nobody", "nothing"))  # "n't" is read as "not"
+# Words that change nothing about a claim; negations and numbers are kept
+_FILLER = frozenset({
+    "a", "an", "the", "and", "at", "in", "on", "of", "to", "for", "with", "from", "by",
+    "was", "were", "is", "are", "be", "been", "that", "this", "there", "then", "just",
+    "really", "very", "about", "around", "got", "get",
+})
+
+
+def fact_dedup_enabled() -> bool:
+    return env_flag("FACT_DEDUP")
+
+
+def fact_dedup_threshold() -> float:
+    return float(os.getenv("FACT_DEDUP_THRESHOLD", "0.7"))
+
+
+def fact_key(text: str) -> tuple[str, ...]:
+    """Normalized terms of a claim in first-seen order; numbers are split out of units ("5:30pm" -> 5, 30, pm)."""
+    terms = {}
+    for word in _WORD.findall(text.lower().replace("n't", " not")):
+        word = stem(word)
+        if word not in _FILLER:
+            terms.update(dict.fromkeys(re.findall(r"\d+|[a-z']+", word)))
+    return tuple(terms)
+
+
+def _topic_key(topic: str) -> str:
+    return " ".join(sorted(fact_key(topic))) or topic.strip().lower()
+
+
+def _same_roles(key: tuple[str, ...], other: tuple[str, ...]) -> bool:
+    """Whether the terms both claims share appear in the same order (who did what to whom)."""
+    shared = set(key) & set(other)
+    return [t for t in key if t in shared] == [t for t in other if t in shared]
+
+
+def _numbers(key: frozenset[str]) -> frozenset[str]:
+    return frozenset(t for t in key if t.isdigit())
+
+
+def _negated(key: frozenset[str]) -> bool:
+    return bool(key & _NEGATIONS)
+
+
+class FactDeduplicator:
+    """Per-session state: claim keys and per-topic inverted indexes over session.facts."""
+
+    def __init__(self, threshold: Optional[float] = None):
+        self.threshold = fact_dedup_threshold() if threshold is None else threshold
+        self.clear()
+
+    def clear(self) -> None:
+        self.keys: list[tuple[str, ...]] = []
+        self.claims: list[str] = []  # to notice when the fact list was replaced
+        self.postings: dict[str, dict[str, list[int]]] = {}  # topic -> term -> fact positions
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _index(self, fact: Fact) -> None:
+        position = len(self.keys)
+        key = fact_key(fact.claim)
+        topic = _topic_key(fact.topic)
+        postings = self.postings.setdefault(topic, {})
+        for term in key:
+            postings.setdefault(term, []).append(position)
+        self.keys.append(key)
+        self.claims.append(fact.claim)
+
+    def sync(self, facts: list[Fact]) -> None:
+        """Index facts added without going through insert(); rebuild if earlier facts changed."""
+        if len(facts) < len(self) or (self.claims and facts[len(self) - 1].claim != self.claims[-1]):
+            self.clear()
+        for fact in facts[len(self):]:
+            self._index(fact)
+
+    def find_duplicate(self, fact: Fact) -> Optional[int]:
+        """Position of the earlier fact this one duplicates, or None."""
+        key = fact_key(fact.claim)
+        if not key:
+            return None
+        postings = self.postings.get(_topic_key(fact.topic))
+        if not postings:
+            return None
+        # A match shares at least ceil(threshold * len(key)) terms, so it must share one
+        # of the len(key) - that + 1 rarest; only those terms' postings are read
+        prefix = len(key) - math.ceil(self.threshold * len(key)) + 1
+        rarest = sorted(key, key=lambda term: len(postings.get(term, ())))[:prefix]
+        candidates = {position for term in rarest for position in postings.get(term, ())}
+
+        best, best_score = None, self.threshold
+        terms = frozenset(key)
+        numbers, negated = _numbers(terms), _negated(terms)
+        for position in candidates:
+            other = self.keys[position]
+            overlap = len(terms.intersection(other))
+            score = overlap / (len(key) + len(other) - overlap)
+            if score < best_score:
+                continue
+            if _numbers(frozenset(other)) != numbers or _negated(frozenset(other)) != negated:
+                continue
+            if not _same_roles(key, other):
+                continue
+            best, best_score = position, score
+        return best
+
+    def insert(self, facts: list[Fact], new_facts: list[Fact], turn: int) -> list[Fact]:
+        """
+        Add new_facts to facts (in place), merging near-duplicates.
+
+        Args:
+            facts: The session's fact list
+            new_facts: Facts extracted from the latest answer
+            turn: Turn number recorded as provenance
+
+        Returns:
+            The facts actually appended
+        """
+        self.sync(facts)
+        added = []
+        for fact in new_facts:
+            position = self.find_duplicate(fact)
+            if position is None:
+                fact.turns = fact.turns or [turn]
+                facts.append(fact)
+                self._index(fact)
+                added.append(fact)
+                continue
+            existing = facts[position]
+            corroborated = turn not in existing.turns or fact.confidence == "certain"
+            if existing.confidence == "uncertain" and corroborated:
+                existing.confidence = "certain"
+                TELEMETRY.increment("facts.corroborated")
+            if turn not in existing.turns:
+                existing.turns.append(turn)
+            existing.timestamp = existing.timestamp or fact.timestamp
+            TELEMETRY.increment("facts.merged")
+        return added
+
+
+FACT_DEDUPLICATORS = FactIndexes(FactDeduplicator)
@@ -0,0 +1,208 @@
+"""Relevance-ranked fact retrieval for question generation.
+
+The question prompt used to show only the last 10 facts, so in long
+interviews the model lost sight of older facts about the goal it was
+targeting and asked about them again. With FACT_RETRIEVAL=true each turn
+shows the facts most relevant to the least-confident open goals instead,
+scored locally with TF-IDF over claims and topics, plus the few newest facts
+so the current thread stays in view, up to FACT_RETRIEVAL_K facts and
+FACT_RETRIEVAL_TOKENS tokens. Selected facts keep interview order.
+
+The index is an inverted index updated incrementally as session.facts grows.
+Like background results, indexes live in this process keyed by session
+(FACT_INDEXES); a new worker simply rebuilds one on first use.
+
+Configure with environment variables:
+    FACT_RETRIEVAL=true
+    FACT_RETRIEVAL_K=10           # max facts shown
+    FACT_RETRIEVAL_TOKENS=400     # max tokens of facts shown
+    FACT_RETRIEVAL_GOALS=2        # least-confident goals used as the query
+"""
+
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+from typing import Any, Optional
+
+from .context_builder import estimate_tokens
+from .env import env_flag, env_int
+from .models import Fact, Goal, GoalStatus
+
+# The newest facts are shown whatever their score
+RECENT_FACTS = 3
+
+# Topics are short labels ("timeline", "Rob's motive"); a topic match counts extra
+TOPIC_WEIGHT = 2
+
+_WORD = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "been", "but", "by", "did", "do", "does",
+    "for", "from", "had", "has", "have", "he", "her", "him", "his", "how", "i", "if",
+    "in", "into", "is", "it", "its", "me", "my", "no", "not", "of", "on", "or", "our",
+    "she", "so", "that", "the", "their", "them", "they", "this", "to", "was", "we",
+    "were", "what", "when", "where", "which", "who", "whom", "why", "will", "with",
+    "would", "you", "your",
+})
+
+
+def fact_retrieval_enabled() -> bool:
+    return env_flag("FACT_RETRIEVAL")
+
+
+
+def stem(word: str) -> str:
+    """Drop a possessive and a plural "s" ("rob's" -> "rob", "flights" -> "flight")."""
+    word = word.removesuffix("'s").strip("'")
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase content words with a light plural/possessive strip."""
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        word = stem(word)
+        if word and word not in _STOPWORDS:
+            terms.append(word)
+    return terms
+
+
+class FactIndex:
+    """Inverted TF-IDF index over one session's facts, in insertion order."""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self.postings: dict[str, list[tuple[int, int]]] = {}  # term -> [(fact position, tf)]
+        self.lengths: list[float] = []  # per-fact length norm
+        self.claims: list[str] = []  # to notice when the fact list was replaced
+
+    def __len__(self) -> int:
+        return len(self.claims)
+
+    def add(self, fact: Fact) -> None:
+        position = len(self.claims)
+        counts = Counter(tokenize(fact.claim))
+        for term in tokenize(fact.topic):
+            counts[term] += TOPIC_WEIGHT
+        for term, tf in counts.items():
+            self.postings.setdefault(term, []).append((position, tf))
+        self.lengths.append(math.sqrt(sum(counts.values())) or 1.0)
+        self.claims.append(fact.claim)
+
+    def sync(self, facts: list[Fact]) -> None:
+        """Index facts appended since the last call; rebuild if earlier facts changed."""
+        if len(facts) < len(self) or (self.claims and facts[len(self) - 1].claim != self.claims[-1]):
+            self.clear()
+        for fact in facts[len(self):]:
+            self.add(fact)
+
+    def scores(self, query: str) -> dict[int, float]:
+        """Fact position -> TF-IDF score for query; facts sharing no term are absent."""
+        total = len(self)
+        scores: dict[int, float] = {}
+        for term, query_tf in Counter(tokenize(query)).items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log((total + 1) / (len(postings) + 1)) + 1
+            for position, tf in postings:
+                scores[position] = scores.get(position, 0.0) + query_tf * tf * idf * idf / self.lengths[position]
+        return scores
+
+    def relevant_facts(
+        self,
+        facts: list[Fact],
+        goals: list[Goal],
+        confidence_threshold: int = 90,
+        k: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        query_goals: Optional[int] = None,
+    ) -> list[Fact]:
+        """
+        Pick the facts to show for the next question.
+
+        Args:
+            facts: All session facts, in interview order
+            goals: Current goals; the least-confident open ones form the query
+            confidence_threshold: Goals at or above this are treated as done
+            k: Max facts returned (FACT_RETRIEVAL_K)
+            token_budget: Max estimated tokens of "- claim" lines (FACT_RETRIEVAL_TOKENS)
+            query_goals: How many goals form the query (FACT_RETRIEVAL_GOALS)
+
+        Returns:
+            The newest RECENT_FACTS facts plus the best-scoring others, in interview order
+        """
+        k = env_int("FACT_RETRIEVAL_K", 10) if k is None else k
+        token_budget = env_int("FACT_RETRIEVAL_TOKENS", 400) if token_budget is None else token_budget
+        query_goals = env_int("FACT_RETRIEVAL_GOALS", 2) if query_goals is None else query_goals
+
+        self.sync(facts)
+        open_goals = [
+            g for g in goals
+            if g.status != GoalStatus.COMPLETE and g.confidence < confidence_threshold
+        ] or goals
+        # Each goal's scores are scaled to its best match and weighted by how far
+        # the goal is from done, so the weakest goal's facts rank first
+        scores: dict[int, float] = {}
+        for goal in sorted(open_goals, key=lambda g: g.confidence)[:query_goals]:
+            goal_scores = self.scores(goal.description)
+            if not goal_scores:
+                continue
+            weight = max(1, confidence_threshold - goal.confidence) / max(goal_scores.values())
+            for position, score in goal_scores.items():
+                scores[position] = scores.get(position, 0.0) + weight * score
+
+        newest = list(range(len(facts) - 1, max(-1, len(facts) - 1 - RECENT_FACTS), -1))
+        # Highest score first; ties and unscored facts fall back to recency
+        ranked = sorted(
+            range(len(facts)), key=lambda i: (scores.get(i, 0.0), i), reverse=True
+        )
+        chosen: set[int] = set()
+        used = 0
+        for position in newest + ranked:
+            if len(chosen) >= k:
+                break
+            if position in chosen:
+                continue
+            cost = estimate_tokens(f"- {facts[position].claim}\n")
+            if used + cost > token_budget and chosen:
+                continue
+            chosen.add(position)
+            used += cost
+        return [facts[i] for i in sorted(chosen)]
+
+
+class FactIndexes:
+    """Per-session index registry, least recently used dropped past max_sessions."""
+
+    def __init__(self, factory: Callable[[], Any] = FactIndex, max_sessions: int = 256):
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._indexes: OrderedDict[str, Any] = OrderedDict()
+
+    def get(self, session_id: str) -> Any:
+        with self._lock:
+            index = self._indexes.pop(session_id, None)
+            if index is None:
+                index = self.factory()
+            self._indexes[session_id] = index
+            while len(self._indexes) > self.max_sessions:
+                self._indexes.popitem(last=False)
+            return index
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._indexes
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._indexes.pop(session_id, None)
+
+
+FACT_INDEXES = FactIndexes()
@@ -0,0 +1,393 @@
+"""Local stand-in for the Anthropic Messages API.
+
+Implements enough of ``POST /v1/messages`` to drive ClaudeClient offline:
+tool_use responses synthesized from the request's tool schemas, text
+responses, SSE streaming, usage blocks, injected 429/529 errors and
+configurable latency distributions. Prompt caching is modelled too: the
+request up to its last cache_control breakpoint is reported as a cache write
+the first time and as a cache read once a response that wrote it has been
+returned; cache reads add no input latency. Point a client at it with
+``ClaudeClient(base_url=...)`` or ANTHROPIC_BASE_URL.
+
+Run standalone:
+    drama-fake-api --port 8765 --latency lognormal:800,0.5 --rate-429 0.02
+"""
+
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+import click
+from pydantic import BaseModel, Field
+
+
+class LatencyModel(BaseModel):
+    """
+    Latency distribution for fake responses, in milliseconds.
+
+    kind: "constant" (a), "uniform" (a..b) or "lognormal" (median a, sigma b).
+    tokens_per_second adds generation time proportional to output tokens, so
+    shorter outputs really are faster. ms_per_image adds input processing time
+    for each image block in the request, ms_per_1k_input_tokens for every
+    thousand input tokens (so long prompts really are slower).
+    """
+    kind: str = "constant"
+    a: float = 0.0
+    b: float = 0.0
+    tokens_per_second: Optional[float] = None
+    ms_per_image: float = 0.0
+    ms_per_1k_input_tokens: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str, tokens_per_second: Optional[float] = None) -> "LatencyModel":
+        """Parse 'constant:200', 'uniform:100,900' or 'lognormal:800,0.5'."""
+        kind, _, params = spec.partition(":")
+        values = [float(v) for v in params.split(",") if v]
+        return cls(
+            kind=kind,
+            a=values[0] if values else 0.0,
+            b=values[1] if len(values) > 1 else 0.0,
+            tokens_per_second=tokens_per_second,
+        )
+
+    def sample_ms(
+        self, rng: random.Random, output_tokens: int = 0, images: int = 0, input_tokens: int = 0
+    ) -> float:
+        if self.kind == "uniform":
+            base = rng.uniform(self.a, self.b)
+        elif self.kind == "lognormal":
+            base = rng.lognormvariate(math.log(max(self.a, 1e-6)), self.b)
+        else:
+            base = self.a
+        if self.tokens_per_second:
+            base += output_tokens / self.tokens_per_second * 1000
+        return (
+            base
+            + images * self.ms_per_image
+            + input_tokens / 1000 * self.ms_per_1k_input_tokens
+        )
+
+
+class FakeServerConfig(BaseModel):
+    latency: LatencyModel = Field(default_factory=LatencyModel)
+    rate_429: float = Field(default=0.0, ge=0, le=1)
+    rate_529: float = Field(default=0.0, ge=0, le=1)
+    default_array_items: int = 2
+    seed: Optional[int] = None
+
+
+def estimate_tokens(payload: Any) -> int:
+    text = payload if isinstance(payload, str) else json.dumps(payload)
+    return max(1, math.ceil(len(text) / 4))
+
+
+def synthesize(schema: dict, name: str = "value", array_items: int = 2) -> Any:
+    """Build a value that satisfies a JSON schema (the subset our tools use)."""
+    kind = schema.get("type")
+    if "enum" in schema:
+        return schema["enum"][0]
+    if kind == "object":
+        properties = schema.get("properties", {})
+        return {
+            key: synthesize(sub, key, array_items) for key, sub in properties.items()
+        }
+    if kind == "array":
+        count = max(schema.get("minItems", array_items), 1)
+        count = min(count, schema.get("maxItems", count))
+        item_schema = schema.get("items", {"type": "string"})
+        return [synthesize(item_schema, f"{name} {i + 1}", array_items) for i in range(count)]
+    if kind == "integer":
+        low = schema.get("minimum", 0)
+        high = schema.get("maximum", low + 100)
+        return (low + high) // 2
+    if kind == "number":
+        low = schema.get("minimum", 0)
+        high = schema.get("maximum", low + 1)
+        return (low + high) / 2
+    if kind == "boolean":
+        return True
+    return f"fake {name}"
+
+
+def count_images(request: dict) -> int:
+    """Number of image blocks across the request's messages."""
+    return sum(
+        1
+        for message in request.get("messages", [])
+        if isinstance(message.get("content"), list)
+        for block in message["content"]
+        if block.get("type") == "image"
+    )
+
+
+def cache_prefix(request: dict) -> Optional[list]:
+    """Tools, system and message blocks up to the last cache_control breakpoint, if any."""
+    blocks = list(request.get("tools") or [])
+    system = request.get("system")
+    blocks += system if isinstance(system, list) else [{"type": "text", "text": system or ""}]
+    for message in request.get("messages", []):
+        content = message.get("content")
+        blocks += content if isinstance(content, list) else [{"type": "text", "text": content}]
+    marked = [i for i, block in enumerate(blocks) if "cache_control" in block]
+    return blocks[: marked[-1] + 1] if marked else None
+
+
+def build_message(request: dict, array_items: int = 2) -> dict:
+    """Build a Messages API response body for a request."""
+    tools = request.get("tools") or []
+    tool_choice = request.get("tool_choice") or {"type": "auto"}
+
+    if tool_choice.get("type") == "tool":
+        chosen = [t for t in tools if t["name"] == tool_choice["name"]]
+    elif tools and tool_choice.get("type") in ("any", "auto"):
+        # Multi-tool agents expect every offered tool to be used
+        chosen = tools
+    else:
+        chosen = []
+
+    if chosen:
+        content = [
+            {
+                "type": "tool_use",
+                "id": f"toolu_fake_{uuid.uuid4().hex[:16]}",
+                "name": tool["name"],
+                "input": synthesize(tool.get("input_schema", {}), tool["name"], array_items),
+            }
+            for tool in chosen
+        ]
+        stop_reason = "tool_use"
+    else:
+        content = [{"type": "text", "text": "Fake response from the local Messages stand-in."}]
+        stop_reason = "end_turn"
+
+    return {
+        "id": f"msg_fake_{uuid.uuid4().hex[:16]}",
+        "type": "message",
+        "role": "assistant",
+        "model": request.get("model", "fake-model"),
+        "content": content,
+        "stop_reason": stop_reason,
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": estimate_tokens(
+                {k: request.get(k) for k in ("system", "messages", "tools")}
+            ),
+            "output_tokens": estimate_tokens(content),
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        },
+    }
+
+
+class FakeMessagesHandler(BaseHTTPRequestHandler):
+    server: "FakeAnthropicServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - silence default access log
+        pass
+
+    def _send_json(self, status: int, body: dict, headers: Optional[dict] = None) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("request-id", f"req_fake_{uuid.uuid4().hex[:12]}")
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: int, error_type: str, message: str) -> None:
+        headers = {"retry-after": "1"} if status == 429 else None
+        self._send_json(
+            status,
+            {"type": "error", "error": {"type": error_type, "message": message}},
+            headers,
+        )
+
+    def do_POST(self):  # noqa: N802 - http.server naming
+        if not self.path.split("?")[0].endswith("/v1/messages"):
+            self._send_error(404, "not_found_error", f"Unknown path {self.path}")
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        server.count_request()
+
+        roll = server.random()
+        if roll < server.config.rate_429:
+            self._send_error(429, "rate_limit_error", "Injected rate limit")
+            return
+        if roll < server.config.rate_429 + server.config.rate_529:
+            self._send_error(529, "overloaded_error", "Injected overload")
+            return
+
+        message = server.build_message(request)
+        usage = message["usage"]
+        cache_key = server.apply_cache(request, usage)
+        delay_ms = server.sample_latency_ms(
+            usage["output_tokens"],
+            count_images(request),
+            usage["input_tokens"] + usage["cache_creation_input_tokens"],
+        )
+
+        if request.get("stream"):
+            self._stream(message, delay_ms)
+        else:
+            time.sleep(delay_ms / 1000)
+            self._send_json(200, message)
+        # Requests already in flight don't see this write
+        server.store_cache(cache_key)
+
+    def _stream(self, message: dict, delay_ms: float) -> None:
+        """Emit the message as Messages API server-sent events."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def event(name: str, data: dict) -> None:
+            self.wfile.write(f"event: {name}\ndata: {json.dumps(data)}\n\n".encode())
+            self.wfile.flush()
+
+        usage = message["usage"]
+        start = {**message, "content": [], "stop_reason": None,
+                 "usage": {**usage, "output_tokens": 1}}
+        event("message_start", {"type": "message_start", "message": start})
+
+        blocks = message["content"]
+        step = delay_ms / 1000 / max(len(blocks) * 2, 1)
+        for index, block in enumerate(blocks):
+            if block["type"] == "tool_use":
+                event("content_block_start", {
+                    "type": "content_block_start", "index": index,
+                    "content_block": {**block, "input": {}},
+                })
+                partial = json.dumps(block["input"])
+                half = len(partial) // 2
+                for chunk in (partial[:half], partial[half:]):
+                    time.sleep(step)
+                    event("content_block_delta", {
+                        "type": "content_block_delta", "index": index,
+                        "delta": {"type": "input_json_delta", "partial_json": chunk},
+                    })
+            else:
+                event("content_block_start", {
+                    "type": "content_block_start", "index": index,
+                    "content_block": {"type": "text", "text": ""},
+                })
+                time.sleep(step * 2)
+                event("content_block_delta", {
+                    "type": "content_block_delta", "index": index,
+                    "delta": {"type": "text_delta", "text": block["text"]},
+                })
+            event("content_block_stop", {"type": "content_block_stop", "index": index})
+
+        event("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+            "usage": {"output_tokens": usage["output_tokens"]},
+        })
+        event("message_stop", {"type": "message_stop"})
+
+
+class FakeAnthropicServer(ThreadingHTTPServer):
+    """Threaded HTTP server; use as a context manager to run it in the background."""
+
+    daemon_threads = True
+
+    def __init__(self, config: Optional[FakeServerConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeServerConfig()
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self.request_count = 0
+        self._cached_prefixes: set[str] = set()
+        self._thread: Optional[threading.Thread] = None
+        super().__init__((host, port), FakeMessagesHandler)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def random(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def sample_latency_ms(self, output_tokens: int, images: int = 0, input_tokens: int = 0) -> float:
+        with self._rng_lock:
+            return self.config.latency.sample_ms(self._rng, output_tokens, images, input_tokens)
+
+    def count_request(self) -> None:
+        with self._rng_lock:
+            self.request_count += 1
+
+    def build_message(self, request: dict) -> dict:
+        return build_message(request, self.config.default_array_items)
+
+    def apply_cache(self, request: dict, usage: dict) -> Optional[str]:
+        """Move the cached prefix's tokens out of input_tokens; return the key to store on a miss."""
+        prefix = cache_prefix(request)
+        if prefix is None:
+            return None
+        tokens = min(estimate_tokens(prefix), usage["input_tokens"])
+        canonical = json.dumps([request.get("model"), prefix], sort_keys=True)
+        key = hashlib.sha256(canonical.encode()).hexdigest()
+        with self._rng_lock:
+            hit = key in self._cached_prefixes
+        usage["input_tokens"] -= tokens
+        usage["cache_read_input_tokens" if hit else "cache_creation_input_tokens"] = tokens
+        return None if hit else key
+
+    def store_cache(self, key: Optional[str]) -> None:
+        if key is not None:
+            with self._rng_lock:
+                self._cached_prefixes.add(key)
+
+    def __enter__(self) -> "FakeAnthropicServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1")
+@click.option("--port", default=8765, type=int)
+@click.option("--latency", default="constant:300", help="constant:MS | uniform:LO,HI | lognormal:MEDIAN,SIGMA")
+@click.option("--tokens-per-second", default=None, type=float, help="Add output-token generation time")
+@click.option("--rate-429", default=0.0, type=float, help="Fraction of requests rejected with 429")
+@click.option("--rate-529", default=0.0, type=float, help="Fraction of requests rejected with 529")
+@click.option("--seed", default=None, type=int)
+def main(host, port, latency, tokens_per_second, rate_429, rate_529, seed):
+    """Serve a fake Anthropic Messages API for offline load testing."""
+    config = FakeServerConfig(
+        latency=LatencyModel.parse(latency, tokens_per_second),
+        rate_429=rate_429,
+        rate_529=rate_529,
+        seed=seed,
+    )
+    server = FakeAnthropicServer(config, host, port)
+    click.echo(f"Fake Messages API on {server.base_url} (ANTHROPIC_BASE_URL={server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
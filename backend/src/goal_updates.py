@@ -0,0 +1,118 @@
+"""Apply model-produced goal updates to a session's goals.
+
+Goals carry short stable IDs ("g1", "g2", ...) that prompts show and tool
+outputs reference, so the model doesn't echo full descriptions back. Updates
+are resolved through an ID index; updates that still name a goal by
+description (older sessions, paraphrases) fall back to exact and then fuzzy
+description matching instead of being dropped.
+"""
+
+import difflib
+import logging
+from typing import Optional
+
+from .models import Goal, GoalStatus
+from .telemetry import TELEMETRY, Telemetry
+
+logger = logging.getLogger(__name__)
+
+# difflib ratio a paraphrased description must reach to count as the same goal
+FUZZY_CUTOFF = 0.6
+
+
+def assign_goal_ids(goals: list[Goal]) -> list[Goal]:
+    """Give every goal without an ID the next free "g<n>" ID, in place."""
+    taken = {g.id for g in goals if g.id}
+    next_number = 1
+    for goal in goals:
+        if goal.id:
+            continue
+        while f"g{next_number}" in taken:
+            next_number += 1
+        goal.id = f"g{next_number}"
+        taken.add(goal.id)
+    return goals
+
+
+def goal_dicts(goals: list[Goal]) -> list[dict]:
+    """Goals as prompt dicts (id, description, confidence, status)."""
+    return [
+        {
+            "id": g.id,
+            "description": g.description,
+            "confidence": g.confidence,
+            "status": g.status.value,
+        }
+        for g in assign_goal_ids(goals)
+    ]
+
+
+def resolve_goal(
+    reference: str, goals: list[Goal], telemetry: Optional[Telemetry] = None
+) -> Optional[Goal]:
+    """Find the goal an update refers to: by ID, exact description, then fuzzy description."""
+    telemetry = telemetry or TELEMETRY
+    by_id = {g.id: g for g in goals if g.id}
+    key = reference.strip()
+
+    if key in by_id:
+        telemetry.increment("goal_updates.matched_id")
+        return by_id[key]
+    # Models sometimes decorate the ID ("[g2]", "G2")
+    normalized = key.strip("[]() ").lower()
+    if normalized in by_id:
+        telemetry.increment("goal_updates.matched_id")
+        return by_id[normalized]
+
+    by_description = {g.description: g for g in goals}
+    if key in by_description:
+        telemetry.increment("goal_updates.matched_description")
+        return by_description[key]
+
+    close = difflib.get_close_matches(key, list(by_description), n=1, cutoff=FUZZY_CUTOFF)
+    if close:
+        telemetry.increment("goal_updates.matched_fuzzy")
+        return by_description[close[0]]
+
+    telemetry.increment("goal_updates.unmatched")
+    logger.warning("Goal update for unknown goal %r dropped", reference)
+    return None
+
+
+def apply_goal_updates(
+    goals: list[Goal], goal_updates: list[dict], telemetry: Optional[Telemetry] = None
+) -> list[Goal]:
+    """
+    Apply goal updates to goals; goals without an update are kept unchanged.
+
+    Args:
+        goals: Current goals (IDs are assigned if missing)
+        goal_updates: Dicts with "goal_id" (or legacy "goal"), "confidence", "status"
+        telemetry: Where match counters are recorded
+
+    Returns:
+        New list of goals in the original order
+    """
+    assign_goal_ids(goals)
+    updates_by_id: dict[str, dict] = {}
+    for update in goal_updates:
+        reference = update.get("goal_id") or update.get("goal") or ""
+        goal = resolve_goal(reference, goals, telemetry)
+        if goal is not None:
+            updates_by_id[goal.id] = update
+
+    updated_goals = []
+    for goal in goals:
+        update = updates_by_id.get(goal.id)
+        if update is None:
+            updated_goals.append(goal)
+            continue
+        updated_goals.append(
+            Goal(
+                id=goal.id,
+                description=goal.description,
+                confidence=update["confidence"],
+                status=GoalStatus(update["status"]),
+            )
+        )
+    return updated_goals
@@ -0,0 +1,131 @@
+"""Hedged requests for interactive model calls.
+
+If the first request hasn't returned after a percentile of recent latency for
+the same agent/route, an identical second request is sent and whichever
+finishes first wins. Hedges are capped to a fraction of eligible traffic so
+they can't double upstream load when everything is slow.
+"""
+
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+from .env import env_flag, env_int
+from .telemetry import TELEMETRY, Telemetry
+
+T = TypeVar("T")
+
+# Shared by every client in the process so the hedge budget is process-wide
+_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedge")
+_BUDGET_LOCK = threading.Lock()
+
+
+class HedgePolicy(BaseModel):
+    enabled: bool = False
+    percentile: float = Field(default=95, gt=0, le=100)
+    min_delay_ms: float = 250  # Never hedge sooner than this
+    max_hedge_ratio: float = Field(default=0.05, ge=0, le=1)  # hedges / eligible calls
+    min_samples: int = 20  # Latency history needed before hedging kicks in
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        """Build policy from HEDGE_* environment variables (disabled by default)."""
+        return cls(
+            enabled=env_flag("HEDGE_ENABLED"),
+            percentile=float(os.getenv("HEDGE_PERCENTILE", "95")),
+            min_delay_ms=float(os.getenv("HEDGE_MIN_DELAY_MS", "250")),
+            max_hedge_ratio=float(os.getenv("HEDGE_MAX_RATIO", "0.05")),
+            min_samples=env_int("HEDGE_MIN_SAMPLES", 20),
+        )
+
+
+class Hedger:
+    def __init__(
+        self,
+        policy: HedgePolicy,
+        telemetry: Optional[Telemetry] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.policy = policy
+        self.telemetry = telemetry or TELEMETRY
+        self.executor = executor or _EXECUTOR
+
+    def hedge_delay_ms(self, latency_key: str) -> Optional[float]:
+        """Delay before hedging, or None while there isn't enough history."""
+        if self.telemetry.sample_count(latency_key) < self.policy.min_samples:
+            return None
+        observed = self.telemetry.latency_percentile(latency_key, self.policy.percentile)
+        if observed is None:
+            return None
+        return max(observed, self.policy.min_delay_ms)
+
+    def _acquire_budget(self) -> bool:
+        """Reserve a hedge if it keeps hedges within max_hedge_ratio of eligible calls."""
+        with _BUDGET_LOCK:
+            eligible = self.telemetry.counter("hedge.eligible")
+            sent = self.telemetry.counter("hedge.sent")
+            if sent + 1 > self.policy.max_hedge_ratio * eligible:
+                return False
+            self.telemetry.increment("hedge.sent")
+            return True
+
+    def run(self, latency_key: str, send: Callable[[], T]) -> T:
+        """
+        Run send(), hedging it with a second identical call if it is slow.
+
+        The first successful result wins. The loser is cancelled if it hasn't
+        started; a request already in flight can't be aborted through the sync
+        SDK, so its result is simply discarded.
+        """
+        self.telemetry.increment("hedge.eligible")
+        delay_ms = self.hedge_delay_ms(latency_key)
+        if delay_ms is None:
+            return send()
+
+        primary = self.executor.submit(send)
+        done, _ = wait([primary], timeout=delay_ms / 1000)
+        if done:
+            return primary.result()
+
+        if not self._acquire_budget():
+            self.telemetry.increment("hedge.budget_denied")
+            return primary.result()
+
+        hedge = self.executor.submit(send)
+        labels: dict[Future, str] = {primary: "primary", hedge: "hedge"}
+        pending = set(labels)
+        first_error: Optional[BaseException] = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    for loser in pending:
+                        loser.cancel()
+                    self.telemetry.increment(f"hedge.{labels[future]}_won")
+                    return future.result()
+                first_error = first_error or error
+
+        raise first_error  # type: ignore
+
+
+def hedge_stats(telemetry: Optional[Telemetry] = None) -> dict:
+    """Hedge counters plus the rates we care about."""
+    telemetry = telemetry or TELEMETRY
+    eligible = telemetry.counter("hedge.eligible")
+    sent = telemetry.counter("hedge.sent")
+    won = telemetry.counter("hedge.hedge_won")
+    return {
+        "eligible": eligible,
+        "sent": sent,
+        "hedge_won": won,
+        "primary_won": telemetry.counter("hedge.primary_won"),
+        "budget_denied": telemetry.counter("hedge.budget_denied"),
+        "hedge_rate": sent / eligible if eligible else 0.0,
+        "hedge_win_rate": won / sent if sent else 0.0,
+    }
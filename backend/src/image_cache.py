@@ -0,0 +1,140 @@
+"""On-disk cache of per-image extraction results, keyed by image content hash.
+
+The same screenshots are uploaded again across sessions and re-investigations.
+With IMAGE_CACHE=true each uploaded image is transcribed on its own (text plus
+visual observations) and the result is stored under the SHA-256 of the decoded
+image bytes, so a later upload of the same image costs no vision tokens; the
+summary itself is then extracted from the transcripts with a text-only call.
+
+The same per-image path, without the cache, is the map step of map-reduce
+extraction for large uploads: images are transcribed in parallel calls and
+reduced by the text-only summary call.
+
+Enable with environment variables:
+    IMAGE_CACHE=true
+    IMAGE_CACHE_DIR=/path/to/cache        # default: next to the session store
+    IMAGE_CACHE_MAX_ENTRIES=5000          # least recently used entries go first
+    IMAGE_CACHE_MAX_BYTES=104857600
+    IMAGE_EXTRACTION=map_reduce           # implied by IMAGE_CACHE
+    IMAGE_EXTRACTION_CONCURRENCY=4        # max parallel per-image calls
+"""
+
+import base64
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .env import env_flag, env_int
+from .telemetry import TELEMETRY, Telemetry
+
+# Bump when the transcription prompt or schema changes, to ignore old entries
+TRANSCRIPTION_VERSION = 1
+
+
+def image_cache_enabled() -> bool:
+    return env_flag("IMAGE_CACHE")
+
+
+def map_reduce_enabled() -> bool:
+    return os.getenv("IMAGE_EXTRACTION", "single").lower() == "map_reduce"
+
+
+def image_extraction_concurrency() -> int:
+    return max(1, env_int("IMAGE_EXTRACTION_CONCURRENCY", 4))
+
+
+def image_hash(image: dict) -> str:
+    """SHA-256 of the decoded image bytes (base64 formatting doesn't matter)."""
+    if image.get("sha256"):
+        return image["sha256"]  # computed at ingestion
+    return hashlib.sha256(base64.b64decode(image["data"])).hexdigest()
+
+
+def _default_cache_dir() -> Path:
+    env_dir = os.getenv("IMAGE_CACHE_DIR")
+    if env_dir:
+        return Path(env_dir)
+    env_data_dir = os.getenv("DATA_DIR")
+    if env_data_dir:
+        return Path(env_data_dir) / ".image_cache"
+    project_root = Path(__file__).parent.parent.parent
+    if project_root == Path("/"):
+        return Path("/tmp/.drama/.image_cache")
+    return project_root / ".drama" / ".image_cache"
+
+
+class ImageExtractionCache:
+    """
+    Per-image extraction results stored as one JSON file per image hash.
+
+    A hit refreshes the file's mtime, so pruning by mtime after each put drops
+    the least recently used entries once max_entries or max_bytes is exceeded.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        telemetry: Optional[Telemetry] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else _default_cache_dir()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.telemetry = telemetry or TELEMETRY
+        self.max_entries = (
+            env_int("IMAGE_CACHE_MAX_ENTRIES", 5000) if max_entries is None else max_entries
+        )
+        self.max_bytes = (
+            env_int("IMAGE_CACHE_MAX_BYTES", 100 * 1024 * 1024) if max_bytes is None else max_bytes
+        )
+        self._lock = threading.Lock()
+
+    def _path(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}.json"
+
+    def get(self, digest: str) -> Optional[dict]:
+        """Cached result for an image hash, or None (counted as hit/miss)."""
+        path = self._path(digest)
+        try:
+            entry = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            entry = None
+        if entry is None or entry.get("version") != TRANSCRIPTION_VERSION:
+            self.telemetry.increment("image_cache.miss")
+            return None
+        self.telemetry.increment("image_cache.hit")
+        with contextlib.suppress(FileNotFoundError):  # pruned meanwhile
+            os.utime(path)
+        return entry["result"]
+
+    def put(self, digest: str, result: dict) -> None:
+        """Store a result; written to a temp file and renamed so readers never see a partial entry."""
+        path = self._path(digest)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with self._lock:
+            tmp.write_text(json.dumps({"version": TRANSCRIPTION_VERSION, "result": result}))
+            os.replace(tmp, path)
+            self._prune()
+
+    def _prune(self) -> None:
+        """Delete least recently used entries until both limits hold."""
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            with contextlib.suppress(FileNotFoundError):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        count, size = len(entries), sum(e[1] for e in entries)
+        evicted = 0
+        for _, entry_size, path in entries:
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            count, size = count - 1, size - entry_size
+            evicted += 1
+        if evicted:
+            self.telemetry.increment("image_cache.evicted", evicted)
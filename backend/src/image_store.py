@@ -0,0 +1,182 @@
+"""Content-addressed on-disk store for uploaded images.
+
+With IMAGE_STORE=true the normalized screenshots of each investigation are
+written once, named by the SHA-256 of their bytes, and the session keeps only
+ImageRef entries (hash plus metadata) instead of inlined base64. Anything that
+needs the images again (re-extraction, reprocessing, audits) loads them from
+here: the blob is memory-mapped and base64-encoded straight into the request
+image dict, with no intermediate read/decode round trip.
+
+Each session holding an image is recorded as an empty marker file
+refs/<hash>/<session_id>, so the reference count is the number of markers and
+adding or dropping a reference is a single atomic file operation (safe across
+worker processes). Archiving a session drops its references; blobs left with
+none are removed by collect_garbage(). Collection renames a blob to a
+tombstone and re-counts its references before deleting it, so a put() racing
+with it either restores the blob or writes it again.
+
+Layout:
+    blobs/<hash[:2]>/<hash>     raw image bytes
+    refs/<hash>/<session_id>    one marker per referencing session
+
+Enable with environment variables:
+    IMAGE_STORE=true
+    IMAGE_STORE_DIR=/path/to/store        # default: next to the session store
+"""
+
+import base64
+import contextlib
+import hashlib
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .env import env_flag
+from .images import sniff_image
+from .models import ImageRef
+from .telemetry import TELEMETRY, Telemetry
+
+
+def image_store_enabled() -> bool:
+    return env_flag("IMAGE_STORE")
+
+
+def _default_store_dir() -> Path:
+    env_dir = os.getenv("IMAGE_STORE_DIR")
+    if env_dir:
+        return Path(env_dir)
+    env_data_dir = os.getenv("DATA_DIR")
+    if env_data_dir:
+        return Path(env_data_dir) / ".images"
+    project_root = Path(__file__).parent.parent.parent
+    if project_root == Path("/"):
+        return Path("/tmp/.drama/.images")
+    return project_root / ".drama" / ".images"
+
+
+class ImageStore:
+    """Hash-named image blobs with per-session reference markers."""
+
+    def __init__(self, store_dir: Optional[Path] = None, telemetry: Optional[Telemetry] = None):
+        self.store_dir = Path(store_dir) if store_dir is not None else _default_store_dir()
+        self.blob_dir = self.store_dir / "blobs"
+        self.ref_dir = self.store_dir / "refs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.ref_dir.mkdir(parents=True, exist_ok=True)
+        self.telemetry = telemetry or TELEMETRY
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def has(self, digest: str) -> bool:
+        return self.blob_path(digest).exists()
+
+    def add_ref(self, digest: str, session_id: str) -> None:
+        refs = self.ref_dir / digest
+        while True:
+            refs.mkdir(exist_ok=True)
+            try:
+                (refs / session_id).touch()
+                return
+            except FileNotFoundError:
+                continue  # collect_garbage() removed the empty directory in between
+
+    def refcount(self, digest: str) -> int:
+        refs = self.ref_dir / digest
+        return sum(1 for _ in refs.iterdir()) if refs.is_dir() else 0
+
+    def put(self, image: dict, session_id: str) -> ImageRef:
+        """
+        Store one image for a session and return its reference.
+
+        The reference marker is written before the blob is checked. A
+        concurrent collect_garbage() that already took the blob away (renamed
+        it to a tombstone) sees the marker on its re-count and puts it back;
+        one that deleted it did so before the marker existed, and then the
+        blob is missing here and written again.
+
+        Args:
+            image: Image dict with base64 "data" and "media_type"
+            session_id: Session that holds the reference
+
+        Returns:
+            ImageRef with the content hash, media type, dimensions and size
+        """
+        data = base64.b64decode(image["data"])
+        digest = image.get("sha256") or hashlib.sha256(data).hexdigest()
+        self.add_ref(digest, session_id)
+
+        path = self.blob_path(digest)
+        if path.exists():
+            self.telemetry.increment("image_store.deduped")
+        else:
+            path.parent.mkdir(exist_ok=True)
+            tmp = path.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            self.telemetry.increment("image_store.written")
+            self.telemetry.increment("image_store.bytes_written", len(data))
+
+        info = sniff_image(data)
+        return ImageRef(
+            sha256=digest,
+            media_type=info.media_type if info else image["media_type"],
+            width=info.width if info else 0,
+            height=info.height if info else 0,
+            size=len(data),
+        )
+
+    def put_all(self, images: list[dict], session_id: str) -> list[ImageRef]:
+        return [self.put(image, session_id) for image in images]
+
+    def load(self, ref: ImageRef) -> dict:
+        """
+        Image dict for an outgoing request, encoded directly from the mapped blob.
+
+        Raises:
+            FileNotFoundError: The blob was never stored or has been collected
+        """
+        with open(self.blob_path(ref.sha256), "rb") as f:
+            if ref.size == 0:
+                data = base64.b64encode(f.read())
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    data = base64.b64encode(mapped)
+        return {"data": data.decode(), "media_type": ref.media_type, "sha256": ref.sha256}
+
+    def load_all(self, refs: list[ImageRef]) -> list[dict]:
+        return [self.load(ref) for ref in refs]
+
+    def release(self, session_id: str, refs: list[ImageRef]) -> None:
+        """Drop a session's references; blobs stay until collect_garbage()."""
+        for ref in refs:
+            (self.ref_dir / ref.sha256 / session_id).unlink(missing_ok=True)
+
+    def collect_garbage(self) -> int:
+        """Delete blobs no session references; returns how many were removed."""
+        removed = 0
+        for shard in self.blob_dir.iterdir():
+            for path in shard.iterdir():
+                if path.suffix in (".tmp", ".gc") or self.refcount(path.name):
+                    continue
+                # Take the blob out of reach first, then count again: a put() that
+                # added its reference meanwhile may have seen the blob and skipped it
+                tombstone = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.gc")
+                try:
+                    os.replace(path, tombstone)
+                except FileNotFoundError:
+                    continue
+                if self.refcount(path.name):
+                    if path.exists():
+                        tombstone.unlink()  # put() already wrote it again
+                    else:
+                        os.replace(tombstone, path)
+                    continue
+                tombstone.unlink()
+                with contextlib.suppress(OSError):
+                    (self.ref_dir / path.name).rmdir()  # only if still empty
+                removed += 1
+        self.telemetry.increment("image_store.collected", removed)
+        return removed
@@ -0,0 +1,239 @@
+"""Image ingestion: verify, downscale, re-encode and dedupe uploads before any model call.
+
+Phone screenshots arrive as multi-megabyte PNGs with a guessed media type.
+Each upload is decoded here, its real format and size read from the file
+header, exact duplicates within the request dropped, and (when Pillow is
+installed) images larger than the max long edge downscaled and re-encoded in
+whichever of PNG, palette PNG and JPEG is smallest. Size caps are enforced
+before anything is sent to the model.
+
+Configure with environment variables:
+    IMAGE_MAX_EDGE=1568           # long edge in pixels after downscaling
+    IMAGE_JPEG_QUALITY=85
+    IMAGE_MAX_BYTES=5242880       # per normalized image (API limit is 5MB)
+    IMAGE_MAX_UPLOAD_BYTES=20971520  # per uploaded file, before decoding
+    IMAGE_MAX_COUNT=20            # images per request
+"""
+
+import base64
+import binascii
+import hashlib
+import io
+import math
+import struct
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .env import env_int
+from .telemetry import TELEMETRY, Telemetry
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it images are verified but not resized
+    Image = None
+
+# The API itself downsizes past this long edge / token count
+API_MAX_EDGE = 1568
+API_MAX_IMAGE_TOKENS = 1600
+
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+class ImageRejectedError(ValueError):
+    """Raised for uploads that aren't a supported image or exceed a size cap."""
+
+
+class ImageInfo(BaseModel):
+    media_type: str
+    width: int
+    height: int
+
+
+class IngestReport(BaseModel):
+    """What normalization did to one request's images."""
+    images_in: int = 0
+    images_out: int = 0
+    duplicates_dropped: int = 0
+    resized: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_in - self.bytes_out
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_in - self.tokens_out
+
+    def summary(self) -> dict:
+        return {**self.model_dump(), "bytes_saved": self.bytes_saved, "tokens_saved": self.tokens_saved}
+
+
+
+def sniff_image(data: bytes) -> Optional[ImageInfo]:
+    """Read format and dimensions from the file header; None if not a supported image."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and data[12:16] == b"IHDR":
+        width, height = struct.unpack(">II", data[16:24])
+        return ImageInfo(media_type="image/png", width=width, height=height)
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        width, height = struct.unpack("<HH", data[6:10])
+        return ImageInfo(media_type="image/gif", width=width, height=height)
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        chunk = data[12:16]
+        if chunk == b"VP8 " and len(data) >= 30:
+            width, height = struct.unpack("<HH", data[26:30])
+            return ImageInfo(media_type="image/webp", width=width & 0x3FFF, height=height & 0x3FFF)
+        if chunk == b"VP8L" and len(data) >= 25:
+            bits = int.from_bytes(data[21:25], "little")
+            return ImageInfo(
+                media_type="image/webp", width=(bits & 0x3FFF) + 1, height=((bits >> 14) & 0x3FFF) + 1
+            )
+        if chunk == b"VP8X" and len(data) >= 30:
+            return ImageInfo(
+                media_type="image/webp",
+                width=int.from_bytes(data[24:27], "little") + 1,
+                height=int.from_bytes(data[27:30], "little") + 1,
+            )
+        return None
+    if data[:2] == b"\xff\xd8":
+        return _sniff_jpeg(data)
+    return None
+
+
+def _sniff_jpeg(data: bytes) -> Optional[ImageInfo]:
+    index = 2
+    while index + 9 <= len(data):
+        if data[index] != 0xFF:
+            index += 1
+            continue
+        marker = data[index + 1]
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">HH", data[index + 5:index + 9])
+            return ImageInfo(media_type="image/jpeg", width=width, height=height)
+        if marker in (0xFF, 0x01) or 0xD0 <= marker <= 0xD8:
+            index += 1 if marker == 0xFF else 2  # fill byte / standalone marker
+            continue
+        (length,) = struct.unpack(">H", data[index + 2:index + 4])
+        index += 2 + length
+    return None
+
+
+def estimate_image_tokens(width: int, height: int) -> int:
+    """Vision input tokens for an image (~width*height/750, after the API's own downscale)."""
+    return min(math.ceil(width * height / 750), API_MAX_IMAGE_TOKENS)
+
+
+def decode_base64_image(encoded: str) -> bytes:
+    """Decode a base64 upload, accepting an optional data: URL prefix."""
+    if encoded.startswith("data:"):
+        encoded = encoded.partition(",")[2]
+    try:
+        return base64.b64decode(encoded, validate=False)
+    except (binascii.Error, ValueError) as e:
+        raise ImageRejectedError(f"Image is not valid base64: {e}") from e
+
+
+def _reencode(data: bytes, info: ImageInfo, max_edge: int, jpeg_quality: int) -> tuple[bytes, ImageInfo]:
+    """Downscale to max_edge and keep the smallest of PNG, palette PNG and JPEG (needs Pillow)."""
+    if Image is None or max(info.width, info.height) <= max_edge:
+        return data, info
+    try:
+        return _reencode_with_pillow(data, max_edge, jpeg_quality)
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError) as e:
+        # A valid header can front a truncated or garbage body
+        raise ImageRejectedError(f"Image could not be decoded: {e}") from e
+
+
+def _reencode_with_pillow(data: bytes, max_edge: int, jpeg_quality: int) -> tuple[bytes, ImageInfo]:
+    with Image.open(io.BytesIO(data)) as img:
+        img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        candidates = []
+        png = io.BytesIO()
+        img.save(png, format="PNG", optimize=True)
+        candidates.append((png.getvalue(), "image/png"))
+        # Screenshots are mostly flat colour; a 256-colour palette keeps text legible
+        palette = io.BytesIO()
+        img.convert("RGB").quantize(256).save(palette, format="PNG", optimize=True)
+        candidates.append((palette.getvalue(), "image/png"))
+        if img.mode not in ("RGBA", "LA") and "transparency" not in img.info:
+            jpeg = io.BytesIO()
+            img.convert("RGB").save(jpeg, format="JPEG", quality=jpeg_quality, optimize=True)
+            candidates.append((jpeg.getvalue(), "image/jpeg"))
+        width, height = img.size
+    encoded, media_type = min(candidates, key=lambda c: len(c[0]))
+    return encoded, ImageInfo(media_type=media_type, width=width, height=height)
+
+
+def normalize_images(
+    uploads: list[bytes],
+    max_edge: Optional[int] = None,
+    telemetry: Optional[Telemetry] = None,
+) -> tuple[list[dict], IngestReport]:
+    """
+    Verify, dedupe, downscale and re-encode one request's uploaded images.
+
+    Args:
+        uploads: Raw image bytes, in upload order
+        max_edge: Long edge in pixels (defaults to IMAGE_MAX_EDGE)
+        telemetry: Where byte/token savings are counted
+
+    Returns:
+        (image dicts with base64 "data", "media_type" and "sha256" for the model, report)
+
+    Raises:
+        ImageRejectedError: An upload isn't a supported image or exceeds a size cap
+    """
+    telemetry = telemetry or TELEMETRY
+    max_edge = max_edge or env_int("IMAGE_MAX_EDGE", API_MAX_EDGE)
+    jpeg_quality = env_int("IMAGE_JPEG_QUALITY", 85)
+    max_upload = env_int("IMAGE_MAX_UPLOAD_BYTES", 20 * 1024 * 1024)
+    max_bytes = env_int("IMAGE_MAX_BYTES", 5 * 1024 * 1024)
+    max_count = env_int("IMAGE_MAX_COUNT", 20)
+
+    # Rejected before any upload is decoded or re-encoded
+    if len(uploads) > max_count:
+        raise ImageRejectedError(f"{len(uploads)} images uploaded (limit {max_count})")
+
+    report = IngestReport(images_in=len(uploads))
+    seen: set[str] = set()
+    images = []
+    for number, data in enumerate(uploads, 1):
+        if len(data) > max_upload:
+            raise ImageRejectedError(f"Image {number} is {len(data)} bytes (limit {max_upload})")
+        info = sniff_image(data)
+        if info is None:
+            raise ImageRejectedError(f"Image {number} is not a PNG, JPEG, GIF or WebP image")
+        report.bytes_in += len(data)
+        report.tokens_in += estimate_image_tokens(info.width, info.height)
+
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in seen:
+            report.duplicates_dropped += 1
+            continue
+        seen.add(digest)
+
+        normalized, normalized_info = _reencode(data, info, max_edge, jpeg_quality)
+        if normalized is not data:
+            report.resized += 1
+        if len(normalized) > max_bytes:
+            raise ImageRejectedError(f"Image {number} is {len(normalized)} bytes after resizing (limit {max_bytes})")
+        report.bytes_out += len(normalized)
+        report.tokens_out += estimate_image_tokens(normalized_info.width, normalized_info.height)
+        images.append({
+            "data": base64.b64encode(normalized).decode(),
+            "media_type": normalized_info.media_type,
+            # Hash of the bytes sent, so the cache and image store needn't decode again
+            "sha256": digest if normalized is data else hashlib.sha256(normalized).hexdigest(),
+        })
+
+    report.images_out = len(images)
+
+    telemetry.increment("images.ingested", report.images_out)
+    telemetry.increment("images.duplicates_dropped", report.duplicates_dropped)
+    telemetry.increment("images.bytes_saved", report.bytes_saved)
+    telemetry.increment("images.tokens_saved", report.tokens_saved)
+    return images, report
@@ -1,21 +1,136 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional
 
+from .agents.conversation_summarizer import ConversationSummarizerAgent
 from .agents.drift_detector import DriftDetectorAgent
 from .agents.fact_and_goal_updater import FactAndGoalUpdater
+from .agents.incremental_analysis import IncrementalAnalysisAgent
 from .agents.goal_generator import GoalGeneratorAgent
 from .agents.question_generator import QuestionGeneratorAgent
 from .agents.summary_and_goal_generator import SummaryAndGoalGenerator
 from .agents.summary_extractor import SummaryExtractorAgent
+from .analysis_state import (
+    analysis_state_due,
+    analysis_state_key,
+    apply_analysis_state,
+    incremental_analysis_enabled,
+)
 from .api_client import ClaudeClient
-from .models import Answer, Message, Session, SessionStatus, ExtractedSummary
+from .background import BACKGROUND
+from .chat_export import minimize_summary, minimize_summary_enabled
+from .env import env_flag, env_int
+from .fact_dedup import FACT_DEDUPLICATORS, fact_dedup_enabled
+from .fact_index import FACT_INDEXES, fact_retrieval_enabled
+from .goal_updates import apply_goal_updates
+from .memory import RollingMemory, apply_memory, rolling_summary_enabled
+from .models import (
+    Answer,
+    ExtractedSummary,
+    Fact,
+    Goal,
+    Message,
+    OptionImplication,
+    QuestionWithAnswers,
+    Session,
+    SessionStatus,
+)
+from .telemetry import TELEMETRY, Telemetry
+from .triage import TriageResult, triage_answer, triage_enabled
+
+# Shared across orchestrators; Flask builds one per request
+_PIPELINE_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="turn")
+
+
+def concurrent_pipeline_enabled() -> bool:
+    """PIPELINE_MODE=concurrent overlaps fact/goal updates with question generation."""
+    return os.getenv("PIPELINE_MODE", "sequential").lower() == "concurrent"
+
+
+def precompute_option_facts_enabled() -> bool:
+    """PRECOMPUTE_OPTION_FACTS=true asks for each option's facts at question time."""
+    return env_flag("PRECOMPUTE_OPTION_FACTS")
+
+
+def drift_check_cadence() -> int:
+    """Check drift every N answers (DRIFT_CHECK_EVERY, default 3; 0 disables)."""
+    return env_int("DRIFT_CHECK_EVERY", 3)
+
+
+def drift_stats(telemetry: Optional[Telemetry] = None) -> dict:
+    """Drift check counters, check latency and turn latency with/without a check."""
+    telemetry = telemetry or TELEMETRY
+
+    def p(key: str, pct: float) -> Optional[float]:
+        return telemetry.latency_percentile(key, pct)
+
+    return {
+        "checked": telemetry.counter("drift.checked"),
+        "detected": telemetry.counter("drift.detected"),
+        "applied": telemetry.counter("drift.applied"),
+        "not_ready": telemetry.counter("drift.not_ready"),
+        "check_p50_ms": p("drift:check", 50),
+        "check_p95_ms": p("drift:check", 95),
+        # Checks run off the critical path, so these two should match
+        "turn_p50_ms_with_check": p("turn:process_answer:drift_check", 50),
+        "turn_p50_ms_without_check": p("turn:process_answer:no_drift_check", 50),
+        "answer_p50_ms": p("api:answer", 50),
+        "answer_p95_ms": p("api:answer", 95),
+    }
 
 
 class InterviewOrchestrator:
     """Orchestrates the sequential agent pipeline for conducting interviews."""
 
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        concurrent: Optional[bool] = None,
+        drift_check_every: Optional[int] = None,
+        triage: Optional[bool] = None,
+        precompute_option_facts: Optional[bool] = None,
+        minimize_summary_input: Optional[bool] = None,
+        rolling_summary: Optional[bool] = None,
+        fact_retrieval: Optional[bool] = None,
+        fact_dedup: Optional[bool] = None,
+        incremental_analysis: Optional[bool] = None,
+    ):
         # TODO: Store session
         self.session: Session = session
+        # Concurrent turn pipeline (PIPELINE_MODE=concurrent when not given)
+        self.concurrent = concurrent_pipeline_enabled() if concurrent is None else concurrent
+        # Background drift check cadence (DRIFT_CHECK_EVERY when not given)
+        self.drift_check_every = (
+            drift_check_cadence() if drift_check_every is None else drift_check_every
+        )
+        # Skip extraction for low-information answers (ANSWER_TRIAGE when not given)
+        self.triage = triage_enabled() if triage is None else triage
+        # Per-option facts from question generation (PRECOMPUTE_OPTION_FACTS when not given)
+        self.precompute_option_facts = (
+            precompute_option_facts_enabled()
+            if precompute_option_facts is None
+            else precompute_option_facts
+        )
+        # Compact pasted chat exports before prompting (MINIMIZE_SUMMARY when not given)
+        self.minimize_summary_input = (
+            minimize_summary_enabled()
+            if minimize_summary_input is None
+            else minimize_summary_input
+        )
+        # Fold older turns into a running summary (ROLLING_SUMMARY when not given)
+        self.rolling_summary = (
+            rolling_summary_enabled() if rolling_summary is None else rolling_summary
+        )
+        # Show facts relevant to the weakest goals, not just the newest (FACT_RETRIEVAL when not given)
+        self.fact_retrieval = fact_retrieval_enabled() if fact_retrieval is None else fact_retrieval
+        # Merge restated facts instead of appending them (FACT_DEDUP when not given)
+        self.fact_dedup = fact_dedup_enabled() if fact_dedup is None else fact_dedup
+        # Keep the analysis state current during the interview (INCREMENTAL_ANALYSIS when not given)
+        self.incremental_analysis = (
+            incremental_analysis_enabled() if incremental_analysis is None else incremental_analysis
+        )
         # Store session_id for context isolation
         self.session_id: str = session.session_id
         # Initialize turn_count from session to preserve state across requests
@@ -42,10 +157,22 @@ class InterviewOrchestrator:
         self.question_generator: QuestionGeneratorAgent = QuestionGeneratorAgent(
             client=self.claude_client
         )
+        self.rolling_memory: RollingMemory = RollingMemory(
+            ConversationSummarizerAgent(client=self.claude_client)
+        )
+        # Per-session fact index kept across requests in this process
+        self.fact_index = FACT_INDEXES.get(self.session_id) if self.fact_retrieval else None
+        self.fact_deduplicator = FACT_DEDUPLICATORS.get(self.session_id) if self.fact_dedup else None
+        self.incremental_analysis_agent: IncrementalAnalysisAgent = IncrementalAnalysisAgent(
+            client=self.claude_client
+        )
 
     def initialize_investigation(self, summary: str, image_data_list: list[dict]) -> str:
         # Store raw summary in session
         self.session.summary = summary
+        # Prompts get the minimized text; the session keeps what the user pasted
+        if self.minimize_summary_input and summary:
+            summary = minimize_summary(summary).text
 
         # OPTIMIZATION: Use combined agent for text-only summaries
         if not image_data_list or len(image_data_list) == 0:
@@ -79,10 +206,12 @@ class InterviewOrchestrator:
             interviewee_name=self.session.interviewee_name,
             interviewee_role=self.session.interviewee_role,
             confidence_threshold=self.session.confidence_threshold,
+            precompute_implications=self.precompute_option_facts,
         )
         first_question = question_data.question
         self.session.current_question = question_data.question
         self.session.answers = question_data.answers
+        self.session.answer_implications = question_data.implications
         # Store question in session.current_question
         # Add assistant message to session.messages
         self.session.messages.append(
@@ -102,6 +231,14 @@ class InterviewOrchestrator:
         """
         # TODO: Increment turn_count
         self.turn_count += 1
+        # Triage against the options shown and facts known before this answer
+        triage = (
+            triage_answer(answer, self.session.facts, self.session.answers)
+            if self.triage
+            else None
+        )
+        # Canned options may come with facts precomputed when they were generated
+        implication = self._implication_for(answer)
         # Add user message to session.messages
         self.session.messages.append(
             Message(
@@ -111,46 +248,93 @@ class InterviewOrchestrator:
                 timestamp=datetime.now().isoformat(),
             )
         )
-        # OPTIMIZATION: Combined fact extraction + goal tracking in single API call
-        gen_facts, updated_goals = self.fact_and_goal_updater.extract_and_update(
-            self.session.current_question,
-            answer,
-            self.session.goals,
-            session_id=self.session_id
-        )
-        # Add facts to session.facts
-        self.session.facts.extend(gen_facts)
-        # Update goals
-        self.session.goals = updated_goals
-
-        # MVP: Drift detection disabled for performance - re-enable for v2
-        drift_redirect = ""
-        # if self.turn_count % 3 == 0:
-        #     drift_analysis = self.drift_detector.check_drift(
-        #         self.session.current_question, answer.answer, session_id=self.session_id
-        #     )
-        #     if not drift_analysis.addressed_question:
-        #         drift_redirect = drift_analysis.redirect_suggestion
-
-        # Step 4: Generate next question
-        question_data = self.question_generator.generate_question_with_answers(
-            self.session.goals,
-            self.session.facts,
-            self.session.messages,
-            extracted_summary=self.session.extracted_summary, # type: ignore
-            drift_redirect=drift_redirect,
-            session_id=self.session_id,
-            interviewee_name=self.session.interviewee_name,
-            interviewee_role=self.session.interviewee_role,
-            confidence_threshold=self.session.confidence_threshold,
+        turn_start = time.perf_counter()
+
+        # Drift checks run in the background; a redirect found for an earlier
+        # answer is applied to this turn's question
+        drift_redirect = self._take_drift_redirect()
+        # A fold finished since the last turn shrinks this turn's prompt
+        if self.rolling_summary:
+            apply_memory(self.session, BACKGROUND.take(self._memory_key))
+        if self.incremental_analysis:
+            apply_analysis_state(self.session, BACKGROUND.take(self._analysis_state_key))
+        drift_checked = bool(
+            self.drift_check_every and self.turn_count % self.drift_check_every == 0
         )
+        if drift_checked:
+            BACKGROUND.submit(
+                self._drift_key, self._check_drift, self.session.current_question, answer.answer
+            )
 
-        # Check if interview is complete
-        is_complete = question_data.target_goal == "wrap_up"
+        if self.concurrent:
+            # Generate the next question from the new answer plus the previous
+            # turn's goals/facts while facts and goals are updated alongside it
+            previous_goals = list(self.session.goals)
+            previous_facts = list(self.session.facts)
+            updates = _PIPELINE_EXECUTOR.submit(
+                self._extract_and_update,
+                self.session.current_question,
+                answer,
+                previous_goals,
+                triage,
+                implication,
+            )
+            question_data = self._generate_next_question(
+                previous_goals, previous_facts, drift_redirect
+            )
+            gen_facts, updated_goals = updates.result()
+            self._add_facts(gen_facts)
+            self.session.goals = updated_goals
+            if question_data.implications and updated_goals != previous_goals:
+                # Precomputed goal updates are absolute confidences judged against
+                # the pre-update goals; committing them would undo this update
+                question_data.implications = []
+                TELEMETRY.increment("extraction.implications_stale")
+            # The question saw pre-update goals; decide wrap-up from the merged state
+            if (
+                question_data.target_goal != "wrap_up"
+                and self._average_confidence() > self.session.confidence_threshold
+            ):
+                # The question generated alongside is an ordinary one that will never
+                # be answered; ask again from the merged goals for the closing message
+                question_data = self._generate_next_question(
+                    self.session.goals, self.session.facts, drift_redirect
+                )
+                question_data.target_goal = "wrap_up"
+            is_complete = question_data.target_goal == "wrap_up"
+        else:
+            # OPTIMIZATION: Combined fact extraction + goal tracking in single API call
+            gen_facts, updated_goals = self._extract_and_update(
+                self.session.current_question,
+                answer,
+                self.session.goals,
+                triage,
+                implication,
+            )
+            # Add facts to session.facts
+            self._add_facts(gen_facts)
+            # Update goals
+            self.session.goals = updated_goals
+
+            # Step 4: Generate next question
+            question_data = self._generate_next_question(
+                self.session.goals, self.session.facts, drift_redirect
+            )
+
+            # Check if interview is complete
+            is_complete = question_data.target_goal == "wrap_up"
+
+        turn_ms = (time.perf_counter() - turn_start) * 1000
+        TELEMETRY.observe("turn:process_answer", turn_ms)
+        TELEMETRY.observe(
+            "turn:process_answer:" + ("drift_check" if drift_checked else "no_drift_check"),
+            turn_ms,
+        )
 
         next_question = question_data.question
         self.session.current_question = next_question
         self.session.answers = question_data.answers
+        self.session.answer_implications = question_data.implications
         self.session.turn_count = self.turn_count
 
         # Add to message history
@@ -164,5 +348,134 @@ class InterviewOrchestrator:
 
         if is_complete:
             self.session.status = SessionStatus.COMPLETE
+            # Nothing will fold or redirect again; only the analysis state below
+            # is still wanted (the analysis request takes it)
+            BACKGROUND.discard(self._drift_key)
+            BACKGROUND.discard(self._memory_key)
+        elif (
+            self.rolling_summary
+            and not BACKGROUND.pending(self._memory_key)
+            and self.rolling_memory.due(self.session)
+        ):
+            # Folded off the response path; picked up by a later turn
+            snapshot = self.session.model_copy(
+                update={"messages": list(self.session.messages), "facts": list(self.session.facts)}
+            )
+            BACKGROUND.submit(self._memory_key, self.rolling_memory.fold, snapshot)
+
+        # Also after the last turn: the analysis request picks that update up
+        if (
+            self.incremental_analysis
+            and not BACKGROUND.pending(self._analysis_state_key)
+            and analysis_state_due(self.session)
+        ):
+            BACKGROUND.submit(
+                self._analysis_state_key,
+                self.incremental_analysis_agent.update_state,
+                self.session.analysis_state,
+                list(self.session.facts),
+                list(self.session.goals),
+                session_id=self.session_id,
+            )
 
         return next_question, is_complete
+
+    def _add_facts(self, facts: list[Fact]) -> None:
+        if self.fact_deduplicator is None:
+            self.session.facts.extend(facts)
+            return
+        self.fact_deduplicator.insert(self.session.facts, facts, turn=self.turn_count)
+
+    def _generate_next_question(
+        self, goals: list[Goal], facts: list[Fact], drift_redirect: str
+    ) -> QuestionWithAnswers:
+        return self.question_generator.generate_question_with_answers(
+            goals,
+            facts,
+            self.session.messages,
+            extracted_summary=self.session.extracted_summary, # type: ignore
+            drift_redirect=drift_redirect,
+            session_id=self.session_id,
+            interviewee_name=self.session.interviewee_name,
+            interviewee_role=self.session.interviewee_role,
+            confidence_threshold=self.session.confidence_threshold,
+            precompute_implications=self.precompute_option_facts,
+            memory=self.session.memory,
+            fact_index=self.fact_index,
+        )
+
+    def _extract_and_update(
+        self,
+        question: str,
+        answer: Answer,
+        goals: list[Goal],
+        triage: Optional[TriageResult],
+        implication: Optional[OptionImplication] = None,
+    ) -> tuple[list[Fact], list[Goal]]:
+        """
+        Facts and updated goals for an answer.
+
+        Triaged-out answers change nothing; canned options with precomputed
+        implications are committed directly; anything else goes to the model.
+        """
+        if triage is not None and triage.skip:
+            return [], list(goals)
+        if implication is not None:
+            TELEMETRY.increment("extraction.precomputed")
+            return list(implication.facts), apply_goal_updates(
+                goals, [u.model_dump() for u in implication.goal_updates]
+            )
+        TELEMETRY.increment("extraction.called")
+        return self.fact_and_goal_updater.extract_and_update(
+            question, answer, goals, session_id=self.session_id
+        )
+
+    def _implication_for(self, answer: Answer) -> Optional[OptionImplication]:
+        """Precomputed implication for a canned option, matched on the server's copy."""
+        text = answer.answer.strip()
+        for implication in self.session.answer_implications:
+            if implication.answer.strip() == text:
+                return implication
+        return None
+
+    @property
+    def _drift_key(self) -> str:
+        return f"drift:{self.session_id}"
+
+    @property
+    def _memory_key(self) -> str:
+        return f"memory:{self.session_id}"
+
+    @property
+    def _analysis_state_key(self) -> str:
+        return analysis_state_key(self.session_id)
+
+    def _check_drift(self, question: str, answer_text: str) -> str:
+        """Run a drift check and return its redirect suggestion ("" if on topic)."""
+        start = time.perf_counter()
+        drift_analysis = self.drift_detector.check_drift(
+            question, answer_text, session_id=self.session_id
+        )
+        TELEMETRY.observe("drift:check", (time.perf_counter() - start) * 1000)
+        TELEMETRY.increment("drift.checked")
+        if drift_analysis.addressed_question:
+            return ""
+        TELEMETRY.increment("drift.detected")
+        return drift_analysis.redirect_suggestion
+
+    def _take_drift_redirect(self) -> str:
+        """Redirect from a finished background drift check; never waits for one."""
+        if BACKGROUND.pending(self._drift_key):
+            redirect = BACKGROUND.take(self._drift_key)
+            if redirect is None and BACKGROUND.pending(self._drift_key):
+                # Still running: leave it for the next turn rather than block this one
+                TELEMETRY.increment("drift.not_ready")
+                return ""
+            if redirect:
+                TELEMETRY.increment("drift.applied")
+                return redirect
+        return ""
+
+    def _average_confidence(self) -> float:
+        goals = self.session.goals
+        return sum(g.confidence for g in goals) / len(goals) if goals else 0
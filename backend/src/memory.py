@@ -0,0 +1,84 @@
+"""Rolling conversation summary that bounds per-turn prompt growth.
+
+Question prompts only show recent facts and messages, so in long interviews
+older answers fall out of view and get asked about again; the analysis prompt
+meanwhile carries the whole transcript. With ROLLING_SUMMARY=true, every
+ROLLING_SUMMARY_EVERY turns the exchanges and facts that have left the recent
+window are folded into session.memory by a small background call (never on
+the response path; the result is applied on the next turn, like drift
+checks). Prompts then show the summary plus everything not yet folded in, so
+their size stays roughly constant however long the interview runs.
+
+Configure with environment variables:
+    ROLLING_SUMMARY=true
+    ROLLING_SUMMARY_EVERY=3        # turns between folds
+    ROLLING_SUMMARY_MESSAGES=6     # most recent messages always kept verbatim
+    ROLLING_SUMMARY_FACTS=10       # most recent facts always kept verbatim
+"""
+
+import time
+from typing import Optional
+
+from .agents.conversation_summarizer import ConversationSummarizerAgent
+from .env import env_flag, env_int
+from .models import ConversationMemory, Session
+from .telemetry import TELEMETRY
+
+
+def rolling_summary_enabled() -> bool:
+    return env_flag("ROLLING_SUMMARY")
+
+
+
+class RollingMemory:
+    """Decides when to fold and builds the next ConversationMemory."""
+
+    def __init__(
+        self,
+        summarizer: ConversationSummarizerAgent,
+        every: Optional[int] = None,
+        keep_messages: Optional[int] = None,
+        keep_facts: Optional[int] = None,
+    ):
+        self.summarizer = summarizer
+        self.every = every or env_int("ROLLING_SUMMARY_EVERY", 3)
+        self.keep_messages = (
+            env_int("ROLLING_SUMMARY_MESSAGES", 6) if keep_messages is None else keep_messages
+        )
+        self.keep_facts = env_int("ROLLING_SUMMARY_FACTS", 10) if keep_facts is None else keep_facts
+
+    def due(self, session: Session) -> bool:
+        """A fold is due once a full cadence of turns sits beyond the recent window."""
+        unfolded = len(session.messages) - session.memory.covered_messages
+        return unfolded >= self.keep_messages + 2 * self.every
+
+    def fold(self, session: Session) -> ConversationMemory:
+        """
+        Fold everything older than the recent window into a new memory.
+
+        Reads only a snapshot taken by the caller, so it is safe to run in
+        the background while the session moves on.
+        """
+        memory = session.memory
+        message_end = max(memory.covered_messages, len(session.messages) - self.keep_messages)
+        fact_end = max(memory.covered_facts, len(session.facts) - self.keep_facts)
+        start = time.perf_counter()
+        summary = self.summarizer.fold(
+            memory.summary,
+            session.messages[memory.covered_messages:message_end],
+            session.facts[memory.covered_facts:fact_end],
+            session_id=session.session_id,
+        )
+        TELEMETRY.observe("memory:fold", (time.perf_counter() - start) * 1000)
+        TELEMETRY.increment("memory.folded")
+        return ConversationMemory(
+            summary=summary, covered_messages=message_end, covered_facts=fact_end
+        )
+
+
+def apply_memory(session: Session, memory: Optional[ConversationMemory]) -> bool:
+    """Adopt a finished fold unless the session already has a newer one."""
+    if memory is None or memory.covered_messages <= session.memory.covered_messages:
+        return False
+    session.memory = memory
+    return True
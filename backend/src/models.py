@@ -12,6 +12,7 @@ class GoalStatus(str, Enum):
 
 class Goal(BaseModel):
     description: str
+    id: str = ""  # Short stable ID ("g1") referenced in prompts and tool outputs
     status: GoalStatus = GoalStatus.NOT_STARTED
     confidence: int = Field(default=0)
 
@@ -27,6 +28,7 @@ class Fact(BaseModel):
     source: str = "user"
     timestamp: Union[str, None] = None
     confidence: str = Field(default="certain")  # "certain" or "uncertain"
+    turns: list[int] = Field(default_factory=list)  # Turns whose answers stated it (FACT_DEDUP)
 
 
 class Message(BaseModel):
@@ -91,12 +93,27 @@ class DriftAnalysis(BaseModel):
     redirect_suggestion: str
 
 
+class GoalUpdate(BaseModel):
+    """New confidence and status for one goal, referenced by goal ID."""
+    goal_id: str
+    confidence: int
+    status: GoalStatus
+
+
+class OptionImplication(BaseModel):
+    """Facts and goal impact the model expects if this answer option is picked."""
+    answer: str
+    facts: list[Fact] = Field(default_factory=list)
+    goal_updates: list[GoalUpdate] = Field(default_factory=list)
+
+
 class QuestionWithAnswers(BaseModel):
     """Interview question with multiple choice answers."""
     question: str
     target_goal: str
     reasoning: str
     answers: list[Answer]
+    implications: list[OptionImplication] = Field(default_factory=list)
 
     @field_validator("answers")
     @classmethod
@@ -131,12 +148,37 @@ class AnalysisReport(BaseModel):
     verdict: Verdict
 
 
+class AnalysisState(BaseModel):
+    """Running analysis kept up to date during the interview (INCREMENTAL_ANALYSIS)."""
+    timeline: list[TimelineEvent] = Field(default_factory=list)
+    key_facts: list[str] = Field(default_factory=list)
+    gaps: list[str] = Field(default_factory=list)
+    covered_facts: int = 0  # session.facts[:covered_facts] are reflected in it
+
+
+class ConversationMemory(BaseModel):
+    """Running summary of the interview older than the recent window."""
+    summary: str = ""
+    covered_messages: int = 0  # session.messages[:covered_messages] are folded in
+    covered_facts: int = 0  # session.facts[:covered_facts] are folded in
+
+
+class ImageRef(BaseModel):
+    """Uploaded image kept in the content-addressed image store."""
+    sha256: str
+    media_type: str
+    width: int = 0
+    height: int = 0
+    size: int = 0  # bytes on disk
+
+
 class Session(BaseModel):
     session_id: str
     incident_name: str
     created_at: str
     status: SessionStatus = SessionStatus.ACTIVE
     summary: str = ""
+    images: list[ImageRef] = Field(default_factory=list)  # Hashes into the image store, never inlined
     extracted_summary: Union[ExtractedSummary, None] = None
     interviewee_name: str = ""
     interviewee_role: str = ""  # "participant", "witness", "secondhand", "friend"
@@ -144,6 +186,11 @@ class Session(BaseModel):
     goals: list[Goal] = Field(default_factory=list)
     messages: list[Message] = Field(default_factory=list)
     facts: list[Fact] = Field(default_factory=list)
+    memory: ConversationMemory = Field(default_factory=ConversationMemory)
+    analysis_state: AnalysisState = Field(default_factory=AnalysisState)
     answers: list[Answer] = Field(default_factory=list)
+    # Precomputed per-option facts/goal impact, kept server-side (not sent to clients)
+    answer_implications: list[OptionImplication] = Field(default_factory=list)
     current_question: str = ""
     turn_count: int = 0
+    analysis: AnalysisReport | None = None  # Latest stored analysis (bulk reprocessing)
@@ -1,5 +1,19 @@
+from .context_builder import (
+    ContextBuilder,
+    ContextSection,
+    estimate_tokens,
+    summarize_omitted,
+    truncate_to_tokens,
+)
 from .models import ExtractedSummary
-from typing import Union
+from .timeline import LocalTimeline
+from typing import Optional, Union
+
+# Longest single transcript message kept when prompts are budgeted
+MAX_MESSAGE_TOKENS = 300
+
+# Share of a budgeted question prompt kept for facts however long the conversation
+MIN_FACT_SHARE = 0.3
 
 TONE_SYSTEM_PROMPT = """
 You're the game host who's three martinis deep and has OPINIONS. You're serving Gen Z realness with a side of messy drama. Think: if your group chat became sentient and hosted a trivia night.
@@ -118,6 +132,17 @@ OUTPUT REQUIREMENTS:
 - Extract facts as stated, avoid speculation in main fields (save speculation for missing_info)
 """
 
+IMAGE_TRANSCRIPTION_SYSTEM = """You are a screenshot transcription agent in the Drama Detective system.
+Your job: Turn one screenshot of a conversation into text, so it can be analyzed without the image.
+
+Use the 'transcribe_screenshot' tool to return your response.
+
+- Transcribe every visible message in order as 'Sender [time]: text'; use the name label, or "Me" for blue/right-side bubbles
+- Keep timestamps and day separators exactly as shown
+- In observations, note what the transcript can't carry: reactions, read receipts, typing indicators, long gaps, deleted messages, conversations cut off at the top or bottom
+- Transcribe only; don't interpret the drama
+"""
+
 GOAL_GENERATOR_SYSTEM = """You are a goal generation agent in the Drama Detective system.
 Your job: Generate 3-4 specific investigation goals based on a drama incident summary.
 
@@ -172,6 +197,7 @@ Your job: Update goal confidence scores based on newly extracted facts.
 Use the 'update_goal_progress' tool to return your response.
 
 Guidelines:
+- Refer to each goal by its ID (e.g. g1), not its description
 - Increase confidence when new facts directly address a goal
 - Mark status as "complete" when confidence >= 80
 - Provide brief reasoning for confidence changes
@@ -192,6 +218,7 @@ Guidelines for fact extraction:
 - Mark confidence level (certain vs uncertain)
 
 Guidelines for goal updates:
+- Refer to each goal by its ID (e.g. g1), not its description
 - Increase confidence when new facts directly address a goal
 - Mark status as "complete" when confidence >= 80
 - Provide brief reasoning for confidence changes
@@ -272,12 +299,40 @@ Guidelines for answer generation:
 - All of the participants in the incidents are gay
 """
 
-ANALYSIS_SYSTEM = """You are an analysis agent in the Drama Detective system.
-Your job: Synthesize all interview data into a comprehensive report.
+OPTION_IMPLICATIONS_INSTRUCTIONS = """
 
-Use the 'generate_analysis_report' tool to return your response.
+For EACH answer option also fill in:
+- implied_facts: the concrete facts that picking this option would establish (empty for evasive or "I don't know" options)
+- goal_impact: every goal's confidence and status as they would be after this option is picked, referencing goals by their ID (e.g. g1)"""
+
+CONVERSATION_SUMMARY_SYSTEM = """You are a memory agent in the Drama Detective system.
+Your job: Keep a compact running summary of a long interview, so later questions don't re-ask what was already covered.
+
+Use the 'update_conversation_summary' tool to return your response.
+
+Guidelines:
+- Merge the new exchanges and facts into the previous summary; never drop anything the previous summary established
+- Keep who said what, what was confirmed or denied, and what the interviewee avoided or couldn't answer
+- Note questions already asked so they aren't repeated
+- Plain prose or short bullet lines, under 250 words
+"""
+
+VERDICT_GUIDELINES = """Verdict:
+- Assign responsibility percentages that add to 100%
+- Be specific about who did what and why they're responsible
+- Primary responsibility should be the person most at fault
+- Contributing factors explain other parties' roles with their percentages
+- Be fair but don't shy away from calling out problematic behavior
 
-UNDERSTANDING THE INPUT DATA:
+Drama Rating (1-10):
+- 1-3: Minor misunderstanding, easily resolved
+- 4-6: Moderate conflict, requires honest conversation
+- 7-8: Serious issue, may damage relationships
+- 9-10: Severe drama, potentially friendship-ending
+- Explanation should justify the rating and suggest resolution path
+"""
+
+ANALYSIS_GUIDELINES = """UNDERSTANDING THE INPUT DATA:
 
 You will receive complete session data from an interactive interview investigation:
 1. Incident Name & Summary
@@ -306,21 +361,68 @@ Gaps:
 - Don't list gaps that are irrelevant to understanding the drama
 - If investigation was thorough, gaps list can be short or empty
 
-Verdict:
-- Assign responsibility percentages that add to 100%
-- Be specific about who did what and why they're responsible
-- Primary responsibility should be the person most at fault
-- Contributing factors explain other parties' roles with their percentages
-- Be fair but don't shy away from calling out problematic behavior
+""" + VERDICT_GUIDELINES
 
-Drama Rating (1-10):
-- 1-3: Minor misunderstanding, easily resolved
-- 4-6: Moderate conflict, requires honest conversation
-- 7-8: Serious issue, may damage relationships
-- 9-10: Severe drama, potentially friendship-ending
-- Explanation should justify the rating and suggest resolution path
+ANALYSIS_SYSTEM = """You are an analysis agent in the Drama Detective system.
+Your job: Synthesize all interview data into a comprehensive report.
+
+Use the 'generate_analysis_report' tool to return your response.
+
+""" + ANALYSIS_GUIDELINES
+
+# PARALLEL_ANALYSIS: one request per report section, all sharing this system
+# prompt, the tools and the session data as a cached prefix
+ANALYSIS_SECTIONS_SYSTEM = """You are an analysis agent in the Drama Detective system.
+Your job: Synthesize all interview data into a comprehensive report, one section at a time.
+
+Each request ends by naming the section to write; return it with that section's tool and nothing else.
+
+""" + ANALYSIS_GUIDELINES
+
+LOCAL_TIMELINE_TASK = """The timeline above is already built; don't repeat it. In timeline_additions, place only
+facts whose time is unclear and key events from the conversation that are missing, each
+with after = the number of the timeline entry it follows (0 = before the first).
+"""
+
+# Per-section request appended after the shared (cached) analysis prompt
+ANALYSIS_SECTION_TASKS = {
+    "timeline": "SECTION: timeline. Call generate_timeline.",
+    "key_facts": "SECTION: key facts. Call generate_key_facts.",
+    "gaps": "SECTION: gaps. Call generate_gaps.",
+    "verdict": (
+        "SECTION: verdict. Call generate_verdict. Judge from the goals and facts above; "
+        "the timeline, key facts and gaps are written separately."
+    ),
+}
+
+ANALYSIS_STATE_SYSTEM = """You are an analysis agent in the Drama Detective system.
+Your job: Keep a running analysis of an interview up to date as new facts come in, so the final report doesn't have to be rebuilt from the whole transcript.
+
+Use the 'update_analysis_state' tool to return your response.
+
+Guidelines:
+- Timeline: add events from the new facts that have a time reference, in chronological order; keep earlier entries unless a new fact corrects them
+- Key facts: merge the new facts into the list; drop redundancy, keep nuance, stay under 15 items
+- Gaps: remove gaps the new facts close; add gaps that would change the verdict if known, judging by the goals' confidence
+- Return the complete updated state, not just the changes
 """
 
+VERDICT_SYSTEM = """You are an analysis agent in the Drama Detective system.
+Your job: Decide who is responsible for the drama, given the timeline, key facts and gaps already compiled during the interview.
+
+Use the 'generate_verdict' tool to return your response.
+
+Weigh uncertain facts and open gaps before assigning blame; facts listed as not yet reflected in the analysis are new and count too.
+
+""" + VERDICT_GUIDELINES
+
+
+def goal_label(goal: dict) -> str:
+    """'[g1] description' when the goal has an ID, else just the description."""
+    if goal.get("id"):
+        return f"[{goal['id']}] {goal['description']}"
+    return goal["description"]
+
 
 def build_summary_extractor_prompt(raw_summary: str) -> str:
     """
@@ -345,6 +447,55 @@ Extract structured data from this drama summary. Analyze the text carefully to i
 Return only the JSON object, no additional text."""
 
 
+def build_screenshot_transcripts_prompt(raw_summary: str, transcriptions: list[dict]) -> str:
+    """
+    Build the summary extractor prompt from screenshot transcriptions instead of images.
+
+    Args:
+        raw_summary: User's free-form description of the drama (may be empty)
+        transcriptions: transcribe_screenshot outputs, in upload order
+
+    Returns:
+        Formatted prompt ready for LLM API call
+    """
+    screenshots = []
+    for number, transcription in enumerate(transcriptions, 1):
+        observations = "\n".join(f"- {o}" for o in transcription.get("observations", []))
+        screenshots.append(
+            f"Screenshot {number}:\n{transcription.get('transcript', '')}"
+            + (f"\nVisual cues:\n{observations}" if observations else "")
+        )
+    return build_summary_extractor_prompt(raw_summary) + (
+        "\n\nThe user also uploaded screenshots, transcribed below:\n\n"
+        + "\n\n".join(screenshots)
+    )
+
+
+def build_summary_chunk_prompt(chunk: str, number: int, total: int) -> str:
+    """
+    Build the summary extractor prompt for one part of a long pasted chat log.
+
+    Args:
+        chunk: Consecutive whole messages from the log
+        number: 1-based position of this part
+        total: Number of parts the log was split into
+
+    Returns:
+        Formatted prompt ready for LLM API call
+    """
+    return f"""Part {number} of {total} of a long chat log pasted by the user:
+
+{chunk}
+
+Extract structured data from this part only; the other parts are extracted separately and merged.
+- Every actor who speaks or is mentioned, with relationships and emotional states shown here
+- The conflict(s) visible in this part
+- Timeline markers exactly as written (dates, times, "yesterday")
+- Missing information about the drama itself; don't flag context that is simply in another part
+
+Return only the JSON object, no additional text."""
+
+
 def build_summary_and_goals_prompt(raw_summary: str) -> str:
     """
     Build combined prompt for summary extraction AND goal generation in one API call.
@@ -483,7 +634,7 @@ Return only the JSON object, no additional text."""
 def build_goal_tracker_prompt(goals: list, new_facts: list) -> str:
     goals_text = "\n".join(
         [
-            f"- {g['description']} (current confidence: {g['confidence']}%)"
+            f"- {goal_label(g)} (current confidence: {g['confidence']}%)"
             for g in goals
         ]
     )
@@ -513,7 +664,7 @@ def build_fact_and_goal_update_prompt(question: str, answer_obj: dict, goals: li
     """
     goals_text = "\n".join(
         [
-            f"- {g['description']} (current confidence: {g['confidence']}%)"
+            f"- {goal_label(g)} (current confidence: {g['confidence']}%)"
             for g in goals
         ]
     )
@@ -550,7 +701,7 @@ def build_question_generator_prompt(
 ) -> str:
     goals_text = "\n".join(
         [
-            f"- {g['description']} (confidence: {g['confidence']}%, status: {g['status']})"
+            f"- {goal_label(g)} (confidence: {g['confidence']}%, status: {g['status']})"
             for g in goals
         ]
     )
@@ -591,6 +742,9 @@ def build_question_with_answers_prompt(
     extracted_summary: ExtractedSummary,
     interviewee_name: str = "",
     interviewee_role: str = "",
+    token_budget: Optional[int] = None,
+    conversation_summary: str = "",
+    facts_ranked: bool = False,
 ) -> str:
         # Format actors section
     actors_text = "\n".join([
@@ -625,20 +779,11 @@ def build_question_with_answers_prompt(
     """Build prompt for merged question + answers generation."""
     goals_text = "\n".join(
         [
-            f"- {g['description']} (confidence: {g['confidence']}%, status: {g['status']})"
+            f"- {goal_label(g)} (confidence: {g['confidence']}%, status: {g['status']})"
             for g in goals
         ]
     )
 
-    facts_text = "\n".join([f"- {f['claim']}" for f in facts[-10:]])  # Last 10 facts
-
-    conversation_text = "\n".join(
-        [
-            f"{m['role'].upper()}: {m['content']}"
-            for m in recent_messages[-6:]  # Last 3 exchanges
-        ]
-    )
-
     drift_text = (
         f"\n\nIMPORTANT: Previous answer went off-track. Suggested redirect: {drift_redirect}"
         if drift_redirect
@@ -669,7 +814,15 @@ Consider this person's perspective when generating questions:
 
 """
 
-    return f"""{interviewee_context}
+    # Older turns folded into a rolling summary; facts/messages are then only the unfolded tail
+    earlier_text = (
+        f"Earlier in the interview (summary):\n{conversation_summary}\n\n"
+        if conversation_summary
+        else ""
+    )
+
+    def render(facts_text: str, conversation_text: str) -> str:
+        return f"""{interviewee_context}
 
 DRAMA INCIDENT CONTEXT:
 
@@ -682,7 +835,7 @@ CONFLICTS IDENTIFIED:
 Investigation goals:
 {goals_text}
 
-Facts gathered so far:
+{earlier_text}Facts gathered so far:
 {facts_text}
 
 Recent conversation:
@@ -691,66 +844,256 @@ Recent conversation:
 Generate the next best question to ask along with 4 multiple choice answer options.
 Return only the JSON object, no additional text."""
 
+    fact_lines = [f"- {f['claim']}" for f in facts]
+    message_lines = [f"{m['role'].upper()}: {m['content']}" for m in recent_messages]
+
+    if token_budget is None:
+        # Unbudgeted: last 10 facts and last 3 exchanges, unless facts were already
+        # ranked (FACT_RETRIEVAL) or the rolling summary bounds the unfolded tail
+        shown_facts = fact_lines if facts_ranked or conversation_summary else fact_lines[-10:]
+        shown_messages = message_lines if conversation_summary else message_lines[-6:]
+        return render("\n".join(shown_facts), "\n".join(shown_messages))
+
+    # Budgeted: the recent conversation fills first, then as many facts as fit,
+    # with MIN_FACT_SHARE of the budget held back so facts are never squeezed out
+    built = ContextBuilder(token_budget - estimate_tokens(render("", ""))).build([
+        ContextSection(
+            "conversation",
+            message_lines,
+            priority=0,
+            summarize=summarize_omitted("messages"),
+            max_item_tokens=MAX_MESSAGE_TOKENS,
+        ),
+        ContextSection(
+            "facts",
+            fact_lines,
+            priority=1,
+            summarize=summarize_omitted(
+                "facts", {line: f.get("topic", "") for line, f in zip(fact_lines, facts, strict=True)}
+            ),
+            min_share=MIN_FACT_SHARE,
+        ),
+    ])
+    return render(built.text("facts"), built.text("conversation"))
+
+
+def build_conversation_summary_prompt(previous_summary: str, messages: list, facts: list) -> str:
+    """
+    Build prompt for folding older exchanges and facts into the running summary.
+
+    Args:
+        previous_summary: Summary so far ("" on the first fold)
+        messages: Message dicts (role, content) leaving the recent window
+        facts: Fact dicts (claim, confidence) leaving the recent window
+    """
+    messages_text = "\n".join(f"{m['role'].upper()}: {m['content']}" for m in messages)
+    facts_text = "\n".join(
+        f"- [{f.get('confidence', 'certain')}] {f['claim']}" for f in facts
+    )
+    return f"""Summary so far:
+{previous_summary or "(none yet)"}
+
+New exchanges to fold in:
+{messages_text or "(none)"}
+
+New facts to fold in:
+{facts_text or "(none)"}
+
+Return the updated summary."""
+
 
-def build_analysis_prompt(session_data: dict) -> str:
+def build_analysis_prompt(
+    session_data: dict,
+    token_budget: Optional[int] = None,
+    local_timeline: Optional[LocalTimeline] = None,
+    sectioned: bool = False,
+) -> str:
     """
     Build comprehensive analysis prompt with all session data.
 
     Args:
         session_data: Dict containing incident_name, summary, goals, facts, messages, turn_count
+        token_budget: Optional input budget; older facts and transcript are
+            summarized or dropped to fit it
+        local_timeline: Timeline built from fact timestamps (LOCAL_TIMELINE); its
+            facts are shown once, as numbered events, and the model only places the rest
+        sectioned: End with a generic task (PARALLEL_ANALYSIS), so the prompt is a
+            prefix shared by every section request; see ANALYSIS_SECTION_TASKS
     """
     # Format goals with confidence scores
     goals_text = "\n".join(
         [
-            f"- {g['description']} (confidence: {g.get('confidence', 0)}%, status: {g.get('status', 'not_started')})"
+            f"- {goal_label(g)} (confidence: {g.get('confidence', 0)}%, status: {g.get('status', 'not_started')})"
             for g in session_data["goals"]
         ]
     )
 
     # Format facts with confidence and timestamps
-    facts_text = "\n".join(
-        [
-            f"- [{f.get('confidence', 'uncertain')}] {f['claim']}"
-            + (f" (at {f['timestamp']})" if f.get("timestamp") else "")
-            for f in session_data["facts"]
-        ]
-    )
-
-    # Format conversation messages
-    messages_text = "\n".join(
-        [
-            f"{m['role'].upper()}: {m['content']}"
-            for m in session_data.get("messages", [])
-        ]
-    )
+    facts = session_data["facts"]
+    timeline_text = ""
+    timeline_task = ""
+    if local_timeline is not None:
+        # Facts already on the timeline aren't repeated in the facts list
+        placed = {event.event for event in local_timeline.events}
+        facts = [f for f in facts if f["claim"] not in placed]
+        timeline_text = "TIMELINE (built from fact timestamps, in order):\n" + (
+            "\n".join(
+                f"{number}. {event.time}: {event.event}"
+                for number, event in enumerate(local_timeline.events, start=1)
+            )
+            or "(no dated facts)"
+        ) + "\n\n"
+        # With sections, only the timeline request needs this
+        timeline_task = "" if sectioned else "\n" + LOCAL_TIMELINE_TASK
+    fact_lines = [
+        f"- [{f.get('confidence', 'uncertain')}] {f['claim']}"
+        + (f" (at {f['timestamp']})" if f.get("timestamp") else "")
+        for f in facts
+    ]
+
+    # Format conversation messages; with a rolling summary only the unfolded tail is verbatim
+    memory = session_data.get("memory") or {}
+    earlier_text = ""
+    messages = session_data.get("messages", [])
+    if memory.get("summary"):
+        earlier_text = f"EARLIER IN THE INTERVIEW (summary):\n{memory['summary']}\n\n"
+        messages = messages[memory.get("covered_messages", 0):]
+    message_lines = [f"{m['role'].upper()}: {m['content']}" for m in messages]
 
     # Get turn count
     turn_count = session_data.get(
         "turn_count", len(session_data.get("messages", [])) // 2
     )
 
-    return f"""Complete interview session data:
+    summary = session_data["summary"]
+    if token_budget is not None:
+        # A pasted chat log can't be allowed to eat the whole budget
+        summary = truncate_to_tokens(summary, token_budget // 4)
+
+    def render(facts_text: str, messages_text: str) -> str:
+        return f"""Complete interview session data:
 
 INCIDENT DETAILS:
 - Name: {session_data["incident_name"]}
-- Initial Summary: {session_data["summary"]}
+- Initial Summary: {summary}
 - Total Interview Turns: {turn_count}
 
 INVESTIGATION GOALS (with confidence scores):
 {goals_text}
 
-FACTS GATHERED (with confidence levels and timestamps):
+{timeline_text}FACTS GATHERED (with confidence levels and timestamps):
 {facts_text}
 
-COMPLETE CONVERSATION TRANSCRIPT:
+{earlier_text}{"RECENT CONVERSATION" if earlier_text else "COMPLETE CONVERSATION TRANSCRIPT"}:
 {messages_text}
 
 ANALYSIS TASK:
-Based on this complete session data, generate your comprehensive analysis report.
+Based on this complete session data, {"write the report section requested below" if sectioned else "generate your comprehensive analysis report"}.
 Consider:
 - How well each goal was addressed (shown by confidence %)
 - The reliability of each fact (certain vs uncertain)
 - The narrative flow from the conversation
 - The depth of investigation (turn count)
-
+{timeline_task}
 Return only the JSON object, no additional text."""
+
+    if token_budget is None:
+        return render("\n".join(fact_lines), "\n".join(message_lines))
+
+    # Facts are the distilled record, so they fill before the raw transcript
+    built = ContextBuilder(token_budget - estimate_tokens(render("", ""))).build([
+        ContextSection(
+            "facts",
+            fact_lines,
+            priority=0,
+            summarize=summarize_omitted(
+                "facts",
+                {line: f.get("topic", "") for line, f in zip(fact_lines, facts, strict=True)},
+            ),
+        ),
+        ContextSection(
+            "messages",
+            message_lines,
+            priority=1,
+            summarize=summarize_omitted("messages"),
+            max_item_tokens=MAX_MESSAGE_TOKENS,
+        ),
+    ])
+    return render(built.text("facts"), built.text("messages"))
+
+
+def _analysis_state_text(state: dict) -> str:
+    timeline_text = "\n".join(f"- {e['time']}: {e['event']}" for e in state.get("timeline", []))
+    key_facts_text = "\n".join(f"- {f}" for f in state.get("key_facts", []))
+    gaps_text = "\n".join(f"- {g}" for g in state.get("gaps", []))
+    return f"""TIMELINE:
+{timeline_text or "(none yet)"}
+
+KEY FACTS:
+{key_facts_text or "(none yet)"}
+
+OPEN GAPS:
+{gaps_text or "(none yet)"}"""
+
+
+def build_analysis_state_prompt(
+    state: dict, new_facts: list, goals: list, local_timeline: bool = False
+) -> str:
+    """
+    Build prompt for merging one turn's facts into the running analysis.
+
+    Args:
+        state: AnalysisState dict (timeline, key_facts, gaps) so far
+        new_facts: Fact dicts (claim, confidence, timestamp) added since the last update
+        goals: Goal dicts with confidence scores
+        local_timeline: The timeline is built locally (LOCAL_TIMELINE); only key facts and gaps are asked for
+    """
+    goals_text = "\n".join(
+        f"- {goal_label(g)} (confidence: {g.get('confidence', 0)}%)" for g in goals
+    )
+    facts_text = "\n".join(
+        f"- [{f.get('confidence', 'uncertain')}] {f['claim']}"
+        + (f" (at {f['timestamp']})" if f.get("timestamp") else "")
+        for f in new_facts
+    )
+    return f"""Current analysis:
+
+{_analysis_state_text(state)}
+
+INVESTIGATION GOALS:
+{goals_text}
+
+NEW FACTS:
+{facts_text}
+
+Return the updated {"key facts and gaps (the timeline is built separately)" if local_timeline else "analysis"}."""
+
+
+def build_verdict_prompt(session_data: dict, state: dict, new_facts: list) -> str:
+    """
+    Build prompt for the verdict alone, from the running analysis.
+
+    Args:
+        session_data: Dict containing incident_name, summary and goals
+        state: AnalysisState dict compiled during the interview
+        new_facts: Fact dicts not yet merged into state
+    """
+    goals_text = "\n".join(
+        f"- {goal_label(g)} (confidence: {g.get('confidence', 0)}%, status: {g.get('status', 'not_started')})"
+        for g in session_data["goals"]
+    )
+    new_facts_text = ""
+    if new_facts:
+        new_facts_text = "\n\nFACTS NOT YET REFLECTED ABOVE:\n" + "\n".join(
+            f"- [{f.get('confidence', 'uncertain')}] {f['claim']}" for f in new_facts
+        )
+    return f"""INCIDENT DETAILS:
+- Name: {session_data["incident_name"]}
+- Initial Summary: {truncate_to_tokens(session_data["summary"], 1000)}
+
+INVESTIGATION GOALS (with confidence scores):
+{goals_text}
+
+{_analysis_state_text(state)}{new_facts_text}
+
+Return the verdict."""
@@ -0,0 +1,92 @@
+"""Repair malformed or partial tool outputs instead of retrying the whole call.
+
+Local patches fix what can be fixed without the model (too many or too few
+answer options, missing optional fields). What can't be patched locally (an
+empty actors list, a tool the model never called) is sent back as a targeted
+follow-up for just that tool, with the original request and outputs as
+context; see ClaudeClient.call_tool_followup.
+"""
+
+import copy
+from typing import Optional
+
+from .telemetry import TELEMETRY, Telemetry
+
+ANSWER_OPTIONS = 4
+
+# Neutral options used to pad a short answer list
+FALLBACK_ANSWERS = [
+    {"answer": "I'm not sure", "reasoning": "Uncertain answer (added to complete the options)"},
+    {"answer": "I'd rather not say", "reasoning": "Evasive answer (added to complete the options)"},
+    {"answer": "Something else happened", "reasoning": "Open answer (added to complete the options)"},
+    {"answer": "I don't remember", "reasoning": "Non-answer (added to complete the options)"},
+]
+
+SUMMARY_DEFAULTS = {
+    "actors": [],
+    "point_of_conflict": {"primary": "", "secondary": []},
+    "general_details": {
+        "timeline_markers": [],
+        "location_context": [],
+        "communication_history": [],
+        "emotional_atmosphere": "",
+    },
+    "missing_info": [],
+}
+
+EMPTY_ACTORS_INSTRUCTION = (
+    "Your extract_summary_structure output had an empty actors list. Call "
+    "extract_summary_structure again with every person mentioned in the "
+    "summary listed in actors (at least one)."
+)
+
+TOO_FEW_GOALS_INSTRUCTION = (
+    "Your generate_investigation_goals output had fewer than 3 goals. Call "
+    "generate_investigation_goals again with 3-4 specific investigation goals."
+)
+
+
+def missing_tool_instruction(tool_name: str) -> str:
+    return f"You didn't call {tool_name}. Call {tool_name} now, based on the same input."
+
+
+def repair_question_output(data: dict, telemetry: Optional[Telemetry] = None) -> dict:
+    """Trim or pad a question's answer options to exactly four."""
+    telemetry = telemetry or TELEMETRY
+    answers = [a for a in data.get("answers", []) if a.get("answer")]
+    if len(answers) == ANSWER_OPTIONS:
+        return data
+
+    telemetry.increment("repair.local.answer_count")
+    if len(answers) > ANSWER_OPTIONS:
+        answers = answers[:ANSWER_OPTIONS]
+    else:
+        taken = {a["answer"].strip().lower() for a in answers}
+        for fallback in FALLBACK_ANSWERS:
+            if len(answers) == ANSWER_OPTIONS:
+                break
+            if fallback["answer"].lower() not in taken:
+                answers.append(dict(fallback))
+    return {**data, "answers": answers}
+
+
+def repair_summary_output(data: dict, telemetry: Optional[Telemetry] = None) -> dict:
+    """Fill missing summary fields with empty defaults (actors are never invented)."""
+    telemetry = telemetry or TELEMETRY
+    repaired = dict(data)
+    patched = False
+    for key, default in SUMMARY_DEFAULTS.items():
+        if key not in repaired or repaired[key] is None:
+            # Copies, so a caller appending to the output can't change the defaults
+            repaired[key] = copy.deepcopy(default)
+            patched = True
+        elif isinstance(default, dict) and isinstance(repaired[key], dict):
+            merged = {
+                **copy.deepcopy(default),
+                **{k: v for k, v in repaired[key].items() if v is not None},
+            }
+            patched = patched or merged != repaired[key]
+            repaired[key] = merged
+    if patched:
+        telemetry.increment("repair.local.summary_defaults")
+    return repaired
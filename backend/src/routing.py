@@ -0,0 +1,143 @@
+"""Per-agent model routing with a latency-SLO fallback.
+
+The routing table maps agent class names (``QuestionGeneratorAgent``,
+``AnalysisAgent``, ...) to a model tier. When an agent's observed p95 latency on
+its primary tier goes past its budget, calls are routed to the fallback tier
+until the slow samples age out of the telemetry window.
+
+Example config (pointed to by the MODEL_ROUTES_PATH environment variable):
+
+    {
+      "tiers": {
+        "standard": {"model": "claude-haiku-4-5", "max_tokens": 2048, "temperature": 0.3},
+        "fast": {"model": "claude-haiku-4-5", "max_tokens": 1024, "temperature": 0.3}
+      },
+      "default_tier": "standard",
+      "agents": {
+        "QuestionGeneratorAgent": {"tier": "standard", "p95_budget_ms": 4000, "fallback_tier": "fast"}
+      }
+    }
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from .telemetry import Telemetry
+
+DEFAULT_TIER = "default"
+
+
+class ModelTier(BaseModel):
+    """Model profile used for a call."""
+    model: str
+    max_tokens: int = Field(default=2048, gt=0)
+    temperature: float = Field(default=0.3, ge=0.0, le=1.0)
+
+
+class AgentRoute(BaseModel):
+    """Routing entry for a single agent class."""
+    tier: str = DEFAULT_TIER
+    p95_budget_ms: Optional[float] = None
+    fallback_tier: Optional[str] = None
+    min_samples: int = 5  # Don't trust a p95 computed from fewer samples
+
+
+class ResolvedRoute(BaseModel):
+    """The tier chosen for one call, as reported to telemetry."""
+    name: str
+    model: str
+    max_tokens: int
+    temperature: float
+    fallback: bool = False
+
+
+class RoutingTable(BaseModel):
+    tiers: dict[str, ModelTier]
+    default_tier: str = DEFAULT_TIER
+    agents: dict[str, AgentRoute] = Field(default_factory=dict)
+
+    @classmethod
+    def single_tier(
+        cls, model: str, max_tokens: int, temperature: float
+    ) -> "RoutingTable":
+        """Table that sends every agent to one model profile."""
+        return cls(
+            tiers={
+                DEFAULT_TIER: ModelTier(
+                    model=model, max_tokens=max_tokens, temperature=temperature
+                )
+            }
+        )
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "RoutingTable":
+        with open(path) as f:
+            return cls.model_validate(json.load(f))
+
+    @classmethod
+    def from_env(
+        cls, model: str, max_tokens: int, temperature: float
+    ) -> "RoutingTable":
+        """
+        Load the table from MODEL_ROUTES_PATH if set.
+
+        The constructor arguments of ClaudeClient always become the "default"
+        tier, so a config file only needs to list the tiers it adds or overrides.
+        """
+        base = cls.single_tier(model, max_tokens, temperature)
+        path = os.getenv("MODEL_ROUTES_PATH")
+        if not path:
+            return base
+        table = cls.from_file(path)
+        table.tiers = {**base.tiers, **table.tiers}
+        return table
+
+    def route_for(self, agent_name: Optional[str]) -> AgentRoute:
+        if agent_name and agent_name in self.agents:
+            return self.agents[agent_name]
+        return AgentRoute(tier=self.default_tier)
+
+    def _tier(self, name: str) -> ModelTier:
+        if name in self.tiers:
+            return self.tiers[name]
+        return self.tiers[self.default_tier]
+
+    def resolve(
+        self, agent_name: Optional[str], telemetry: Optional[Telemetry] = None
+    ) -> ResolvedRoute:
+        """
+        Pick the tier for the next call from agent_name.
+
+        Falls back when the agent's windowed p95 on its primary tier exceeds
+        p95_budget_ms. Primary-tier samples stop arriving while the fallback is
+        in use, so the primary is retried once they expire from the window.
+        """
+        route = self.route_for(agent_name)
+        tier_name = route.tier if route.tier in self.tiers else self.default_tier
+        use_fallback = False
+
+        if (
+            telemetry is not None
+            and route.p95_budget_ms is not None
+            and route.fallback_tier in self.tiers
+        ):
+            key = f"{agent_name}:{tier_name}"
+            if telemetry.sample_count(key) >= route.min_samples:
+                p95 = telemetry.latency_percentile(key, 95)
+                use_fallback = p95 is not None and p95 > route.p95_budget_ms
+
+        if use_fallback:
+            tier_name = route.fallback_tier  # type: ignore
+
+        tier = self._tier(tier_name)
+        return ResolvedRoute(
+            name=tier_name,
+            model=tier.model,
+            max_tokens=tier.max_tokens,
+            temperature=tier.temperature,
+            fallback=use_fallback,
+        )
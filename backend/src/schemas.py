@@ -6,6 +6,8 @@ tool calling feature. Each schema defines the exact format that an agent must
 return, preventing malformed JSON and ensuring type safety.
 """
 
+import copy
+
 # Goal Generator Schema
 GOAL_GENERATOR_SCHEMA = {
     "name": "generate_investigation_goals",
@@ -76,12 +78,12 @@ GOAL_TRACKER_SCHEMA = {
                 "items": {
                     "type": "object",
                     "properties": {
-                        "goal": {"type": "string"},
+                        "goal_id": {"type": "string", "description": "Goal ID, e.g. g1"},
                         "confidence": {"type": "integer", "minimum": 0, "maximum": 100},
                         "status": {"type": "string", "enum": ["not_started", "in_progress", "complete"]},
                         "reasoning": {"type": "string"}
                     },
-                    "required": ["goal", "confidence", "status", "reasoning"]
+                    "required": ["goal_id", "confidence", "status", "reasoning"]
                 }
             }
         },
@@ -117,6 +119,36 @@ QUESTION_WITH_ANSWERS_SCHEMA = {
     }
 }
 
+# Question Generator Schema with precomputed facts and goal impact per option
+QUESTION_WITH_IMPLICATIONS_SCHEMA = copy.deepcopy(QUESTION_WITH_ANSWERS_SCHEMA)
+_option_schema = QUESTION_WITH_IMPLICATIONS_SCHEMA["input_schema"]["properties"]["answers"]["items"]
+_option_schema["properties"]["implied_facts"] = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "topic": {"type": "string"},
+            "claim": {"type": "string"},
+            "timestamp": {"type": "string"},
+            "confidence": {"type": "string", "enum": ["certain", "uncertain"]}
+        },
+        "required": ["topic", "claim", "confidence"]
+    }
+}
+_option_schema["properties"]["goal_impact"] = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "goal_id": {"type": "string", "description": "Goal ID, e.g. g1"},
+            "confidence": {"type": "integer", "minimum": 0, "maximum": 100},
+            "status": {"type": "string", "enum": ["not_started", "in_progress", "complete"]}
+        },
+        "required": ["goal_id", "confidence", "status"]
+    }
+}
+_option_schema["required"] = ["answer", "reasoning", "implied_facts", "goal_impact"]
+
 # Summary Extractor Schema
 SUMMARY_EXTRACTOR_SCHEMA = {
     "name": "extract_summary_structure",
@@ -185,7 +217,43 @@ SUMMARY_EXTRACTOR_SCHEMA = {
     }
 }
 
+# Per-image Transcription Schema (cached by image hash, see image_cache.py)
+IMAGE_TRANSCRIPTION_SCHEMA = {
+    "name": "transcribe_screenshot",
+    "description": "Transcribe one screenshot and note visual cues",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "transcript": {
+                "type": "string",
+                "description": "Visible messages in order, one per line as 'Sender [time]: text'"
+            },
+            "observations": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Visual cues the text doesn't carry (reactions, read receipts, gaps, cut-off context, which sender is blue)"
+            }
+        },
+        "required": ["transcript", "observations"]
+    }
+}
+
 # Analysis Schema
+CONVERSATION_SUMMARY_SCHEMA = {
+    "name": "update_conversation_summary",
+    "description": "Fold older interview exchanges and facts into the running summary",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "summary": {
+                "type": "string",
+                "description": "Updated summary of everything covered so far (under 250 words)"
+            }
+        },
+        "required": ["summary"]
+    }
+}
+
 ANALYSIS_SCHEMA = {
     "name": "generate_analysis_report",
     "description": "Generate comprehensive drama incident analysis",
@@ -226,4 +294,122 @@ ANALYSIS_SCHEMA = {
         },
         "required": ["timeline", "key_facts", "gaps", "verdict"]
     }
-}
\ No newline at end of file
+}
+
+# LOCAL_TIMELINE: the timeline is built from fact timestamps locally; the model
+# only places events it couldn't be built from
+ANALYSIS_LOCAL_TIMELINE_SCHEMA = {
+    "name": "generate_analysis_report",
+    "description": "Generate comprehensive drama incident analysis around a prebuilt timeline",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "timeline_additions": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "after": {"type": "integer", "minimum": 0},
+                        "time": {"type": "string"},
+                        "event": {"type": "string"}
+                    },
+                    "required": ["after", "time", "event"]
+                }
+            },
+            **{
+                key: ANALYSIS_SCHEMA["input_schema"]["properties"][key]
+                for key in ("key_facts", "gaps", "verdict")
+            }
+        },
+        "required": ["timeline_additions", "key_facts", "gaps", "verdict"]
+    }
+}
+
+# Incremental analysis (INCREMENTAL_ANALYSIS): the running state is updated per
+# turn, and the final call only returns the verdict
+ANALYSIS_STATE_SCHEMA = {
+    "name": "update_analysis_state",
+    "description": "Merge new facts into the running analysis",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            key: ANALYSIS_SCHEMA["input_schema"]["properties"][key]
+            for key in ("timeline", "key_facts", "gaps")
+        },
+        "required": ["timeline", "key_facts", "gaps"]
+    }
+}
+
+VERDICT_SCHEMA = {
+    "name": "generate_verdict",
+    "description": "Assign responsibility for the drama",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "verdict": ANALYSIS_SCHEMA["input_schema"]["properties"]["verdict"]
+        },
+        "required": ["verdict"]
+    }
+}
+
+ANALYSIS_STATE_LOCAL_TIMELINE_SCHEMA = {
+    **ANALYSIS_STATE_SCHEMA,
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            key: ANALYSIS_SCHEMA["input_schema"]["properties"][key]
+            for key in ("key_facts", "gaps")
+        },
+        "required": ["key_facts", "gaps"]
+    }
+}
+
+# Sectioned analysis (PARALLEL_ANALYSIS): one tool per report section, all
+# offered in every section request so the requests share a cached prefix
+TIMELINE_SECTION_SCHEMA = {
+    "name": "generate_timeline",
+    "description": "Write the report's timeline",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "timeline": ANALYSIS_SCHEMA["input_schema"]["properties"]["timeline"]
+        },
+        "required": ["timeline"]
+    }
+}
+
+TIMELINE_ADDITIONS_SECTION_SCHEMA = {
+    "name": "generate_timeline",
+    "description": "Place events on the prebuilt timeline",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "timeline_additions": ANALYSIS_LOCAL_TIMELINE_SCHEMA["input_schema"]["properties"]["timeline_additions"]
+        },
+        "required": ["timeline_additions"]
+    }
+}
+
+KEY_FACTS_SECTION_SCHEMA = {
+    "name": "generate_key_facts",
+    "description": "Write the report's key facts",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "key_facts": ANALYSIS_SCHEMA["input_schema"]["properties"]["key_facts"]
+        },
+        "required": ["key_facts"]
+    }
+}
+
+GAPS_SECTION_SCHEMA = {
+    "name": "generate_gaps",
+    "description": "Write the report's open gaps",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "gaps": ANALYSIS_SCHEMA["input_schema"]["properties"]["gaps"]
+        },
+        "required": ["gaps"]
+    }
+}
@@ -5,6 +5,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from .background import BACKGROUND
+from .fact_dedup import FACT_DEDUPLICATORS
+from .fact_index import FACT_INDEXES
+from .image_store import ImageStore
 from .models import Session
 
 
@@ -82,3 +86,29 @@ class SessionManager:
                 continue
         sessions.sort(key=lambda s: s.created_at, reverse=True)
         return sessions
+
+    def archive_session(self, session_id: str, image_store: Optional[ImageStore] = None) -> Session:
+        """
+        Move a session out of the active store and release its images.
+
+        The session JSON moves to data_dir/archive (so list_sessions skips it)
+        and its image references are dropped; images no other session holds
+        are garbage-collected from the image store. Background results, the
+        fact index and the fact deduplicator kept in this process for the
+        session are dropped too.
+
+        Raises:
+            FileNotFoundError: No active session with this ID
+        """
+        session = self.load_session(session_id)
+        archive_dir = self.data_dir / "archive"
+        archive_dir.mkdir(exist_ok=True)
+        os.replace(self.data_dir / f"{session_id}.json", archive_dir / f"{session_id}.json")
+        BACKGROUND.discard_session(session_id)
+        FACT_INDEXES.discard(session_id)
+        FACT_DEDUPLICATORS.discard(session_id)
+        if session.images:
+            image_store = image_store or ImageStore()
+            image_store.release(session_id, session.images)
+            image_store.collect_garbage()
+        return session
@@ -0,0 +1,168 @@
+"""In-process telemetry for LLM calls and pipeline stages.
+
+A single module-level ``TELEMETRY`` instance is shared by every ClaudeClient and
+orchestrator in the process. Flask builds a fresh client per request, so latency
+history has to outlive any one client for percentiles to mean anything.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Optional
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class CallRecord(BaseModel):
+    """One upstream model call and the route that served it."""
+    agent: str
+    route: str
+    model: str
+    latency_ms: float
+    fallback: bool = False
+    input_tokens: int = 0  # uncached input only, as the API reports it
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    status: str = "ok"  # "ok" or "error"
+    source: str = "api"  # "api" or "replay" (served from a cassette)
+    timestamp: float = 0.0
+
+
+def percentile(values: list[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of values, or None when there are no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class LatencyWindow:
+    """Latency samples that expire after window_seconds."""
+
+    def __init__(self, window_seconds: float = 300.0, max_samples: int = 1000):
+        self.window_seconds = window_seconds
+        self.samples: deque[tuple[float, float]] = deque(maxlen=max_samples)
+
+    def add(self, latency_ms: float, now: Optional[float] = None) -> None:
+        self.samples.append((now if now is not None else time.monotonic(), latency_ms))
+
+    def values(self, now: Optional[float] = None) -> list[float]:
+        now = now if now is not None else time.monotonic()
+        # Drop expired samples from the left; deque is in insertion order
+        while self.samples and now - self.samples[0][0] > self.window_seconds:
+            self.samples.popleft()
+        return [latency for _, latency in self.samples]
+
+    def percentile(self, pct: float, now: Optional[float] = None) -> Optional[float]:
+        return percentile(self.values(now), pct)
+
+
+class Telemetry:
+    """Thread-safe store of call records, latency windows and counters."""
+
+    def __init__(self, window_seconds: float = 300.0, max_records: int = 500):
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._records: deque[CallRecord] = deque(maxlen=max_records)
+        self._latencies: dict[str, LatencyWindow] = {}
+        self._counters: dict[str, int] = defaultdict(int)
+        self._gauges: dict[str, float] = {}
+
+    def _window(self, key: str) -> LatencyWindow:
+        if key not in self._latencies:
+            self._latencies[key] = LatencyWindow(self.window_seconds)
+        return self._latencies[key]
+
+    def record_call(self, record: CallRecord) -> None:
+        """Store a call record and feed its latency into the agent/route window."""
+        if not record.timestamp:
+            record.timestamp = time.time()
+        with self._lock:
+            self._records.append(record)
+            if record.status == "ok":
+                self._window(f"{record.agent}:{record.route}").add(record.latency_ms)
+            self._counters[f"calls.{record.route}"] += 1
+            if record.fallback:
+                self._counters["calls.fallback"] += 1
+        logger.info(
+            "llm_call agent=%s route=%s model=%s latency_ms=%.0f fallback=%s status=%s",
+            record.agent,
+            record.route,
+            record.model,
+            record.latency_ms,
+            record.fallback,
+            record.status,
+        )
+
+    def observe(self, key: str, latency_ms: float) -> None:
+        """Record a latency sample for an arbitrary pipeline stage."""
+        with self._lock:
+            self._window(key).add(latency_ms)
+
+    def latency_percentile(self, key: str, pct: float) -> Optional[float]:
+        with self._lock:
+            window = self._latencies.get(key)
+            return window.percentile(pct) if window else None
+
+    def sample_count(self, key: str) -> int:
+        with self._lock:
+            window = self._latencies.get(key)
+            return len(window.values()) if window else 0
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Record the latest value of a measurement (e.g. prompt size)."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def gauge(self, name: str) -> Optional[float]:
+        with self._lock:
+            return self._gauges.get(name)
+
+    def recent_calls(self, limit: int = 50) -> list[CallRecord]:
+        with self._lock:
+            return list(self._records)[-limit:]
+
+    def snapshot(self) -> dict:
+        """Serializable view of counters, latency percentiles and recent calls."""
+        with self._lock:
+            latencies = {}
+            for key, window in self._latencies.items():
+                values = window.values()
+                if values:
+                    latencies[key] = {
+                        "count": len(values),
+                        "p50_ms": percentile(values, 50),
+                        "p95_ms": percentile(values, 95),
+                        "p99_ms": percentile(values, 99),
+                    }
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "latencies": latencies,
+                "recent_calls": [r.model_dump() for r in list(self._records)[-20:]],
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._latencies.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+
+# Shared process-wide instance
+TELEMETRY = Telemetry()
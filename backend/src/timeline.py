@@ -0,0 +1,323 @@
+"""Build the analysis timeline locally from fact timestamps.
+
+Fact.timestamp holds whatever the interviewee said: "last Friday around 6",
+"March 12", "2 weeks ago", "that night". parse_time() normalizes such text
+against a reference time (when the session started) into a TimePoint with a
+sortable key and a precision, and build_timeline() orders the facts into
+TimelineEvents deterministically: by time, then by interview order. A time
+with no date ("5:30pm") is placed on the day of the closest earlier dated
+fact. Timestamps that can't be parsed are returned as unclear, for the model
+to place.
+
+With LOCAL_TIMELINE=true the analysis prompt carries this timeline instead of
+asking the model to restate every fact as an event; the model only places
+the unclear facts (timeline_additions), which shrinks output and input.
+"""
+
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from .env import env_flag
+from .models import Fact, TimelineEvent
+
+# Coarse to fine; a coarser point sorts before a finer one at the same start
+PRECISIONS = ("year", "month", "week", "day", "part_of_day", "hour", "minute")
+
+MONTHS = {
+    name: number
+    for number, names in enumerate(
+        [("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+         ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+         ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"), ("dec", "december")],
+        start=1,
+    )
+    for name in names
+}
+WEEKDAYS = {
+    name: number
+    for number, names in enumerate(
+        [("mon", "monday"), ("tue", "tues", "tuesday"), ("wed", "wednesday"), ("thu", "thur", "thurs", "thursday"),
+         ("fri", "friday"), ("sat", "saturday"), ("sun", "sunday")]
+    )
+    for name in names
+}
+PARTS_OF_DAY = {
+    "morning": time(9), "breakfast": time(8), "noon": time(12), "lunch": time(12, 30),
+    "afternoon": time(15), "evening": time(19), "dinner": time(19), "night": time(22),
+    "tonight": time(22), "midnight": time(23, 59),
+}
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "a couple of": 2, "a couple": 2, "couple of": 2, "two": 2, "three": 3,
+    "a few": 3, "few": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+UNIT_DAYS = {"day": 1, "week": 7, "month": 30, "year": 365}
+
+_MONTH = "|".join(sorted(MONTHS, key=len, reverse=True))
+_WEEKDAY = "|".join(sorted(WEEKDAYS, key=len, reverse=True))
+_COUNT = "|".join(sorted(NUMBER_WORDS, key=len, reverse=True)) + r"|\d+"
+
+_ISO_DATE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_NUMERIC_DATE = re.compile(r"\b(\d{1,2})/(\d{1,2})(?:/(\d{2}|\d{4}))?\b")
+_MONTH_DAY = re.compile(rf"\b({_MONTH})\.? (\d{{1,2}})(?:st|nd|rd|th)?\b(?:,? (\d{{4}}))?")
+_DAY_MONTH = re.compile(rf"\b(\d{{1,2}})(?:st|nd|rd|th)? (?:of )?({_MONTH})\b\.?(?:,? (\d{{4}}))?")
+_MONTH_ONLY = re.compile(rf"\b(early |mid-?|late )?({_MONTH})\b(?:,? (\d{{4}}))?")
+_YEAR_ONLY = re.compile(r"\b(?:in |back in )?((?:19|20)\d{2})\b")
+_AGO = re.compile(rf"\b({_COUNT}) (day|week|month|year)s? ago\b")
+_LAST_UNIT = re.compile(r"\b(last|this|next) (week(?:end)?|month|year)\b")
+_WEEKDAY_REF = re.compile(rf"\b(last |this |next |on )?({_WEEKDAY})\b")
+_CLOCK_12 = re.compile(r"\b(\d{1,2})(?:[:.](\d{2}))?\s*([ap])\.?\s?m\b\.?")
+_CLOCK_24 = re.compile(r"\b([01]?\d|2[0-3]):([0-5]\d)\b")
+_BARE_HOUR = re.compile(r"\b(?:around|about|at|by|after|before|like|until|till|~)\s*(\d{1,2})\b(?![:/\d])")
+_PART_OF_DAY = re.compile(r"\b(" + "|".join(PARTS_OF_DAY) + r")\b")
+
+
+def local_timeline_enabled() -> bool:
+    return env_flag("LOCAL_TIMELINE")
+
+
+class TimePoint(BaseModel):
+    """A normalized time expression: start of the span it names, and how precise it is."""
+    day: Optional[date] = None  # None: a time of day with no date
+    clock: Optional[time] = None
+    precision: str = "day"
+
+    @property
+    def has_date(self) -> bool:
+        return self.day is not None
+
+    def key(self, day: Optional[date] = None) -> tuple:
+        """Sortable key; day stands in for a missing date."""
+        when = datetime.combine(self.day or day or date.min, self.clock or time.min)
+        return (when, PRECISIONS.index(self.precision))
+
+    def label(self, current_year: Optional[int] = None) -> str:
+        """Readable rendering ("Tue Mar 12 5:30 PM", "March 2023", "evening"); current_year is left out."""
+        parts = []
+        if self.day is not None:
+            year = "" if self.day.year == current_year else f" {self.day.year}"
+            if self.precision == "year":
+                return str(self.day.year)
+            if self.precision == "month":
+                return self.day.strftime("%B") + year
+            if self.precision == "week":
+                return "week of " + self.day.strftime("%b %-d") + year
+            parts.append(self.day.strftime("%a %b %-d") + year)
+        if self.clock is not None:
+            if self.precision == "part_of_day":
+                parts.append(next(name for name, t in PARTS_OF_DAY.items() if t == self.clock))
+            else:
+                parts.append(self.clock.strftime("%-I:%M %p"))
+        return " ".join(parts)
+
+
+def _count(text: str) -> int:
+    return int(text) if text.isdigit() else NUMBER_WORDS[text]
+
+
+def _past_date(year: Optional[str], month: int, day: int, reference: date) -> Optional[date]:
+    """Date with the year filled in so that it isn't after the reference (events are past)."""
+    try:
+        if year:
+            return date(int(year) + (2000 if len(year) == 2 else 0), month, day)
+        candidate = date(reference.year, month, day)
+        return candidate if candidate <= reference else candidate.replace(year=reference.year - 1)
+    except ValueError:
+        return None
+
+
+def _parse_date(text: str, reference: date) -> tuple[Optional[date], Optional[str]]:
+    match = _ISO_DATE.search(text)
+    if match:
+        year, month, day = (int(g) for g in match.groups())
+        try:
+            return date(year, month, day), "day"
+        except ValueError:
+            pass
+    match = _MONTH_DAY.search(text) or _DAY_MONTH.search(text)
+    if match:
+        groups = match.groups()
+        if groups[0].isdigit():
+            day, month, year = int(groups[0]), MONTHS[groups[1]], groups[2]
+        else:
+            month, day, year = MONTHS[groups[0]], int(groups[1]), groups[2]
+        found = _past_date(year, month, day, reference)
+        if found:
+            return found, "day"
+    match = _NUMERIC_DATE.search(text)
+    if match:
+        first, second, year = int(match.group(1)), int(match.group(2)), match.group(3)
+        # Month first unless that can't be a month or would put the event in the future
+        found = _past_date(year, first, second, reference) if first <= 12 else None
+        if found is None or found > reference:
+            found = _past_date(year, second, first, reference) or found
+        if found:
+            return found, "day"
+    if re.search(r"\bday before yesterday\b", text):
+        return reference - timedelta(days=2), "day"
+    if re.search(r"\b(yesterday|last night)\b", text):
+        return reference - timedelta(days=1), "day"
+    if re.search(r"\b(today|tonight|this (morning|afternoon|evening))\b", text):
+        return reference, "day"
+    match = _AGO.search(text)
+    if match:
+        days = _count(match.group(1)) * UNIT_DAYS[match.group(2)]
+        precision = "day" if match.group(2) in ("day", "week") else match.group(2)
+        return reference - timedelta(days=days), precision
+    match = _WEEKDAY_REF.search(text)
+    if match:
+        qualifier, weekday = (match.group(1) or "").strip(), WEEKDAYS[match.group(2)]
+        back = (reference.weekday() - weekday) % 7
+        if qualifier == "last" and back == 0:
+            back = 7
+        elif qualifier == "next":
+            back = -((weekday - reference.weekday()) % 7 or 7)
+        return reference - timedelta(days=back), "day"
+    match = _LAST_UNIT.search(text)
+    if match:
+        step = {"last": -1, "this": 0, "next": 1}[match.group(1)]
+        unit = match.group(2)
+        if unit.startswith("week"):
+            monday = reference - timedelta(days=reference.weekday()) + timedelta(weeks=step)
+            if unit == "weekend":
+                return monday + timedelta(days=5), "day"
+            return monday, "week"
+        if unit == "month":
+            month_index = reference.year * 12 + reference.month - 1 + step
+            return date(month_index // 12, month_index % 12 + 1, 1), "month"
+        return date(reference.year + step, 1, 1), "year"
+    match = _MONTH_ONLY.search(text)
+    # Bare "may" is usually the verb
+    if match and (match.group(2) != "may" or match.group(3)):
+        qualifier, month, year = (match.group(1) or "").strip(" -"), MONTHS[match.group(2)], match.group(3)
+        day = {"early": 1, "mid": 15, "late": 25}.get(qualifier, 1)
+        return _past_date(year, month, day, reference), "month"
+    match = _YEAR_ONLY.search(text)
+    if match:
+        return date(int(match.group(1)), 1, 1), "year"
+    return None, None
+
+
+def _parse_clock(text: str) -> tuple[Optional[time], Optional[str]]:
+    match = _CLOCK_12.search(text)
+    if match:
+        hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), match.group(3)
+        if 1 <= hour <= 12 and minute < 60:
+            hour = hour % 12 + (12 if meridiem == "p" else 0)
+            return time(hour, minute), "minute" if match.group(2) else "hour"
+    match = _CLOCK_24.search(text)
+    if match:
+        return time(int(match.group(1)), int(match.group(2))), "minute"
+    match = _BARE_HOUR.search(text)
+    if match and 1 <= int(match.group(1)) <= 12:
+        hour = int(match.group(1))
+        # Social plans: "around 6" is evening, "at 9" morning or night, so read small hours as pm
+        part = _PART_OF_DAY.search(text)
+        if hour == 12:
+            # "around 12" is noon unless it's "12 at night"
+            night = part is not None and PARTS_OF_DAY[part.group(1)].hour >= 22
+            return time(0 if night else 12), "hour"
+        pm = hour < 8 or (part is not None and PARTS_OF_DAY[part.group(1)].hour >= 12)
+        return time(hour % 12 + (12 if pm else 0)), "hour"
+    match = _PART_OF_DAY.search(text)
+    if match:
+        return PARTS_OF_DAY[match.group(1)], "part_of_day"
+    return None, None
+
+
+def parse_time(text: str, reference: datetime) -> Optional[TimePoint]:
+    """
+    Normalize a free-text time expression.
+
+    Args:
+        text: e.g. "last Friday around 6", "March 12, 2024", "5:30pm", "2 weeks ago"
+        reference: When the expression was said; relative expressions count back from it
+
+    Returns:
+        TimePoint, or None if nothing in text reads as a time
+    """
+    text = text.lower().strip()
+    if "last night" in text and not _CLOCK_12.search(text):
+        return TimePoint(day=reference.date() - timedelta(days=1), clock=PARTS_OF_DAY["night"], precision="part_of_day")
+    day, day_precision = _parse_date(text, reference.date())
+    clock, clock_precision = _parse_clock(text)
+    if day is None and clock is None:
+        return None
+    if clock is not None and day_precision in (None, "day"):
+        return TimePoint(day=day, clock=clock, precision=clock_precision)
+    return TimePoint(day=day, precision=day_precision)
+
+
+def reference_time(created_at: str) -> datetime:
+    """Session start as the reference for relative timestamps (now if unreadable)."""
+    try:
+        return datetime.fromisoformat(created_at)
+    except (TypeError, ValueError):
+        return datetime.now()
+
+
+class LocalTimeline(BaseModel):
+    events: list[TimelineEvent] = Field(default_factory=list)
+    unclear: list[Fact] = Field(default_factory=list)  # timestamp given but not parseable
+
+
+def build_timeline(facts: list[Fact], reference: datetime) -> LocalTimeline:
+    """
+    Order facts with a parseable timestamp into timeline events.
+
+    Args:
+        facts: Session facts in interview order
+        reference: Session start; relative timestamps count back from it
+
+    Returns:
+        LocalTimeline with sorted events and the facts whose timestamp couldn't be read
+    """
+    placed: list[tuple[tuple, int, TimePoint, Fact]] = []
+    unclear: list[Fact] = []
+    last_day = reference.date()
+    for index, fact in enumerate(facts):
+        if not fact.timestamp:
+            continue
+        point = parse_time(fact.timestamp, reference)
+        if point is None:
+            unclear.append(fact)
+            continue
+        if point.has_date:
+            last_day = point.day
+        placed.append((point.key(last_day), index, point, fact))
+
+    placed.sort(key=lambda item: (item[0], item[1]))
+    return LocalTimeline(
+        events=[
+            TimelineEvent(time=point.label(reference.year) or fact.timestamp, event=fact.claim)
+            for _, _, point, fact in placed
+        ],
+        unclear=unclear,
+    )
+
+
+def merge_timeline(events: list[TimelineEvent], additions: list[dict]) -> list[TimelineEvent]:
+    """
+    Insert model-placed events into the local timeline.
+
+    Args:
+        events: Local timeline, in order
+        additions: {"after": n, "time": ..., "event": ...}; after=0 places an event first,
+            after=n places it after the nth local event
+
+    Returns:
+        Combined timeline; additions sharing a slot keep their given order
+    """
+    slots: dict[int, list[TimelineEvent]] = {}
+    for addition in additions:
+        after = max(0, min(len(events), int(addition.get("after", len(events)))))
+        slots.setdefault(after, []).append(
+            TimelineEvent(time=addition.get("time", ""), event=addition.get("event", ""))
+        )
+    merged = list(slots.get(0, []))
+    for position, event in enumerate(events, start=1):
+        merged.append(event)
+        merged.extend(slots.get(position, []))
+    return merged
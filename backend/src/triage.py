@@ -0,0 +1,158 @@
+"""Local triage of answers ahead of the agent pipeline.
+
+Cheap heuristics flag answers that can't add facts: non-answers ("idk", "not
+sure", near-empty text) and answers that only repeat facts already on file.
+For those the fact/goal extraction call is skipped and the session's goals
+carry over unchanged; the next question is still generated as usual.
+
+Enable with ANSWER_TRIAGE=true.
+"""
+
+import re
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .env import env_flag
+from .models import Answer, Fact
+from .telemetry import TELEMETRY, Telemetry
+
+NON_ANSWER_PATTERNS = [
+    r"(i )?(don'?t|do not) know",
+    r"idk",
+    r"not sure",
+    r"no idea",
+    r"(i )?(can'?t|cannot|don'?t|do not) (remember|recall)",
+    r"no comment",
+    r"pass",
+    r"skip",
+    r"whatever",
+    r"who knows",
+    r"not (relevant|important)",
+    r"i'?d rather not",
+]
+# The whole answer must be non-answer phrases; one inside a sentence
+# ("idk, maybe Rob told him") doesn't make the rest uninformative
+_PHRASE = "(?:" + "|".join(NON_ANSWER_PATTERNS) + ")"
+_NON_ANSWER = re.compile(f"{_PHRASE}( {_PHRASE})*")
+
+# Words dropped before matching non-answer phrases
+FILLER = frozenset({
+    "honestly", "tbh", "lol", "haha", "um", "uh", "hmm", "sorry", "really",
+    "just", "man", "dude", "bro", "like", "so", "well", "ok", "okay",
+})
+
+# Function words ignored when comparing an answer against known facts
+STOPWORDS = frozenset({
+    "a", "an", "the", "and", "or", "but", "so", "of", "to", "in", "on", "at",
+    "for", "with", "from", "by", "about", "as", "is", "are", "was", "were", "be",
+    "been", "being", "it", "its", "this", "that", "these", "those", "i", "me",
+    "my", "we", "our", "you", "your", "he", "him", "his", "she", "her", "they",
+    "them", "their", "there", "here", "just", "really", "very", "then", "than",
+    "too", "did", "do", "does", "had", "has", "have", "not", "no", "yes", "yeah",
+    "ok", "okay", "um", "uh", "like",
+})
+
+# An answer with any of these contradicts or qualifies a fact, never repeats it
+NEGATIONS = frozenset({
+    "not", "no", "never", "without", "nobody", "nothing", "none", "neither",
+    "nor", "except",
+})
+
+# Short yes/no replies answer yes/no questions; never treat them as empty
+YES_NO = frozenset({"yes", "yeah", "yep", "yup", "no", "nope", "nah"})
+
+MIN_CONTENT_WORDS = 2
+
+
+class TriageResult(BaseModel):
+    skip: bool
+    reason: str  # "informative", "empty", "non_answer", "repetition" or "known_option"
+
+
+def triage_enabled() -> bool:
+    return env_flag("ANSWER_TRIAGE")
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"[a-z0-9']+", text.lower().replace("\u2019", "'"))
+
+
+def content_words(text: str) -> set[str]:
+    return {w for w in _words(text) if w not in STOPWORDS}
+
+
+def is_non_answer(text: str) -> bool:
+    """Whether the whole answer, minus punctuation and filler, is a non-answer."""
+    normalized = " ".join(w for w in _words(text) if w not in FILLER)
+    return _NON_ANSWER.fullmatch(normalized) is not None
+
+
+def is_repetition(text: str, facts: list[Fact]) -> bool:
+    """Whether one fact already holds every content word of the answer.
+
+    Negated answers ("never", "without", "didn't") are never repetitions: they
+    can contradict the fact while sharing all of its words.
+    """
+    words = content_words(text)
+    if not words or any(w in NEGATIONS or w.endswith("n't") for w in _words(text)):
+        return False
+    return any(words <= content_words(f.claim) for f in facts)
+
+
+def triage_answer(
+    answer: Answer,
+    facts: list[Fact],
+    options: Optional[list[Answer]] = None,
+    telemetry: Optional[Telemetry] = None,
+) -> TriageResult:
+    """
+    Classify an answer as worth a fact/goal extraction call or not.
+
+    Args:
+        answer: The submitted answer
+        facts: Facts already collected for the session
+        options: The canned options offered with the question
+        telemetry: Where skip counters are recorded
+
+    Returns:
+        TriageResult with skip=True when extraction can be skipped
+    """
+    telemetry = telemetry or TELEMETRY
+    text = answer.answer.strip().lower()
+    words = text.split()
+    canned = any(o.answer.strip().lower() == text for o in options or [])
+
+    if is_non_answer(text):
+        reason = "non_answer"
+    elif words and words[0].strip(".,!") in YES_NO:
+        reason = "informative"
+    elif len(content_words(text)) < MIN_CONTENT_WORDS and not re.search(r"\d", text):
+        reason = "empty"
+    elif is_repetition(text, facts):
+        reason = "known_option" if canned else "repetition"
+    else:
+        reason = "informative"
+
+    result = TriageResult(skip=reason != "informative", reason=reason)
+    telemetry.increment("triage.total")
+    if result.skip:
+        telemetry.increment("triage.skipped")
+        telemetry.increment(f"triage.skipped.{reason}")
+    return result
+
+
+def triage_stats(telemetry: Optional[Telemetry] = None) -> dict:
+    """Triage counters and the share of answers that skipped extraction."""
+    telemetry = telemetry or TELEMETRY
+    total = telemetry.counter("triage.total")
+    skipped = telemetry.counter("triage.skipped")
+    return {
+        "total": total,
+        "skipped": skipped,
+        "skip_rate": skipped / total if total else 0.0,
+        "by_reason": {
+            reason: telemetry.counter(f"triage.skipped.{reason}")
+            for reason in ("empty", "non_answer", "repetition", "known_option")
+        },
+    }
@@ -0,0 +1,36 @@
+"""Shared fixtures for the analysis tests."""
+from collections.abc import Callable
+
+import pytest
+
+from src.models import Goal, Session
+
+
+@pytest.fixture
+def verdict() -> dict:
+    """A valid verdict as the model returns it."""
+    return {
+        "primary_responsibility": "Rob",
+        "percentage": 70,
+        "reasoning": "Booked without telling Lamar",
+        "contributing_factors": "Tasha 30%",
+        "drama_rating": 6,
+        "drama_rating_explanation": "Talk it out",
+    }
+
+
+@pytest.fixture
+def trip_session() -> Callable[..., Session]:
+    """Factory for the Cancun-trip session; pass facts and any other Session fields."""
+
+    def make(**fields) -> Session:
+        return Session(**{
+            "session_id": "s1",
+            "incident_name": "Trip",
+            "created_at": "2024-03-20T12:00:00",  # a Wednesday
+            "summary": "Rob and Tasha went to Cancun without Lamar.",
+            "goals": [Goal(description="Who knew", confidence=60)],
+            **fields,
+        })
+
+    return make
@@ -184,3 +184,33 @@ def test_generate_wrap_up_when_goals_complete():
 
     # Assert target_goal == "wrap_up"
     assert result["target_goal"] == "wrap_up"
+
+
+def test_precomputed_option_implications():
+    from src.fake_anthropic_server import synthesize
+    from src.models import Actor, Conflict, ExtractedSummary, GeneralDetails
+    from src.schemas import QUESTION_WITH_IMPLICATIONS_SCHEMA
+
+    mock_client = Mock(spec=ClaudeClient)
+    mock_client.call_with_tool.side_effect = lambda system, prompt, schema, **kw: synthesize(
+        schema["input_schema"]
+    )
+
+    result = QuestionGeneratorAgent(mock_client).generate_question_with_answers(
+        [Goal(description="Timeline", confidence=30, status=GoalStatus.IN_PROGRESS)],
+        [],
+        [],
+        extracted_summary=ExtractedSummary(
+            actors=[Actor(name="Lamar")],
+            point_of_conflict=Conflict(primary="Mexico trip"),
+            general_details=GeneralDetails(),
+        ),
+        precompute_implications=True,
+    )
+
+    schema = mock_client.call_with_tool.call_args.args[2]
+    assert schema is QUESTION_WITH_IMPLICATIONS_SCHEMA
+    assert len(result.implications) == 4
+    assert result.implications[0].answer == result.answers[0].answer
+    assert result.implications[0].facts[0].claim
+    assert result.implications[0].goal_updates[0].confidence == 50
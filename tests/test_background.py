@@ -0,0 +1,100 @@
+"""Tests for background results picked up by later requests."""
+import threading
+
+import pytest
+
+from src.background import BackgroundResults
+from src.image_store import ImageStore
+from src.session import SessionManager
+from src.telemetry import Telemetry
+
+
+@pytest.fixture
+def background(monkeypatch):
+    """A fresh instance in place of the process-wide BACKGROUND."""
+    results = BackgroundResults(telemetry=Telemetry())
+    monkeypatch.setattr("src.background.BACKGROUND", results)
+    monkeypatch.setattr("src.session.BACKGROUND", results)
+    return results
+
+
+def test_take_returns_result_once_ready():
+    results = BackgroundResults(telemetry=Telemetry())
+    release = threading.Event()
+    results.submit("k", lambda: release.wait(2) and "done")
+
+    assert results.take("k") is None  # still running: not waited for
+    assert results.pending("k")
+
+    release.set()
+    results.wait_all(timeout=2)
+    assert results.take("k") == "done"
+    assert not results.pending("k")
+    assert results.take("k") is None
+
+
+def test_failed_task_is_dropped_and_counted():
+    telemetry = Telemetry()
+    results = BackgroundResults(telemetry=telemetry)
+
+    def boom():
+        raise RuntimeError("upstream error")
+
+    results.submit("k", boom)
+    results.wait_all(timeout=2)
+
+    assert results.take("k") is None
+    assert not results.pending("k")
+    assert telemetry.counter("background.errors") == 1
+
+
+def test_oldest_results_are_evicted_past_max_results():
+    telemetry = Telemetry()
+    results = BackgroundResults(telemetry=telemetry, max_results=2)
+    release = threading.Event()
+
+    for key in ("a", "b", "c"):
+        results.submit(key, release.wait, 2)
+    release.set()
+
+    assert not results.pending("a")
+    assert results.pending("b") and results.pending("c")
+    assert telemetry.counter("background.evicted") == 1
+
+
+def test_untaken_results_expire():
+    now = [0.0]
+    results = BackgroundResults(telemetry=Telemetry(), ttl_seconds=60, clock=lambda: now[0])
+    results.submit("memory:s1", lambda: "done").result(timeout=2)
+
+    now[0] = 30.0
+    results.submit("memory:s2", lambda: "done")
+    assert results.pending("memory:s1")
+
+    now[0] = 61.0
+    results.submit("memory:s3", lambda: "done")
+    assert not results.pending("memory:s1")
+
+
+def test_discard_session_drops_every_key_of_that_session():
+    results = BackgroundResults(telemetry=Telemetry())
+    for key in ("drift:s1", "memory:s1", "analysis_state:s1", "memory:s2"):
+        results.submit(key, lambda: "done")
+
+    results.discard_session("s1")
+
+    assert [k for k in ("drift:s1", "memory:s1", "analysis_state:s1", "memory:s2") if results.pending(k)] == [
+        "memory:s2"
+    ]
+
+
+def test_archive_session_drops_background_results(tmp_path, background):
+    manager = SessionManager(data_dir=tmp_path / "sessions")
+    session = manager.create_session("Trip", "Rob", "witness")
+    manager.save_session(session)
+    key = f"memory:{session.session_id}"
+    background.submit(key, lambda: "done").result(timeout=2)
+
+    manager.archive_session(session.session_id, image_store=ImageStore(tmp_path / "images"))
+
+    assert not background.pending(key)
@@ -0,0 +1,137 @@
+"""Tests for bulk re-analysis through the local batch stand-in."""
+import pytest
+
+from src.agents.agent_analysis import AnalysisAgent
+from src.api_client import ClaudeClient
+from src.batch import (
+    BatchRequest,
+    BulkReanalyzer,
+    LocalBatchBackend,
+    ReanalysisCheckpoint,
+)
+from src.fake_anthropic_server import build_message
+from src.session import SessionManager
+from src.telemetry import Telemetry
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "fake-key")
+    return AnalysisAgent(client=ClaudeClient(telemetry=Telemetry()))
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SessionManager(data_dir=tmp_path / "sessions")
+    for i in range(5):
+        manager.save_session(manager.create_session(f"incident {i}", "Sam", "participant"))
+    return manager
+
+
+def make_reanalyzer(manager, backend, agent, checkpoint_path, **kwargs):
+    return BulkReanalyzer(
+        manager, backend, agent, checkpoint_path,
+        telemetry=Telemetry(), sleep=lambda _: None, **kwargs,
+    )
+
+
+def test_local_backend_round_trip(tmp_path):
+    backend = LocalBatchBackend(tmp_path / "batches")
+    params = {"model": "m", "messages": [{"role": "user", "content": "hi"}]}
+    batch_id = backend.submit([BatchRequest(custom_id="a", params=params)])
+
+    assert backend.is_done(batch_id)
+    [result] = list(backend.results(batch_id))
+    assert result.custom_id == "a"
+    assert result.status == "succeeded"
+    assert result.message["content"][0]["type"] == "text"
+
+
+def test_reanalyze_writes_results_to_storage(tmp_path, manager, agent):
+    backend = LocalBatchBackend(tmp_path / "batches")
+    ids = [s.session_id for s in manager.list_sessions()]
+
+    summary = make_reanalyzer(manager, backend, agent, tmp_path / "cp.json", chunk_size=2).run(ids)
+
+    assert sorted(summary.completed) == sorted(ids)
+    assert all(manager.load_session(sid).analysis is not None for sid in ids)
+    assert not (tmp_path / "cp.json").exists()
+
+
+def test_resume_skips_completed_and_collects_pending(tmp_path, manager, agent):
+    calls = []
+
+    def responder(params):
+        calls.append(params)
+        return build_message(params)
+
+    backend = LocalBatchBackend(tmp_path / "batches", responder=responder)
+    ids = [s.session_id for s in manager.list_sessions()]
+    checkpoint_path = tmp_path / "cp.json"
+
+    # Simulate an interrupted run: two done, one batch submitted but not collected
+    params = agent.build_batch_request(manager.load_session(ids[2]).model_dump(), ids[2])
+    pending_batch = backend.submit([BatchRequest(custom_id=ids[2], params=params)])
+    reanalyzer = make_reanalyzer(manager, backend, agent, checkpoint_path)
+    ReanalysisCheckpoint(
+        fingerprint=reanalyzer.fingerprint(ids), completed=ids[:2], pending={pending_batch: [ids[2]]}
+    ).save(checkpoint_path)
+
+    summary = reanalyzer.run(ids)
+
+    assert summary.skipped == ids[:2]
+    assert sorted(summary.completed) == sorted(ids[2:])
+    assert len(calls) == 3  # the pending batch plus the two never submitted
+    assert manager.load_session(ids[0]).analysis is None
+
+
+def test_errored_items_are_recorded_and_retried(tmp_path, manager, agent):
+    def failing(params):
+        raise RuntimeError("overloaded")
+
+    ids = [s.session_id for s in manager.list_sessions()][:2]
+    checkpoint_path = tmp_path / "cp.json"
+
+    failed_run = make_reanalyzer(
+        manager, LocalBatchBackend(tmp_path / "b1", responder=failing), agent, checkpoint_path
+    ).run(ids)
+    assert set(failed_run.failed) == set(ids)
+
+    retry = make_reanalyzer(
+        manager, LocalBatchBackend(tmp_path / "b2"), agent, checkpoint_path
+    ).run(ids)
+    assert sorted(retry.completed) == sorted(ids)
+    assert not checkpoint_path.exists()
+
+
+def test_checkpoint_from_a_different_run_is_ignored(tmp_path, manager, agent, monkeypatch):
+    ids = [s.session_id for s in manager.list_sessions()][:2]
+    checkpoint_path = tmp_path / "cp.json"
+    reanalyzer = make_reanalyzer(manager, LocalBatchBackend(tmp_path / "b"), agent, checkpoint_path)
+    ReanalysisCheckpoint(fingerprint=reanalyzer.fingerprint(ids), completed=ids).save(checkpoint_path)
+
+    monkeypatch.setattr("src.agents.agent_analysis.ANALYSIS_SYSTEM", "a revised prompt")
+
+    assert sorted(reanalyzer.run(ids).completed) == sorted(ids)
+
+
+def test_all_chunks_are_submitted_before_any_is_polled(tmp_path, manager, agent):
+    events = []
+
+    class RecordingBackend(LocalBatchBackend):
+        def submit(self, requests):
+            events.append("submit")
+            return super().submit(requests)
+
+        def is_done(self, batch_id):
+            events.append("poll")
+            return super().is_done(batch_id)
+
+    ids = [s.session_id for s in manager.list_sessions()]
+    backend = RecordingBackend(tmp_path / "batches")
+
+    summary = make_reanalyzer(manager, backend, agent, tmp_path / "cp.json", chunk_size=2).run(ids)
+
+    assert sorted(summary.completed) == sorted(ids)
+    assert events[:3] == ["submit"] * 3
+    assert "submit" not in events[3:]
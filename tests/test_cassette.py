@@ -0,0 +1,92 @@
+"""Tests for LLM traffic record/replay cassettes."""
+from unittest.mock import patch
+
+import pytest
+
+from src.api_client import ClaudeClient
+from src.cassette import Cassette, CassetteMissError, request_hash
+from src.fake_anthropic_server import FakeAnthropicServer
+from src.schemas import DRIFT_DETECTOR_SCHEMA, QUESTION_WITH_ANSWERS_SCHEMA
+from src.telemetry import Telemetry
+
+
+def test_request_hash_ignores_session_prefix():
+    base = {"model": "m", "messages": [{"role": "user", "content": "hi"}]}
+    a = {**base, "system": "[Session: aaa]\n\nYou are an agent"}
+    b = {**base, "system": [{"type": "text", "text": "[Session: bbb]\n\nYou are an agent"}]}
+    c = {**base, "system": "[Session: ccc]\n\nYou are an agent"}
+
+    assert request_hash(a) == request_hash(c)
+    assert request_hash(a) != request_hash(b)  # string vs block system really differ
+    assert request_hash(a) != request_hash({**a, "model": "other"})
+
+
+def test_invalid_mode_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(tmp_path / "c.jsonl", mode="rewind")
+
+
+def test_record_then_replay_offline(tmp_path, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "fake-key")
+    path = tmp_path / "interview.jsonl"
+
+    with FakeAnthropicServer() as server:
+        recorder = ClaudeClient(
+            base_url=server.base_url,
+            cassette=Cassette(path, mode="record"),
+            telemetry=Telemetry(),
+        )
+        recorded = recorder.call_with_tool(
+            "system", "prompt", QUESTION_WITH_ANSWERS_SCHEMA, session_id="run-1"
+        )
+        upstream_calls = server.request_count
+
+    telemetry = Telemetry()
+    # Unreachable base URL: any network call would fail
+    player = ClaudeClient(
+        base_url="http://127.0.0.1:9",
+        cassette=Cassette(path, mode="replay"),
+        telemetry=telemetry,
+    )
+    replayed = player.call_with_tool(
+        "system", "prompt", QUESTION_WITH_ANSWERS_SCHEMA, session_id="run-2"
+    )
+
+    assert upstream_calls == 1
+    assert replayed == recorded
+    assert telemetry.recent_calls()[-1].source == "replay"
+    assert telemetry.recent_calls()[-1].output_tokens > 0
+
+
+def test_replay_miss_raises(tmp_path):
+    path = tmp_path / "empty.jsonl"
+    path.write_text("")
+    cassette = Cassette(path, mode="replay")
+
+    with pytest.raises(CassetteMissError):
+        cassette.replay({"model": "m", "tools": [DRIFT_DETECTOR_SCHEMA]})
+
+
+def test_replay_miss_is_not_retried(tmp_path, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "fake-key")
+    path = tmp_path / "empty.jsonl"
+    path.write_text("")
+    client = ClaudeClient(
+        base_url="http://127.0.0.1:9",
+        cassette=Cassette(path, mode="replay"),
+        telemetry=Telemetry(),
+    )
+
+    with patch("src.api_client.time.sleep") as sleep, pytest.raises(CassetteMissError):
+        client.call_with_tool("system", "prompt", DRIFT_DETECTOR_SCHEMA, max_retries=3)
+    sleep.assert_not_called()
+
+
+def test_clients_share_the_env_cassette(tmp_path, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "fake-key")
+    path = tmp_path / "shared.jsonl"
+    path.write_text("")
+    monkeypatch.setenv("LLM_CASSETTE", str(path))
+    monkeypatch.setenv("LLM_CASSETTE_MODE", "replay")
+
+    assert ClaudeClient().cassette is ClaudeClient().cassette
@@ -0,0 +1,121 @@
+"""Tests for chunked summary extraction of long pasted chat logs."""
+import threading
+import time
+from unittest.mock import Mock
+
+from src.agents.summary_and_goal_generator import SummaryAndGoalGenerator
+from src.agents.summary_extractor import SummaryExtractorAgent
+from src.api_client import ClaudeClient
+from src.chat_chunking import merge_summaries, split_messages, split_on_message_boundaries
+from src.repair import repair_summary_output
+
+WHATSAPP = """12/03/2024, 21:41 - Lamar: did you book the trip without me
+12/03/2024, 21:42 - Rob: it wasn't like that
+it was last minute
+12/03/2024, 21:45 - Lamar: ok"""
+
+
+def part(actors, primary, secondary=(), markers=(), atmosphere="", missing=()):
+    return repair_summary_output({
+        "actors": [{"name": name, "relationships": rel, "emotional_state": [], "role": ""} for name, rel in actors],
+        "point_of_conflict": {"primary": primary, "secondary": list(secondary)},
+        "general_details": {"timeline_markers": list(markers), "emotional_atmosphere": atmosphere},
+        "missing_info": list(missing),
+    })
+
+
+def test_continuation_lines_stay_with_their_message():
+    assert split_messages(WHATSAPP) == [
+        "12/03/2024, 21:41 - Lamar: did you book the trip without me",
+        "12/03/2024, 21:42 - Rob: it wasn't like that\nit was last minute",
+        "12/03/2024, 21:45 - Lamar: ok",
+    ]
+
+
+def test_chunks_never_split_a_message():
+    log = "\n".join(f"[9:{i:02d} PM] Rob: message number {i} about the trip" for i in range(60))
+
+    chunks = split_on_message_boundaries(log, chunk_tokens=100)
+
+    assert len(chunks) > 1
+    assert all(len(c) <= 400 for c in chunks)
+    assert "\n".join(chunks) == log
+
+
+def test_oversized_single_message_is_cut_on_whitespace():
+    chunks = split_on_message_boundaries("Rob: " + "word " * 200, chunk_tokens=50)
+
+    assert all(len(c) <= 200 for c in chunks)
+    assert all(c.split()[-1] == "word" for c in chunks[1:])
+
+
+def test_merge_dedupes_actors_and_timeline():
+    merged = merge_summaries([
+        part([("Lamar", ["Rob's friend"]), ("Rob", [])], "Secret trip", markers=["March 12"], atmosphere="tense"),
+        part([("lamar", ["Rob's friend", "roommate"])], "Secret trip!", secondary=["Unpaid deposit"],
+             markers=["march 12", "March 14"], atmosphere="Tense", missing=["Who paid"]),
+        part([("Tasha", [])], "Group chat exclusion", secondary=["secret trip"]),
+    ])
+
+    assert [(a["name"], a["relationships"]) for a in merged["actors"]] == [
+        ("Lamar", ["Rob's friend", "roommate"]), ("Rob", []), ("Tasha", []),
+    ]
+    assert merged["point_of_conflict"] == {
+        "primary": "Secret trip",
+        "secondary": ["Group chat exclusion", "Unpaid deposit"],
+    }
+    assert merged["general_details"]["timeline_markers"] == ["March 12", "March 14"]
+    assert merged["general_details"]["emotional_atmosphere"] == "tense"
+    assert merged["missing_info"] == ["Who paid"]
+
+
+def test_long_summary_is_extracted_in_parallel_chunks():
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def extract(system, prompt, schema, **kwargs):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        speaker = prompt.split("] ")[1].split(":")[0]
+        return part([(speaker, [])], "Secret trip")
+
+    client = Mock(spec=ClaudeClient)
+    client.call_with_tool.side_effect = extract
+    log = "\n".join(f"[9:{i % 60:02d} PM] {'Lamar' if i < 30 else 'Rob'}: " + "x" * 30 for i in range(60))
+
+    summary = SummaryExtractorAgent(client, chunk_tokens=200).extract_summary(log, [])
+
+    assert client.call_with_tool.call_count == 4
+    assert peak[0] > 1
+    assert [a.name for a in summary.actors] == ["Lamar", "Rob"]
+
+
+def test_short_summary_keeps_the_single_combined_call():
+    client = Mock(spec=ClaudeClient)
+    client.call_with_multiple_tools.return_value = {
+        "extract_summary_structure": part([("Rob", [])], "Secret trip"),
+        "generate_investigation_goals": {"goals": ["Who booked", "Who knew", "Who paid"]},
+    }
+
+    SummaryAndGoalGenerator(client, chunk_tokens=6000).extract_and_generate("Rob booked a trip.")
+
+    client.call_with_multiple_tools.assert_called_once()
+    client.call_with_tool.assert_not_called()
+
+
+def test_empty_actors_repair_after_chunking_sends_one_chunk():
+    client = Mock(spec=ClaudeClient)
+    client.call_with_tool.return_value = part([], "Secret trip")
+    client.image_content.side_effect = lambda images, prompt: prompt
+    client.call_tool_followup.return_value = part([("Lamar", [])], "Secret trip")
+    log = "\n".join(f"[9:{i % 60:02d} PM] Lamar: " + "x" * 30 for i in range(60))
+
+    summary = SummaryExtractorAgent(client, chunk_tokens=200).extract_summary(log, [])
+
+    repair_prompt = client.call_tool_followup.call_args.args[1]
+    assert repair_prompt.count("Lamar:") == split_on_message_boundaries(log, 200)[0].count("Lamar:")
+    assert repair_prompt.count("Lamar:") < 60
+    assert [a.name for a in summary.actors] == ["Lamar"]
@@ -0,0 +1,140 @@
+"""Tests for the local chat-export parser and summary minimizer."""
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.chat_export import minimize_lines, minimize_summary
+from src.interview import InterviewOrchestrator
+from src.models import Answer, Goal, QuestionWithAnswers, Session
+
+CORPUS = Path(__file__).parent.parent / "backend" / "benchmarks" / "chat_exports"
+
+
+def test_whatsapp_android_export():
+    raw = """12/03/2024, 20:58 - Messages and calls are end-to-end encrypted. No one outside of this chat can read them.
+12/03/2024, 20:59 - Tasha added Lamar
+12/03/2024, 21:04 - Lamar: did you book the trip without me
+12/03/2024, 21:05 - Rob: it wasn't like that
+it was last minute
+12/03/2024, 21:05 - Rob: <Media omitted>
+12/03/2024, 21:06 - Lamar: ok
+12/03/2024, 21:06 - Lamar: ok
+12/03/2024, 23:30 - Rob: This message was deleted"""
+
+    assert list(minimize_lines(raw.splitlines())) == [
+        "-- 12/03/2024 --",
+        "[21:04] Lamar: did you book the trip without me",
+        "Rob: it wasn't like that / it was last minute",
+        "Lamar: ok (x2)",
+        "[23:30] Rob: [deleted]",
+    ]
+
+
+def test_whatsapp_ios_export_with_12_hour_times():
+    raw = """[12/03/24, 9:04:30 PM] Lamar: did you book the trip without me
+[12/03/24, 9:05:41 PM] Rob: ‎image omitted
+[13/03/24, 12:10:02 AM] Rob: it was last minute <This message was edited>"""
+
+    assert minimize_summary(raw).text == (
+        "-- 12/03/24 --\n[21:04] Lamar: did you book the trip without me\n"
+        "-- 13/03/24 --\n[00:10] Rob: it was last minute"
+    )
+
+
+def test_imessage_export():
+    raw = """Mar 12, 2024  9:03:53 PM (Read by you after 2 seconds)
+Me
+did you book the trip without me
+
+Mar 12, 2024  9:04:30 PM
+Rob
+it wasn't like that
+Read
+"""
+
+    result = minimize_summary(raw)
+
+    assert result.format == "imessage"
+    assert result.text == "-- Mar 12, 2024 --\n[21:03] Me: did you book the trip without me\nRob: it wasn't like that"
+
+
+def test_discord_export_drops_attachments_and_quotes():
+    raw = """[3/12/2024 9:08 PM] Lamar
+did you book the trip without me
+
+[3/12/2024 9:09 PM] Rob
+{Attachments}
+https://cdn.discordapp.com/attachments/1/2/IMG_1.png
+
+[3/12/2024 9:10 PM] Rob
+> did you book the trip without me
+no"""
+
+    result = minimize_summary(raw)
+
+    assert result.format == "discord"
+    assert result.text == "-- 3/12/2024 --\n[21:08] Lamar: did you book the trip without me\nRob: no"
+
+
+def test_prose_summary_only_collapses_whitespace():
+    raw = "Rob booked a trip.\n\n\n\nNote:   I found out   from Tasha."
+
+    result = minimize_summary(raw)
+
+    assert result.format == "text"
+    assert result.text == "Rob booked a trip.\n\nNote: I found out from Tasha."
+
+
+def test_users_own_words_around_an_export_are_kept():
+    raw = "Here's the chat, I'm so done\n12/03/2024, 21:04 - Lamar: did you book the trip"
+
+    assert minimize_summary(raw).text.splitlines()[0] == "Here's the chat, I'm so done"
+
+
+@pytest.mark.parametrize("path", sorted(CORPUS.glob("*.txt")), ids=lambda p: p.name)
+def test_sample_exports_shrink_and_keep_every_speaker(path):
+    raw = path.read_text()
+
+    result = minimize_summary(raw)
+
+    assert result.format != "text"
+    assert result.tokens_out < result.tokens_in * 0.6
+    for speaker in ("Rob", "Tasha", "Jess"):
+        assert f"{speaker}: " in result.text
+
+
+def test_orchestrator_prompts_with_minimized_summary_and_stores_raw():
+    session = Session(session_id="s1", incident_name="Trip", created_at="2025-01-01T12:00:00")
+    raw = "12/03/2024, 21:04 - Lamar: did you book the trip\n12/03/2024, 21:05 - Rob: <Media omitted>"
+    with patch("src.interview.ClaudeClient"):
+        orchestrator = InterviewOrchestrator(session, minimize_summary_input=True)
+    orchestrator.summary_and_goal_generator.extract_and_generate = Mock(
+        return_value=(None, [Goal(description="Who booked", id="g1")])
+    )
+    orchestrator.question_generator.generate_question_with_answers = Mock(
+        return_value=QuestionWithAnswers(
+            question="Who booked it?",
+            target_goal="g1",
+            reasoning="",
+            answers=[Answer(answer=f"option {i}", reasoning="") for i in range(4)],
+        )
+    )
+
+    orchestrator.initialize_investigation(raw, image_data_list=[])
+
+    sent = orchestrator.summary_and_goal_generator.extract_and_generate.call_args.args[0]
+    assert sent == "-- 12/03/2024 --\n[21:04] Lamar: did you book the trip"
+    assert session.summary == raw
+
+
+def test_identical_messages_from_two_speakers_are_both_kept():
+    raw = """12/03/2024, 21:04 - Lamar: happy birthday to you!!!
+12/03/2024, 21:05 - Rob: happy birthday to you!!!
+12/03/2024, 21:06 - Tasha: > happy birthday to you!!!"""
+
+    result = minimize_summary(raw)
+
+    assert result.text == (
+        "-- 12/03/2024 --\n[21:04] Lamar: happy birthday to you!!!\nRob: happy birthday to you!!!"
+    )
@@ -0,0 +1,59 @@
+"""Tests for compact tool schemas and output expansion."""
+import json
+
+import pytest
+
+from src.api_client import ClaudeClient
+from src.compact_schemas import compact_schema, expand_tool_output
+from src.fake_anthropic_server import FakeAnthropicServer, synthesize
+from src.models import AnalysisReport, ExtractedSummary, QuestionWithAnswers
+from src.schemas import (
+    ANALYSIS_SCHEMA,
+    GOAL_TRACKER_SCHEMA,
+    QUESTION_WITH_ANSWERS_SCHEMA,
+    QUESTION_WITH_IMPLICATIONS_SCHEMA,
+    SUMMARY_EXTRACTOR_SCHEMA,
+)
+from src.telemetry import Telemetry
+
+
+@pytest.mark.parametrize("schema, model", [
+    (ANALYSIS_SCHEMA, AnalysisReport),
+    (QUESTION_WITH_ANSWERS_SCHEMA, QuestionWithAnswers),
+    (SUMMARY_EXTRACTOR_SCHEMA, ExtractedSummary),
+])
+def test_compact_output_expands_to_models(schema, model):
+    compact = compact_schema(schema)
+    output = synthesize(compact["input_schema"], array_items=4)
+
+    expanded = expand_tool_output(schema, output)
+
+    model.model_validate(expanded)
+    assert len(json.dumps(compact["input_schema"]["required"])) < len(
+        json.dumps(schema["input_schema"]["required"])
+    )
+
+
+def test_enum_codes_round_trip():
+    compact = compact_schema(QUESTION_WITH_IMPLICATIONS_SCHEMA)
+    option = compact["input_schema"]["properties"]["a"]["items"]
+    assert option["properties"]["f"]["items"]["properties"]["cf"]["enum"] == ["c", "u"]
+
+    output = synthesize(compact["input_schema"], array_items=4)
+    expanded = expand_tool_output(QUESTION_WITH_IMPLICATIONS_SCHEMA, output)
+    assert expanded["answers"][0]["implied_facts"][0]["confidence"] == "certain"
+    assert expanded["answers"][0]["goal_impact"][0]["status"] == "not_started"
+
+
+def test_tools_without_key_map_are_untouched():
+    assert compact_schema(GOAL_TRACKER_SCHEMA) is GOAL_TRACKER_SCHEMA
+
+
+def test_client_sends_compact_schema_and_returns_original_keys(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "fake-key")
+    with FakeAnthropicServer() as server:
+        client = ClaudeClient(base_url=server.base_url, compact_schemas=True, telemetry=Telemetry())
+        result = client.call_with_tool("system", "prompt", ANALYSIS_SCHEMA)
+
+    AnalysisReport.model_validate(result)
+    assert "drama_rating_explanation" in result["verdict"]
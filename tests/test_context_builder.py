@@ -0,0 +1,145 @@
+"""Tests for the token-budgeted context builder and budgeted prompts."""
+from src.context_builder import (
+    ContextBuilder,
+    ContextSection,
+    estimate_tokens,
+    get_input_budget,
+    summarize_omitted,
+)
+from src.models import Actor, Conflict, ExtractedSummary, GeneralDetails
+from src.prompts import build_analysis_prompt, build_question_with_answers_prompt
+
+
+def make_summary():
+    return ExtractedSummary(
+        actors=[Actor(name="Lamar"), Actor(name="Rob")],
+        point_of_conflict=Conflict(primary="Mexico trip"),
+        general_details=GeneralDetails(),
+    )
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("a" * 400) == 100
+
+
+def test_everything_fits_under_large_budget():
+    built = ContextBuilder(1000).build([
+        ContextSection("facts", ["- one", "- two"], priority=0),
+    ])
+    assert built.text("facts") == "- one\n- two"
+    assert built.dropped == {}
+    assert built.estimated_tokens <= 1000
+
+
+def test_lowest_priority_is_trimmed_first():
+    messages = [f"USER: message {i} " + "x" * 40 for i in range(10)]
+    facts = [f"- fact {i} " + "y" * 40 for i in range(10)]
+
+    built = ContextBuilder(150).build([
+        ContextSection("conversation", messages, priority=0),
+        ContextSection("facts", facts, priority=1),
+    ])
+
+    assert "conversation" not in built.dropped
+    assert built.dropped["facts"] > 0
+    assert built.estimated_tokens <= 150
+
+
+def test_min_share_is_kept_free_for_a_later_section():
+    messages = [f"USER: message {i} " + "x" * 40 for i in range(30)]
+    facts = [f"- fact {i} " + "y" * 40 for i in range(30)]
+
+    built = ContextBuilder(300).build([
+        ContextSection("conversation", messages, priority=0),
+        ContextSection("facts", facts, priority=1, min_share=0.3),
+    ])
+
+    assert estimate_tokens(built.text("facts")) >= 0.3 * 300 - 15  # within one item
+    assert built.dropped["conversation"] > 0
+    assert built.estimated_tokens <= 300
+
+
+def test_unused_min_share_goes_to_earlier_sections():
+    messages = [f"USER: message {i} " + "x" * 40 for i in range(30)]
+
+    built = ContextBuilder(300).build([
+        ContextSection("conversation", messages, priority=0),
+        ContextSection("facts", ["- one fact"], priority=1, min_share=0.3),
+    ])
+
+    assert built.text("facts") == "- one fact"
+    assert built.estimated_tokens > 0.8 * 300
+
+
+def test_newest_items_are_kept_and_order_preserved():
+    items = [f"line {i}" for i in range(20)]
+    built = ContextBuilder(12).build([ContextSection("log", items, keep="newest")])
+
+    kept = built.text("log").split("\n")
+    assert kept[-1] == "line 19"
+    assert kept == sorted(kept, key=lambda line: int(line.split()[1]))
+
+
+def test_dropped_items_are_summarized():
+    facts = [f"- fact {i}" for i in range(30)]
+    topics = {line: "timing" if i % 2 else "people" for i, line in enumerate(facts)}
+
+    built = ContextBuilder(40).build([
+        ContextSection("facts", facts, summarize=summarize_omitted("facts", topics)),
+    ])
+
+    first_line = built.text("facts").split("\n")[0]
+    assert first_line.startswith(f"({built.dropped['facts']} earlier facts omitted")
+    assert "timing" in first_line
+    assert "facts" in built.summarized
+
+
+def test_input_budget_env_override(monkeypatch):
+    monkeypatch.setenv("INPUT_TOKEN_BUDGETS", '{"AnalysisAgent": 500}')
+    assert get_input_budget("AnalysisAgent") == 500
+    assert get_input_budget("DriftDetectorAgent") is None
+
+
+def test_question_prompt_respects_budget_and_keeps_old_facts_when_short():
+    facts = [{"claim": f"fact number {i}", "topic": "t", "timestamp": ""} for i in range(15)]
+    messages = [{"role": "user", "content": "hi"}]
+
+    prompt = build_question_with_answers_prompt(
+        [], facts, messages, "", make_summary(), token_budget=3000
+    )
+
+    # Short session: every fact fits, unlike the old fixed last-10 slice
+    assert "fact number 0" in prompt
+    assert "fact number 14" in prompt
+
+
+def test_long_conversation_does_not_squeeze_facts_out_of_question_prompt():
+    facts = [{"claim": f"fact number {i}", "topic": "t", "timestamp": ""} for i in range(40)]
+    messages = [{"role": "user", "content": "m" * 1000} for _ in range(40)]
+
+    prompt = build_question_with_answers_prompt(
+        [], facts, messages, "", make_summary(), token_budget=3000
+    )
+
+    assert "fact number 39" in prompt
+    assert "fact number 0" in prompt
+
+
+def test_analysis_prompt_bounded_for_long_sessions():
+    session_data = {
+        "incident_name": "mexico",
+        "summary": "summary",
+        "goals": [{"description": "Timeline", "confidence": 50, "status": "in_progress"}],
+        "facts": [{"claim": f"claim {i} " + "z" * 80, "topic": "t"} for i in range(300)],
+        "messages": [{"role": "user", "content": "m" * 400} for _ in range(300)],
+        "turn_count": 150,
+    }
+
+    unbounded = build_analysis_prompt(session_data)
+    bounded = build_analysis_prompt(session_data, token_budget=4000)
+
+    assert estimate_tokens(unbounded) > 4000
+    assert estimate_tokens(bounded) <= 4000
+    assert "earlier facts omitted" in bounded
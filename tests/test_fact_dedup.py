@@ -0,0 +1,81 @@
+"""Tests for near-duplicate fact merging."""
+from src.fact_dedup import FactDeduplicator, fact_key
+from src.fact_index import FactIndexes
+from src.models import Fact
+from src.session import SessionManager
+
+
+def insert(dedup, facts, turn, *claims, topic="timeline", confidence="certain", timestamp=None):
+    new = [Fact(topic=topic, claim=c, confidence=confidence, timestamp=timestamp) for c in claims]
+    return dedup.insert(facts, new, turn=turn)
+
+
+def test_fact_key_normalizes_wording():
+    assert fact_key("Sarah got there at 5:30pm") == ("sarah", "5", "30", "pm")
+    assert "not" in fact_key("Rob didn't book it")
+
+
+def test_paraphrase_is_merged_with_provenance():
+    dedup, facts = FactDeduplicator(threshold=0.7), []
+    insert(dedup, facts, 1, "Sarah arrived at 5:30pm")
+
+    added = insert(dedup, facts, 3, "sarah arrived around 5:30 pm", timestamp="5:30pm")
+
+    assert added == []
+    assert len(facts) == 1
+    assert facts[0].claim == "Sarah arrived at 5:30pm"
+    assert facts[0].turns == [1, 3]
+    assert facts[0].timestamp == "5:30pm"
+
+
+def test_restated_in_a_later_turn_becomes_certain():
+    dedup, facts = FactDeduplicator(threshold=0.7), []
+    insert(dedup, facts, 1, "Rob booked the flights", confidence="uncertain")
+    insert(dedup, facts, 1, "Rob booked the flights", confidence="uncertain")
+    assert facts[0].confidence == "uncertain"  # same answer twice isn't corroboration
+
+    insert(dedup, facts, 2, "rob booked flights", confidence="uncertain")
+
+    assert facts[0].confidence == "certain"
+
+
+def test_numbers_negation_and_topic_keep_facts_apart():
+    dedup, facts = FactDeduplicator(threshold=0.7), []
+    insert(dedup, facts, 1, "Sarah arrived at 5:30pm", "Rob booked the flights")
+
+    insert(dedup, facts, 2, "Sarah arrived at 6:30pm", "Rob didn't book the flights")
+    insert(dedup, facts, 2, "Sarah arrived at 5:30pm", topic="motive")
+
+    assert len(facts) == 5
+
+
+def test_role_reversal_is_not_merged():
+    dedup, facts = FactDeduplicator(threshold=0.7), []
+    insert(dedup, facts, 1, "Rob told Lamar about the party")
+
+    added = insert(dedup, facts, 2, "Lamar told Rob about the party")
+
+    assert [f.claim for f in added] == ["Lamar told Rob about the party"]
+    assert len(facts) == 2
+
+
+def test_facts_added_elsewhere_are_indexed_before_insert():
+    dedup = FactDeduplicator(threshold=0.7)
+    facts = [Fact(topic="timeline", claim="Tasha knew on Friday")]
+
+    insert(dedup, facts, 4, "Tasha knew on Friday")
+
+    assert len(facts) == 1 and facts[0].turns == [4]
+
+
+def test_archived_session_deduplicator_is_dropped(tmp_path, monkeypatch):
+    deduplicators = FactIndexes(FactDeduplicator)
+    monkeypatch.setattr("src.session.FACT_DEDUPLICATORS", deduplicators)
+    manager = SessionManager(data_dir=tmp_path / "sessions")
+    session = manager.create_session("Trip", "Rob", "witness")
+    manager.save_session(session)
+    deduplicators.get(session.session_id)
+
+    manager.archive_session(session.session_id)
+
+    assert session.session_id not in deduplicators
@@ -0,0 +1,119 @@
+"""Tests for relevance-ranked fact retrieval."""
+from unittest.mock import Mock
+
+from src.agents.question_generator import QuestionGeneratorAgent
+from src.api_client import ClaudeClient
+from src.fact_index import FactIndex, FactIndexes, tokenize
+from src.models import Actor, Conflict, ExtractedSummary, Fact, GeneralDetails, Goal, GoalStatus
+from src.session import SessionManager
+
+
+def facts_about(*claims: str) -> list[Fact]:
+    return [Fact(topic="misc", claim=claim) for claim in claims]
+
+
+GOALS = [
+    Goal(description="How Lamar found out about the trip", confidence=20, status=GoalStatus.IN_PROGRESS),
+    Goal(description="Who paid for the flights", confidence=85, status=GoalStatus.IN_PROGRESS),
+]
+
+
+def test_tokenize_drops_stopwords_and_plurals():
+    assert tokenize("Rob's flights were booked in March") == ["rob", "flight", "booked", "march"]
+
+
+def test_older_relevant_facts_beat_newer_unrelated_ones():
+    facts = facts_about(
+        "Lamar found out from an Instagram story",
+        *[f"Tasha ordered dessert number {i}" for i in range(20)],
+    )
+
+    shown = FactIndex().relevant_facts(facts, GOALS, k=5)
+
+    assert shown[0].claim == "Lamar found out from an Instagram story"
+    # The newest facts are always kept, in interview order
+    assert [f.claim for f in shown[-3:]] == [f"Tasha ordered dessert number {i}" for i in (17, 18, 19)]
+
+
+def test_weakest_goal_outranks_a_nearly_done_one():
+    facts = facts_about("Rob paid for the flights", "Lamar found out on Sunday", "filler", "filler", "filler")
+
+    shown = FactIndex().relevant_facts(facts, GOALS, k=4)
+
+    assert "Lamar found out on Sunday" in [f.claim for f in shown]
+    assert "Rob paid for the flights" not in [f.claim for f in shown]
+
+
+def test_token_budget_limits_facts():
+    facts = facts_about(*[f"Lamar found out, version {i} " + "x" * 80 for i in range(10)])
+
+    shown = FactIndex().relevant_facts(facts, GOALS, k=10, token_budget=60)
+
+    assert len(shown) == 2
+
+
+def test_index_updates_incrementally_and_rebuilds_on_replacement():
+    index = FactIndex()
+    facts = facts_about("Lamar found out", "Rob booked")
+    index.sync(facts)
+    postings = index.postings["lamar"]
+
+    facts.append(Fact(topic="misc", claim="Lamar was angry"))
+    index.sync(facts)
+    assert index.postings["lamar"] is postings and len(postings) == 2
+
+    index.sync(facts_about("Someone else entirely"))
+    assert len(index) == 1 and "lamar" not in index.postings
+
+
+def test_registry_keeps_one_index_per_session():
+    indexes = FactIndexes(max_sessions=2)
+    first = indexes.get("a")
+
+    assert indexes.get("a") is first
+    indexes.get("b")
+    indexes.get("c")
+    assert indexes.get("a") is not first
+
+
+def test_archived_session_index_is_dropped(tmp_path, monkeypatch):
+    indexes = FactIndexes()
+    monkeypatch.setattr("src.session.FACT_INDEXES", indexes)
+    manager = SessionManager(data_dir=tmp_path / "sessions")
+    session = manager.create_session("Trip", "Rob", "witness")
+    manager.save_session(session)
+    indexes.get(session.session_id)
+
+    manager.archive_session(session.session_id)
+
+    assert session.session_id not in indexes
+
+
+def test_question_generator_shows_ranked_facts():
+    mock_client = Mock(spec=ClaudeClient)
+    mock_client.call_with_tool.return_value = {
+        "question": "How did Lamar hear?",
+        "target_goal": "How Lamar found out about the trip",
+        "reasoning": "",
+        "answers": [{"answer": f"option {i}", "reasoning": ""} for i in range(4)],
+    }
+    facts = facts_about(
+        "Lamar found out from an Instagram story",
+        *[f"Tasha ordered dessert number {i}" for i in range(20)],
+    )
+
+    QuestionGeneratorAgent(mock_client).generate_question_with_answers(
+        GOALS,
+        facts,
+        [],
+        extracted_summary=ExtractedSummary(
+            actors=[Actor(name="Lamar")],
+            point_of_conflict=Conflict(primary="Mexico trip"),
+            general_details=GeneralDetails(),
+        ),
+        fact_index=FactIndex(),
+    )
+
+    prompt = mock_client.call_with_tool.call_args.args[1]
+    assert "- Lamar found out from an Instagram story" in prompt
+    assert "dessert number 0\n" not in prompt
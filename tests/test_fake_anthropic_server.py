@@ -0,0 +1,86 @@
+"""Tests for the local fake Messages API server."""
+import httpx
+import pytest
+
+from src.api_client import ClaudeClient
+from src.fake_anthropic_server import (
+    FakeAnthropicServer,
+    FakeServerConfig,
+    LatencyModel,
+    synthesize,
+)
+from src.schemas import FACT_EXTRACTOR_SCHEMA, GOAL_TRACKER_SCHEMA, QUESTION_WITH_ANSWERS_SCHEMA
+from src.telemetry import Telemetry
+
+
+@pytest.fixture
+def fake_server():
+    with FakeAnthropicServer(FakeServerConfig(seed=1)) as server:
+        yield server
+
+
+@pytest.fixture
+def client(fake_server, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "fake-key")
+    return ClaudeClient(base_url=fake_server.base_url, telemetry=Telemetry())
+
+
+def test_synthesize_respects_schema_constraints():
+    value = synthesize(QUESTION_WITH_ANSWERS_SCHEMA["input_schema"])
+    assert len(value["answers"]) == 4
+    assert set(value["answers"][0]) == {"answer", "reasoning"}
+
+    goal_update = synthesize(GOAL_TRACKER_SCHEMA["input_schema"])["goal_updates"][0]
+    assert goal_update["status"] == "not_started"
+    assert 0 <= goal_update["confidence"] <= 100
+
+
+def test_latency_model_parse():
+    model = LatencyModel.parse("uniform:100,900", tokens_per_second=50)
+    assert (model.kind, model.a, model.b, model.tokens_per_second) == ("uniform", 100, 900, 50)
+
+
+def test_client_tool_call_against_fake_server(client, fake_server):
+    result = client.call_with_tool(
+        "system", "prompt", QUESTION_WITH_ANSWERS_SCHEMA, agent_name="QuestionGeneratorAgent"
+    )
+
+    assert len(result["answers"]) == 4
+    assert fake_server.request_count == 1
+    record = client.telemetry.recent_calls()[-1]
+    assert record.input_tokens > 0
+    assert record.output_tokens > 0
+
+
+def test_multi_tool_call_returns_every_tool(client):
+    results = client.call_with_multiple_tools(
+        "system", "prompt", [FACT_EXTRACTOR_SCHEMA, GOAL_TRACKER_SCHEMA]
+    )
+    assert set(results) == {"extract_facts", "update_goal_progress"}
+
+
+def test_streaming_response(client):
+    with client.client.messages.stream(
+        model="claude-haiku-4-5",
+        max_tokens=100,
+        messages=[{"role": "user", "content": "hi"}],
+        tools=[FACT_EXTRACTOR_SCHEMA],
+        tool_choice={"type": "tool", "name": "extract_facts"},
+    ) as stream:
+        message = stream.get_final_message()
+
+    assert message.content[0].name == "extract_facts"
+    assert message.content[0].input["facts"]
+    assert message.usage.output_tokens > 0
+
+
+@pytest.mark.parametrize("field,status,error_type", [
+    ("rate_429", 429, "rate_limit_error"),
+    ("rate_529", 529, "overloaded_error"),
+])
+def test_error_injection(field, status, error_type):
+    with FakeAnthropicServer(FakeServerConfig(**{field: 1.0})) as server:
+        response = httpx.post(f"{server.base_url}/v1/messages", json={"messages": []})
+
+    assert response.status_code == status
+    assert response.json()["error"]["type"] == error_type
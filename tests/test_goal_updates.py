@@ -0,0 +1,50 @@
+"""Tests for goal IDs and ID-indexed goal updates."""
+from src.goal_updates import apply_goal_updates, assign_goal_ids, goal_dicts
+from src.models import Goal, GoalStatus
+from src.prompts import build_goal_tracker_prompt
+from src.telemetry import Telemetry
+
+
+def make_goals():
+    return [
+        Goal(description="Establish the timeline of the Mexico trip"),
+        Goal(description="Identify who knew about the trip", id="g2"),
+        Goal(description="Understand why Lamar wasn't told"),
+    ]
+
+
+def update(reference, confidence, key="goal_id"):
+    return {key: reference, "confidence": confidence, "status": "in_progress", "reasoning": ""}
+
+
+def test_assign_ids_keeps_existing_and_fills_gaps():
+    goals = assign_goal_ids(make_goals())
+    assert [g.id for g in goals] == ["g1", "g2", "g3"]
+
+
+def test_updates_applied_by_id():
+    telemetry = Telemetry()
+    goals = apply_goal_updates(make_goals(), [update("g3", 40), update("[G1]", 20)], telemetry)
+
+    assert [g.confidence for g in goals] == [20, 0, 40]
+    assert goals[2].id == "g3"
+    assert goals[2].status == GoalStatus.IN_PROGRESS
+    assert telemetry.counter("goal_updates.matched_id") == 2
+
+
+def test_paraphrased_description_falls_back_to_fuzzy_match():
+    telemetry = Telemetry()
+    goals = apply_goal_updates(
+        make_goals(),
+        [update("Understand why Lamar was not told", 55, key="goal"), update("Unrelated", 90, key="goal")],
+        telemetry,
+    )
+
+    assert [g.confidence for g in goals] == [0, 0, 55]
+    assert telemetry.counter("goal_updates.matched_fuzzy") == 1
+    assert telemetry.counter("goal_updates.unmatched") == 1
+
+
+def test_prompt_shows_goal_ids():
+    prompt = build_goal_tracker_prompt(goal_dicts(make_goals()), [{"claim": "x"}])
+    assert "[g1] Establish the timeline of the Mexico trip" in prompt
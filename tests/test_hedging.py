@@ -0,0 +1,100 @@
+"""Tests for hedged requests on interactive calls."""
+import threading
+import time
+
+import pytest
+
+from src.hedging import HedgePolicy, Hedger, hedge_stats
+from src.telemetry import Telemetry
+
+
+def warm(telemetry, key, latency_ms=20, count=20):
+    for _ in range(count):
+        telemetry.observe(key, latency_ms)
+
+
+def make_hedger(telemetry, **overrides):
+    settings = {"enabled": True, "min_delay_ms": 10, "max_hedge_ratio": 1.0, "min_samples": 20}
+    return Hedger(HedgePolicy(**{**settings, **overrides}), telemetry)
+
+
+def test_no_hedge_without_latency_history():
+    telemetry = Telemetry()
+    hedger = make_hedger(telemetry)
+    calls = []
+
+    result = hedger.run("QuestionGeneratorAgent:default", lambda: calls.append(1) or "ok")
+
+    assert result == "ok"
+    assert len(calls) == 1
+    assert telemetry.counter("hedge.sent") == 0
+
+
+def test_fast_primary_is_not_hedged():
+    telemetry = Telemetry()
+    warm(telemetry, "k", latency_ms=200)
+    hedger = make_hedger(telemetry)
+    calls = []
+
+    assert hedger.run("k", lambda: calls.append(1) or "primary") == "primary"
+    assert len(calls) == 1
+
+
+def test_slow_primary_loses_to_hedge():
+    telemetry = Telemetry()
+    warm(telemetry, "k")
+    hedger = make_hedger(telemetry)
+    attempt = {"n": 0}
+    lock = threading.Lock()
+
+    def send():
+        with lock:
+            attempt["n"] += 1
+            n = attempt["n"]
+        if n == 1:
+            time.sleep(0.5)
+            return "primary"
+        return "hedge"
+
+    assert hedger.run("k", send) == "hedge"
+    stats = hedge_stats(telemetry)
+    assert stats["sent"] == 1
+    assert stats["hedge_won"] == 1
+    assert stats["hedge_win_rate"] == 1.0
+
+
+def test_budget_caps_hedges():
+    telemetry = Telemetry()
+    warm(telemetry, "k")
+    hedger = make_hedger(telemetry, max_hedge_ratio=0.0)
+
+    def send():
+        time.sleep(0.05)
+        return "primary"
+
+    assert hedger.run("k", send) == "primary"
+    assert telemetry.counter("hedge.sent") == 0
+    assert telemetry.counter("hedge.budget_denied") == 1
+
+
+def test_error_raised_when_both_requests_fail():
+    telemetry = Telemetry()
+    warm(telemetry, "k")
+    hedger = make_hedger(telemetry)
+
+    def send():
+        time.sleep(0.05)
+        raise RuntimeError("overloaded")
+
+    with pytest.raises(RuntimeError, match="overloaded"):
+        hedger.run("k", send)
+
+
+def test_policy_from_env(monkeypatch):
+    monkeypatch.setenv("HEDGE_ENABLED", "true")
+    monkeypatch.setenv("HEDGE_PERCENTILE", "90")
+
+    policy = HedgePolicy.from_env()
+
+    assert policy.enabled
+    assert policy.percentile == 90
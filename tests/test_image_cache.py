@@ -0,0 +1,153 @@
+"""Tests for the per-image extraction cache and map-reduce image extraction."""
+import base64
+import os
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.agents.summary_extractor import SummaryExtractorAgent
+from src.api_client import ClaudeClient
+from src.image_cache import ImageExtractionCache, image_hash
+from src.schemas import IMAGE_TRANSCRIPTION_SCHEMA, SUMMARY_EXTRACTOR_SCHEMA
+from src.telemetry import Telemetry
+
+SUMMARY = {
+    "actors": [{"name": "Rob", "role": "friend", "relationships": [], "emotional_state": []}],
+    "point_of_conflict": {"primary": "Secret trip", "secondary": []},
+    "general_details": {
+        "timeline_markers": [],
+        "location_context": [],
+        "communication_history": [],
+        "emotional_atmosphere": "tense",
+    },
+    "missing_info": [],
+}
+
+
+def image(payload: bytes) -> dict:
+    return {"data": base64.b64encode(payload).decode(), "media_type": "image/png"}
+
+
+def make_agent(tmp_path, telemetry):
+    client = Mock(spec=ClaudeClient)
+    client.call_with_tool_and_images.side_effect = lambda *args, image_data_list, **kwargs: {
+        "transcript": f"Rob: {base64.b64decode(image_data_list[0]['data']).decode()}",
+        "observations": ["Lamar left it on read"],
+    }
+    client.call_with_tool.return_value = SUMMARY
+    cache = ImageExtractionCache(tmp_path, telemetry=telemetry)
+    return SummaryExtractorAgent(client, image_cache=cache), client
+
+
+def test_hash_ignores_base64_line_breaks():
+    plain = image(b"x" * 100)
+    wrapped = {**plain, "data": plain["data"][:40] + "\n" + plain["data"][40:]}
+
+    assert image_hash(plain) == image_hash(wrapped)
+
+
+def test_only_unseen_images_are_sent_to_the_model(tmp_path):
+    telemetry = Telemetry()
+    agent, client = make_agent(tmp_path, telemetry)
+
+    agent.extract_summary("", [image(b"flights booked"), image(b"see you in Cancun")])
+    agent.extract_summary("", [image(b"see you in Cancun"), image(b"new screenshot")])
+
+    sent = [c.kwargs["image_data_list"][0] for c in client.call_with_tool_and_images.call_args_list]
+    assert [base64.b64decode(i["data"]) for i in sent] == [
+        b"flights booked", b"see you in Cancun", b"new screenshot"
+    ]
+    assert all(c.args[2] == IMAGE_TRANSCRIPTION_SCHEMA for c in client.call_with_tool_and_images.call_args_list)
+    assert telemetry.counter("image_cache.hit") == 1
+    assert telemetry.counter("image_cache.miss") == 3
+
+
+def test_summary_is_extracted_from_transcripts_without_images(tmp_path):
+    agent, client = make_agent(tmp_path, Telemetry())
+
+    summary = agent.extract_summary("They went without me", [image(b"flights booked")] * 2)
+
+    assert summary.actors[0].name == "Rob"
+    assert client.call_with_tool_and_images.call_count == 1  # duplicate in one upload
+    prompt = client.call_with_tool.call_args.args[1]
+    assert client.call_with_tool.call_args.args[2] == SUMMARY_EXTRACTOR_SCHEMA
+    assert "They went without me" in prompt
+    assert "Screenshot 2:\nRob: flights booked" in prompt
+    assert "Lamar left it on read" in prompt
+
+
+def test_cache_survives_a_new_instance(tmp_path):
+    digest = image_hash(image(b"flights booked"))
+    ImageExtractionCache(tmp_path, telemetry=Telemetry()).put(digest, {"transcript": "t", "observations": []})
+
+    assert ImageExtractionCache(tmp_path, telemetry=Telemetry()).get(digest) == {
+        "transcript": "t", "observations": []
+    }
+
+
+def test_map_reduce_transcribes_in_bounded_parallel_calls():
+    client = Mock(spec=ClaudeClient)
+    in_flight, peak, lock = [0], [0], threading.Lock()
+
+    def transcribe(*args, image_data_list, **kwargs):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return {"transcript": base64.b64decode(image_data_list[0]["data"]).decode(), "observations": []}
+
+    client.call_with_tool_and_images.side_effect = transcribe
+    client.call_with_tool.return_value = SUMMARY
+    agent = SummaryExtractorAgent(client, map_reduce=True, concurrency=3)
+
+    transcripts = agent.transcribe_images([image(f"shot {i}".encode()) for i in range(7)])
+
+    assert [t["transcript"] for t in transcripts] == [f"shot {i}" for i in range(7)]
+    assert peak[0] == 3
+
+
+def test_failed_upload_keeps_finished_images_cached(tmp_path):
+    telemetry = Telemetry()
+    agent, client = make_agent(tmp_path, telemetry)
+    transcribe = client.call_with_tool_and_images.side_effect
+
+    def flaky(*args, image_data_list, **kwargs):
+        if image_data_list[0]["data"] == image(b"broken")["data"]:
+            raise RuntimeError("upstream error")
+        return transcribe(*args, image_data_list=image_data_list, **kwargs)
+
+    client.call_with_tool_and_images.side_effect = flaky
+    with pytest.raises(RuntimeError):
+        agent.transcribe_images([image(b"flights booked"), image(b"broken")])
+
+    assert agent.image_cache.get(image_hash(image(b"flights booked"))) is not None
+
+
+def test_least_recently_used_entries_are_pruned(tmp_path):
+    telemetry = Telemetry()
+    cache = ImageExtractionCache(tmp_path, telemetry=telemetry, max_entries=2)
+    cache.put("a", {"transcript": "a"})
+    cache.put("b", {"transcript": "b"})
+    os.utime(tmp_path / "a.json", (1, 1))
+    os.utime(tmp_path / "b.json", (2, 2))
+
+    assert cache.get("a") == {"transcript": "a"}  # now the most recently used
+    cache.put("c", {"transcript": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert telemetry.counter("image_cache.evicted") == 1
+
+
+def test_byte_limit_prunes_oldest_entries(tmp_path):
+    cache = ImageExtractionCache(tmp_path, telemetry=Telemetry(), max_bytes=100)
+    cache.put("old", {"transcript": "x" * 40})
+    os.utime(tmp_path / "old.json", (1, 1))
+
+    cache.put("new", {"transcript": "y" * 40})
+
+    assert sorted(p.name for p in tmp_path.glob("*.json")) == ["new.json"]
@@ -0,0 +1,124 @@
+"""Tests for the content-addressed image store and session archival."""
+import base64
+import hashlib
+import struct
+import zlib
+
+from src.image_store import ImageStore
+from src.models import ImageRef
+from src.session import SessionManager
+from src.telemetry import Telemetry
+
+
+def png(width: int, height: int, seed: bytes = b"") -> bytes:
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    chunk = b"IHDR" + ihdr
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + struct.pack(">I", len(ihdr)) + chunk + struct.pack(">I", zlib.crc32(chunk))
+        + seed
+    )
+
+
+def image(data: bytes) -> dict:
+    return {"data": base64.b64encode(data).decode(), "media_type": "image/jpeg"}
+
+
+def test_put_names_blob_by_hash_and_reads_real_metadata(tmp_path):
+    store = ImageStore(tmp_path)
+    data = png(1170, 2532, b"chat")
+
+    ref = store.put(image(data), "s1")
+
+    assert ref == ImageRef(
+        sha256=hashlib.sha256(data).hexdigest(),
+        media_type="image/png",
+        width=1170,
+        height=2532,
+        size=len(data),
+    )
+    assert store.blob_path(ref.sha256).read_bytes() == data
+
+
+def test_load_round_trips_through_mmap(tmp_path):
+    store = ImageStore(tmp_path)
+    data = png(10, 10, b"x" * 5000)
+    ref = store.put(image(data), "s1")
+
+    loaded = store.load(ref)
+
+    assert base64.b64decode(loaded["data"]) == data
+    assert loaded["media_type"] == "image/png"
+    assert loaded["sha256"] == ref.sha256
+
+
+def test_shared_image_is_stored_once_and_counted_per_session(tmp_path):
+    telemetry = Telemetry()
+    store = ImageStore(tmp_path, telemetry=telemetry)
+    shared = image(png(10, 10, b"shared"))
+
+    ref = store.put(shared, "s1")
+    store.put(shared, "s2")
+    store.put(shared, "s2")  # same session twice is one reference
+
+    assert store.refcount(ref.sha256) == 2
+    assert telemetry.counter("image_store.written") == 1
+    assert telemetry.counter("image_store.deduped") == 2
+
+
+def test_garbage_collection_keeps_referenced_blobs(tmp_path):
+    store = ImageStore(tmp_path)
+    shared = store.put(image(png(10, 10, b"shared")), "s1")
+    store.put(image(png(10, 10, b"shared")), "s2")
+    own = store.put(image(png(10, 10, b"own")), "s1")
+
+    store.release("s1", [shared, own])
+
+    assert store.collect_garbage() == 1
+    assert store.has(shared.sha256)
+    assert not store.has(own.sha256)
+
+
+def test_archive_session_releases_images(tmp_path):
+    store = ImageStore(tmp_path / "images")
+    manager = SessionManager(data_dir=tmp_path / "sessions")
+    kept = manager.create_session("Trip", "Lamar", "participant")
+    archived = manager.create_session("Trip", "Rob", "witness")
+    shared = image(png(10, 10, b"shared"))
+    kept.images = store.put_all([shared], kept.session_id)
+    archived.images = store.put_all([shared, image(png(10, 10, b"own"))], archived.session_id)
+    manager.save_session(kept)
+    manager.save_session(archived)
+
+    manager.archive_session(archived.session_id, image_store=store)
+
+    assert [s.session_id for s in manager.list_sessions()] == [kept.session_id]
+    assert (tmp_path / "sessions" / "archive" / f"{archived.session_id}.json").exists()
+    assert store.has(kept.images[0].sha256)
+    assert not store.has(archived.images[1].sha256)
+    # The session JSON never inlines image bytes
+    assert shared["data"] not in (tmp_path / "sessions" / "archive" / f"{archived.session_id}.json").read_text()
+
+
+def test_garbage_collection_keeps_blob_referenced_during_collection(tmp_path):
+    store = ImageStore(tmp_path)
+    shared = image(png(10, 10, b"shared"))
+    ref = store.put(shared, "s1")
+    store.release("s1", [ref])
+    counts = []
+    refcount = store.refcount
+
+    def racing_refcount(digest):
+        count = refcount(digest)
+        if not counts:
+            # A put() for another session lands right after the first count,
+            # sees the blob still there and skips writing it
+            assert store.put(shared, "s2") == ref
+        counts.append(count)
+        return count
+
+    store.refcount = racing_refcount
+
+    assert store.collect_garbage() == 0
+    assert counts == [0, 1]
+    assert store.load(ref)["data"] == shared["data"]
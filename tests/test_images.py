@@ -0,0 +1,154 @@
+"""Tests for server-side image normalization."""
+import base64
+import hashlib
+import io
+import struct
+import zlib
+from unittest.mock import Mock, patch
+
+import jwt
+import pytest
+
+from src.images import (
+    ImageRejectedError,
+    decode_base64_image,
+    estimate_image_tokens,
+    normalize_images,
+    sniff_image,
+)
+from src.telemetry import Telemetry
+
+
+def png(width: int, height: int, seed: bytes = b"") -> bytes:
+    """Minimal valid header-only PNG; seed makes otherwise identical files differ."""
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    chunk = b"IHDR" + ihdr
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + struct.pack(">I", len(ihdr)) + chunk + struct.pack(">I", zlib.crc32(chunk))
+        + seed
+    )
+
+
+def jpeg(width: int, height: int) -> bytes:
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    sof = b"\xff\xc0" + struct.pack(">HBHH", 17, 8, height, width) + b"\x00" * 10
+    return b"\xff\xd8" + app0 + sof + b"\xff\xd9"
+
+
+@pytest.mark.parametrize("data, expected", [
+    (png(1170, 2532), ("image/png", 1170, 2532)),
+    (jpeg(640, 480), ("image/jpeg", 640, 480)),
+    (b"GIF89a" + struct.pack("<HH", 320, 200) + b"\x00" * 8, ("image/gif", 320, 200)),
+    (
+        b"RIFF" + b"\x00" * 4 + b"WEBPVP8X" + b"\x00" * 8
+        + (799).to_bytes(3, "little") + (599).to_bytes(3, "little"),
+        ("image/webp", 800, 600),
+    ),
+])
+def test_format_and_size_come_from_the_header(data, expected):
+    info = sniff_image(data)
+
+    assert (info.media_type, info.width, info.height) == expected
+
+
+def test_non_images_are_rejected():
+    with pytest.raises(ImageRejectedError):
+        normalize_images([b"<html>not an image</html>"], telemetry=Telemetry())
+
+
+def test_exact_duplicates_are_dropped_and_reported():
+    telemetry = Telemetry()
+    first, other = png(100, 100, b"a"), png(100, 100, b"b")
+
+    images, report = normalize_images([first, other, first], telemetry=telemetry)
+
+    assert [base64.b64decode(i["data"]) for i in images] == [first, other]
+    assert report.duplicates_dropped == 1
+    assert report.bytes_saved == len(first)
+    assert report.tokens_saved == estimate_image_tokens(100, 100)
+    assert telemetry.counter("images.duplicates_dropped") == 1
+
+
+def test_size_caps_are_enforced(monkeypatch):
+    monkeypatch.setenv("IMAGE_MAX_UPLOAD_BYTES", "10")
+    with pytest.raises(ImageRejectedError, match="limit 10"):
+        normalize_images([png(10, 10)], telemetry=Telemetry())
+
+    monkeypatch.delenv("IMAGE_MAX_UPLOAD_BYTES")
+    monkeypatch.setenv("IMAGE_MAX_COUNT", "1")
+    with pytest.raises(ImageRejectedError, match="limit 1"):
+        normalize_images([png(10, 10, b"a"), png(10, 10, b"b")], telemetry=Telemetry())
+
+
+def test_data_url_prefix_is_accepted():
+    encoded = base64.b64encode(png(10, 10)).decode()
+
+    assert decode_base64_image(f"data:image/png;base64,{encoded}") == png(10, 10)
+
+
+def test_large_screenshots_are_downscaled():
+    pil_image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    pil_image.new("RGB", (1170, 2532), "white").save(buffer, format="PNG")
+
+    images, report = normalize_images([buffer.getvalue()], max_edge=1024, telemetry=Telemetry())
+
+    info = sniff_image(base64.b64decode(images[0]["data"]))
+    assert max(info.width, info.height) == 1024
+    assert report.resized == 1
+    assert report.tokens_saved > 0
+
+
+def test_corrupt_body_behind_a_valid_header_is_rejected():
+    pytest.importorskip("PIL.Image")
+
+    with pytest.raises(ImageRejectedError, match="could not be decoded"):
+        normalize_images([png(4000, 3000, b"garbage" * 100)], telemetry=Telemetry())
+
+
+@patch("src.api.routes.SessionManager")
+@patch("src.api.routes.InterviewOrchestrator")
+def test_investigate_accepts_multipart_uploads(mock_orchestrator_class, mock_session_manager_class):
+    from src.api.app import create_app
+    from src.api.routes import JWT_ALGORITHM, JWT_SECRET
+    from src.models import Session
+
+    session = Session(session_id="s1", incident_name="trip", created_at="2025-01-01T12:00:00")
+    mock_session_manager_class.return_value.create_session.return_value = session
+    orchestrator = Mock()
+    mock_orchestrator_class.return_value = orchestrator
+    token = jwt.encode({"sub": "test"}, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    shot = png(100, 100)
+
+    response = create_app().test_client().post(
+        "/api/investigate",
+        data={
+            "incident_name": "trip",
+            "interviewee_name": "Lamar",
+            "interviewee_role": "friend",
+            "confidence_threshold": "80",
+            "images": [(io.BytesIO(shot), "a.png"), (io.BytesIO(shot), "b.png")],
+        },
+        headers={"Authorization": f"Bearer {token}"},
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()["image_report"]["duplicates_dropped"] == 1
+    sent = orchestrator.initialize_investigation.call_args.kwargs["image_data_list"]
+    assert sent == [{
+        "data": base64.b64encode(shot).decode(),
+        "media_type": "image/png",
+        "sha256": hashlib.sha256(shot).hexdigest(),
+    }]
+
+
+def test_too_many_uploads_are_rejected_before_decoding(monkeypatch):
+    monkeypatch.setenv("IMAGE_MAX_COUNT", "2")
+    telemetry = Telemetry()
+
+    with patch("src.images.sniff_image") as sniff, pytest.raises(ImageRejectedError, match="3 images"):
+        normalize_images([png(10, 10)] * 3, telemetry=telemetry)
+
+    sniff.assert_not_called()
@@ -0,0 +1,86 @@
+"""Tests for incremental analysis (running state + verdict-only final call)."""
+from unittest.mock import Mock
+
+import pytest
+
+from src.agents.incremental_analysis import IncrementalAnalysisAgent
+from src.analysis_state import analysis_state_due, apply_analysis_state
+from src.api_client import ClaudeClient
+from src.models import AnalysisState, Fact, Session, TimelineEvent
+from src.schemas import ANALYSIS_SCHEMA, ANALYSIS_STATE_SCHEMA, VERDICT_SCHEMA
+
+
+@pytest.fixture
+def session_with_state(trip_session):
+    def make(covered_facts: int) -> Session:
+        session = trip_session(facts=[
+            Fact(topic="trip", claim="Rob booked in March", timestamp="March"),
+            Fact(topic="trip", claim="Tasha knew first"),
+            Fact(topic="trip", claim="Lamar saw the photos", timestamp="the Sunday after"),
+        ])
+        session.analysis_state = AnalysisState(
+            timeline=[TimelineEvent(time="March", event="Rob booked the trip")],
+            key_facts=["Rob booked", "Tasha knew first"],
+            gaps=["Why Lamar wasn't invited"],
+            covered_facts=covered_facts,
+        )
+        return session
+
+    return make
+
+
+def test_state_and_verdict_schemas_reuse_the_report_fields():
+    properties = ANALYSIS_SCHEMA["input_schema"]["properties"]
+    assert ANALYSIS_STATE_SCHEMA["input_schema"]["properties"]["timeline"] is properties["timeline"]
+    assert VERDICT_SCHEMA["input_schema"]["properties"]["verdict"] is properties["verdict"]
+
+
+def test_update_state_sends_only_new_facts(session_with_state):
+    client = Mock(spec=ClaudeClient)
+    client.call_with_tool.return_value = {"timeline": [], "key_facts": ["x"], "gaps": []}
+    session = session_with_state(covered_facts=2)
+
+    state = IncrementalAnalysisAgent(client).update_state(
+        session.analysis_state, session.facts, session.goals
+    )
+
+    prompt = client.call_with_tool.call_args.args[1]
+    assert "- [certain] Lamar saw the photos (at the Sunday after)" in prompt
+    assert "Tasha knew first" in prompt  # from the current state, not as a new fact
+    assert "- [certain] Tasha knew first" not in prompt
+    assert state.covered_facts == 3
+
+
+def test_final_call_only_asks_for_the_verdict(session_with_state, verdict):
+    client = Mock(spec=ClaudeClient)
+    client.call_with_tool.return_value = {"verdict": verdict}
+    session = session_with_state(covered_facts=2)
+
+    report = IncrementalAnalysisAgent(client).generate_analysis(session.model_dump())
+
+    assert client.call_with_tool.call_args.args[2] is VERDICT_SCHEMA
+    prompt = client.call_with_tool.call_args.args[1]
+    assert "FACTS NOT YET REFLECTED ABOVE:\n- [certain] Lamar saw the photos" in prompt
+    assert report.verdict.primary_responsibility == "Rob"
+    # The fact the state hasn't absorbed yet is appended locally
+    assert report.key_facts == ["Rob booked", "Tasha knew first", "Lamar saw the photos"]
+    assert report.timeline[-1] == TimelineEvent(time="the Sunday after", event="Lamar saw the photos")
+    assert report.gaps == ["Why Lamar wasn't invited"]
+
+
+def test_sessions_without_state_get_the_full_analysis(session_with_state, verdict):
+    client = Mock(spec=ClaudeClient)
+    client.call_with_tool.return_value = {"timeline": [], "key_facts": [], "gaps": [], "verdict": verdict}
+
+    IncrementalAnalysisAgent(client).generate_analysis(session_with_state(0).model_dump())
+
+    assert client.call_with_tool.call_args.args[2] is ANALYSIS_SCHEMA
+
+
+def test_due_and_apply(session_with_state):
+    session = session_with_state(covered_facts=2)
+    assert analysis_state_due(session)
+
+    assert not apply_analysis_state(session, AnalysisState(covered_facts=1))
+    assert apply_analysis_state(session, AnalysisState(covered_facts=3))
+    assert not analysis_state_due(session)
@@ -261,3 +261,261 @@ def test_initialize_investigation_uses_summary_extractor():
 
         # Assert first question returned
         assert first_question == "How did you find out about the trip?"
+
+
+def make_turn_orchestrator(
+    concurrent, delay=0.0, goals_after=(60, 70), target_goal="Timeline", **kwargs
+):
+    import time
+
+    from src.models import QuestionWithAnswers
+
+    session = Session(
+        session_id="test-concurrent",
+        incident_name="Test Incident",
+        created_at="2025-01-01T12:00:00",
+        current_question="What time did Sarah arrive?",
+        goals=[
+            Goal(description="Timeline", confidence=30, status=GoalStatus.IN_PROGRESS),
+            Goal(description="People", confidence=50, status=GoalStatus.IN_PROGRESS),
+        ],
+        confidence_threshold=80,
+    )
+    with patch("src.interview.ClaudeClient"):
+        orchestrator = InterviewOrchestrator(session, concurrent=concurrent, **kwargs)
+
+    def extract_and_update(question, answer, goals, session_id=None):
+        time.sleep(delay)
+        return (
+            [Fact(topic="timing", claim="Sarah arrived at 5:30pm")],
+            [
+                Goal(description=g.description, confidence=c, status=GoalStatus.IN_PROGRESS)
+                for g, c in zip(goals, goals_after, strict=True)
+            ],
+        )
+
+    def generate(goals, facts, messages, **kwargs):
+        orchestrator.seen_last_message = messages[-1].content
+        time.sleep(delay)
+        done = sum(g.confidence for g in goals) / len(goals) > kwargs["confidence_threshold"]
+        return QuestionWithAnswers(
+            question="Anything else before we wrap up?" if done else "Who else was there?",
+            target_goal=target_goal,
+            reasoning="",
+            answers=[Answer(answer=f"option {i}", reasoning="") for i in range(4)],
+        )
+
+    orchestrator.fact_and_goal_updater.extract_and_update = Mock(side_effect=extract_and_update)
+    orchestrator.question_generator.generate_question_with_answers = Mock(side_effect=generate)
+    return orchestrator, session
+
+
+def test_concurrent_pipeline_overlaps_calls_and_merges_state():
+    import time
+
+    orchestrator, session = make_turn_orchestrator(concurrent=True, delay=0.2)
+
+    start = time.perf_counter()
+    next_question, is_complete = orchestrator.process_answer(Answer(answer="5:30", reasoning=""))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.35  # both 200ms calls ran side by side
+    assert next_question == "Who else was there?"
+    assert not is_complete
+    assert [g.confidence for g in session.goals] == [60, 70]
+    assert session.facts[-1].claim == "Sarah arrived at 5:30pm"
+    # Question generation saw the previous goals and the new answer
+    kwargs = orchestrator.question_generator.generate_question_with_answers.call_args
+    assert [g.confidence for g in kwargs.args[0]] == [30, 50]
+    assert orchestrator.seen_last_message == "5:30"
+
+
+def test_concurrent_pipeline_wraps_up_from_merged_goals():
+    orchestrator, session = make_turn_orchestrator(concurrent=True, goals_after=(90, 95))
+
+    next_question, is_complete = orchestrator.process_answer(Answer(answer="5:30", reasoning=""))
+
+    assert is_complete
+    assert session.status == SessionStatus.COMPLETE
+    # The ordinary question generated alongside is replaced by a closing one
+    assert next_question == session.current_question == "Anything else before we wrap up?"
+    assert session.messages[-1].content == "Anything else before we wrap up?"
+    final_goals = orchestrator.question_generator.generate_question_with_answers.call_args.args[0]
+    assert [g.confidence for g in final_goals] == [90, 95]
+
+
+def test_pipeline_mode_env(monkeypatch):
+    monkeypatch.setenv("PIPELINE_MODE", "concurrent")
+    orchestrator, _ = make_turn_orchestrator(concurrent=None)
+    assert orchestrator.concurrent
+    monkeypatch.delenv("PIPELINE_MODE")
+    orchestrator, _ = make_turn_orchestrator(concurrent=None)
+    assert not orchestrator.concurrent
+
+
+def test_drift_check_runs_in_background_and_redirects_next_turn():
+    import time
+
+    from src.background import BACKGROUND
+    from src.models import DriftAnalysis
+
+    orchestrator, session = make_turn_orchestrator(concurrent=False, drift_check_every=1)
+
+    def check_drift(question, answer, session_id=None):
+        time.sleep(0.3)
+        return DriftAnalysis(
+            addressed_question=False, drift_reason="dodged", redirect_suggestion="Ask about 5pm"
+        )
+
+    orchestrator.drift_detector.check_drift = Mock(side_effect=check_drift)
+
+    start = time.perf_counter()
+    orchestrator.process_answer(Answer(answer="I like pizza", reasoning=""))
+    assert time.perf_counter() - start < 0.2  # the 300ms drift check didn't block the turn
+
+    BACKGROUND.wait_all(timeout=2)
+    orchestrator.process_answer(Answer(answer="5:30", reasoning=""))
+
+    generate = orchestrator.question_generator.generate_question_with_answers
+    assert generate.call_args_list[0].kwargs["drift_redirect"] == ""
+    assert generate.call_args_list[1].kwargs["drift_redirect"] == "Ask about 5pm"
+    BACKGROUND.wait_all(timeout=2)
+
+
+def test_drift_check_cadence():
+    orchestrator, _ = make_turn_orchestrator(concurrent=False, drift_check_every=3)
+    orchestrator.drift_detector.check_drift = Mock()
+
+    for _ in range(3):
+        orchestrator.process_answer(Answer(answer="5:30", reasoning=""))
+
+    from src.background import BACKGROUND
+    BACKGROUND.wait_all(timeout=2)
+    assert orchestrator.drift_detector.check_drift.call_count == 1
+
+    disabled, _ = make_turn_orchestrator(concurrent=False, drift_check_every=0)
+    disabled.drift_detector.check_drift = Mock()
+    disabled.process_answer(Answer(answer="5:30", reasoning=""))
+    disabled.drift_detector.check_drift.assert_not_called()
+
+
+def test_triaged_answer_skips_extraction():
+    orchestrator, session = make_turn_orchestrator(concurrent=False, triage=True)
+
+    orchestrator.process_answer(Answer(answer="idk", reasoning=""))
+
+    orchestrator.fact_and_goal_updater.extract_and_update.assert_not_called()
+    assert [g.confidence for g in session.goals] == [30, 50]
+    assert session.current_question == "Who else was there?"
+
+
+def test_canned_answer_commits_precomputed_facts():
+    from src.models import GoalUpdate, OptionImplication
+
+    orchestrator, session = make_turn_orchestrator(concurrent=False, drift_check_every=0)
+    session.answers = [Answer(answer="Rob booked it", reasoning="")]
+    session.answer_implications = [
+        OptionImplication(
+            answer="Rob booked it",
+            facts=[Fact(topic="planning", claim="Rob booked the trip")],
+            goal_updates=[GoalUpdate(goal_id="g1", confidence=45, status=GoalStatus.IN_PROGRESS)],
+        )
+    ]
+
+    orchestrator.process_answer(Answer(answer="Rob booked it", reasoning=""))
+    orchestrator.fact_and_goal_updater.extract_and_update.assert_not_called()
+    assert session.facts[-1].claim == "Rob booked the trip"
+    assert [g.confidence for g in session.goals] == [45, 50]
+
+    # Custom answers still go through extraction
+    orchestrator.process_answer(Answer(answer="Marcus drove them", reasoning=""))
+    orchestrator.fact_and_goal_updater.extract_and_update.assert_called_once()
+
+
+def test_concurrent_turn_drops_implications_computed_against_stale_goals():
+    from src.models import GoalUpdate, OptionImplication
+
+    orchestrator, session = make_turn_orchestrator(concurrent=True, drift_check_every=0)
+    generate = orchestrator.question_generator.generate_question_with_answers.side_effect
+
+    def generate_with_implications(goals, facts, messages, **kwargs):
+        question_data = generate(goals, facts, messages, **kwargs)
+        question_data.implications = [
+            OptionImplication(
+                answer="option 0",
+                goal_updates=[GoalUpdate(goal_id="g1", confidence=35, status=GoalStatus.IN_PROGRESS)],
+            )
+        ]
+        return question_data
+
+    orchestrator.question_generator.generate_question_with_answers.side_effect = (
+        generate_with_implications
+    )
+
+    orchestrator.process_answer(Answer(answer="5:30", reasoning=""))
+    assert session.answer_implications == []
+
+    orchestrator.process_answer(Answer(answer="option 0", reasoning=""))
+    assert orchestrator.fact_and_goal_updater.extract_and_update.call_count == 2
+    assert [g.confidence for g in session.goals] == [60, 70]
+
+
+def test_rolling_summary_folds_in_background_and_shrinks_next_prompt():
+    from src.background import BACKGROUND
+
+    orchestrator, session = make_turn_orchestrator(
+        concurrent=False, drift_check_every=0, rolling_summary=True
+    )
+    orchestrator.rolling_memory.every = 1
+    orchestrator.rolling_memory.keep_messages = 2
+    orchestrator.rolling_memory.summarizer.fold = Mock(return_value="Sarah arrived late.")
+
+    orchestrator.process_answer(Answer(answer="5:30", reasoning=""))
+    orchestrator.process_answer(Answer(answer="with Rob", reasoning=""))
+    # The fold due after turn two runs off the response path...
+    BACKGROUND.wait_all(timeout=2)
+    assert orchestrator.session.memory.summary == ""
+    # ...and is picked up by the next turn's question prompt
+    orchestrator.process_answer(Answer(answer="at the bar", reasoning=""))
+
+    assert orchestrator.rolling_memory.summarizer.fold.call_count == 1
+    memory = orchestrator.question_generator.generate_question_with_answers.call_args.kwargs["memory"]
+    assert memory.summary == "Sarah arrived late."
+    assert memory.covered_messages == 2
+    BACKGROUND.wait_all(timeout=2)
+
+
+def test_fact_dedup_merges_restated_facts_across_turns():
+    orchestrator, session = make_turn_orchestrator(
+        concurrent=False, drift_check_every=0, fact_dedup=True
+    )
+
+    orchestrator.process_answer(Answer(answer="5:30", reasoning=""))
+    orchestrator.process_answer(Answer(answer="like I said, 5:30", reasoning=""))
+
+    assert [f.claim for f in session.facts] == ["Sarah arrived at 5:30pm"]
+    assert session.facts[0].turns == [1, 2]
+
+
+def test_incremental_analysis_updates_state_in_background():
+    from src.background import BACKGROUND
+    from src.models import AnalysisState
+
+    orchestrator, session = make_turn_orchestrator(
+        concurrent=False, drift_check_every=0, incremental_analysis=True
+    )
+    update_state = Mock(
+        side_effect=lambda state, facts, goals, session_id=None: AnalysisState(
+            key_facts=[f.claim for f in facts], covered_facts=len(facts)
+        )
+    )
+    orchestrator.incremental_analysis_agent.update_state = update_state
+
+    orchestrator.process_answer(Answer(answer="5:30", reasoning=""))
+    BACKGROUND.wait_all(timeout=2)
+    assert session.analysis_state.covered_facts == 0  # applied next turn, never awaited
+    orchestrator.process_answer(Answer(answer="with Rob", reasoning=""))
+
+    assert session.analysis_state.key_facts == ["Sarah arrived at 5:30pm"]
+    BACKGROUND.wait_all(timeout=2)
+    assert update_state.call_count == 2
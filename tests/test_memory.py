@@ -0,0 +1,79 @@
+"""Tests for the rolling conversation summary."""
+from unittest.mock import Mock
+
+from src.agents.conversation_summarizer import ConversationSummarizerAgent
+from src.memory import RollingMemory, apply_memory
+from src.models import ConversationMemory, Fact, Message, Session
+from src.prompts import build_analysis_prompt
+
+
+def session_with_turns(turns: int) -> Session:
+    session = Session(session_id="s1", incident_name="Trip", created_at="2025-01-01T12:00:00")
+    for i in range(turns):
+        session.messages.append(Message(role="assistant", content=f"Question {i}?", timestamp=""))
+        session.messages.append(Message(role="user", content=f"Answer {i}", timestamp=""))
+        session.facts.append(Fact(topic="trip", claim=f"Fact {i}"))
+    return session
+
+
+def rolling(**kwargs) -> tuple[RollingMemory, Mock]:
+    summarizer = Mock(spec=ConversationSummarizerAgent)
+    summarizer.fold.return_value = "Rob booked the trip; Lamar found out from Tasha."
+    return RollingMemory(summarizer, **kwargs), summarizer
+
+
+def test_fold_is_due_after_a_cadence_beyond_the_window():
+    memory, _ = rolling(every=3, keep_messages=6, keep_facts=4)
+
+    assert not memory.due(session_with_turns(5))
+    assert memory.due(session_with_turns(6))
+
+
+def test_fold_covers_everything_older_than_the_window():
+    memory, summarizer = rolling(every=3, keep_messages=6, keep_facts=4)
+    session = session_with_turns(8)
+
+    folded = memory.fold(session)
+
+    previous, messages, facts = summarizer.fold.call_args.args
+    assert previous == ""
+    assert [m.content for m in messages][-1] == "Answer 4"
+    assert [f.claim for f in facts] == [f"Fact {i}" for i in range(4)]
+    assert folded == ConversationMemory(
+        summary="Rob booked the trip; Lamar found out from Tasha.",
+        covered_messages=10,
+        covered_facts=4,
+    )
+
+
+def test_next_fold_starts_where_the_last_one_ended():
+    memory, summarizer = rolling(every=3, keep_messages=6, keep_facts=4)
+    session = session_with_turns(14)
+    session.memory = ConversationMemory(summary="earlier", covered_messages=10, covered_facts=4)
+
+    memory.fold(session)
+
+    previous, messages, facts = summarizer.fold.call_args.args
+    assert previous == "earlier"
+    assert messages[0].content == "Question 5?"
+    assert facts[0].claim == "Fact 4"
+
+
+def test_stale_fold_is_not_applied():
+    session = session_with_turns(1)
+    session.memory = ConversationMemory(summary="newer", covered_messages=10)
+
+    assert not apply_memory(session, ConversationMemory(summary="older", covered_messages=6))
+    assert session.memory.summary == "newer"
+
+
+def test_analysis_prompt_replaces_folded_transcript_with_summary():
+    session = session_with_turns(30)
+    session.memory = ConversationMemory(summary="Rob booked it.", covered_messages=54, covered_facts=20)
+
+    prompt = build_analysis_prompt(session.model_dump())
+
+    assert "EARLIER IN THE INTERVIEW (summary):\nRob booked it." in prompt
+    assert "Question 0?" not in prompt
+    assert "ASSISTANT: Question 27?" in prompt
+    assert "Fact 0" in prompt  # facts stay; only the transcript is summarized
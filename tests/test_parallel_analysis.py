@@ -0,0 +1,129 @@
+"""Tests for sectioned analysis (PARALLEL_ANALYSIS): concurrent section calls merged locally."""
+import os
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.agents.agent_analysis import AnalysisAgent
+from src.api_client import ClaudeClient
+from src.fake_anthropic_server import FakeAnthropicServer, FakeServerConfig
+from src.models import AnalysisReport, Fact
+from src.prompts import ANALYSIS_SECTIONS_SYSTEM, build_analysis_prompt
+from src.schemas import TIMELINE_ADDITIONS_SECTION_SCHEMA, TIMELINE_SECTION_SCHEMA
+from src.telemetry import Telemetry
+
+TRIP_FACTS = [
+    Fact(topic="trip", claim="Lamar saw the photos", timestamp="on Sunday"),
+    Fact(topic="trip", claim="Rob booked the trip", timestamp="March 2"),
+    Fact(topic="trip", claim="Tasha found out", timestamp="the day after"),
+]
+
+
+@pytest.fixture
+def session_data(trip_session) -> dict:
+    return trip_session(facts=TRIP_FACTS).model_dump()
+
+
+@pytest.fixture
+def sections(verdict) -> dict:
+    return {
+        "generate_timeline": {"timeline": [{"time": "March 2", "event": "Rob booked the trip"}]},
+        "generate_key_facts": {"key_facts": ["Rob booked without Lamar"]},
+        "generate_gaps": {"gaps": ["Why Lamar wasn't invited"]},
+        "generate_verdict": {"verdict": verdict},
+    }
+
+
+def section_client(sections: dict, delay: float = 0.0) -> Mock:
+    client = Mock(spec=ClaudeClient)
+
+    def answer(system, user, prior, schemas, target, instruction, **kwargs):
+        time.sleep(delay)
+        return sections[target]
+
+    client.call_tool_followup.side_effect = answer
+    return client
+
+
+def test_sections_share_prefix_and_merge_into_report(session_data, sections):
+    client = section_client(sections)
+
+    report = AnalysisAgent(client, local_timeline=False, parallel=True).generate_analysis(session_data, "s1")
+
+    calls = client.call_tool_followup.call_args_list
+    assert sorted(c.args[4] for c in calls) == sorted(sections)
+    # Everything before the section request is identical, so it is cached once
+    assert {c.args[0] for c in calls} == {ANALYSIS_SECTIONS_SYSTEM}
+    assert len({c.args[1] for c in calls}) == 1
+    assert all(c.args[3] == calls[0].args[3] for c in calls)
+    assert all(c.args[2] == {} and c.kwargs["use_cache"] for c in calls)
+    assert isinstance(report, AnalysisReport)
+    assert report.timeline[0].event == "Rob booked the trip"
+    assert report.key_facts == ["Rob booked without Lamar"]
+    assert report.gaps == ["Why Lamar wasn't invited"]
+    assert report.verdict.primary_responsibility == "Rob"
+
+
+def test_sections_run_concurrently(session_data, sections):
+    client = section_client(sections, delay=0.3)
+
+    start = time.perf_counter()
+    AnalysisAgent(client, local_timeline=False, parallel=True).generate_analysis(session_data)
+
+    assert time.perf_counter() - start < 0.9
+
+
+def test_local_timeline_section_only_places_unclear_facts(session_data, sections):
+    additions = [{"after": 1, "time": "the day after", "event": "Tasha found out"}]
+    client = Mock(spec=ClaudeClient)
+    client.call_tool_followup.side_effect = lambda *args, **kwargs: (
+        {"timeline_additions": additions} if args[4] == "generate_timeline" else sections[args[4]]
+    )
+
+    report = AnalysisAgent(client, local_timeline=True, parallel=True).generate_analysis(session_data)
+
+    call = client.call_tool_followup.call_args_list[0]
+    assert TIMELINE_ADDITIONS_SECTION_SCHEMA in call.args[3]
+    assert TIMELINE_SECTION_SCHEMA not in call.args[3]
+    timeline_call = next(c for c in client.call_tool_followup.call_args_list if c.args[4] == "generate_timeline")
+    assert "timeline_additions" in timeline_call.args[5]
+    assert [e.event for e in report.timeline] == ["Rob booked the trip", "Tasha found out", "Lamar saw the photos"]
+
+
+def test_sectioned_prompt_leaves_the_task_to_each_request(session_data):
+    prompt = build_analysis_prompt(session_data, sectioned=True)
+
+    assert "write the report section requested below" in prompt
+    assert "generate your comprehensive analysis report" not in prompt
+
+
+def test_parallel_analysis_env_flag():
+    with patch.dict(os.environ, {"PARALLEL_ANALYSIS": "true"}):
+        assert AnalysisAgent(Mock(spec=ClaudeClient)).parallel
+    with patch.dict(os.environ, {"PARALLEL_ANALYSIS": ""}):
+        assert not AnalysisAgent(Mock(spec=ClaudeClient)).parallel
+
+
+def test_first_section_is_sent_alone_before_the_rest(session_data, sections):
+    client = section_client(sections)
+
+    AnalysisAgent(client, local_timeline=False, parallel=True).generate_analysis(session_data)
+
+    assert client.call_tool_followup.call_args_list[0].args[4] == "generate_gaps"
+
+
+def test_sectioned_analysis_against_fake_api(session_data):
+    telemetry = Telemetry()
+    with FakeAnthropicServer(FakeServerConfig(seed=0)) as fake:
+        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "fake-key"}):
+            client = ClaudeClient(base_url=fake.base_url, telemetry=telemetry)
+        report = AnalysisAgent(client, local_timeline=False, parallel=True).generate_analysis(session_data)
+
+        assert fake.request_count == 4
+    assert len(report.key_facts) == 2
+    assert 1 <= report.verdict.drama_rating <= 10
+    # The first section writes the shared prefix; the three sent after it read it
+    calls = telemetry.recent_calls()
+    assert sum(c.cache_creation_input_tokens > 0 for c in calls) == 1
+    assert sum(c.cache_read_input_tokens > 0 for c in calls) == 3
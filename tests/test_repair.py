@@ -0,0 +1,135 @@
+"""Tests for local repair of tool outputs and targeted follow-up calls."""
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from anthropic.types import ToolUseBlock
+
+from src.agents.summary_and_goal_generator import SummaryAndGoalGenerator
+from src.api_client import ClaudeClient
+from src.models import ExtractedSummary, QuestionWithAnswers
+from src.repair import repair_question_output, repair_summary_output
+from src.schemas import GOAL_GENERATOR_SCHEMA, SUMMARY_EXTRACTOR_SCHEMA
+from src.telemetry import Telemetry
+
+SUMMARY = {
+    "actors": [{"name": "Rob", "role": "friend", "relationships": [], "emotional_state": []}],
+    "point_of_conflict": {"primary": "Secret trip", "secondary": []},
+    "general_details": {
+        "timeline_markers": [],
+        "location_context": [],
+        "communication_history": [],
+        "emotional_atmosphere": "tense",
+    },
+    "missing_info": [],
+}
+
+GOALS = {"goals": ["Timeline", "Who knew", "Why it was hidden"]}
+
+
+def question(answer_count):
+    return {
+        "question": "Who booked the flights?",
+        "target_goal": "g1",
+        "reasoning": "Anchors the timeline",
+        "answers": [{"answer": f"Option {i}", "reasoning": "r"} for i in range(answer_count)],
+    }
+
+
+def tool_response(*uses):
+    return SimpleNamespace(
+        content=[
+            ToolUseBlock(type="tool_use", id=f"toolu_{i}", name=name, input=data)
+            for i, (name, data) in enumerate(uses)
+        ]
+    )
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "fake-key")
+    client = ClaudeClient(telemetry=Telemetry(), compact_schemas=False)
+    client._create_message = Mock()
+    return client
+
+
+@pytest.mark.parametrize("count", [2, 3, 5, 6])
+def test_question_answers_are_trimmed_or_padded_to_four(count):
+    telemetry = Telemetry()
+
+    repaired = repair_question_output(question(count), telemetry)
+
+    QuestionWithAnswers.model_validate(repaired)
+    assert [a["answer"] for a in repaired["answers"][: min(count, 4)]] == [
+        f"Option {i}" for i in range(min(count, 4))
+    ]
+    assert telemetry.counter("repair.local.answer_count") == 1
+
+
+def test_valid_question_is_untouched():
+    telemetry = Telemetry()
+    data = question(4)
+
+    assert repair_question_output(data, telemetry) is data
+    assert telemetry.counter("repair.local.answer_count") == 0
+
+
+def test_summary_defaults_fill_missing_fields():
+    telemetry = Telemetry()
+    partial = {"actors": SUMMARY["actors"], "point_of_conflict": {"primary": "Secret trip"}}
+
+    repaired = repair_summary_output(partial, telemetry)
+
+    ExtractedSummary.model_validate(repaired)
+    assert repaired["point_of_conflict"] == {"primary": "Secret trip", "secondary": []}
+    assert telemetry.counter("repair.local.summary_defaults") == 1
+
+
+def test_summary_defaults_are_not_shared_between_outputs():
+    first = repair_summary_output({"actors": [], "point_of_conflict": {"primary": "Trip"}}, Telemetry())
+    first["actors"].append({"name": "Rob"})
+    first["point_of_conflict"]["secondary"].append("Deposit")
+    first["general_details"]["timeline_markers"].append("March 12")
+
+    second = repair_summary_output({}, Telemetry())
+
+    assert second["actors"] == []
+    assert second["point_of_conflict"]["secondary"] == []
+    assert second["general_details"]["timeline_markers"] == []
+
+
+def test_missing_tool_is_requested_alone_with_prior_output_as_context(client):
+    client._create_message.side_effect = [
+        tool_response(("extract_summary_structure", SUMMARY)),
+        tool_response(("generate_investigation_goals", GOALS)),
+    ]
+
+    results = client.call_with_multiple_tools(
+        "system", "prompt", [SUMMARY_EXTRACTOR_SCHEMA, GOAL_GENERATOR_SCHEMA], use_cache=True
+    )
+
+    assert results == {"extract_summary_structure": SUMMARY, "generate_investigation_goals": GOALS}
+    followup = client._create_message.call_args_list[1].kwargs
+    assert followup["tool_choice"] == {"type": "tool", "name": "generate_investigation_goals"}
+    user, assistant, result = followup["messages"]
+    assert user["content"][-1]["cache_control"] == {"type": "ephemeral"}
+    assert assistant["content"][0]["input"] == SUMMARY
+    assert result["content"][0]["tool_use_id"] == assistant["content"][0]["id"]
+    assert "generate_investigation_goals" in result["content"][-1]["text"]
+    assert client.telemetry.counter("repair.followup.missing_tool") == 1
+
+
+def test_too_few_goals_triggers_goal_followup_only(client):
+    client._create_message.side_effect = [
+        tool_response(
+            ("extract_summary_structure", SUMMARY),
+            ("generate_investigation_goals", {"goals": ["Timeline"]}),
+        ),
+        tool_response(("generate_investigation_goals", GOALS)),
+    ]
+
+    summary, goals = SummaryAndGoalGenerator(client).extract_and_generate("Rob went to Mexico")
+
+    assert summary.actors[0].name == "Rob"
+    assert [g.description for g in goals] == GOALS["goals"]
+    assert client._create_message.call_count == 2
@@ -0,0 +1,111 @@
+"""Tests for per-agent model routing and the latency-SLO fallback."""
+import json
+from unittest.mock import Mock, patch
+
+from src.api_client import ClaudeClient
+from src.routing import AgentRoute, ModelTier, RoutingTable
+from src.telemetry import CallRecord, Telemetry
+
+
+def make_table():
+    return RoutingTable(
+        tiers={
+            "default": ModelTier(model="claude-haiku-4-5", max_tokens=2048, temperature=0.3),
+            "analysis": ModelTier(model="claude-sonnet-4-5", max_tokens=4096, temperature=0.2),
+            "fast": ModelTier(model="claude-haiku-4-5", max_tokens=1024, temperature=0.3),
+        },
+        agents={
+            "AnalysisAgent": AgentRoute(
+                tier="analysis", p95_budget_ms=1000, fallback_tier="fast", min_samples=3
+            ),
+        },
+    )
+
+
+def record(telemetry, agent, route, latency_ms):
+    telemetry.record_call(
+        CallRecord(agent=agent, route=route, model="m", latency_ms=latency_ms)
+    )
+
+
+def test_unknown_agent_uses_default_tier():
+    route = make_table().resolve("QuestionGeneratorAgent", Telemetry())
+    assert route.name == "default"
+    assert route.max_tokens == 2048
+    assert not route.fallback
+
+
+def test_agent_uses_configured_tier():
+    route = make_table().resolve("AnalysisAgent", Telemetry())
+    assert route.model == "claude-sonnet-4-5"
+    assert route.temperature == 0.2
+
+
+def test_fallback_when_p95_exceeds_budget():
+    table = make_table()
+    telemetry = Telemetry()
+    for latency in (1500, 1600, 1700):
+        record(telemetry, "AnalysisAgent", "analysis", latency)
+
+    route = table.resolve("AnalysisAgent", telemetry)
+    assert route.name == "fast"
+    assert route.fallback
+
+
+def test_no_fallback_below_min_samples():
+    table = make_table()
+    telemetry = Telemetry()
+    record(telemetry, "AnalysisAgent", "analysis", 5000)
+
+    assert table.resolve("AnalysisAgent", telemetry).name == "analysis"
+
+
+def test_primary_retried_after_window_expires():
+    table = make_table()
+    telemetry = Telemetry(window_seconds=0.0)
+    for latency in (1500, 1600, 1700):
+        record(telemetry, "AnalysisAgent", "analysis", latency)
+
+    assert table.resolve("AnalysisAgent", telemetry).name == "analysis"
+
+
+def test_from_env_merges_config_with_default_tier(tmp_path, monkeypatch):
+    config = tmp_path / "routes.json"
+    config.write_text(json.dumps({
+        "tiers": {"fast": {"model": "claude-haiku-4-5", "max_tokens": 512}},
+        "agents": {"DriftDetectorAgent": {"tier": "fast"}},
+    }))
+    monkeypatch.setenv("MODEL_ROUTES_PATH", str(config))
+
+    table = RoutingTable.from_env("claude-haiku-4-5", 2048, 0.3)
+
+    assert set(table.tiers) == {"default", "fast"}
+    assert table.resolve("DriftDetectorAgent").max_tokens == 512
+    assert table.resolve("FactAndGoalUpdater").max_tokens == 2048
+
+
+@patch.dict("os.environ", {"ANTHROPIC_API_KEY": "mock-api-key-12345"})
+@patch("src.api_client.Anthropic")
+def test_client_sends_route_and_records_telemetry(mock_anthropic):
+    telemetry = Telemetry()
+    client = ClaudeClient(routing_table=make_table(), telemetry=telemetry)
+
+    tool_block = Mock(type="tool_use", input={"ok": True})
+    tool_block.name = "generate_analysis_report"
+    response = Mock(content=[tool_block], usage=Mock(input_tokens=100, output_tokens=20))
+    mock_anthropic.return_value.messages.create.return_value = response
+
+    with patch("src.api_client.ToolUseBlock", Mock):
+        client.call_with_multiple_tools(
+            "system", "prompt", [{"name": "generate_analysis_report"}],
+            agent_name="AnalysisAgent",
+        )
+
+    kwargs = mock_anthropic.return_value.messages.create.call_args.kwargs
+    assert kwargs["model"] == "claude-sonnet-4-5"
+    assert kwargs["max_tokens"] == 4096
+
+    calls = telemetry.recent_calls()
+    assert calls[-1].agent == "AnalysisAgent"
+    assert calls[-1].route == "analysis"
+    assert calls[-1].output_tokens == 20
@@ -0,0 +1,130 @@
+"""Tests for the local timeline (temporal normalizer + deterministic ordering)."""
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from src.agents.agent_analysis import AnalysisAgent
+from src.api_client import ClaudeClient
+from src.models import Fact, TimelineEvent
+from src.prompts import build_analysis_prompt
+from src.schemas import ANALYSIS_LOCAL_TIMELINE_SCHEMA
+from src.timeline import build_timeline, merge_timeline, parse_time
+
+# A Wednesday
+REFERENCE = datetime(2024, 3, 20, 12, 0)
+
+
+@pytest.mark.parametrize(
+    "text, label, precision",
+    [
+        ("March 12", "Tue Mar 12", "day"),
+        ("12th of March, 2023", "Sun Mar 12 2023", "day"),
+        ("2024-03-05", "Tue Mar 5", "day"),
+        ("12/03/2024", "Tue Mar 12", "day"),  # month-first would be in the future
+        ("last Friday around 6", "Fri Mar 15 6:00 PM", "hour"),
+        ("on Sunday", "Sun Mar 17", "day"),
+        ("yesterday at 5:30pm", "Tue Mar 19 5:30 PM", "minute"),
+        ("last night", "Tue Mar 19 night", "part_of_day"),
+        ("2 weeks ago", "Wed Mar 6", "day"),
+        ("a couple of days ago", "Mon Mar 18", "day"),
+        ("last week", "week of Mar 11", "week"),
+        ("late February", "February", "month"),
+        ("in 2019", "2019", "year"),
+        ("21:40", "9:40 PM", "minute"),
+        ("around 12", "12:00 PM", "hour"),
+        ("at 12 at night", "12:00 AM", "hour"),
+        ("after dinner", "evening", "part_of_day"),
+    ],
+)
+def test_parse_time(text, label, precision):
+    point = parse_time(text, REFERENCE)
+
+    assert point.label(REFERENCE.year) == label
+    assert point.precision == precision
+
+
+@pytest.mark.parametrize("text", ["the day after", "before the party", "it may have been"])
+def test_unreadable_times_are_none(text):
+    assert parse_time(text, REFERENCE) is None
+
+
+def fact(claim, timestamp):
+    return Fact(topic="trip", claim=claim, timestamp=timestamp)
+
+
+def test_build_timeline_orders_facts_and_anchors_bare_times():
+    facts = [
+        fact("They argued", "March 14 around 9pm"),
+        fact("Lamar left", "10:15pm"),  # no date: same day as the fact before it
+        fact("Rob booked the trip", "March 2"),
+        fact("Tasha found out", "the day after"),
+        fact("Rob texted", None),
+        fact("Dinner started", "8pm"),  # anchored to March 2
+    ]
+
+    timeline = build_timeline(facts, REFERENCE)
+
+    assert [e.event for e in timeline.events] == [
+        "Rob booked the trip", "Dinner started", "They argued", "Lamar left",
+    ]
+    assert timeline.events[1].time == "8:00 PM"
+    assert [f.claim for f in timeline.unclear] == ["Tasha found out"]
+
+
+def test_ties_keep_interview_order():
+    facts = [fact("First", "March 12"), fact("Second", "3/12"), fact("Earlier", "March 1")]
+
+    assert [e.event for e in build_timeline(facts, REFERENCE).events] == ["Earlier", "First", "Second"]
+
+
+def test_merge_timeline_inserts_after_numbered_events():
+    events = [TimelineEvent(time="a", event="A"), TimelineEvent(time="b", event="B")]
+
+    merged = merge_timeline(
+        events,
+        [{"after": 1, "time": "x", "event": "X"}, {"after": 0, "time": "y", "event": "Y"},
+         {"after": 9, "time": "z", "event": "Z"}],
+    )
+
+    assert [e.event for e in merged] == ["Y", "A", "X", "B", "Z"]
+
+
+@pytest.fixture
+def session_data(trip_session) -> dict:
+    return trip_session(facts=[
+        fact("Lamar saw the photos", "on Sunday"),
+        fact("Rob booked the trip", "March 2"),
+        fact("Tasha found out", "the day after"),
+        Fact(topic="trip", claim="Rob felt guilty"),
+    ]).model_dump()
+
+
+def test_prompt_shows_dated_facts_once_as_numbered_events(session_data):
+    data = session_data
+    timeline = build_timeline([Fact.model_validate(f) for f in data["facts"]], REFERENCE)
+
+    prompt = build_analysis_prompt(data, local_timeline=timeline)
+
+    assert "1. Sat Mar 2: Rob booked the trip\n2. Sun Mar 17: Lamar saw the photos" in prompt
+    assert prompt.count("Rob booked the trip") == 1
+    assert "- [certain] Tasha found out (at the day after)" in prompt
+    assert "timeline_additions" in prompt
+
+
+def test_analysis_agent_merges_model_placed_events(session_data, verdict):
+    client = Mock(spec=ClaudeClient)
+    client.call_with_tool.return_value = {
+        "timeline_additions": [{"after": 1, "time": "the day after", "event": "Tasha found out"}],
+        "key_facts": ["Rob booked without Lamar"],
+        "gaps": [],
+        "verdict": verdict,
+    }
+
+    report = AnalysisAgent(client, local_timeline=True).generate_analysis(session_data)
+
+    assert client.call_with_tool.call_args.args[2] is ANALYSIS_LOCAL_TIMELINE_SCHEMA
+    assert [e.event for e in report.timeline] == [
+        "Rob booked the trip", "Tasha found out", "Lamar saw the photos",
+    ]
+    assert report.key_facts == ["Rob booked without Lamar"]
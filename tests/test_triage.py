@@ -0,0 +1,59 @@
+"""Tests for local answer triage."""
+import pytest
+
+from src.models import Answer, Fact
+from src.telemetry import Telemetry
+from src.triage import triage_answer, triage_stats
+
+FACTS = [Fact(topic="timing", claim="John and Rob flew to Cancun on March 3rd")]
+
+
+def triage(text, options=None, telemetry=None):
+    return triage_answer(
+        Answer(answer=text, reasoning=""), FACTS, options, telemetry or Telemetry()
+    )
+
+
+@pytest.mark.parametrize("text", ["I don't know", "idk", "no idea lol", "Not sure tbh", "..."])
+def test_non_answers_are_skipped(text):
+    assert triage(text).skip
+
+
+@pytest.mark.parametrize("text", [
+    "No",
+    "At 5pm",
+    "Marcus drove them to the airport",
+    "I don't know why, but Rob told Marcus about the trip a week before they left",
+    "idk, maybe Rob told him on Friday",
+    "Whatever, Marcus leaked the group chat",
+    "Skip lunch was when Rob told Lamar",
+])
+def test_informative_answers_go_through(text):
+    assert not triage(text).skip
+
+
+def test_repetition_of_known_fact():
+    assert triage("they flew to Cancun March 3rd").reason == "repetition"
+    option = Answer(answer="John and Rob flew to Cancun on March 3rd", reasoning="")
+    assert triage(option.answer, options=[option]).reason == "known_option"
+
+
+@pytest.mark.parametrize("text", [
+    "John and Rob never flew to Cancun on March 3rd",
+    "Rob flew to Cancun on March 3rd without John",
+    "John and Rob didn't fly to Cancun on March 3rd",
+    "John and Rob flew to Cancun on March 3rd with Marcus",
+])
+def test_negated_or_extended_fact_is_not_repetition(text):
+    assert triage(text).reason == "informative"
+
+
+def test_skip_rate_metrics():
+    telemetry = Telemetry()
+    for text in ["idk", "Marcus knew", "no idea", "Rob paid for it"]:
+        triage(text, telemetry=telemetry)
+
+    stats = triage_stats(telemetry)
+    assert stats["total"] == 4
+    assert stats["skip_rate"] == 0.5
+    assert stats["by_reason"]["non_answer"] == 2